@@ -0,0 +1,113 @@
+"""제출 경로 입장 제어 (토큰 버킷 + 대기열 상한)
+
+Google Sheets 쓰기 쿼터(분당 요청 수)에 맞춘 토큰 버킷으로 업로드 순서를 정하고,
+예상 대기 시간이 max_wait를 넘거나 대기열이 가득 차면 기다리지 않고 바로
+로컬 저장소 쪽으로 돌립니다(업로드 대기열에 남아 나중에 동기화).
+
+clock/sleep을 주입할 수 있어 가짜 시계로 결정적으로 시험할 수 있습니다.
+"""
+import threading
+import time
+from collections import deque
+
+
+class TokenBucket:
+    """초당 rate개씩 차는 토큰 버킷. reserve()는 토큰을 미리 빌려 쓰고 기다릴 시간을 돌려준다"""
+
+    def __init__(self, rate_per_sec, capacity, clock=time.monotonic):
+        self.rate = float(rate_per_sec)
+        self.capacity = float(capacity)
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self):
+        self._refill()
+        return self.tokens
+
+    def reserve(self, max_wait, n=1):
+        """max_wait 안에 토큰이 생기면 예약하고 대기 시간(초), 아니면 None"""
+        self._refill()
+        wait = 0.0 if self.tokens >= n else (n - self.tokens) / self.rate
+        if wait > max_wait:
+            return None
+        self.tokens -= n
+        return wait
+
+
+class Ticket:
+    __slots__ = ('admitted', 'delay', 'reason', 'issued_at')
+
+    def __init__(self, admitted, delay, reason, issued_at):
+        self.admitted = admitted
+        self.delay = delay
+        self.reason = reason
+        self.issued_at = issued_at
+
+
+class AdmissionController:
+    def __init__(self, bucket, max_queue=30, max_wait=8.0, clock=time.monotonic, sleep=time.sleep,
+                 history=500):
+        self.bucket = bucket
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.admitted = 0
+        self.shed = {'queue_full': 0, 'timeout': 0}
+        self.wait_times = deque(maxlen=history)
+
+    def admit(self):
+        """입장권 발급 (잠금 안에서 토큰만 예약, 대기는 wait()에서)"""
+        with self._lock:
+            now = self.clock()
+            if self.queue_depth >= self.max_queue:
+                self.shed['queue_full'] += 1
+                return Ticket(False, 0.0, 'queue_full', now)
+            delay = self.bucket.reserve(self.max_wait)
+            if delay is None:
+                self.shed['timeout'] += 1
+                return Ticket(False, 0.0, 'timeout', now)
+            self.admitted += 1
+            if delay > 0:
+                self.queue_depth += 1
+                self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            return Ticket(True, delay, 'admitted', now)
+
+    def wait(self, ticket):
+        """예약한 차례까지 대기"""
+        if not ticket.admitted:
+            return
+        try:
+            if ticket.delay > 0:
+                self.sleep(ticket.delay)
+        finally:
+            with self._lock:
+                if ticket.delay > 0:
+                    self.queue_depth -= 1
+                self.wait_times.append(self.clock() - ticket.issued_at)
+
+    def metrics(self):
+        with self._lock:
+            waits = sorted(self.wait_times)
+            tokens = self.bucket.available()
+        pct = lambda q: waits[min(len(waits) - 1, int(q * len(waits)))] if waits else 0.0
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'admitted': self.admitted,
+            'shed_queue_full': self.shed['queue_full'],
+            'shed_timeout': self.shed['timeout'],
+            'wait_p50': pct(0.5),
+            'wait_p95': pct(0.95),
+            'wait_max': waits[-1] if waits else 0.0,
+            'tokens': tokens,
+        }
@@ -0,0 +1,133 @@
+"""소속 × 카테고리 × 수산물 × 조리법 × 메뉴 집계 큐브
+
+응답 1건이 들어올 때마다 셀 카운터만 갱신하고, 대시보드의 드릴다운/피벗은
+원시 응답을 다시 훑지 않고 셀(O(cells))에서 바로 계산합니다.
+"""
+from collections import Counter
+
+import pandas as pd
+
+DIMENSIONS = ('소속', '카테고리', '수산물', '조리법', '메뉴')
+INGREDIENT_DIMENSIONS = ('소속', '카테고리', '수산물')
+UNKNOWN_LABEL = '(기타)'
+
+
+def build_catalog_lookup(menu_data, ingredient_categories):
+    """수산물 → 카테고리, (수산물, 메뉴) → 조리법 조회표"""
+    ing_to_category = {}
+    for label, ing_list in ingredient_categories:
+        for ing in ing_list:
+            ing_to_category[ing] = label
+
+    menu_to_method = {}
+    for ing, methods in menu_data.items():
+        for method, menus in methods.items():
+            for menu in menus:
+                menu_to_method[(ing, menu)] = method
+    return ing_to_category, menu_to_method
+
+
+class AggregateCube:
+    """응답 단위로 증분 갱신되는 집계 큐브
+
+    - ingredient_cells: (소속, 카테고리, 수산물) → 선택 수
+    - menu_cells: (소속, 카테고리, 수산물, 조리법, 메뉴) → 선택 수
+    - respondents: 소속 → 응답자 수
+    """
+
+    def __init__(self, menu_data, ingredient_categories):
+        self._ing_to_category, self._menu_to_method = build_catalog_lookup(menu_data, ingredient_categories)
+        self.ingredient_cells = Counter()
+        self.menu_cells = Counter()
+        self.respondents = Counter()
+
+    @classmethod
+    def from_records(cls, records, menu_data, ingredient_categories):
+        """records: (소속, 선택한_수산물 list, 선택한_메뉴 dict) 반복자"""
+        cube = cls(menu_data, ingredient_categories)
+        for affiliation, ingredients, menus_map in records:
+            cube.add_response(affiliation, ingredients, menus_map)
+        return cube
+
+    def to_state(self):
+        """공유 캐시(JSON)용: 셀마다 [키..., 선택 수]"""
+        return {
+            'ingredient_cells': [[*key, n] for key, n in self.ingredient_cells.items()],
+            'menu_cells': [[*key, n] for key, n in self.menu_cells.items()],
+            'respondents': [[aff, n] for aff, n in self.respondents.items()],
+        }
+
+    @classmethod
+    def from_state(cls, state, menu_data, ingredient_categories):
+        cube = cls(menu_data, ingredient_categories)
+        cube.ingredient_cells = Counter({tuple(cell[:-1]): cell[-1] for cell in state['ingredient_cells']})
+        cube.menu_cells = Counter({tuple(cell[:-1]): cell[-1] for cell in state['menu_cells']})
+        cube.respondents = Counter({aff: n for aff, n in state['respondents']})
+        return cube
+
+    def add_response(self, affiliation, ingredients, menus_map):
+        aff = str(affiliation).strip() if affiliation is not None else ''
+        aff = aff or UNKNOWN_LABEL
+        self.respondents[aff] += 1
+
+        for ing in ingredients or []:
+            if ing:
+                cat = self._ing_to_category.get(ing, UNKNOWN_LABEL)
+                self.ingredient_cells[(aff, cat, ing)] += 1
+
+        for ing, menus in (menus_map or {}).items():
+            mlist = menus if isinstance(menus, list) else []
+            cat = self._ing_to_category.get(ing, UNKNOWN_LABEL)
+            for m in mlist:
+                if m:
+                    method = self._menu_to_method.get((ing, m), UNKNOWN_LABEL)
+                    self.menu_cells[(aff, cat, ing, method, m)] += 1
+
+    @property
+    def total_respondents(self):
+        return sum(self.respondents.values())
+
+    def affiliations(self):
+        return sorted(self.respondents)
+
+    def _cells_for(self, dims, filters):
+        need_menu = any(d not in INGREDIENT_DIMENSIONS for d in list(dims) + list(filters))
+        if need_menu:
+            return self.menu_cells, DIMENSIONS
+        return self.ingredient_cells, INGREDIENT_DIMENSIONS
+
+    def rollup(self, dims, filters=None):
+        """dims 기준으로 셀을 합산 (filters: {차원: 값 또는 값 집합})"""
+        filters = filters or {}
+        for d in list(dims) + list(filters):
+            if d not in DIMENSIONS:
+                raise ValueError(f"알 수 없는 차원: {d}")
+
+        cells, cell_dims = self._cells_for(dims, filters)
+        pos = {d: i for i, d in enumerate(cell_dims)}
+        dim_idx = [pos[d] for d in dims]
+        filt = []
+        for d, v in filters.items():
+            allowed = v if isinstance(v, (set, frozenset, list, tuple)) else {v}
+            filt.append((pos[d], set(allowed)))
+
+        out = Counter()
+        for key, cnt in cells.items():
+            if all(key[i] in allowed for i, allowed in filt):
+                out[tuple(key[i] for i in dim_idx)] += cnt
+        return out
+
+    def to_frame(self, dims, filters=None, value_name='선택 수'):
+        rolled = self.rollup(dims, filters)
+        rows = [dict(zip(dims, key), **{value_name: cnt}) for key, cnt in rolled.most_common()]
+        return pd.DataFrame(rows, columns=list(dims) + [value_name])
+
+    def pivot(self, row_dim, col_dim, filters=None):
+        rolled = self.rollup((row_dim, col_dim), filters)
+        if not rolled:
+            return pd.DataFrame()
+        s = pd.Series(rolled)
+        s.index = pd.MultiIndex.from_tuples(s.index, names=[row_dim, col_dim])
+        table = s.unstack(col_dim, fill_value=0)
+        table = table.loc[table.sum(axis=1).sort_values(ascending=False).index]
+        return table
@@ -1,124 +1,91 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timezone, timedelta
-import gspread
 import os
 import traceback
-from google.oauth2.service_account import Credentials
-import matplotlib.pyplot as plt
+# gspread / google-auth / matplotlib는 첫 화면을 막지 않도록 예열 스레드나 사용하는 곳에서 import
 # import seaborn as sns  # ← 필요시 주석 해제, 오타(ㄹ) 제거
-import matplotlib as mpl
-import matplotlib.font_manager as fm
-from matplotlib import rcParams
 import urllib.request
 import json
 import ast
-from collections import Counter
+import io
+import copy
+import threading
+import time
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from catalog import CATALOG_HISTORY_KEY, exposure_counts, load_catalog, record_catalog_version
+from aggregate_cube import AggregateCube, DIMENSIONS as CUBE_DIMENSIONS
+from search_index import RespondentSearchIndex
+from migrate_schema import SCHEMA_VERSION, load_ingredients, load_menus, store_schema_version
+from storage import (LockTimeout, RESPONSE_COLUMNS, default_store_url, ensure_affiliation_counts, import_excel_once,
+                     make_response_row, new_response_id, open_store)
+from sheets_sync import SheetsSync
+from roster import publish_pairs, publish_quotas
+from asset_index import load_or_build_asset_index
+from facility_reports import ReportJobQueue
+from live_feed import LiveCounters
+from rerun_profiler import RerunProfiler
+from telemetry import TelemetryRecorder, dwell_table, events_frame, funnel_table, render_table, toggle_table
+from admission import AdmissionController, TokenBucket
+from circuit_breaker import CLOSED, HALF_OPEN, CircuitBreaker, CircuitOpen
+from warmup import Warmup
+import templates
 
 # ===================== 기본 설정 / 스타일 =====================
 
-LIGHT_FORCE_CSS = """
-<style>
-:root { color-scheme: light !important; }
-@media (prefers-color-scheme: dark) {
-  html, body, [data-testid="stAppViewContainer"], [data-testid="stSidebar"], [data-testid="stApp"] {
-    background-color: #ffffff !important; color: #000000 !important;
-  }
-}
-html, body, [data-testid="stAppViewContainer"], [data-testid="stApp"] {
-  background-color: #ffffff !important; color: #000000 !important;
-}
-[data-testid="stSidebar"] {
-  background-color: #ffffff !important; color: #000000 !important; border-right: 1px solid #e0e0e0 !important;
-}
-header[data-testid="stHeader"] { background-color: #ffffff !important; color: #000000 !important; border-bottom: 1px solid #e0e0e0 !important; }
-header[data-testid="stHeader"] > div { background-color: #ffffff !important; }
-hr { border-color: #cccccc !important; }
-
-input, textarea, select { background-color:#ffffff !important; color:#000000 !important; border:1px solid #999 !important; border-radius:6px !important; }
-[data-baseweb="input"] { background-color:#ffffff !important; color:#000000 !important; border-radius:6px !important; border:1px solid #999 !important; }
-[data-baseweb="input"] input { color:#000000 !important; }
-[data-baseweb="input"] > div { background-color: transparent !important; }
-[data-baseweb="input"]:focus-within { box-shadow: 0 0 0 2px rgba(0,120,255,0.3) !important; border-color:#0078FF !important; }
-
-button, button[kind] {
-  background-color:#0078FF !important; color:#fff !important; border:1px solid #0078FF !important; border-radius:8px !important; font-weight:600 !important;
-}
-button:disabled, button[disabled] { background-color:#d3d3d3 !important; color:#666 !important; border:1px solid #ccc !important; }
-button[kind="secondary"] { background-color:#fff !important; color:#000 !important; border:1px solid #999 !important; }
-button[kind="primary"] { background-color:#0078FF !important; color:#fff !important; border:1px solid #0078FF !important; }
-
-[data-testid="stHorizontalBlock"] {
-  display:grid !important; grid-template-columns: repeat(3, 1fr) !important; gap:8px !important; width:100% !important;
-}
-[data-testid="stHorizontalBlock"] > div { min-width:0 !important; }
-[data-testid="stColumn"] { width:100% !important; flex:1 1 auto !important; }
-
-@media (max-width: 768px) {
-  [data-testid="stHorizontalBlock"] { grid-template-columns: repeat(3, 1fr) !important; }
-}
-
-button[kind="secondary"], button[kind="primary"] {
-  width:100% !important; padding:10px 8px !important; white-space:normal !important; word-break:break-word !important;
-  font-size:14px !important; line-height:1.3 !important; border-radius:10px !important; font-weight:600 !important;
-}
-input::placeholder, textarea::placeholder { color:#555 !important; opacity:1 !important; }
-[data-baseweb="input"] input::placeholder { color:#555 !important; opacity:1 !important; }
-
-label, div[data-testid="stFormLabel"], span[data-testid="stMarkdownContainer"] label {
-  color:#000 !important; font-weight:600 !important;
-}
-[data-testid="stFormSubmitButton"] label, [data-testid="stFormLabel"] p, [data-testid="stFormLabel"] span {
-  color:#000 !important;
-}
-</style>
-"""
-
-JS_PATCH = """
-<script>
-window.addEventListener('load', function() {
-  function fixLayout() {
-    const cols = document.querySelectorAll('[data-testid="stColumn"]');
-    cols.forEach(col => {
-      col.style.flex = '1 1 calc(33.33% - 6px)';
-      col.style.minWidth = 'calc(33.33% - 6px)';
-    });
-    const btns = document.querySelectorAll('button');
-    btns.forEach(btn => {
-      btn.style.width = '100%';
-      btn.style.whiteSpace = 'normal';
-      btn.style.wordBreak = 'break-word';
-    });
-  }
-  setTimeout(fixLayout, 500);
-  setInterval(fixLayout, 1500);
-});
-</script>
-"""
-
 st.set_page_config(page_title="블루푸드 선호도 조사", page_icon="🐟", layout="wide")
-st.markdown(LIGHT_FORCE_CSS, unsafe_allow_html=True)
-st.markdown(JS_PATCH, unsafe_allow_html=True)
+
+@st.cache_resource
+def _html_payload_stats():
+    return {'lock': threading.Lock(), 'surveys': deque(maxlen=500)}
+
+def render_html(markup):
+    """st.markdown(unsafe_allow_html) + 세션별 전송 바이트 집계"""
+    st.session_state['_html_bytes'] = st.session_state.get('_html_bytes', 0) + len(markup.encode('utf-8'))
+    st.markdown(markup, unsafe_allow_html=True)
+
+def record_survey_payload():
+    """설문 1건 완료 시 그 세션이 보낸 HTML 바이트를 기록 (세션당 한 번)"""
+    if st.session_state.get('_html_bytes_recorded'):
+        return
+    st.session_state['_html_bytes_recorded'] = True
+    stats = _html_payload_stats()
+    with stats['lock']:
+        stats['surveys'].append(st.session_state.get('_html_bytes', 0))
+
+# 전역 CSS: 정적 파일로 한 번 받아 브라우저가 캐시 (매 재실행에는 <link> 한 줄만 전송)
+# (예전 JS_PATCH는 st.markdown 안의 <script>가 실행되지 않아 제거, 레이아웃은 CSS로 처리)
+if st.get_option("server.enableStaticServing"):
+    render_html(templates.GLOBAL_CSS_TAG)
+else:
+    render_html(templates.inline_global_css())
 
 # ===================== 폰트 =====================
 
 FONT_PATH = "/tmp/NanumGothic.ttf"
 FONT_URL = "https://github.com/google/fonts/raw/main/ofl/nanumgothic/NanumGothic-Regular.ttf"
 
-if not os.path.exists(FONT_PATH):
+def setup_korean_font():
+    """나눔고딕 다운로드 + matplotlib 등록 (프로세스당 한 번, 예열 스레드에서 실행)"""
+    if not os.path.exists(FONT_PATH):
+        try:
+            urllib.request.urlretrieve(FONT_URL, FONT_PATH)
+        except Exception as e:
+            print(f"⚠️ 폰트 다운로드 실패: {e}")
+
+    import matplotlib as mpl
+    import matplotlib.font_manager as fm  # 첫 import 때 폰트 캐시 생성
+    import matplotlib.pyplot  # noqa: F401  (pyplot 초기화도 미리)
     try:
-        urllib.request.urlretrieve(FONT_URL, FONT_PATH)
+        fm.fontManager.addfont(FONT_PATH)
+        fontprop = fm.FontProperties(fname=FONT_PATH)
+        mpl.rcParams['font.family'] = fontprop.get_name()
+        mpl.rcParams['axes.unicode_minus'] = False
     except Exception as e:
-        print(f"⚠️ 폰트 다운로드 실패: {e}")
-
-try:
-    fontprop = fm.FontProperties(fname=FONT_PATH)
-    rcParams['font.family'] = fontprop.get_name()
-    mpl.rcParams['font.family'] = fontprop.get_name()
-    mpl.rcParams['axes.unicode_minus'] = False
-except Exception as e:
-    print(f"⚠️ 폰트 로드 실패, 기본 폰트 사용: {e}")
-    fontprop = None
+        print(f"⚠️ 폰트 로드 실패, 기본 폰트 사용: {e}")
 
 # ===================== 시간/환경 =====================
 
@@ -133,15 +100,84 @@ def format_korean_time():
 
 # ===================== Google Sheets 연결 & 저장 =====================
 
-def get_google_sheet_cached():
-    """Google Sheets 연결 (안전 버전)"""
+# ---- 서킷 브레이커 (Google이 느리거나 죽으면 로컬 저장소 + 마지막 명단으로만 동작) ----
+
+GOOGLE_TIMEOUT_SEC = 10
+BREAKER_DEFAULTS = {'failure_rate': 0.5, 'window': 10, 'min_calls': 3, 'open_sec': 30, 'max_open_sec': 300,
+                    'slow_call_sec': 8}
+
+@st.cache_resource
+def get_google_breaker():
+    cfg = dict(BREAKER_DEFAULTS)
+    try:
+        if "circuit_breaker" in st.secrets:
+            cfg.update({k: v for k, v in st.secrets["circuit_breaker"].items() if k in cfg})
+    except Exception:
+        pass
+
+    def on_state_change(before, after):
+        print(f"🔌 Google 서킷 브레이커: {before} → {after}")
+        if before == HALF_OPEN and after == CLOSED:
+            schedule_pending_upload()  # 끊긴 동안 로컬에 쌓인 응답 올리기
+
+    return CircuitBreaker(failure_rate=float(cfg['failure_rate']), window=int(cfg['window']),
+                          min_calls=int(cfg['min_calls']), open_seconds=float(cfg['open_sec']),
+                          max_open_seconds=float(cfg['max_open_sec']), slow_call_sec=float(cfg['slow_call_sec']),
+                          on_state_change=on_state_change)
+
+def google_call(fn, *args, **kwargs):
+    """Google 호출은 모두 여기로 (회로가 열려 있으면 바로 CircuitOpen)"""
+    return get_google_breaker().call(fn, *args, **kwargs)
+
+def google_available():
+    return get_google_breaker().available()
+
+@st.cache_resource
+def _google_sheet_holder():
+    return {'lock': threading.Lock(), 'sheet': None}
+
+def _open_google_sheet(report):
+    sheet = _connect_google_sheet(report)
+    if sheet is None:
+        raise ConnectionError("Google Sheets 연결 불가")
+    return sheet
+
+def get_google_sheet_cached(report=None):
+    """Google Sheets 연결 (프로세스당 한 번 인증, 성공한 연결은 재사용). 연결 불가/차단 중이면 None
+
+    다른 스레드가 연결 중이면 기다리지 않고 None (제출은 로컬 대기열로)
+    """
+    holder = _google_sheet_holder()
+    if holder['sheet'] is not None:
+        return holder['sheet']
+    if not google_available() or not holder['lock'].acquire(blocking=False):
+        return None
+    try:
+        if holder['sheet'] is None:
+            holder['sheet'] = google_call(_open_google_sheet, report)
+        return holder['sheet']
+    except Exception:
+        return None
+    finally:
+        holder['lock'].release()
+
+def warm_google_sheet():
+    """예열용: 화면 없이 연결만 만들어 둔다"""
+    get_google_sheet_cached(report=print)
+
+def _connect_google_sheet(report=None):
+    """Google Sheets 연결 (안전 버전). report: 오류 표시 함수 (기본 서버 로그, 참여자 화면에는 표시하지 않음)"""
+    report = report or print
     try:
+        import gspread
+        from google.oauth2.service_account import Credentials
+
         if "gcp_service_account" not in st.secrets:
-            st.error("❌ gcp_service_account 누락")
+            report("❌ gcp_service_account 누락")
             return None
         
         if "google_sheets" not in st.secrets:
-            st.error("❌ google_sheets 설정 누락")
+            report("❌ google_sheets 설정 누락")
             return None
         
         creds_dict = dict(st.secrets["gcp_service_account"])
@@ -162,6 +198,7 @@ def get_google_sheet_cached():
 
         creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
         client = gspread.authorize(creds)
+        client.set_timeout(GOOGLE_TIMEOUT_SEC)
 
         sheet = None
         if sheet_id:
@@ -175,80 +212,275 @@ def get_google_sheet_cached():
                 workbook = client.open(sheet_name)
                 sheet = workbook.sheet1
             except Exception as e:
-                st.error(f"❌ 시트 열기 실패: {e}")
+                report(f"❌ 시트 열기 실패: {e}")
                 return None
 
         if sheet is None:
-            st.error("❌ 시트를 찾을 수 없습니다.")
+            report("❌ 시트를 찾을 수 없습니다.")
             return None
 
-        # 헤더 없으면 생성 (이름/소속 버전)
-        first_row = sheet.row_values(1)
-        if not first_row or all(cell == '' for cell in first_row):
-            headers = ['이름', '소속', '설문일시', '선택한_수산물', '선택한_메뉴']
-            sheet.append_row(headers)
+        # 헤더 없으면 생성, 나중에 생긴 열(응답ID, 카탈로그버전)이 없으면 추가
+        SheetsSync(sheet, None).ensure_header()
 
         return sheet
     except Exception as e:
-        st.error(f"❌ Google Sheets 연결 오류: {e}")
-        st.code(traceback.format_exc())
+        report(f"❌ Google Sheets 연결 오류: {e}")
+        traceback.print_exc()
         return None
 
-def save_to_google_sheets(name, affiliation, selected_ingredients, selected_menus):
-    """Google Sheets 저장 (에러 나도 설문은 진행 가능)"""
+def save_to_google_sheets(row, queued=True):
+    """Google Sheets 저장 (에러 나도 설문은 진행 가능)
+
+    로컬 업로드 대기열에 들어간 행(queued)은 SheetsSync.push로만 올린다. 저장소 'sheets-sync' 잠금 안에서
+    저장된 행 그대로 올리므로 동기화 작업과 겹쳐도 두 번 올라가지 않는다. 로컬 저장에 실패한 행만 직접 추가
+    """
     try:
         sheet = get_google_sheet_cached()
         if sheet is None:
+            st.session_state.sheets_offline = not google_available()
             return False
 
-        menus_text = json.dumps(selected_menus, ensure_ascii=False)
-        ingredients_text = json.dumps(selected_ingredients, ensure_ascii=False)
-        now_str = format_korean_time()
-
-        new_row = [name, affiliation, now_str, ingredients_text, menus_text]
-        sheet.append_row(new_row)
+        if queued:
+            push_pending_uploads()
+            uploaded = row['응답ID'] not in set(get_response_store().get_meta('pending_upload', []))
+        else:
+            google_call(sheet.append_row, [row[col] for col in RESPONSE_COLUMNS])
+            uploaded = True
 
-        st.session_state.google_sheets_success = True
-        return True
+        st.session_state.google_sheets_success = uploaded
+        return uploaded
+    except LockTimeout:
+        # 다른 프로세스가 동기화 중: 대기열에 남은 행은 업로드 스레드가 이어서 올림
+        st.session_state.google_sheets_success = False
+        st.session_state.sheets_deferred = True
+        schedule_pending_upload()
+        return False
+    except CircuitOpen:
+        st.session_state.google_sheets_success = False
+        st.session_state.sheets_offline = True
+        return False
     except Exception as e:
         print(f"⚠️ Google Sheets 저장 오류: {e}")
         st.session_state.google_sheets_success = False
         return False
 
-def save_to_excel(name, affiliation, selected_ingredients, selected_menus):
-    """로컬 백업 엑셀 저장"""
+# ===================== 공유 저장소 (응답/임시저장/캐시) =====================
+
+LEGACY_EXCEL_FILE = "bluefood_survey.xlsx"
+
+def _store_url():
+    """BLUEFOOD_STORE_URL > secrets [storage] url > 공유 볼륨(BLUEFOOD_DATA_DIR)의 SQLite"""
+    if os.environ.get("BLUEFOOD_STORE_URL"):
+        return os.environ["BLUEFOOD_STORE_URL"]
     try:
-        filename = "bluefood_survey.xlsx"
+        if "storage" in st.secrets and st.secrets["storage"].get("url"):
+            return st.secrets["storage"]["url"]
+    except Exception:
+        pass
+    return default_store_url()
 
-        if os.path.exists(filename):
-            df = pd.read_excel(filename)
-        else:
-            df = pd.DataFrame(columns=['이름', '소속', '설문일시', '선택한_수산물', '선택한_메뉴'])
-
-        menus_text = json.dumps(selected_menus, ensure_ascii=False)
-        ingredients_text = json.dumps(selected_ingredients, ensure_ascii=False)
-        now_str = format_korean_time()
-
-        new_row = {
-            '이름': name,
-            '소속': affiliation,
-            '설문일시': now_str,
-            '선택한_수산물': ingredients_text,
-            '선택한_메뉴': menus_text
-        }
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-
-        df.to_excel(filename, index=False)
-        
-        return filename, df
+@st.cache_resource
+def get_response_store():
+    store = open_store(_store_url())
+    try:
+        imported = import_excel_once(store, LEGACY_EXCEL_FILE)
+        if imported:
+            print(f"📦 기존 엑셀 백업 {imported}건을 공유 저장소로 옮겼습니다.")
+    except Exception as e:
+        print(f"⚠️ 엑셀 백업 가져오기 실패: {e}")
+    return store
+
+def dataset_key(store_version):
+    """대시보드 캐시 키: 저장소 버전 + 카탈로그 버전 (카탈로그가 바뀌면 행렬/큐브의 항목 구성도 바뀜)"""
+    return None if store_version is None else f"{store_version}@{CATALOG.version}"
+
+def save_to_local_store(row, selected_ingredients, selected_menus):
+    """공유 저장소에 저장 (Google Sheets 업로드 대기열에도 등록)"""
+    try:
+        store = get_response_store()
+        prev_version = dataset_key(store.version())
+
+        store.append_rows([row], queue_upload=True)
+        new_version = dataset_key(store.version())
+        record_catalog_version(store, CATALOG)
+
+        apply_response_to_cube(prev_version, new_version, row['소속'], selected_ingredients, selected_menus)
+        return True
+    except Exception as e:
+        print(f"❌ 로컬 저장소 저장 오류: {e}")
+        return False
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def export_responses_xlsx(dataset_version):
+    """전체 응답 엑셀 파일 (데이터 버전당 한 번 생성)"""
+    buf = io.BytesIO()
+    get_response_store().read_frame().to_excel(buf, index=False)
+    return buf.getvalue()
+
+# ---- 진행 중 설문 임시저장 (다른 서버 프로세스로 넘어가도 이어서 진행) ----
+
+DRAFT_TTL_SEC = 24 * 60 * 60
+
+def _draft_key(name, affiliation):
+    return f"{str(name).strip()}|{str(affiliation).strip()}"
+
+def save_draft():
+    try:
+        get_response_store().kv_set('draft', _draft_key(st.session_state.name, st.session_state.affiliation), {
+            'category_index': st.session_state.category_index,
+            'selected_ingredients': list(st.session_state.selected_ingredients),
+            'selected_menus': {k: list(v) for k, v in st.session_state.selected_menus.items()},
+        }, ttl=DRAFT_TTL_SEC)
+    except Exception as e:
+        print(f"⚠️ 임시저장 실패: {e}")
+
+def load_draft(name, affiliation):
+    try:
+        return get_response_store().kv_get('draft', _draft_key(name, affiliation))
+    except Exception:
+        return None
+
+def clear_draft(name, affiliation):
+    try:
+        get_response_store().kv_delete('draft', _draft_key(name, affiliation))
+    except Exception:
+        pass
+
+# ---- 제출 입장 제어 (Google Sheets 쓰기 쿼터 보호) ----
+
+ADMISSION_DEFAULTS = {'rate_per_min': 50, 'burst': 10, 'max_wait_sec': 8, 'max_queue': 30}
+
+@st.cache_resource
+def get_admission_controller():
+    cfg = dict(ADMISSION_DEFAULTS)
+    try:
+        if "admission" in st.secrets:
+            cfg.update({k: v for k, v in st.secrets["admission"].items() if k in cfg})
+    except Exception:
+        pass
+    bucket = TokenBucket(float(cfg['rate_per_min']) / 60.0, float(cfg['burst']))
+    return AdmissionController(bucket, max_queue=int(cfg['max_queue']), max_wait=float(cfg['max_wait_sec']))
+
+def upload_with_admission(row, queued=True):
+    """토큰이 있으면(또는 잠깐 기다리면) 바로 Sheets에 올리고, 아니면 로컬 대기열에 남긴다"""
+    if not google_available():
+        # 회로가 열려 있으면 입장 대기도 없이 로컬 대기열로 (복구되면 자동 업로드)
+        st.session_state.google_sheets_success = False
+        st.session_state.sheets_offline = True
+        return False
+    controller = get_admission_controller()
+    ticket = controller.admit()
+    if not ticket.admitted:
+        st.session_state.google_sheets_success = False
+        st.session_state.sheets_deferred = True
+        schedule_pending_upload()
+        return False
+
+    if ticket.delay > 0.3:
+        with st.spinner(f"참여자가 많아 저장 순서를 기다리고 있습니다... (약 {int(ticket.delay) + 1}초)"):
+            controller.wait(ticket)
+    else:
+        controller.wait(ticket)
+    return save_to_google_sheets(row, queued=queued)
+
+@st.cache_resource
+def _pending_upload_worker():
+    return {'lock': threading.Lock(), 'thread': None}
+
+def push_pending_uploads():
+    """로컬 업로드 대기열만 Sheets로 올림 (입장 제어 토큰 1개 = append_rows 1회)"""
+    sheet = get_google_sheet_cached()
+    if sheet is None:
+        return 0
+    store = get_response_store()
+    with store.lock('sheets-sync', timeout=5, lease=120):
+        return google_call(SheetsSync(sheet, store).push)
+
+def _drain_pending_uploads():
+    controller = get_admission_controller()
+    store = get_response_store()
+    while store.get_meta('pending_upload', []):
+        ticket = controller.admit()
+        if not ticket.admitted:
+            time.sleep(controller.max_wait)
+            continue
+        controller.wait(ticket)
+        try:
+            if not push_pending_uploads():
+                return
+        except CircuitOpen:
+            return
+        except Exception as e:
+            print(f"⚠️ 대기열 업로드 실패: {e}")
+            return
+
+def schedule_pending_upload():
+    """대기열 업로드 스레드를 (없을 때만) 띄운다"""
+    worker = _pending_upload_worker()
+    with worker['lock']:
+        if worker['thread'] is not None and worker['thread'].is_alive():
+            return
+        worker['thread'] = threading.Thread(target=_drain_pending_uploads, name="bluefood-upload-drain",
+                                            daemon=True)
+        worker['thread'].start()
+
+# ---- Google Sheets ↔ 로컬 동기화 ----
+
+SYNC_INTERVAL_SEC = 60
+
+@st.cache_resource
+def _sync_state():
+    return {'lock': threading.Lock(), 'last_run': 0.0, 'last_result': None, 'last_error': None}
+
+def sync_with_google_sheets(force=False):
+    """Sheet에 새로 추가된 행만 가져오고, 로컬 대기열을 올린다 (기본 60초에 한 번)"""
+    state = _sync_state()
+    if not state['lock'].acquire(blocking=False):
+        return state
+    try:
+        now = time.monotonic()
+        if not force and state['last_run'] and now - state['last_run'] < SYNC_INTERVAL_SEC:
+            return state
+        state['last_run'] = now
+        sheet = get_google_sheet_cached()
+        if sheet is None:
+            breaker = get_google_breaker()
+            state['last_error'] = ("Google Sheets 연결 불가" if breaker.state == CLOSED
+                                   else f"Google 연결 차단 중 ({breaker.retry_in():.0f}초 뒤 재시도)")
+            return state
+        store = get_response_store()
+        prev_version = store.version()
+        # 여러 서버 프로세스가 동시에 올리면 같은 행이 두 번 올라가므로 저장소 잠금 안에서
+        with store.lock('sheets-sync', timeout=5, lease=120):
+            state['last_result'] = google_call(SheetsSync(sheet, store).sync)
+        state['last_result']['at'] = format_korean_time()
+        state['last_error'] = None
+        if state['last_result']['pulled'] and prev_version != store.version():
+            # 외부에서 들어온 행은 큐브를 다음 조회 때 재구성
+            _aggregate_cube_holder()['version'] = None
+    except LockTimeout:
+        state['last_error'] = "다른 서버 프로세스가 동기화 중"
+    except CircuitOpen as e:
+        state['last_error'] = str(e)
     except Exception as e:
-        print(f"❌ Excel 저장 오류: {e}")
-        return None, None
+        print(f"⚠️ Google Sheets 동기화 오류: {e}")
+        state['last_error'] = str(e)
+    finally:
+        state['lock'].release()
+    return state
 
 # ===================== Session State 초기화 =====================
 
 if 'step' not in st.session_state:
     st.session_state.step = 'info'        # info -> guide -> category_loop -> complete
+
+# ---- 설문 카탈로그 (menu_catalog.json, 파일이 바뀌면 다음 rerun부터 반영) ----
+# 진행 중인 설문은 시작할 때의 카탈로그로 끝까지 (중간에 메뉴가 바뀌지 않게), 새 설문부터 새 카탈로그
+if 'catalog' not in st.session_state or st.session_state.step == 'info':
+    st.session_state.catalog = load_catalog()
+CATALOG = st.session_state.catalog
+MENU_DATA, INGREDIENT_CATEGORIES = CATALOG.menu_data, CATALOG.categories
+TOTAL_CATEGORY_COUNT = len(INGREDIENT_CATEGORIES)
 if 'name' not in st.session_state:
     st.session_state.name = ""
 if 'affiliation' not in st.session_state:
@@ -314,16 +546,26 @@ def _safe_load_dict(s):
         pass
     return {}
 
+def _selection_loaders():
+    """스키마 2(migrate_schema.py로 정규 JSON)면 빠른 파서 하나, 아니면 json → literal_eval 두 단계"""
+    try:
+        if store_schema_version(get_response_store()) >= SCHEMA_VERSION:
+            return load_ingredients, load_menus
+    except Exception:
+        pass
+    return _safe_load_list, _safe_load_dict
+
 def build_aggregates(df):
     ing_counter = Counter()
     menu_counter = Counter()
     per_person_rows = []
+    load_list, load_dict = _selection_loaders()
 
     for _, row in df.iterrows():
         name = row.get('이름', '')
         aff  = row.get('소속', '')
-        ings = _safe_load_list(row.get('선택한_수산물'))
-        menus_map = _safe_load_dict(row.get('선택한_메뉴'))
+        ings = load_list(row.get('선택한_수산물'))
+        menus_map = load_dict(row.get('선택한_메뉴'))
 
         for ing in ings:
             if ing:
@@ -339,7 +581,7 @@ def build_aggregates(df):
             chosen_menus = menus_map.get(ing, [])
             chosen_menus = chosen_menus if isinstance(chosen_menus, list) else []
             if not chosen_menus:
-                per_person_rows.append({'이름': name, '소속': aff, '수산물': ing, '메뉴': '(메뉴 선택 없음)'})
+                per_person_rows.append({'이름': name, '소속': aff, '수산물': ing, '메뉴': NO_MENU_LABEL})
             else:
                 for m in chosen_menus:
                     per_person_rows.append({'이름': name, '소속': aff, '수산물': ing, '메뉴': m})
@@ -347,10 +589,706 @@ def build_aggregates(df):
     ing_rank_df = pd.DataFrame([{'수산물': k, '선택 수': v} for k, v in ing_counter.most_common()])
     menu_rank_df = pd.DataFrame([{'메뉴': k, '선택 수': v} for k, v in menu_counter.most_common()])
     per_person_df = pd.DataFrame(per_person_rows)
+    ing_rank_df, menu_rank_df = _add_exposure(df, ing_rank_df, menu_rank_df)
 
     return ing_rank_df, menu_rank_df, per_person_df
 
-def show_admin_dashboard(df):
+def _add_exposure(df, ing_rank_df, menu_rank_df):
+    """응답이 여러 카탈로그 버전에 걸쳐 있으면 항목별 노출 응답자 수와 선택률 열 추가
+    (나중에 추가된 메뉴가 그 전 응답자 수만큼 불리하게 보이지 않도록)"""
+    if '카탈로그버전' not in df.columns or len(ing_rank_df) == 0:
+        return ing_rank_df, menu_rank_df
+    versions = Counter('' if v is None or (isinstance(v, float) and pd.isna(v)) else str(v).strip()
+                       for v in df['카탈로그버전'])
+    if len(versions) < 2:
+        return ing_rank_df, menu_rank_df
+    try:
+        history = get_response_store().get_meta(CATALOG_HISTORY_KEY, {}) or {}
+    except Exception:
+        return ing_rank_df, menu_rank_df
+    ing_exposed, menu_exposed, everywhere = exposure_counts(versions, history)
+    out = []
+    for rank_df, label, exposed in ((ing_rank_df, '수산물', ing_exposed), (menu_rank_df, '메뉴', menu_exposed)):
+        if len(rank_df) > 0:
+            rank_df = rank_df.copy()
+            rank_df['노출 응답자'] = [max(exposed[k] + everywhere, n) for k, n in zip(rank_df[label], rank_df['선택 수'])]
+            rank_df['선택률(%)'] = (rank_df['선택 수'] / rank_df['노출 응답자'] * 100).round(1)
+        out.append(rank_df)
+    return tuple(out)
+
+NO_MENU_LABEL = '(메뉴 선택 없음)'
+
+@st.cache_resource(max_entries=2)
+def load_dashboard_aggregates(dataset_version, _df):
+    """데이터 버전당 한 번: 랭킹/개인별 표 + 개인별 검색 인덱스"""
+    ing_rank_df, menu_rank_df, per_person_df = build_aggregates(_df)
+    if len(per_person_df) > 0:
+        per_person_df = per_person_df.sort_values(['이름', '소속', '수산물', '메뉴']).reset_index(drop=True)
+    search_index = RespondentSearchIndex(per_person_df, NO_MENU_LABEL) if len(per_person_df) > 0 else None
+    return ing_rank_df, menu_rank_df, per_person_df, search_index
+
+# ---- 응답자×항목 행렬, 랭킹 부트스트랩 (데이터 버전별 캐시) ----
+
+BOOTSTRAP_RESAMPLE_OPTIONS = [1000, 5000, 10000]
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_incidence(dataset_version, _df):
+    from incidence import build_incidence  # scipy는 대시보드에서만 필요하므로 지연 import
+    ids = _df['응답ID'] if '응답ID' in _df.columns else [None] * len(_df)
+    times = _df['설문일시'] if '설문일시' in _df.columns else [None] * len(_df)
+    records = ((*rec, rid, at) for rec, rid, at in zip(_iter_cube_records(_df), ids, times))
+    return build_incidence(records, MENU_DATA, INGREDIENT_CATEGORIES)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def load_ranking_bootstrap(dataset_version, kind, affiliation, n_resamples, _incidence):
+    from uncertainty import bootstrap_rankings
+    matrix = _incidence.matrix(kind)
+    if affiliation is not None:
+        matrix = matrix[_incidence.rows_for_affiliation(affiliation)]
+    return bootstrap_rankings(matrix, _incidence.labels(kind), n_resamples=n_resamples)
+
+def show_ranking_uncertainty(df, dataset_version, top_n):
+    with st.expander("📏 순위 신뢰도 (부트스트랩)", expanded=False):
+        st.caption("응답자를 복원추출해 다시 집계한 결과로 선택률의 신뢰구간과 순위가 유지될 확률을 봅니다. "
+                   "응답 수가 적은 소속일수록 구간이 넓습니다.")
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            kind_label = st.selectbox("대상", ["식재료", "메뉴"], key="boot_kind")
+        with c2:
+            affs = sorted({a for a in df['소속'].dropna().astype(str) if a})
+            aff_sel = st.selectbox("소속", ["(전체)"] + affs, key="boot_aff")
+        with c3:
+            n_resamples = st.selectbox("반복 수", BOOTSTRAP_RESAMPLE_OPTIONS, index=1, key="boot_n")
+
+        kind = 'ingredient' if kind_label == "식재료" else 'menu'
+        params = (dataset_version, kind, None if aff_sel == "(전체)" else aff_sel, int(n_resamples))
+        if st.button("계산", key="boot_run"):
+            st.session_state.boot_params = params
+        if st.session_state.get('boot_params') != params:
+            return
+
+        incidence = load_incidence(dataset_version, df)
+        with st.spinner("부트스트랩 계산 중..."):
+            result = load_ranking_bootstrap(*params, incidence)
+        if not result.labels:
+            st.info("선택 데이터가 아직 없습니다.")
+            return
+        table = result.summary(label='수산물' if kind == 'ingredient' else '메뉴', top_n=int(top_n))
+        st.caption(f"응답자 {result.n_respondents}명 · 반복 {result.n_resamples:,}회")
+        st.dataframe(table, use_container_width=True, height=420)
+        st.download_button(
+            "⬇️ 순위 신뢰도 CSV 다운로드",
+            data=table.to_csv(index=False).encode('utf-8-sig'),
+            file_name=f"{kind}_ranking_bootstrap.csv",
+            mime="text/csv"
+        )
+
+# ---- 메뉴 구성 최적화 (커버리지 최대화) ----
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def load_menu_optimizer(dataset_version, affiliation, _incidence):
+    from menu_optimizer import MenuOptimizer
+    rows = None if affiliation is None else _incidence.rows_for_affiliation(affiliation)
+    return MenuOptimizer(_incidence, MENU_DATA, INGREDIENT_CATEGORIES, rows=rows)
+
+EXACT_PLAN_CACHE = 16
+
+@st.cache_resource
+def _exact_plan_jobs():
+    """정확 모드(정수계획) 계산은 화면 스레드 밖 스레드 하나에서. 조건별 Future를 최근 EXACT_PLAN_CACHE개까지 보관"""
+    return {'lock': threading.Lock(), 'futures': {},
+            'pool': ThreadPoolExecutor(max_workers=1, thread_name_prefix="bluefood-menu-plan")}
+
+def submit_exact_plan(key, optimizer, k, constraints):
+    jobs = _exact_plan_jobs()
+    with jobs['lock']:
+        future = jobs['futures'].get(key)
+        if future is None or (future.done() and future.exception() is not None):
+            future = jobs['pool'].submit(optimizer.exact, k, constraints)
+            jobs['futures'][key] = future
+            while len(jobs['futures']) > EXACT_PLAN_CACHE:
+                jobs['futures'].pop(next(iter(jobs['futures'])))
+        return future
+
+def show_menu_optimizer(df, dataset_version):
+    from menu_optimizer import PlanConstraints
+
+    st.markdown("### 🧮 메뉴 구성 최적화")
+    st.caption("k개 메뉴로 구성했을 때 '고른 메뉴가 하나 이상 포함된' 응답자 수가 최대가 되는 조합을 찾습니다.")
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        affs = sorted({a for a in df['소속'].dropna().astype(str) if a})
+        aff_sel = st.selectbox("소속", ["(전체)"] + affs, key="opt_aff")
+        k = int(st.number_input("메뉴 수 (k)", min_value=1, max_value=60, value=10, step=1, key="opt_k"))
+    with c2:
+        max_ing = int(st.number_input("수산물당 최대 메뉴 수 (0=제한 없음)", min_value=0, max_value=10, value=1, key="opt_max_ing"))
+        max_method = int(st.number_input("조리법당 최대 메뉴 수 (0=제한 없음)", min_value=0, max_value=20, value=0, key="opt_max_method"))
+    with c3:
+        min_methods = int(st.number_input("최소 조리법 종류 수", min_value=0, max_value=20, value=0, key="opt_min_methods"))
+        max_cat = int(st.number_input("카테고리당 최대 메뉴 수 (0=제한 없음)", min_value=0, max_value=60, value=0, key="opt_max_cat"))
+
+    min_per_category = {}
+    with st.expander("카테고리별 최소 메뉴 수 / 반드시 포함할 메뉴", expanded=False):
+        cols = st.columns(3)
+        for i, (label, _) in enumerate(INGREDIENT_CATEGORIES):
+            with cols[i % 3]:
+                v = int(st.number_input(label, min_value=0, max_value=20, value=0, key=f"opt_min_cat_{i}"))
+            if v:
+                min_per_category[label] = v
+        incidence = load_incidence(dataset_version, df)
+        fixed = st.multiselect("반드시 포함할 메뉴", incidence.menu_labels, key="opt_fixed")
+
+    affiliation = None if aff_sel == "(전체)" else aff_sel
+    optimizer = load_menu_optimizer(dataset_version, affiliation, incidence)
+    if optimizer.n_respondents == 0:
+        st.info("선택 데이터가 아직 없습니다.")
+        return
+
+    constraints = PlanConstraints(
+        max_per_ingredient=max_ing or None,
+        max_per_method=max_method or None,
+        min_methods=min_methods,
+        max_per_category=max_cat or None,
+        min_per_category=min_per_category,
+        fixed=fixed,
+    )
+    constraint_key = (max_ing, max_method, min_methods, max_cat, tuple(sorted(min_per_category.items())), tuple(fixed))
+
+    from menu_optimizer import EXACT_MAX_PATTERNS
+    exact_ok = optimizer.exact_available()
+    exact = st.checkbox("정확 모드 (정수계획, 최대 10초)", value=False, key="opt_exact", disabled=not exact_ok,
+                        help=None if exact_ok else f"서로 다른 선택 조합이 {EXACT_MAX_PATTERNS}개를 넘어 탐욕 결과만 제공합니다.")
+    plan = optimizer.greedy(k, constraints)
+    if exact and exact_ok:
+        future = submit_exact_plan((dataset_version, affiliation, k, constraint_key), optimizer, k, constraints)
+        if not future.done():
+            @st.fragment(run_every=1)
+            def _wait_exact():
+                if future.done():
+                    st.rerun()  # 끝나면 전체를 다시 그려 정확해 표시
+                st.caption("⏳ 정확해 계산 중 (최대 10초) · 끝날 때까지 아래에는 탐욕 결과를 표시합니다.")
+            _wait_exact()
+        elif future.exception() is not None:
+            st.warning(f"⚠️ 정확해 계산 실패, 탐욕 결과를 표시합니다: {future.exception()}")
+        else:
+            plan = future.result()
+
+    mode_label = "정확" if plan.mode == 'exact' else "탐욕"
+    if plan.mode == 'exact' and plan.optimal:
+        mode_label += " (최적 확인)"
+    st.metric("커버된 응답자", f"{plan.covered} / {plan.n_respondents}명", f"{plan.coverage * 100:.1f}%")
+    st.caption(f"방식: {mode_label} · 계산 {plan.seconds * 1000:.0f}ms")
+    for msg in plan.unmet:
+        st.warning(f"⚠️ {msg}")
+
+    info = [optimizer.menu_info(m) for m in plan.menus]
+    table = pd.DataFrame({
+        '순서': range(1, len(plan.menus) + 1),
+        '메뉴': plan.menus,
+        '수산물': [", ".join(ings) for ings, _ in info],
+        '조리법': [method for _, method in info],
+        '추가 커버': plan.gains,
+        '누적 커버율(%)': [round(v / plan.n_respondents * 100, 1) for v in pd.Series(plan.gains).cumsum()],
+    })
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    st.download_button(
+        "⬇️ 메뉴 구성 CSV 다운로드",
+        data=table.to_csv(index=False).encode('utf-8-sig'),
+        file_name="menu_plan.csv",
+        mime="text/csv"
+    )
+
+# ---- 소속별 집계 큐브 (프로세스 공유, 제출 시 증분 갱신) ----
+
+@st.cache_resource
+def _aggregate_cube_holder():
+    return {'lock': threading.Lock(), 'version': None, 'cube': None}
+
+def _iter_cube_records(df):
+    affs = df['소속'] if '소속' in df.columns else [''] * len(df)
+    load_list, load_dict = _selection_loaders()
+    for aff, ings, menus in zip(affs, df['선택한_수산물'], df['선택한_메뉴']):
+        aff = '' if aff is None or (isinstance(aff, float) and pd.isna(aff)) else aff
+        yield aff, load_list(ings), load_dict(menus)
+
+def _load_shared_cube(version):
+    """다른 서버 프로세스가 이미 만든 같은 버전의 큐브가 있으면 재사용"""
+    try:
+        cached = get_response_store().kv_get('cache', 'aggregate_cube')
+    except Exception:
+        return None
+    if isinstance(cached, dict) and cached.get('version') == version:
+        return AggregateCube.from_state(cached['cube'], MENU_DATA, INGREDIENT_CATEGORIES)
+    return None
+
+def _publish_shared_cube(version, cube):
+    try:
+        get_response_store().kv_set('cache', 'aggregate_cube', {'version': version, 'cube': cube.to_state()})
+    except Exception as e:
+        print(f"⚠️ 집계 캐시 공유 실패: {e}")
+
+def load_aggregate_cube(df, version):
+    """데이터 버전이 바뀐 경우에만 큐브를 다시 만든다"""
+    holder = _aggregate_cube_holder()
+    with holder['lock']:
+        if holder['cube'] is None or version is None or holder['version'] != version:
+            cube = _load_shared_cube(version) if version is not None else None
+            if cube is None:
+                cube = AggregateCube.from_records(_iter_cube_records(df), MENU_DATA, INGREDIENT_CATEGORIES)
+                if version is not None:
+                    _publish_shared_cube(version, cube)
+            holder['cube'] = cube
+            holder['version'] = version
+        return holder['cube']
+
+def _revision_number(version):
+    """dataset_key의 저장소 revision (r12@... → 12). 엑셀 저장소처럼 번호가 없으면 None"""
+    head = (version or '').split('@', 1)[0]
+    return int(head[1:]) if head[:1] == 'r' and head[1:].isdigit() else None
+
+def apply_response_to_cube(prev_version, new_version, affiliation, selected_ingredients, selected_menus):
+    """제출 1건을 큐브에 반영. 그사이 이 제출만 들어왔을 때(revision +1)만 더하고, 아니면 다음 조회 때 재구성
+
+    공유 kv에는 재구성한 큐브만 올림 (제출마다 큐브 전체를 쓰지 않음)
+    """
+    holder = _aggregate_cube_holder()
+    with holder['lock']:
+        if holder['cube'] is None or prev_version is None or holder['version'] != prev_version:
+            return
+        if new_version == prev_version:
+            return  # 이미 있는 응답ID라 저장되지 않음
+        prev_rev, new_rev = _revision_number(prev_version), _revision_number(new_version)
+        if prev_rev is not None and new_rev == prev_rev + 1:
+            holder['cube'].add_response(affiliation, selected_ingredients, selected_menus)
+            holder['version'] = new_version
+        else:
+            # 다른 서버 프로세스의 응답이 섞였거나 버전으로 확인할 수 없음
+            holder['cube'] = None
+            holder['version'] = None
+
+# ---- 항목 유사도 인덱스 (프로세스 공유, 주기적으로 재구성) ----
+
+SIMILARITY_TOP_K = 10
+SIMILARITY_REBUILD_SEC = 60
+
+@st.cache_resource
+def _similarity_holder():
+    return {'lock': threading.Lock(), 'version': None, 'index': None, 'built_at': 0.0}
+
+def load_similarity_index(df, version):
+    """{'ingredient': SimilarityIndex, 'menu': SimilarityIndex}
+
+    응답마다 증분 갱신하지 않고(상위 k개 목록만 두므로), 데이터 버전이 바뀌었으면
+    SIMILARITY_REBUILD_SEC에 한 번만 응답자×항목 행렬로 다시 만든다 (그 사이에는 직전 인덱스를 그대로 씀)
+    """
+    from similarity import SimilarityIndex
+    holder = _similarity_holder()
+    with holder['lock']:
+        due = time.monotonic() - holder['built_at'] >= SIMILARITY_REBUILD_SEC
+        if holder['index'] is None or (holder['version'] != version and due):
+            incidence = load_incidence(version, df)
+            holder['index'] = {
+                kind: SimilarityIndex.from_matrix(incidence.matrix(kind), incidence.labels(kind), k=SIMILARITY_TOP_K)
+                for kind in ('ingredient', 'menu')
+            }
+            holder['version'] = version
+            holder['built_at'] = time.monotonic()
+        return holder['index']
+
+def show_similarity(df, dataset_version):
+    st.markdown("### 🔗 함께 선택된 항목")
+    st.caption("선택한 항목을 고른 응답자가 함께 고른 항목입니다. 대체 메뉴를 찾을 때 참고하세요.")
+    indexes = load_similarity_index(df, dataset_version)
+    if _similarity_holder()['version'] != dataset_version:
+        st.caption(f"※ 최근 응답은 {SIMILARITY_REBUILD_SEC}초 안에 반영됩니다.")
+
+    c1, c2, c3 = st.columns([1, 2, 1])
+    with c1:
+        kind_label = st.selectbox("대상", ["메뉴", "식재료"], key="sim_kind")
+    index = indexes['menu' if kind_label == "메뉴" else 'ingredient']
+    items = index.items()
+    if not items:
+        st.info("선택 데이터가 아직 없습니다.")
+        return
+    with c2:
+        item = st.selectbox(kind_label, items, format_func=lambda i: f"{i} ({index.counts[i]}명)", key="sim_item")
+    with c3:
+        metric_label = st.radio("유사도", ["코사인", "자카드"], horizontal=True, key="sim_metric")
+
+    neighbours = index.query(item, 'cosine' if metric_label == "코사인" else 'jaccard')
+    if not neighbours:
+        st.info("함께 선택된 항목이 없습니다.")
+        return
+    table = pd.DataFrame(neighbours, columns=[kind_label, '유사도', '함께 선택한 응답자 수'])
+    table['선택 수'] = [index.counts[other] for other in table[kind_label]]
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+# ---- 영양 프로파일 (영양 성분표 × 응답자×메뉴 행렬, 데이터 버전별 캐시) ----
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_nutrient_table(path, signature):
+    from nutrition import load_nutrient_table
+    return load_nutrient_table(path)
+
+def get_nutrient_table():
+    """영양 성분표 (없으면 None, 파일이 바뀌었을 때만 다시 읽음)"""
+    from nutrition import nutrient_path
+    path = nutrient_path()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return _load_nutrient_table(path, (stat.st_mtime_ns, stat.st_size))
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_nutrient_profiles(dataset_version, table_signature, _incidence, _table):
+    from nutrition import compute_profiles
+    return compute_profiles(_incidence, _table)
+
+def show_nutrition(df, dataset_version):
+    st.markdown("### 🥗 선호 메뉴 영양 프로파일")
+    st.caption("응답자가 고른 메뉴들의 1인분 영양 성분 평균입니다. 소속별 값은 소속 응답자들이 고른 메뉴 전체의 평균이라 "
+               "많이 고른 메뉴가 크게 반영됩니다. 성분표에 값이 없는 메뉴는 그 성분 계산에서 빠집니다.")
+    try:
+        table = get_nutrient_table()
+    except ValueError as e:
+        st.error(f"영양 성분표 오류: {e}")
+        return
+    if table is None:
+        st.info("영양 성분표(menu_nutrients.csv)가 없습니다. `python nutrition.py template`으로 빈 표를 만든 뒤 "
+                "메뉴별 값을 채워 주세요.")
+        return
+
+    incidence = load_incidence(dataset_version, df)
+    profiles = load_nutrient_profiles(dataset_version, table.signature, incidence, table)
+    share, _ = table.coverage(incidence.menu_labels)
+    st.caption("성분표 반영 비율(카탈로그 메뉴 중 값이 있는 비율): "
+               + " · ".join(f"{n} {pct:.0f}%" for n, pct in share.items()))
+    if len(profiles.respondents) == 0:
+        st.info("집계할 응답이 아직 없습니다.")
+        return
+
+    st.markdown("#### 🏢 소속별")
+    st.dataframe(profiles.facilities, use_container_width=True, hide_index=True)
+    st.download_button(
+        "⬇️ 소속별 영양 프로파일 CSV 다운로드",
+        data=profiles.facilities.to_csv(index=False).encode('utf-8-sig'),
+        file_name="nutrient_profile_by_affiliation.csv",
+        mime="text/csv"
+    )
+
+    st.markdown("#### 👤 응답자별")
+    aff_sel = st.selectbox("소속", ["(전체)"] + list(profiles.facilities['소속']), key="nutrition_aff")
+    people = profiles.respondents
+    if aff_sel != "(전체)":
+        people = people[people['소속'] == aff_sel]
+    st.dataframe(people, use_container_width=True, hide_index=True, height=420)
+    st.download_button(
+        "⬇️ 응답자별 영양 프로파일 CSV 다운로드",
+        data=people.to_csv(index=False).encode('utf-8-sig'),
+        file_name="nutrient_profile_by_respondent.csv",
+        mime="text/csv"
+    )
+
+# ---- 집단 비교 (항목별 선택률 검정 + FDR) ----
+
+COHORT_MODES = ["소속", "기간", "카테고리 선택 여부"]
+REST_LABEL = "(나머지 전체)"
+
+def _cohort_masks(incidence, mode):
+    """(A 마스크, B 마스크, A 이름, B 이름, 비교에서 뺄 항목) 또는 None"""
+    from cohort import affiliation_mask, ingredient_mask, time_mask
+    if mode == "소속":
+        affs = sorted(set(incidence.affiliations.astype(str)))
+        if len(affs) < 2:
+            st.info("소속이 두 곳 이상이어야 비교할 수 있습니다.")
+            return None
+        c1, c2 = st.columns(2)
+        with c1:
+            aff_a = st.selectbox("집단 A", affs, key="cohort_aff_a")
+        with c2:
+            aff_b = st.selectbox("집단 B", [REST_LABEL] + [a for a in affs if a != aff_a], key="cohort_aff_b")
+        mask_a = affiliation_mask(incidence, [aff_a])
+        mask_b = ~mask_a if aff_b == REST_LABEL else affiliation_mask(incidence, [aff_b])
+        return mask_a, mask_b, aff_a, aff_b, ()
+    if mode == "기간":
+        times = pd.Series(incidence.submitted_at, dtype=object).dropna().astype(str)
+        days = pd.to_datetime(times.str[:10], format="%Y-%m-%d", errors='coerce').dropna()
+        if len(days) == 0:
+            st.info("설문일시가 있는 응답이 없습니다.")
+            return None
+        first, last = days.min().date(), days.max().date()
+        middle = first + (last - first) / 2
+        c1, c2 = st.columns(2)
+        with c1:
+            range_a = st.date_input("집단 A 기간", (first, middle), min_value=first, max_value=last, key="cohort_time_a")
+        with c2:
+            range_b = st.date_input("집단 B 기간", (middle + timedelta(days=1), last), min_value=first, max_value=last,
+                                    key="cohort_time_b")
+        if len(range_a) != 2 or len(range_b) != 2:
+            st.info("기간의 시작일과 종료일을 모두 골라 주세요.")
+            return None
+
+        def window(r):
+            return time_mask(incidence, r[0].isoformat(), (r[1] + timedelta(days=1)).isoformat())
+
+        return window(range_a), window(range_b), f"{range_a[0]}~{range_a[1]}", f"{range_b[0]}~{range_b[1]}", ()
+    labels = [label for label, _ in INGREDIENT_CATEGORIES]
+    cat = st.selectbox("카테고리", labels, key="cohort_cat")
+    ings = dict(INGREDIENT_CATEGORIES)[cat]
+    mask_a = ingredient_mask(incidence, ings)
+    return mask_a, ~mask_a, f"{cat} 선택", f"{cat} 미선택", ings
+
+def show_cohort_compare(df, dataset_version):
+    from cohort import DEFAULT_ALPHA, compare_cohorts
+    st.markdown("### ⚖️ 집단 비교")
+    st.caption("두 응답자 집단의 항목별 선택률을 비교합니다. 기대도수가 5 미만인 항목은 Fisher 정확 검정, 나머지는 카이제곱 검정이고 "
+               "여러 항목을 한꺼번에 검정하므로 q값(FDR, Benjamini–Hochberg)으로 유의 여부를 표시합니다.")
+    incidence = load_incidence(dataset_version, df)
+    if incidence.n_respondents == 0:
+        st.info("비교할 응답이 아직 없습니다.")
+        return
+
+    c1, c2, c3 = st.columns([2, 1, 1])
+    with c1:
+        mode = st.radio("비교 기준", COHORT_MODES, horizontal=True, key="cohort_mode")
+    with c2:
+        kind_label = st.radio("대상", ["메뉴", "식재료"], horizontal=True, key="cohort_kind")
+    with c3:
+        alpha = st.number_input("유의수준 (q)", min_value=0.001, max_value=0.2, value=DEFAULT_ALPHA, step=0.01,
+                                format="%.3f", key="cohort_alpha")
+    picked = _cohort_masks(incidence, mode)
+    if picked is None:
+        return
+    mask_a, mask_b, name_a, name_b, exclude = picked
+    kind = 'menu' if kind_label == "메뉴" else 'ingredient'
+    table, n_a, n_b = compare_cohorts(incidence, mask_a, mask_b, kind, alpha=alpha,
+                                      exclude=exclude if kind == 'ingredient' else ())
+    st.caption(f"A: {name_a} {n_a}명 · B: {name_b} {n_b}명")
+    if len(table) == 0:
+        st.info("두 집단 모두 응답이 있어야 비교할 수 있습니다.")
+        return
+
+    only_sig = st.checkbox(f"유의한 항목만 보기 ({int(table['유의'].sum())}개)", value=False, key="cohort_only_sig")
+    shown = table[table['유의']] if only_sig else table
+    st.dataframe(shown.rename(columns={'항목': kind_label}), use_container_width=True, hide_index=True, height=420,
+                 column_config={'p': st.column_config.NumberColumn(format="%.2e"),
+                                'q (FDR)': st.column_config.NumberColumn(format="%.2e")})
+    st.download_button(
+        "⬇️ 집단 비교 CSV 다운로드",
+        data=shown.rename(columns={'항목': kind_label}).to_csv(index=False).encode('utf-8-sig'),
+        file_name="cohort_comparison.csv",
+        mime="text/csv"
+    )
+
+# ---- SQL 콘솔 (메모리 SQLite 분석 DB, 관리자가 새로 만들 때만 다시 만듦) ----
+
+SQL_TIMEOUT_SEC = 5
+SQL_MAX_ROWS = 10000
+SQL_PAGE_SIZE = 100
+
+@st.cache_resource
+def _sql_db_holder():
+    return {'lock': threading.Lock(), 'db': None}
+
+def load_sql_db(df, dataset_version, rebuild=False):
+    """분석 DB (없을 때 한 번 만들고, 이후에는 rebuild=True일 때만 최신 데이터로 다시 만듦)"""
+    from sql_console import AnalyticsDB
+    holder = _sql_db_holder()
+    with holder['lock']:
+        if holder['db'] is None or rebuild:
+            try:
+                table = get_nutrient_table()
+            except ValueError:
+                table = None
+            previous = holder['db']
+            holder['db'] = AnalyticsDB.from_frame(df, *_selection_loaders(), MENU_DATA, INGREDIENT_CATEGORIES,
+                                                  nutrient_table=table, version=dataset_version)
+            if previous is not None:
+                previous.close()
+        return holder['db']
+
+def _use_sql_example():
+    from sql_console import EXAMPLES
+    st.session_state['sql_text'] = EXAMPLES[st.session_state['sql_example']]
+
+def show_sql_console(df, dataset_version):
+    from sql_console import EXAMPLES, QueryTimeout
+    st.markdown("### 🧾 SQL 콘솔")
+    st.caption(f"응답 데이터를 정규화한 표에 SELECT 문을 실행합니다. 읽기 전용이며, {SQL_TIMEOUT_SEC}초가 넘는 질의는 중단되고 "
+               f"결과는 {SQL_MAX_ROWS:,}행까지만 가져옵니다.")
+    db = _sql_db_holder()['db']
+    if db is None:  # 탭은 대시보드를 열 때마다 모두 그려지므로 처음 만드는 것은 눌렀을 때만
+        if st.button("🧾 분석 DB 만들기", key="sql_build"):
+            with st.spinner("분석 DB 만드는 중..."):
+                load_sql_db(df, dataset_version)
+            st.rerun()
+        return
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        st.caption(f"데이터 버전 {db.version} 기준 · 만드는 데 {db.build_seconds:.1f}s")
+    with c2:
+        if db.version != dataset_version and st.button("🔄 최신 데이터로 다시 만들기", key="sql_rebuild"):
+            with st.spinner("분석 DB 다시 만드는 중..."):
+                load_sql_db(df, dataset_version, rebuild=True)
+            st.rerun()
+    if db.version != dataset_version:
+        st.info("이후 들어온 응답은 아직 반영되지 않았습니다.")
+
+    with st.expander("📚 표 구조", expanded=False):
+        for name, columns in db.tables.items():
+            st.markdown(f"**{name}**: " + ", ".join(f"`{c}`" for c in columns))
+        st.caption("selections_long.kind: 'ingredient'(menu는 비어 있음) / 'menu'")
+
+    st.selectbox("예시 질의", list(EXAMPLES), index=None, placeholder="예시 불러오기", key="sql_example",
+                 on_change=_use_sql_example)
+    st.session_state.setdefault('sql_text', EXAMPLES["소속별 응답 수"])
+    sql = st.text_area("SQL", key="sql_text", height=160)
+    if st.button("▶️ 실행", key="sql_run", type="primary") and sql and sql.strip():
+        st.session_state.pop('sql_result', None)
+        try:
+            st.session_state['sql_result'] = db.query(sql, timeout_sec=SQL_TIMEOUT_SEC, max_rows=SQL_MAX_ROWS)
+            st.session_state['sql_page'] = 1
+        except QueryTimeout as e:
+            st.error(f"⏱️ {e}. 조건을 좁히거나 LIMIT를 붙여 보세요.")
+        except Exception as e:
+            st.error(f"SQL 오류: {e}")
+
+    result = st.session_state.get('sql_result')
+    if result is None:
+        return
+    frame = result.frame
+    pages = max(1, -(-len(frame) // SQL_PAGE_SIZE))
+    note = f" (최대 {SQL_MAX_ROWS:,}행에서 잘림)" if result.truncated else ""
+    st.caption(f"{len(frame):,}행{note} · {result.elapsed_ms:.0f}ms")
+    if result.truncated:
+        st.warning(f"결과가 {SQL_MAX_ROWS:,}행을 넘어 앞부분만 가져왔습니다. 집계하거나 조건을 좁혀 보세요.")
+    page = st.number_input("페이지", min_value=1, max_value=pages, step=1, key="sql_page") if pages > 1 else 1
+    start = (int(page) - 1) * SQL_PAGE_SIZE
+    st.dataframe(frame.iloc[start:start + SQL_PAGE_SIZE], use_container_width=True, hide_index=True)
+    st.download_button(
+        "⬇️ 결과 CSV 다운로드",
+        data=frame.to_csv(index=False).encode('utf-8-sig'),
+        file_name="sql_result.csv",
+        mime="text/csv",
+        key="sql_csv"
+    )
+
+def show_affiliation_cube(cube):
+    st.markdown("### 🏢 소속별 분석")
+    if cube.total_respondents == 0:
+        st.info("집계할 응답이 아직 없습니다.")
+        return
+
+    f1, f2, f3 = st.columns(3)
+    with f1:
+        aff_sel = st.selectbox("소속", ["(전체)"] + cube.affiliations(), key="cube_aff")
+    with f2:
+        cat_sel = st.selectbox("카테고리", ["(전체)"] + [label for label, _ in INGREDIENT_CATEGORIES], key="cube_cat")
+    with f3:
+        ing_options = [ing for label, ings in INGREDIENT_CATEGORIES if cat_sel in ("(전체)", label) for ing in ings]
+        ing_sel = st.selectbox("수산물", ["(전체)"] + ing_options, key="cube_ing")
+
+    filters = {}
+    if aff_sel != "(전체)":
+        filters['소속'] = aff_sel
+    if cat_sel != "(전체)":
+        filters['카테고리'] = cat_sel
+    if ing_sel != "(전체)":
+        filters['수산물'] = ing_sel
+
+    n_resp = cube.respondents.get(aff_sel, 0) if aff_sel != "(전체)" else cube.total_respondents
+    st.caption(f"응답자 수: {n_resp}명")
+
+    dims = list(CUBE_DIMENSIONS)
+    p1, p2 = st.columns(2)
+    with p1:
+        row_dim = st.selectbox("행", dims, index=dims.index('수산물'), key="cube_row")
+    with p2:
+        col_dim = st.selectbox("열", dims, index=dims.index('조리법'), key="cube_col")
+
+    if row_dim == col_dim:
+        table = cube.to_frame((row_dim,), filters)
+    else:
+        table = cube.pivot(row_dim, col_dim, filters)
+
+    if len(table) == 0:
+        st.info("조건에 해당하는 선택 데이터가 없습니다.")
+        return
+
+    st.dataframe(table, use_container_width=True, height=420)
+    st.download_button(
+        "⬇️ 소속별 집계 CSV 다운로드",
+        data=table.to_csv().encode('utf-8-sig'),
+        file_name="affiliation_pivot.csv",
+        mime="text/csv"
+    )
+
+# ---- 소속별 결과 묶음 (백그라운드 작업 큐, 데이터 버전별 캐시) ----
+
+@st.cache_resource
+def get_report_jobs():
+    root = os.path.join(os.environ.get("BLUEFOOD_DATA_DIR", APP_DIR), "reports")
+    return ReportJobQueue(root, font_path=FONT_PATH)
+
+def snapshot_aggregate_cube(df, version):
+    """작업용 큐브 복사본 (제출 때마다 증분 갱신되는 공유 큐브와 분리)"""
+    load_aggregate_cube(df, version)
+    holder = _aggregate_cube_holder()
+    with holder['lock']:
+        if holder['version'] == version:
+            return copy.deepcopy(holder['cube'])
+    return AggregateCube.from_records(_iter_cube_records(df), MENU_DATA, INGREDIENT_CATEGORIES)
+
+def show_facility_report_request(df, dataset_version, per_person_df):
+    st.markdown("#### 📦 소속별 결과 묶음")
+    st.caption("소속마다 순위/조리법/개인별 선택 시트가 담긴 엑셀과 차트 이미지를 ZIP으로 만듭니다. "
+               "백그라운드에서 만들어지며 진행 상황은 사이드바에 표시됩니다.")
+    if st.button("📦 전체 소속 결과 만들기", key="report_submit"):
+        get_report_jobs().submit(dataset_version, snapshot_aggregate_cube(df, dataset_version), per_person_df)
+        st.rerun()
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _read_artifact(path, mtime):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _artifact_bytes(path):
+    return _read_artifact(path, os.path.getmtime(path))
+
+def show_report_jobs():
+    """사이드바: 최근 결과 묶음 작업 진행률 (진행 중이면 2초마다 이 부분만 갱신)"""
+    job = get_report_jobs().latest()
+    if job is None:
+        return
+
+    @st.fragment(run_every=2 if job.state in ('queued', 'running') else None)
+    def _status():
+        if job.state == 'failed':
+            st.caption(f"⚠️ 소속별 결과 생성 실패: {job.error}")
+        elif job.state != 'done':
+            st.session_state.report_job_watching = job.version
+            st.progress(job.progress(), f"📦 소속별 결과 생성 중 {job.done}/{job.total}")
+        elif st.session_state.get('report_job_watching') == job.version:
+            # 지켜보던 작업이 끝나면 전체를 한 번 다시 그려 다운로드 버튼을 띄움
+            st.session_state.report_job_watching = None
+            st.rerun()
+
+    _status()
+    if job.state == 'done':
+        took = f" · {job.seconds}s" if job.seconds is not None else ""
+        st.caption(f"📦 소속별 결과 {job.total}곳{took}")
+        st.download_button("⬇️ 전체 소속 결과 ZIP", data=_artifact_bytes(job.bundle),
+                           file_name=os.path.basename(job.bundle), mime="application/zip",
+                           use_container_width=True, key="report_bundle")
+        aff = st.selectbox("소속별 ZIP", job.affiliations, key="report_aff")
+        if aff in job.paths:
+            st.download_button("⬇️ 선택한 소속 ZIP", data=_artifact_bytes(job.paths[aff]),
+                               file_name=os.path.basename(job.paths[aff]), mime="application/zip",
+                               use_container_width=True, key="report_one")
+
+def show_admin_dashboard(df, dataset_version=None):
     st.markdown("## 📊 관리자 대시보드")
 
     required_cols = {'이름', '소속', '선택한_수산물', '선택한_메뉴'}
@@ -365,9 +1303,16 @@ def show_admin_dashboard(df):
     with right:
         st.caption("※ 날짜 필터는 '설문일시'가 문자열이라면 적용이 어려울 수 있어요. 필요하면 날짜형으로 저장 권장합니다.")
 
-    ing_rank_df, menu_rank_df, per_person_df = build_aggregates(df)
+    if dataset_version is None:
+        ing_rank_df, menu_rank_df, per_person_df = build_aggregates(df)
+        search_index = RespondentSearchIndex(per_person_df, NO_MENU_LABEL) if len(per_person_df) > 0 else None
+    else:
+        ing_rank_df, menu_rank_df, per_person_df, search_index = load_dashboard_aggregates(dataset_version, df)
+    cube = load_aggregate_cube(df, dataset_version)
 
-    tab1, tab2, tab3 = st.tabs(["🏆 랭킹(식재료/메뉴)", "👤 개인별 선택", "📄 원시 데이터 미리보기"])
+    tab1, tab2, tab_cube, tab_cohort, tab_plan, tab_sim, tab_nutri, tab_funnel, tab_sql, tab3 = st.tabs([
+        "🏆 랭킹(식재료/메뉴)", "👤 개인별 선택", "🏢 소속별 분석", "⚖️ 집단 비교", "🧮 메뉴 구성", "🔗 함께 선택",
+        "🥗 영양", "📉 응답 흐름", "🧾 SQL", "📄 원시 데이터 미리보기"])
 
     with tab1:
         col_a, col_b = st.columns(2)
@@ -379,6 +1324,7 @@ def show_admin_dashboard(df):
             else:
                 st.dataframe(ing_rank_df.head(int(top_n)), use_container_width=True)
                 try:
+                    import matplotlib.pyplot as plt
                     fig, ax = plt.subplots(figsize=(6, 4))
                     head = ing_rank_df.head(int(top_n))
                     ax.bar(head['수산물'], head['선택 수'])
@@ -397,6 +1343,7 @@ def show_admin_dashboard(df):
             else:
                 st.dataframe(menu_rank_df.head(int(top_n)), use_container_width=True)
                 try:
+                    import matplotlib.pyplot as plt
                     fig, ax = plt.subplots(figsize=(6, 4))
                     head = menu_rank_df.head(int(top_n))
                     ax.bar(head['메뉴'], head['선택 수'])
@@ -420,6 +1367,8 @@ def show_admin_dashboard(df):
             file_name="menu_ranking.csv",
             mime="text/csv"
         )
+        if dataset_version is not None:
+            show_ranking_uncertainty(df, dataset_version, top_n)
 
     with tab2:
         st.markdown("### 👤 개인별 선택 내역")
@@ -434,21 +1383,17 @@ def show_admin_dashboard(df):
             with c3:
                 only_menu_selected = st.checkbox("메뉴 선택 있는 행만 보기", value=False)
 
-            filtered = per_person_df.copy()
-            if name_q.strip():
-                filtered = filtered[filtered['이름'].astype(str).str.contains(name_q.strip(), case=False, na=False)]
-            if aff_q.strip():
-                filtered = filtered[filtered['소속'].astype(str).str.contains(aff_q.strip(), case=False, na=False)]
-            if only_menu_selected:
-                filtered = filtered[filtered['메뉴'] != '(메뉴 선택 없음)']
-
-            uniq_names = ["(전체)"] + sorted(per_person_df['이름'].dropna().unique().tolist())
-            sel_name = st.selectbox("이름 선택", uniq_names)
-            if sel_name != "(전체)":
-                filtered = filtered[filtered['이름'] == sel_name]
+            sel_name = st.selectbox("이름 선택", ["(전체)"] + search_index.name_options)
+            row_ids = search_index.filter(
+                name_q=name_q,
+                aff_q=aff_q,
+                only_menu_selected=only_menu_selected,
+                exact_name=None if sel_name == "(전체)" else sel_name,
+            )
+            filtered = search_index.select(row_ids)
+            st.caption("※ 초성으로도 검색할 수 있습니다 (예: ㅎㄱㄷ)")
 
-            st.dataframe(filtered.sort_values(['이름', '소속', '수산물', '메뉴']),
-                         use_container_width=True, height=420)
+            st.dataframe(filtered, use_container_width=True, height=420)
 
             st.download_button(
                 "⬇️ 개인별 선택 CSV 다운로드",
@@ -457,284 +1402,218 @@ def show_admin_dashboard(df):
                 mime="text/csv"
             )
 
+    with tab_cube:
+        show_quota_progress()
+        show_affiliation_cube(cube)
+        if dataset_version is not None:
+            show_facility_report_request(df, dataset_version, per_person_df)
+
+    with tab_cohort:
+        if dataset_version is None:
+            st.info("저장소 데이터 버전이 있어야 집단을 비교할 수 있습니다.")
+        else:
+            show_cohort_compare(df, dataset_version)
+
+    with tab_plan:
+        if dataset_version is None:
+            st.info("저장소 데이터 버전이 있어야 메뉴 구성을 계산할 수 있습니다.")
+        else:
+            show_menu_optimizer(df, dataset_version)
+
+    with tab_sim:
+        if dataset_version is None:
+            st.info("저장소 데이터 버전이 있어야 유사도를 계산할 수 있습니다.")
+        else:
+            show_similarity(df, dataset_version)
+
+    with tab_nutri:
+        if dataset_version is None:
+            st.info("저장소 데이터 버전이 있어야 영양 프로파일을 계산할 수 있습니다.")
+        else:
+            show_nutrition(df, dataset_version)
+
+    with tab_funnel:
+        show_funnel()
+
+    with tab_sql:
+        if dataset_version is None:
+            st.info("저장소 데이터 버전이 있어야 SQL 콘솔을 쓸 수 있습니다.")
+        else:
+            show_sql_console(df, dataset_version)
+
     with tab3:
         st.markdown("### 📄 원시 데이터 (백업 파일 기준)")
         st.dataframe(df, use_container_width=True, height=420)
 
-# ===================== 설문 데이터 (수산물/메뉴) =====================
-# (MENU_DATA, INGREDIENT_CATEGORIES 그대로 사용 — 생략 없이 원본을 유지하세요)
-# ---- 중략: 사용자 제공 MENU_DATA, INGREDIENT_CATEGORIES를 그대로 둡니다. ----
-# >>> 여기에 질문에 포함된 MENU_DATA, INGREDIENT_CATEGORIES 전부 그대로 붙여넣으세요 <<<
-
-MENU_DATA = {
-    '맛살': {'밥/죽': ['게맛살볶음밥'], '무침': ['게맛살콩나물무침'], '볶음': ['맛살볶음'], '부침': ['맛살전']},
-    '어란': {
-        '밥/죽': ['날치알밥'],
-        '면류': ['명란파스타'],
-        '국/탕': ['알탕'],
-        '찜': ['날치알달걀찜'],
-        '무침': ['명란젓갈'],
-        '볶음': ['날치알스크램블에그'],
-        '부침': ['날치알계란말이'],
-        '구이': ['명란구이']
-    },
-    '어묵': {
-        '밥/죽': ['어묵볶음밥'],
-        '면류': ['어묵우동'],
-        '국/탕': ['어묵탕'],
-        '조림': ['어묵조림'],
-        '찜': ['콩나물어묵찜', '어묵찜'],
-        '볶음': ['매콤어묵볶음', '간장어묵볶음'],
-        '부침': ['어묵전'],
-        '튀김': ['어묵고로케']
-    },
-    '쥐포': {
-        '조림': ['쥐포조림'],
-        '무침': ['쥐포무침'],
-        '볶음': ['쥐포볶음'],
-        '부침': ['쥐포전'],
-        '튀김': ['쥐포튀김'],
-        '구이': ['쥐포구이']
-    },
-    '김': {'밥/죽': ['김밥'], '무침': ['김무침'], '튀김': ['김부각'], '구이': ['김자반']},
-    '다시마': {'무침': ['다시마채무침'], '볶음': ['다시마채볶음'], '튀김': ['다시마튀각']},
-    '매생이': {'면류': ['매생이칼국수'], '국/탕': ['매생이굴국'], '부침': ['매생이전']},
-    '미역': {'밥/죽': ['미역국밥'], '국/탕': ['미역국'], '무침': ['미역초무침'], '볶음': ['미역줄기볶음']},
-    '파래': {'무침': ['파래무침'], '볶음': ['파래볶음'], '부침': ['물파래전']},
-    '톳': {'밥/죽': ['톳밥'], '무침': ['톳무침']},
-    '꼴뚜기': {'조림': ['꼴뚜기조림'], '찜': ['꼴뚜기찜'], '무침': ['꼴뚜기젓무침'], '볶음': ['꼴뚜기볶음']},
-    '낙지': {
-        '밥/죽': ['낙지비빔밥'],
-        '면류': ['낙지수제비'],
-        '국/탕': ['낙지연포탕'],
-        '찜': ['낙지찜'],
-        '무침': ['낙지초무침'],
-        '볶음': ['낙지볶음'],
-        '구이': ['낙지호롱구이'],
-        '기타(생식)': ['낙지탕탕이']
-    },
-    '문어': {
-        '밥/죽': ['문어볶음밥'],
-        '면류': ['문어라면'],
-        '국/탕': ['문어탕'],
-        '조림': ['문어조림'],
-        '찜': ['문어콩나물찜'],
-        '무침': ['문어초무침'],
-        '볶음': ['문어볶음'],
-        '부침': ['문어전'],
-        '튀김': ['문어튀김'],
-        '기타(생식)': ['문어회']
-    },
-    '오징어': {
-        '밥/죽': ['오징어덮밥'],
-        '국/탕': ['오징어무국'],
-        '조림': ['오징어조림'],
-        '찜': ['오징어콩나물찜', '오징어숙회'],
-        '무침': ['오징어초무침'],
-        '볶음': ['오징어볶음'],
-        '부침': ['오징어해물전'],
-        '튀김': ['오징어튀김'],
-        '구이': ['오징어버터구이'],
-        '기타(생식)': ['오징어회']
-    },
-    '주꾸미': {
-        '밥/죽': ['주꾸미볶음덮밥'],
-        '면류': ['주꾸미감자수제비', '주꾸미짬뽕'],
-        '국/탕': ['주꾸미연포탕'],
-        '찜': ['주꾸미숙회', '주꾸미찜'],
-        '무침': ['주꾸미무침'],
-        '볶음': ['주꾸미볶음']
-    },
-    '가재': {'찜': ['가재찜'], '구이': ['가재구이']},
-    '게': {
-        '밥/죽': ['게살볶음밥'],
-        '면류': ['게살파스타', '꽃게라면'],
-        '국/탕': ['꽃게탕'],
-        '조림': ['꽃게조림'],
-        '찜': ['꽃게찜'],
-        '무침': ['꽃게무침'],
-        '볶음': ['꽃게볶음'],
-        '튀김': ['꽃게강정'],
-        '기타(생식)': ['간장게장', '양념게장']
-    },
-    '새우': {
-        '밥/죽': ['새우볶음밥'],
-        '면류': ['새우크림파스타'],
-        '국/탕': ['새우달걀국', '얼큰새우매운탕'],
-        '조림': ['새우조림'],
-        '찜': ['새우달걀찜'],
-        '무침': ['새우젓'],
-        '볶음': ['건새우볶음'],
-        '부침': ['새우전'],
-        '튀김': ['새우튀김'],
-        '구이': ['새우버터구이'],
-        '기타(생식)': ['간장새우장', '양념새우장']
-    },
-    '다슬기': {'면류': ['다슬기수제비'], '국/탕': ['다슬기된장국'], '무침': ['다슬기무침'], '부침': ['다슬기파전']},
-    '꼬막': {
-        '밥/죽': ['꼬막비빔밥'],
-        '면류': ['꼬막칼국수'],
-        '국/탕': ['꼬막된장찌개'],
-        '찜': ['꼬막찜'],
-        '무침': ['꼬막무침'],
-        '부침': ['꼬막전'],
-        '구이': ['꼬막떡꼬치구이']
-    },
-    '가리비': {
-        '밥/죽': ['가리비초밥'],
-        '면류': ['가리비칼국수'],
-        '국/탕': ['가리비탕'],
-        '찜': ['가리비찜'],
-        '무침': ['가리비초무침'],
-        '볶음': ['가리비볶음'],
-        '구이': ['가리비버터구이']
-    },
-    '골뱅이': {
-        '밥/죽': ['골뱅이죽'],
-        '면류': ['골뱅이비빔면'],
-        '국/탕': ['골뱅이탕'],
-        '무침': ['골뱅이무침'],
-        '볶음': ['골뱅이볶음'],
-        '튀김': ['골뱅이튀김'],
-        '구이': ['골뱅이꼬치구이'],
-        '기타(생식)': ['골뱅이물회']
-    },
-    '굴': {
-        '밥/죽': ['굴국밥'],
-        '면류': ['굴칼국수', '굴짬뽕'],
-        '국/탕': ['매생이굴국', '굴순두부찌개'],
-        '조림': ['굴조림'],
-        '찜': ['굴찜'],
-        '무침': ['굴무침'],
-        '볶음': ['굴볶음'],
-        '부침': ['굴전'],
-        '튀김': ['굴튀김'],
-        '구이': ['굴구이'],
-        '기타(생식)': ['생굴']
-    },
-    '미더덕': {
-        '밥/죽': ['미더덕밥'],
-        '국/탕': ['미더덕된장찌개', '미더덕순두부찌개'],
-        '찜': ['미더덕콩나물찜']
-    },
-    '바지락': {
-        '밥/죽': ['바지락비빔밥'],
-        '면류': ['바지락칼국수'],
-        '국/탕': ['바지락미역국', '바지락순두부찌개'],
-        '찜': ['바지락찜'],
-        '무침': ['바지락무침'],
-        '볶음': ['바지락볶음', '매콤바지락볶음'],
-        '부침': ['바지락부추전']
-    },
-    '백합': {
-        '밥/죽': ['백합볶음밥'],
-        '면류': ['백합칼국수'],
-        '국/탕': ['백합탕'],
-        '찜': ['백합찜'],
-        '무침': ['백합무침'],
-        '볶음': ['백합볶음'],
-        '구이': ['백합구이']
-    },
-    '소라': {
-        '밥/죽': ['참소라야채죽'],
-        '면류': ['소라비빔면'],
-        '국/탕': ['소라된장찌개'],
-        '조림': ['참소라장조림'],
-        '찜': ['소라숙회'],
-        '무침': ['소라무침'],
-        '볶음': ['소라버터볶음'],
-        '튀김': ['소라튀김'],
-        '구이': ['소라구이'],
-        '기타(생식)': ['소라회']
-    },
-    '재첩': {'국/탕': ['재첩국'], '무침': ['재첩무침'], '부침': ['재첩부추전']},
-    '전복': {
-        '밥/죽': ['전복죽'],
-        '면류': ['전복파스타'],
-        '국/탕': ['전복미역국'],
-        '조림': ['전복장조림'],
-        '찜': ['전복찜'],
-        '무침': ['전복무침'],
-        '볶음': ['전복볶음'],
-        '구이': ['전복구이'],
-        '기타(생식)': ['전복회']
-    },
-    '홍합': {
-        '밥/죽': ['홍합죽'],
-        '면류': ['홍합칼국수', '홍합짬뽕'],
-        '국/탕': ['홍합탕', '홍합된장찌개'],
-        '조림': ['홍합조림'],
-        '찜': ['홍합찜'],
-        '무침': ['홍합무침'],
-        '볶음': ['홍합볶음'],
-        '부침': ['홍합전'],
-        '구이': ['홍합구이']
-    },
-    '가자미': {
-        '국/탕': ['가자미미역국'],
-        '조림': ['가자미조림'],
-        '찜': ['가자미찜'],
-        '부침': ['가자미전'],
-        '튀김': ['가자미튀김'],
-        '구이': ['가자미구이']
-    },
-    '다랑어': {
-        '밥/죽': ['참치김밥'],
-        '국/탕': ['참치김치찌개'],
-        '볶음': ['참치양배추볶음'],
-        '부침': ['참치달걀말이'],
-        '구이': ['참치스테이크'],
-        '생식류/절임류/장류': ['참치회']
-    },
-    '고등어': {'조림': ['고등어조림'], '구이': ['고등어구이']},
-    '갈치': {'조림': ['갈치조림'], '구이': ['갈치구이']},
-    '꽁치': {'국/탕': ['꽁치김치찌개'], '조림': ['꽁치조림'], '구이': ['꽁치구이']},
-    '대구': {'국/탕': ['맑은대구탕', '대구매운탕'], '조림': ['대구조림'], '부침': ['대구전']},
-    '멸치': {'밥/죽': ['멸치김밥'], '볶음': ['멸치볶음']},
-    '명태': {
-        '국/탕': ['황태미역국'],
-        '조림': ['코다리조림'],
-        '찜': ['명태찜'],
-        '무침': ['북어채무침'],
-        '구이': ['코다리구이']
-    },
-    '박대': {'조림': ['박대조림'], '구이': ['박대구이']},
-    '뱅어': {'무침': ['뱅어포무침'], '튀김': ['뱅어포튀김']},
-    '병어': {'조림': ['병어조림'], '구이': ['병어구이']},
-    '삼치': {'조림': ['삼치조림'], '튀김': ['삼치튀김'], '구이': ['삼치구이']},
-    '아귀': {'국/탕': ['아귀탕'], '찜': ['아귀찜']},
-    '연어': {'밥/죽': ['연어덮밥'], '구이': ['연어구이'], '생식류/절임류/장류': ['연어회']},
-    '임연수': {'조림': ['임연수조림'], '구이': ['임연수구이']},
-    '장어': {
-        '밥/죽': ['장어덮밥'],
-        '조림': ['장어조림'],
-        '찜': ['장어찜'],
-        '튀김': ['장어튀김'],
-        '구이': ['장어구이']
-    },
-    '조기': {'조림': ['조기조림'], '찜': ['조기찜'], '구이': ['조기구이']}
-}
-
-INGREDIENT_CATEGORIES = [
-    ("🍤 가공수산물", ['맛살', '어란', '어묵', '쥐포']),
-    ("🌿 해조류", ['김', '다시마', '매생이', '미역', '파래', '톳']),
-    ("🦑 연체류", ['꼴뚜기', '낙지', '문어', '오징어', '주꾸미']),
-    ("🦀 갑각류", ['가재', '게', '새우']),
-    ("🐚 패류", [
-        '다슬기', '꼬막', '가리비', '골뱅이', '굴', '미더덕', '바지락', '백합',
-        '소라', '재첩', '전복', '홍합'
-    ]),
-    ("🐟 어류", [
-        '가자미', '다랑어', '고등어', '갈치', '꽁치', '대구', '멸치', '명태',
-        '박대', '뱅어', '병어', '삼치', '아귀', '연어', '임연수', '장어', '조기'
-    ])
-]
-
-TOTAL_CATEGORY_COUNT = len(INGREDIENT_CATEGORIES)
+# ---- 실시간 모드 (변경 피드로 새 응답만 반영) ----
+
+LIVE_REFRESH_SEC = 3
+
+@st.cache_resource
+def get_live_counters():
+    return LiveCounters(*_selection_loaders())
+
+def show_live_dashboard(top_n=10):
+    """전체 대시보드 대신: 새 응답만 카운터에 더하고 이 부분만 LIVE_REFRESH_SEC마다 다시 그림"""
+
+    @st.fragment(run_every=LIVE_REFRESH_SEC)
+    def _live():
+        live = get_live_counters()
+        t0 = time.perf_counter()
+        try:
+            applied = live.poll(get_response_store())
+        except Exception as e:
+            st.caption(f"⚠️ 실시간 갱신 실패: {e}")
+            return
+        poll_ms = (time.perf_counter() - t0) * 1000
+        snap = live.snapshot(top_n, get_korean_time())
+        prev_total = st.session_state.get('live_prev_total', snap['total'])
+        st.session_state.live_prev_total = snap['total']
+
+        c1, c2 = st.columns(2)
+        c1.metric("총 응답", f"{snap['total']}건", delta=(snap['total'] - prev_total) or None)
+        c2.metric("최근 10분", f"{snap['recent_window']}건")
+        if snap['total'] == 0:
+            st.info("아직 설문 데이터가 없습니다.")
+            return
+        st.markdown("### 🐟 식재료 Top")
+        st.dataframe(pd.DataFrame(snap['ingredients'], columns=['수산물', '선택 수']),
+                     use_container_width=True, hide_index=True)
+        st.markdown("### 🍽️ 메뉴 Top")
+        st.dataframe(pd.DataFrame(snap['menus'], columns=['메뉴', '선택 수']),
+                     use_container_width=True, hide_index=True)
+        st.markdown("### 🏢 소속별 응답 수")
+        st.dataframe(pd.DataFrame(snap['affiliations'], columns=['소속', '응답 수']),
+                     use_container_width=True, hide_index=True)
+        st.markdown("### 🕒 최근 응답")
+        st.dataframe(pd.DataFrame(snap['recent']), use_container_width=True, hide_index=True)
+        st.caption(f"🔄 {LIVE_REFRESH_SEC}초마다 갱신 · 이번에 반영 {applied}건 ({poll_ms:.1f}ms)")
+
+    _live()
+
+# ===================== 이미지 에셋 인덱스 =====================
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+@st.cache_resource(max_entries=2)
+def get_asset_index(catalog_version):
+    """카탈로그 이름 → 이미지 경로/크기/해시 (카탈로그 버전당 한 번, 디스크에 저장해 재시작 시 재사용)"""
+    cache_path = os.path.join(os.environ.get("BLUEFOOD_DATA_DIR", APP_DIR), ".asset_index.json")
+    index = load_or_build_asset_index(APP_DIR, MENU_DATA, INGREDIENT_CATEGORIES, cache_path)
+    for kind, names in index.missing.items():
+        if names:
+            print(f"⚠️ 이미지 없음 ({kind}): {', '.join(names)}")
+    if index.orphans:
+        print(f"⚠️ 카탈로그에 없는 이미지: {', '.join(index.orphans)}")
+    return index
+
+def show_asset_report():
+    index = get_asset_index(CATALOG.version)
+    report = index.report()
+    n_missing = sum(len(v) for v in report['missing'].values())
+    with st.expander(f"🖼️ 이미지 점검 (누락 {n_missing} · 미사용 {len(report['orphans'])})"):
+        st.caption(f"수산물 {report['entries']['ingredient']}개 · 메뉴 {report['entries']['menu']}개 이미지 연결됨")
+        for kind, label in (('ingredient', '수산물'), ('menu', '메뉴')):
+            if report['missing'][kind]:
+                st.markdown(f"**{label} 이미지 없음:** {', '.join(report['missing'][kind])}")
+        if report['orphans']:
+            st.markdown(f"**카탈로그에 없는 파일:** {', '.join(report['orphans'])}")
+        if report['ignored']:
+            st.caption(f"무시한 파일: {', '.join(report['ignored'])}")
 
 # ===================== 화이트리스트 체크 (이름+소속) =====================
 
-@st.cache_data(ttl=300)
+WHITELIST_TTL_SEC = 300
+
+QUOTA_SHEET = "모집_목표"
+
+def _parse_quota(value):
+    """목표 인원 칸 → 양의 정수 (비어 있거나 0 이하면 None = 목표 없음)"""
+    try:
+        target = int(float(str(value).replace(',', '').strip()))
+    except ValueError:
+        return None
+    return target if target > 0 else None
+
+def _read_sheet_whitelist_pairs(sheet):
+    """'참여자_명단'(이름, 소속)과 '모집_목표'(소속, 목표 인원) 탭 → (명단 쌍 set, {소속: 목표})"""
+    pairs, quotas = set(), {}
+    workbook = sheet.spreadsheet
+    titles = [ws.title for ws in workbook.worksheets()]
+    if "참여자_명단" in titles:
+        w = workbook.worksheet("참여자_명단")
+        rows = w.get_all_values()
+        for r in rows[1:]:
+            if len(r) >= 2:
+                nm = str(r[0]).strip()
+                aff = str(r[1]).strip()
+                if nm and aff:
+                    pairs.add((nm, aff))
+    if QUOTA_SHEET in titles:
+        for r in workbook.worksheet(QUOTA_SHEET).get_all_values()[1:]:
+            if len(r) >= 2:
+                aff = str(r[0]).strip()
+                target = _parse_quota(r[1])
+                if aff and target:
+                    quotas[aff] = target
+    return pairs, quotas
+
+def _fetch_sheet_whitelist_pairs():
+    """Google Sheets 명단/모집 목표 읽기 → (명단 쌍, 목표). 연결/조회 실패(회로 차단 포함) 시 None"""
+    try:
+        sheet = get_google_sheet_cached()
+        if sheet is None:
+            return None
+        return google_call(_read_sheet_whitelist_pairs, sheet)
+    except Exception:
+        return None
+
+class WhitelistLoading(RuntimeError):
+    """첫 명단을 다른 곳(예열 스레드, 다른 프로세스)이 읽는 중이고 마지막 명단도 없음"""
+
+def _cached_pairs(store, key):
+    """kv에 [이름, 소속] 목록으로 둔 명단 → set (없으면 None)"""
+    cached = store.kv_get('cache', key)
+    return None if cached is None else {(nm, aff) for nm, aff in cached}
+
+def load_sheet_whitelist_pairs():
+    """참여자_명단 (서버 프로세스 공유 캐시 → 없으면 한 프로세스만 Sheets 조회)"""
+    store = get_response_store()
+    cached = _cached_pairs(store, 'whitelist')
+    if cached is not None:
+        return cached
+    # 다른 곳(예열 스레드, 다른 프로세스)이 이미 갱신 중이거나 Google 회로가 열려 있으면 마지막 명단 사용
+    last_good = _cached_pairs(store, 'whitelist_last_good')
+    if last_good is not None and not google_available():
+        return last_good
+    try:
+        # 화면 스레드는 잠금을 기다리지 않음 (첫 명단이 늦으면 "명단 불러오는 중" 안내)
+        with store.lock('whitelist-refresh', timeout=0):
+            cached = _cached_pairs(store, 'whitelist')
+            if cached is not None:
+                return cached
+            fetched = _fetch_sheet_whitelist_pairs()
+            if fetched is not None:
+                pairs, quotas = fetched
+                listed = sorted([nm, aff] for nm, aff in pairs)
+                store.kv_set('cache', 'whitelist', listed, ttl=WHITELIST_TTL_SEC)
+                store.kv_set('cache', 'whitelist_last_good', listed)
+                store.kv_set('cache', 'quota_targets', quotas)  # 명단과 같은 주기로 갱신, 실패 시 마지막 값 유지
+                return pairs
+            return last_good or set()
+    except LockTimeout:
+        if last_good is not None:
+            return last_good
+        raise WhitelistLoading()
+
+def whitelist_loading():
+    """예열 스레드가 아직 첫 명단을 읽기 전/중이고 공유 캐시에도 없음"""
+    if not start_warmup().is_running('whitelist'):
+        return False
+    store = get_response_store()
+    return _cached_pairs(store, 'whitelist') is None and _cached_pairs(store, 'whitelist_last_good') is None
+
+@st.cache_data(ttl=WHITELIST_TTL_SEC)
 def load_allowed_name_affil_pairs():
     pairs = set()
     try:
@@ -749,21 +1628,15 @@ def load_allowed_name_affil_pairs():
     except Exception:
         pass
     try:
-        sheet = get_google_sheet_cached()
-        if sheet is not None:
-            workbook = sheet.spreadsheet
-            titles = [ws.title for ws in workbook.worksheets()]
-            if "참여자_명단" in titles:
-                w = workbook.worksheet("참여자_명단")
-                rows = w.get_all_values()
-                for r in rows[1:]:
-                    if len(r) >= 2:
-                        nm = str(r[0]).strip()
-                        aff = str(r[1]).strip()
-                        if nm and aff:
-                            pairs.add((nm, aff))
+        pairs |= load_sheet_whitelist_pairs()
+    except WhitelistLoading:
+        raise  # 명단 없이 캐시하면 그동안 누구나 통과하므로 캐시하지 않음
     except Exception:
         pass
+    try:
+        publish_pairs(get_response_store(), pairs)  # 수집 서버(ingest_server.py)도 같은 명단으로 확인
+    except Exception:
+        traceback.print_exc()
     return pairs
 
 def is_valid_name_affil(name: str, affiliation: str) -> bool:
@@ -774,19 +1647,101 @@ def is_valid_name_affil(name: str, affiliation: str) -> bool:
         return True
     return (name.strip(), affiliation.strip()) in allowed
 
+# ===================== 모집 목표 (소속별 목표 인원) =====================
+
+@st.cache_data(ttl=WHITELIST_TTL_SEC)
+def load_quota_targets():
+    """{소속: 목표 인원}: secrets [quotas] + Google Sheets '모집_목표' 탭 (시트가 우선)"""
+    targets = {}
+    try:
+        for aff, value in dict(st.secrets.get("quotas", {})).items():
+            target = _parse_quota(value)
+            if str(aff).strip() and target:
+                targets[str(aff).strip()] = target
+    except Exception:
+        pass
+    try:
+        load_sheet_whitelist_pairs()  # 명단 캐시가 만료됐으면 목표도 함께 다시 읽음
+        targets.update(get_response_store().kv_get('cache', 'quota_targets', {}) or {})
+    except WhitelistLoading:
+        raise
+    except Exception:
+        pass
+    try:
+        publish_quotas(get_response_store(), targets)
+    except Exception:
+        traceback.print_exc()
+    return targets
+
+@st.cache_resource
+def _affiliation_counts_checked():
+    """카운터가 생기기 전 저장소면 프로세스당 한 번 전부 세어 둠"""
+    ensure_affiliation_counts(get_response_store())
+    return True
+
+def affiliation_quota_full(affiliation):
+    """목표 인원이 찬 소속인지 (카운터 한 칸만 읽음, 목표가 없으면 False)"""
+    affiliation = affiliation.strip()
+    target = load_quota_targets().get(affiliation)
+    if not target:
+        return False
+    try:
+        _affiliation_counts_checked()
+        return get_response_store().affiliation_counts([affiliation])[affiliation] >= target
+    except Exception:
+        traceback.print_exc()
+        return False  # 카운터를 못 읽으면 참여를 막지 않음
+
+def quota_progress_frame(targets, counts):
+    rows = []
+    for aff in sorted(set(targets) | {a for a, n in counts.items() if a and n}):
+        target, n = targets.get(aff), counts.get(aff, 0)
+        rows.append({'소속': aff, '응답': n, '목표': target,
+                     '달성률(%)': round(n / target * 100, 1) if target else None,
+                     '남은 인원': max(target - n, 0) if target else None,
+                     '상태': ("🔒 마감" if n >= target else "🟢 모집 중") if target else "목표 없음"})
+    return pd.DataFrame(rows, columns=['소속', '응답', '목표', '달성률(%)', '남은 인원', '상태'])
+
+@st.fragment(run_every=LIVE_REFRESH_SEC)
+def show_quota_progress():
+    """관리자: 소속별 모집 현황 (카운터만 읽어 LIVE_REFRESH_SEC마다 갱신)"""
+    st.markdown("### 🎯 소속별 모집 현황")
+    store = get_response_store()
+    try:
+        _affiliation_counts_checked()
+        counts = store.affiliation_counts()
+    except Exception as e:
+        st.caption(f"⚠️ 응답 수 카운터를 읽지 못했습니다: {e}")
+        return
+    try:
+        targets = load_quota_targets()
+    except WhitelistLoading:
+        st.caption("⏳ 참여자 명단/모집 목표를 불러오는 중입니다.")
+        return
+    table = quota_progress_frame(targets, counts)
+    if len(table) == 0:
+        st.info("아직 응답이 없고 모집 목표도 없습니다.")
+    else:
+        if targets:
+            done = sum(1 for aff, t in targets.items() if counts.get(aff, 0) >= t)
+            st.caption(f"목표 {len(targets)}곳 중 {done}곳 마감 · 목표는 '{QUOTA_SHEET}' 탭 또는 secrets [quotas]")
+        else:
+            st.caption(f"모집 목표가 없습니다. Google Sheets '{QUOTA_SHEET}' 탭(소속, 목표 인원)이나 secrets [quotas]에 "
+                       "넣으면 목표가 찬 소속은 정보 입력 단계에서 참여가 마감됩니다.")
+        st.dataframe(table, use_container_width=True, hide_index=True,
+                     column_config={'달성률(%)': st.column_config.ProgressColumn(min_value=0, max_value=100,
+                                                                               format="%.1f%%")})
+    if st.button("🔁 응답 저장소로 다시 세기", key="quota_rebuild",
+                 help="응답을 직접 지우거나 고친 뒤 카운터가 실제 응답 수와 다를 때"):
+        counts = store.rebuild_affiliation_counts()
+        st.toast(f"소속 {len(counts)}곳 응답 {sum(counts.values())}건으로 다시 셌습니다.")
+
 # ===================== 화면 1: 참여자 정보 입력 =====================
 
 def show_info_form():
-    st.markdown("<h1>블루푸드<br>선호도 조사</h1>", unsafe_allow_html=True)
+    render_html(templates.TITLE)
     st.markdown("## 1단계: 참여자 정보 입력")
-    st.markdown(
-        """
-        <p style="font-size:16px; line-height:1.5; color:#333;">
-        설문 참여를 위해 성함과 소속을 입력해주세요.
-        </p>
-        """,
-        unsafe_allow_html=True
-    )
+    render_html(templates.INFO_LEAD)
 
     with st.form("info_form"):
         name = st.text_input("성함", value=st.session_state.name, placeholder="홍길동", max_chars=20)
@@ -796,69 +1751,47 @@ def show_info_form():
         if submitted:
             if not name or not affiliation:
                 st.error("성함과 소속을 모두 입력해주세요.")
+            elif whitelist_loading():
+                st.info("⏳ 참여자 명단을 불러오는 중입니다. 잠시 후 다시 눌러주세요.")
             else:
-                if not is_valid_name_affil(name, affiliation):
+                try:
+                    valid = is_valid_name_affil(name, affiliation)
+                    full = valid and affiliation_quota_full(affiliation)
+                except WhitelistLoading:
+                    st.info("⏳ 참여자 명단을 불러오는 중입니다. 잠시 후 다시 눌러주세요.")
+                    return
+                if not valid:
                     st.error("❌ 등록되지 않은 성함/소속입니다. 담당자로부터 받은 정보를 입력해주세요.")
+                elif not (draft := load_draft(name, affiliation)) and full:
+                    # 진행 중이던 설문(임시저장)은 마감 후에도 끝낼 수 있음
+                    st.error("❌ 이 소속은 목표 인원이 모두 모여 참여가 마감되었습니다. 참여해 주셔서 감사합니다.")
                 else:
                     st.session_state.name = name
                     st.session_state.affiliation = affiliation
                     st.session_state.step = 'guide'
                     st.session_state.category_index = 0
+                    if draft:
+                        # 진행 중이던 설문 이어하기
+                        st.session_state.selected_ingredients = list(draft.get('selected_ingredients', []))
+                        st.session_state.selected_menus = dict(draft.get('selected_menus', {}))
+                        st.session_state.category_index = min(int(draft.get('category_index', 0)),
+                                                              TOTAL_CATEGORY_COUNT - 1)
+                        st.session_state.step = 'category_loop'
                     st.rerun()
 
 # ===================== 화면 1.5: 전체 가이드 =====================
 
 def show_overall_guide():
-    st.markdown("<h1>블루푸드<br>선호도 조사</h1>", unsafe_allow_html=True)
-    st.markdown("""
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 15px; margin-bottom: 30px; color: #fff; font-weight: 700; font-size: 20px; line-height: 1.4; display: flex; align-items: center; gap: 10px;">
-            <span style="font-size:24px;">📋</span><span>설문 안내</span>
-        </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown(
-        """
-        <h3 style="margin-top:0; color:#000000;">
-            <span style="font-size:20px;">🍯</span>&nbsp;2단계 진행 방법
-        </h3>
-        """,
-        unsafe_allow_html=True
-    )
-
-    st.markdown("""
-        <div style="background-color:#f0f2f6; padding:20px; border-radius:10px; margin-bottom:15px; border:1px solid #d5d8df; color:#000; font-size:16px; line-height:1.5;">
-            <div style="display:inline-block; background-color:#4c6ef5; color:#fff; font-weight:700; padding:4px 10px; border-radius:6px; font-size:14px; margin-bottom:10px;">1단계</div>
-            <div>아래 수산물(원재료) 중에서 <strong>좋아하시는 것</strong>을 <strong>모두 선택</strong>해주세요.<br>
-            <span style="font-size:14px; color:#444;">↘ 각 카테고리는 아무 것도 선택하지 않으셔도 됩니다.</span></div>
-        </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown("""
-        <div style="background-color:#f0f2f6; padding:20px; border-radius:10px; margin-bottom:20px; border:1px solid #d5d8df; color:#000; font-size:16px; line-height:1.5;">
-            <div style="display:inline-block; background-color:#764ba2; color:#fff; font-weight:700; padding:4px 10px; border-radius:6px; font-size:14px; margin-bottom:10px;">2단계</div>
-            <div>선택하신 재료가 있다면, <strong>각각에 대해 선호하시는 메뉴</strong>를 골라주세요.</div>
-        </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown("""
-        <div style="background-color:#fffeca; border:1px solid #ffec8a; color:#4a3b00; font-size:15px; font-weight:600; padding:14px 16px; border-radius:8px; line-height:1.4; margin-bottom:24px;">
-            ⚠ 전체 설문 기준으로는 <strong>최소 3개 이상</strong> 수산물을 선택해주세요.
-        </div>
-    """, unsafe_allow_html=True)
+    render_html(templates.TITLE)
+    render_html(templates.GUIDE_BANNER)
+    render_html(templates.GUIDE_HEADING)
+    render_html(templates.GUIDE_STEP_1)
+    render_html(templates.GUIDE_STEP_2)
+    render_html(templates.GUIDE_NOTE)
 
     st.markdown("---")
 
-    st.markdown("""
-        <style>
-        div.stButton > button {
-            width: 100% !important; font-size: 20px !important; padding: 18px 0 !important;
-            border-radius: 12px !important; font-weight: 700 !important; background-color:#0078FF !important; color:#fff !important; border:none !important;
-        }
-        @media (max-width: 768px) {
-            div.stButton { width:100% !important; display:flex !important; justify-content:center !important; }
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    render_html(templates.GUIDE_BUTTON_STYLE)
 
     if st.button("🚀 설문 시작하기", use_container_width=True, type="primary"):
         st.session_state.step = "category_loop"
@@ -871,17 +1804,11 @@ def show_category_step():
     idx = st.session_state.category_index
     cat_label, ing_list = INGREDIENT_CATEGORIES[idx]
 
-    st.markdown("<h1>블루푸드<br>선호도 조사</h1>", unsafe_allow_html=True)
+    render_html(templates.TITLE)
     st.markdown(f"## 2단계: {cat_label} 선호도 조사")
 
     st.markdown("### 🐟 선호 수산물 선택")
-    st.markdown(
-        """
-        <p>아래 수산물(원재료) 중에서 <strong>좋아하는 수산물</strong>을 모두 선택해주세요. 
-        좋아하는 재료가 없으시면 선택하지 않으셔도 됩니다.<br>
-        <strong>※ 단, 전체 설문 기준으로는 최소 3개 이상 수산물을 선택 부탁드립니다.</strong></p>
-        """,  unsafe_allow_html=True
-    )
+    render_html(templates.CATEGORY_LEAD)
 
     num_cols = 3
     cols = st.columns([1,1,1])
@@ -902,24 +1829,11 @@ def show_category_step():
                     st.session_state.selected_ingredients.append(ing_name)
                     if ing_name not in st.session_state.selected_menus:
                         st.session_state.selected_menus[ing_name] = []
+                track('toggle', detail=f"ing:{'-' if is_selected_globally else '+'}{ing_name}")
                 st.rerun()
 
     total_selected_count = len(st.session_state.selected_ingredients)
-    if total_selected_count < 3:
-        box_msg = f"현재까지 전체 선택 수산물: {total_selected_count}개 · 최소 3개 이상 선택 부탁드립니다."
-        box_style = "background-color:#fff3cd;border:1px solid #ffe69c;color:#664d03;"
-    else:
-        box_msg = f"현재까지 전체 선택 수산물: {total_selected_count}개"
-        box_style = "background-color:#d1e7dd;border:1px solid #badbcc;color:#0f5132;"
-
-    st.markdown(
-        f"""
-        <div style="{box_style} border-radius:8px; padding:12px 16px; font-size:16px; font-weight:500; margin:16px 0;">
-            {box_msg}
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    render_html(templates.total_selected_box(total_selected_count))
 
     st.markdown("---")
 
@@ -929,29 +1843,12 @@ def show_category_step():
 
     if picked_any_here:
         st.markdown("### 🐟 선호 메뉴 선택")
-        st.markdown(
-            """
-            <p style="font-size:15px; line-height:1.5; color:#333; margin-top:-8px;">
-            이 카테고리에서 선택하신 수산물이 있다면,<br>
-            각 수산물마다 좋아하시는 조리 메뉴를 골라주세요.<br>
-            <strong>각 수산물당 최소 1개 이상</strong> 선택 부탁드립니다.
-            </p>
-            """,
-            unsafe_allow_html=True
-        )
+        render_html(templates.MENU_LEAD)
 
         for ing_idx_local, ing_name in enumerate(chosen_ings_in_this_cat):
-            st.markdown(
-                f"""<h4 style="margin-top:16px; margin-bottom:12px; font-size:18px; font-weight:700; color:#000;">
-                    🍽️ {ing_name} 메뉴
-                </h4>""",
-                unsafe_allow_html=True
-            )
+            render_html(templates.menu_title(ing_name))
 
-            all_menus = []
-            if ing_name in MENU_DATA:
-                for menu_list in MENU_DATA[ing_name].values():
-                    all_menus.extend(menu_list)
+            all_menus = CATALOG.menus_for(ing_name)
 
             if ing_name not in st.session_state.selected_menus:
                 st.session_state.selected_menus[ing_name] = []
@@ -970,71 +1867,29 @@ def show_category_step():
                             st.session_state.selected_menus[ing_name].remove(menu_name)
                         else:
                             st.session_state.selected_menus[ing_name].append(menu_name)
+                        track('toggle', detail=f"menu:{'-' if is_menu_selected else '+'}{ing_name}|{menu_name}")
                         st.rerun()
 
             chosen_cnt = len(st.session_state.selected_menus.get(ing_name, []))
             if chosen_cnt == 0:
                 all_valid_this_cat = False
-                st.markdown(
-                    f"""
-                    <div style="background-color:#fff8cd; border:1px solid #ffe69c; color:#664d03;
-                                font-size:15px; font-weight:500; border-radius:8px; padding:10px 14px; margin:8px 0;">
-                        ⚠️ <strong>{ing_name}</strong>: 최소 1개 이상의 메뉴를 선택해주세요.
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
-            else:
-                st.markdown(
-                    f"""
-                    <div style="background-color:#d1e7dd; border:1px solid #badbcc; color:#0f5132;
-                                font-size:15px; font-weight:500; border-radius:8px; padding:10px 14px; margin:8px 0;">
-                        ✅ <strong>{ing_name}</strong>: {chosen_cnt}개 메뉴 선택됨
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
+            render_html(templates.menu_status_box(ing_name, chosen_cnt))
 
     st.markdown("### 📍선택한 식재료 및 메뉴")
     if len(chosen_ings_in_this_cat) == 0:
         st.info("아직 이 카테고리에서 선택하신 수산물이 없습니다.")
     else:
-        st.markdown(
-            f"""
-            <div style="border:1px solid #ddd; border-radius:8px; padding:12px 16px; margin-bottom:12px;
-                        font-size:15px; line-height:1.5;">
-                <div style="font-weight:600; margin-bottom:6px;">🐟 선택한 수산물:</div>
-                <div>{", ".join(chosen_ings_in_this_cat)}</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-
-        parts = []
-        for ing_name in chosen_ings_in_this_cat:
-            chosen_menu_list = st.session_state.selected_menus.get(ing_name, [])
-            if chosen_menu_list:
-                parts.append(f"<li><b>{ing_name}</b>: {', '.join(chosen_menu_list)}</li>")
-            else:
-                parts.append(f"<li><b>{ing_name}</b>: (메뉴 선택 없음)</li>")
-
-        st.markdown(
-            f"""
-            <div style="border:1px solid #ddd; border-radius:8px; padding:12px 16px; margin-bottom:20px;
-                        font-size:15px; line-height:1.5;">
-                <div style="font-weight:600; margin-bottom:6px;">🍽️ 선택한 메뉴:</div>
-                <ul style="margin-top:4px; margin-bottom:0; padding-left:20px;">
-                    {''.join(parts)}
-                </ul>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+        render_html(templates.selected_ingredients_summary(tuple(chosen_ings_in_this_cat)))
+        render_html(templates.selected_menus_summary(tuple(
+            (ing_name, tuple(st.session_state.selected_menus.get(ing_name, [])))
+            for ing_name in chosen_ings_in_this_cat
+        )))
 
     col_prev, col_mid, col_next = st.columns([1,1,1])
 
     with col_prev:
         if st.button("← 이전", use_container_width=True):
+            track('nav', detail='prev')
             if idx > 0:
                 st.session_state.category_index -= 1
             else:
@@ -1043,6 +1898,7 @@ def show_category_step():
 
     with col_mid:
         if st.button("초기화", use_container_width=True):
+            track('nav', detail='reset')
             for ing_name in ing_list:
                 if ing_name in st.session_state.selected_ingredients:
                     st.session_state.selected_ingredients.remove(ing_name)
@@ -1059,38 +1915,47 @@ def show_category_step():
         final_disabled = (not cat_ready) or (is_last_category and not global_ready)
 
         if st.button(next_btn_label, use_container_width=True, disabled=final_disabled):
+            track('nav', detail='submit' if is_last_category else 'next')
             if is_last_category:
-                filename, df = save_to_excel(
+                row = make_response_row(
+                    new_response_id(),
                     st.session_state.name,
                     st.session_state.affiliation,
+                    format_korean_time(),
                     st.session_state.selected_ingredients,
-                    st.session_state.selected_menus
+                    st.session_state.selected_menus,
+                    CATALOG.version
                 )
-                save_to_google_sheets(
-                    st.session_state.name,
-                    st.session_state.affiliation,
+                saved_locally = save_to_local_store(
+                    row,
                     st.session_state.selected_ingredients,
                     st.session_state.selected_menus
                 )
-                if filename is not None or st.session_state.get("google_sheets_success", False):
+                upload_with_admission(row, queued=saved_locally)
+                if saved_locally or st.session_state.get("google_sheets_success", False):
                     st.session_state.already_saved = True
-                    st.session_state.filename = filename
-                    st.session_state.survey_data = df
+                    clear_draft(st.session_state.name, st.session_state.affiliation)
                     st.session_state.step = 'complete'
                     st.rerun()
                 else:
                     st.error("❌ 설문 데이터 저장에 실패했습니다. 다시 시도해주세요.")
             else:
                 st.session_state.category_index += 1
+                save_draft()
                 st.rerun()
 
 # ===================== 화면 3: 완료 =====================
 
 def show_completion():
+    record_survey_payload()
     st.success("🎉 설문이 완료되었습니다! 감사합니다.")
 
     if st.session_state.google_sheets_success:
         st.success("✅ 데이터가 Google Sheets에 저장되었습니다!")
+    elif st.session_state.get("sheets_deferred", False):
+        st.info("⏳ 참여자가 많아 Google Sheets 저장은 잠시 뒤 자동으로 진행됩니다. 응답은 안전하게 저장되었습니다.")
+    elif st.session_state.get("sheets_offline", False):
+        st.info("⏳ 응답은 안전하게 저장되었습니다. Google Sheets 연결이 복구되면 자동으로 올라갑니다.")
     else:
         st.warning("⚠️ Google Sheets 연결에 문제가 있어 로컬 백업 파일에 저장되었습니다.")
 
@@ -1106,17 +1971,17 @@ def show_completion():
         if menus:
             st.markdown(f"**{ing_name}:** {', '.join(menus)}")
 
-    if st.session_state.is_admin and st.session_state.get("filename"):
-        if os.path.exists(st.session_state.filename):
-            with open(st.session_state.filename, 'rb') as file:
-                st.download_button(
-                    label="📥 백업 파일 다운로드 (관리자 전용)",
-                    data=file.read(),
-                    file_name=f"bluefood_survey_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                    type="primary",
-                    use_container_width=True
-                )
+    if st.session_state.is_admin:
+        store = get_response_store()
+        if store.count() > 0:
+            st.download_button(
+                label="📥 백업 파일 다운로드 (관리자 전용)",
+                data=export_responses_xlsx(store.version()),
+                file_name=f"bluefood_survey_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                type="primary",
+                use_container_width=True
+            )
 
     if st.button("🔄 새 설문 시작하기", use_container_width=True):
         admin_status = st.session_state.is_admin
@@ -1139,34 +2004,168 @@ def show_completion():
         st.session_state.category_index = 0
         st.rerun()
 
+# ===================== 설문 진행 기록 (퍼널 / 체류 시간) =====================
+
+@st.cache_resource
+def get_telemetry():
+    return TelemetryRecorder(get_response_store())
+
+def _current_page():
+    step = st.session_state.step
+    return step, (st.session_state.category_index if step == 'category_loop' else None)
+
+def track(kind, value=None, detail=None):
+    """현재 화면 기준 이벤트 1건 (관리자 세션은 기록하지 않음, 실패해도 설문은 계속)"""
+    if st.session_state.is_admin:
+        return
+    if 'telemetry_sid' not in st.session_state:
+        st.session_state.telemetry_sid = new_response_id()
+    try:
+        get_telemetry().record(st.session_state.telemetry_sid, kind, *_current_page(), value=value, detail=detail)
+    except Exception as e:
+        print(f"⚠️ 진행 기록 실패: {e}")
+
+def track_page():
+    """화면이 바뀌었으면 이전 화면 exit(머문 초) + 새 화면 enter"""
+    page = _current_page()
+    prev = st.session_state.get('telemetry_page')
+    if prev == page or st.session_state.is_admin:
+        return
+    now = time.time()
+    if prev is not None:
+        if 'telemetry_sid' in st.session_state:
+            get_telemetry().record(st.session_state.telemetry_sid, 'exit', *prev,
+                                   value=round(now - st.session_state.telemetry_entered, 2))
+    st.session_state.telemetry_page = page
+    st.session_state.telemetry_entered = now
+    track('enter')
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_telemetry_events():
+    events, _ = get_response_store().read_events()
+    return events_frame(events)
+
+def show_funnel():
+    st.markdown("### 📉 화면별 진행 / 이탈")
+    if st.button("🔄 새로 읽기", key="funnel_refresh"):
+        get_telemetry().flush()
+        load_telemetry_events.clear()
+    frame = load_telemetry_events()
+    m = get_telemetry().metrics()
+    st.caption(f"이벤트 {len(frame)}건 · 세션 {frame['session'].nunique()}개 · 이 서버 대기 {m['pending']}건"
+               + (f" · ⚠️ 저장 실패: {m['last_error']}" if m['last_error'] else ""))
+    if len(frame) == 0:
+        st.info("아직 진행 기록이 없습니다.")
+        return
+    labels = [label for label, _ in INGREDIENT_CATEGORIES]
+
+    funnel = funnel_table(frame, labels)
+    st.dataframe(funnel, use_container_width=True, hide_index=True)
+    try:
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots(figsize=(7, 3.5))
+        ax.bar(funnel['화면'], funnel['도달 세션'])
+        ax.set_ylabel("도달 세션")
+        plt.xticks(rotation=45, ha='right')
+        st.pyplot(fig)
+    except Exception:
+        pass
+
+    st.markdown("#### ⏱️ 화면별 머문 시간 (초)")
+    dwell, dwell_events = dwell_table(frame, labels)
+    st.dataframe(dwell, use_container_width=True)
+    if len(dwell):
+        page = st.selectbox("분포 보기", list(dwell.index), key="funnel_dwell_page")
+        values = dwell_events.loc[dwell_events['화면'] == page, 'value']
+        try:
+            import matplotlib.pyplot as plt
+            fig, ax = plt.subplots(figsize=(7, 3))
+            ax.hist(values.clip(upper=values.quantile(0.99)), bins=30)
+            ax.set_xlabel("머문 시간 (초, 상위 1% 제외)")
+            ax.set_ylabel("세션")
+            st.pyplot(fig)
+        except Exception:
+            pass
+
+    st.markdown("#### 🖥️ 화면별 서버 렌더링 시간 (ms)")
+    st.dataframe(render_table(frame, labels), use_container_width=True)
+
+    st.markdown("#### 👆 카테고리별 선택 조작")
+    st.dataframe(toggle_table(frame, labels), use_container_width=True, hide_index=True)
+    st.caption("※ 세션당 조작이 많고 머문 시간이 긴 카테고리는 항목 나누기(페이지) 후보입니다.")
+
+# ===================== 예열 =====================
+
+@st.cache_resource
+def start_warmup():
+    """서버 프로세스당 한 번: 무거운 초기화를 백그라운드에서 (화면은 기다리지 않음)"""
+    return (Warmup()
+            .add('font', setup_korean_font)
+            .add('store', get_response_store)
+            .add('asset_index', lambda: get_asset_index(CATALOG.version))
+            .add('google_auth', warm_google_sheet)
+            .add('whitelist', load_sheet_whitelist_pairs)
+            .add('roster', lambda: (load_allowed_name_affil_pairs(), load_quota_targets()))  # 수집 서버용 명단 공유
+            .start())
+
+def show_warmup_status(warmup):
+    labels = {'done': '✅', 'running': '⏳', 'pending': '…', 'failed': '⚠️'}
+    parts = []
+    for name, s in warmup.status().items():
+        sec = f" {s['seconds']:.1f}s" if s['seconds'] is not None else ""
+        parts.append(f"{labels.get(s['state'], '')}{name}{sec}")
+    first = f" · 첫 화면 {warmup.first_render_ms:.0f}ms" if warmup.first_render_ms is not None else ""
+    st.caption("🔥 예열: " + " · ".join(parts) + first)
+
+# ===================== 느린 rerun 프로파일링 =====================
+
+@st.cache_resource
+def get_rerun_profiler():
+    return RerunProfiler()
+
+def show_profiler_controls():
+    """관리자: 프로세스 전체 rerun 프로파일링 켜기/끄기, 느린 rerun 스택 파일 내려받기"""
+    profiler = get_rerun_profiler()
+
+    def _toggle():
+        profiler.enabled = st.session_state.profiler_enabled
+
+    def _threshold():
+        profiler.threshold_ms = st.session_state.profiler_threshold_ms
+
+    st.toggle("🩺 느린 화면 프로파일링", value=profiler.enabled, key="profiler_enabled", on_change=_toggle,
+              help="모든 참여자의 rerun을 표본 추출해 기준보다 느린 경우만 스택을 보관합니다")
+    if not profiler.enabled and not profiler.recent():
+        return
+    st.number_input("기준 (ms)", min_value=50, max_value=30000, step=50, value=int(profiler.threshold_ms),
+                    key="profiler_threshold_ms", on_change=_threshold)
+    m = profiler.metrics()
+    st.caption(f"🩺 측정한 rerun {m['profiled']}회 · 보관 {m['captured']}건 (최근 {m['keep']}건)")
+    captures = profiler.recent()
+    if not captures:
+        return
+    labels = [f"{c.at} · {c.step}#{c.category_index} · {c.duration_ms:.0f}ms · 표본 {c.samples}" for c in captures]
+    pick = st.selectbox("보관된 느린 rerun", range(len(captures)), format_func=labels.__getitem__,
+                        key="profiler_pick")
+    chosen = captures[pick]
+    st.download_button("⬇️ 스택 파일 (flamegraph)", data=chosen.folded().encode('utf-8'),
+                       file_name=chosen.filename(), mime="text/plain", use_container_width=True)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for c in captures:
+            zf.writestr(c.filename(), c.folded())
+    st.download_button("⬇️ 전체 받기 (ZIP)", data=buf.getvalue(), file_name="slow_reruns.zip",
+                       mime="application/zip", use_container_width=True)
+
 # ===================== 메인 =====================
 
 def main():
+    started = time.perf_counter()
+    warmup = start_warmup()
+    track_page()
+
     with st.sidebar:
-        st.markdown(
-            """
-            <div style="background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-                        padding: 16px; border-radius: 12px; margin-bottom: 16px; color: white;
-                        box-shadow: 0 4px 10px rgba(0,0,0,0.15); font-size:16px; line-height:1.4;">
-                <div style="font-size:18px;font-weight:700;text-align:center;margin-bottom:8px;">
-                    📌 연구 정보
-                </div>
-                <div style="background: rgba(255,255,255,0.15); padding:8px; border-radius:8px; margin-bottom:8px;">
-                    <strong>🔹 연구명</strong><br>
-                    요양원 거주 고령자 대상 건강 상태 및<br>블루푸드 식이 데이터베이스 구축
-                </div>
-                <div style="background: rgba(255,255,255,0.15); padding:8px; border-radius:8px; margin-bottom:8px;">
-                    <strong>🔹 정부과제명</strong><br>
-                    글로벌 블루푸드 미래리더 양성 프로젝트
-                </div>
-                <div style="background: rgba(255,255,255,0.15); padding:8px; border-radius:8px;">
-                    <strong>🔹 연구 담당자</strong><br>
-                    류혜리, 유정연<br>(서울대학교 농생명공학부 박사과정)
-                </div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+        render_html(templates.SIDEBAR_RESEARCH)
 
         st.markdown("---")
         if not st.session_state.is_admin:
@@ -1182,30 +2181,64 @@ def main():
                         st.error("잘못된 패스워드입니다.")
         else:
             st.success("🔐 관리자 모드")
-            backup_files = ["bluefood_survey.xlsx", "bluefood_survey_backup.xlsx"]
-            available_file = None
-            for file in backup_files:
-                if os.path.exists(file):
-                    available_file = file
-                    break
-    
-            if available_file:
-                with open(available_file, 'rb') as file:
-                    st.download_button(
-                        label="📥 전체 설문 데이터 다운로드",
-                        data=file.read(),
-                        file_name=f"bluefood_survey_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                        use_container_width=True
-                    )
-    
+
+            force_sync = st.button("🔄 Google Sheets 동기화", use_container_width=True)
+            sync_state = sync_with_google_sheets(force=force_sync)
+            if sync_state['last_error']:
+                st.caption(f"⚠️ 동기화 실패: {sync_state['last_error']}")
+            elif sync_state['last_result']:
+                r = sync_state['last_result']
+                st.caption(f"🔄 {r['at']} 동기화 · 가져옴 {r['pulled']}건 · 올림 {r['pushed']}건")
+            pending_cnt = len(get_response_store().get_meta('pending_upload', []))
+            if pending_cnt:
+                st.caption(f"⏳ Google Sheets 업로드 대기: {pending_cnt}건")
+            st.caption(f"🗄️ 저장소: {get_response_store().label}")
+            if store_schema_version(get_response_store()) < SCHEMA_VERSION:
+                st.caption("🧹 저장된 선택 항목이 예전 형식입니다. `python migrate_schema.py`로 한 번 변환하면 대시보드가 빨라집니다.")
+            adm = get_admission_controller().metrics()
+            st.caption(
+                f"🚦 제출 입장 제어 · 대기 {adm['queue_depth']}명(최대 {adm['max_queue_depth']}) · "
+                f"대기시간 p50 {adm['wait_p50']:.1f}s / p95 {adm['wait_p95']:.1f}s · "
+                f"로컬로 돌림 {adm['shed_queue_full'] + adm['shed_timeout']}건"
+            )
+            brk = get_google_breaker().metrics()
+            if brk['state'] == CLOSED:
+                st.caption(f"🔌 Google 연결 정상 · 최근 실패율 {brk['failure_rate'] * 100:.0f}%")
+            else:
+                st.caption(f"🔌 Google 연결 차단 중 — 로컬 저장소만 사용 · {brk['retry_in']:.0f}초 뒤 재시도 · "
+                           f"건너뛴 호출 {brk['rejected']}건 · 마지막 오류: {brk['last_error']}")
+            show_asset_report()
+            show_warmup_status(warmup)
+            show_report_jobs()
+            show_profiler_controls()
+            payloads = list(_html_payload_stats()['surveys'])
+            if payloads:
+                st.caption(f"📦 설문 1건당 HTML 전송량 평균 {sum(payloads) / len(payloads) / 1024:.1f}KB "
+                           f"(완료 {len(payloads)}건 기준)")
+
+            store = get_response_store()
+            live_mode = st.toggle("📡 실시간 모드", key="live_mode",
+                                  help="새 응답만 반영해 요약을 자동 갱신합니다 (전체 대시보드는 끄면 표시)")
+            if live_mode:
+                show_live_dashboard()
+                show_quota_progress()
+            elif store.count() > 0:
+                dataset_version = dataset_key(store.version())
+                st.download_button(
+                    label="📥 전체 설문 데이터 다운로드",
+                    data=export_responses_xlsx(store.version()),
+                    file_name=f"bluefood_survey_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                    mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                    use_container_width=True
+                )
+
                 try:
-                    df = pd.read_excel(available_file)
+                    df = store.read_frame()
                     st.markdown(f"**📊 총 응답 수: {len(df)}건**")
                     if '설문일시' in df.columns:
                         st.markdown(f"**📅 최근 응답: {df['설문일시'].max()}**")
     
-                    show_admin_dashboard(df)
+                    show_admin_dashboard(df, dataset_version)
                 except Exception:
                     st.markdown("**📊 데이터 로드 오류**")
             else:
@@ -1216,33 +2249,7 @@ def main():
                 st.rerun()
 
         current_cat_num = st.session_state.category_index + 1 if st.session_state.step == 'category_loop' else 0
-        st.markdown(
-            f"""
-            <div style="background:#ffffff; padding:16px; border-radius:12px; margin-bottom:16px; color:#333;
-                        font-size:16px; line-height:1.5; box-shadow:0 4px 10px rgba(0,0,0,0.1); border:1px solid #ddd;">
-                <div style="font-size:18px;font-weight:700;color:#0077b6;text-align:center;margin-bottom:8px;">
-                    📋 설문 안내
-                </div>
-                <p><strong>🎯 목적</strong><br>블루푸드 선호도 조사</p>
-                <p><strong>⏱️ 소요</strong><br>약 3-5분</p>
-                <p><strong>📝 설문 방식</strong><br>
-                    1️⃣ 참여자 정보 입력(성함/소속)<br>
-                    2️⃣ 카테고리별로<br>
-                    &nbsp;&nbsp;• 선호 수산물 선택 →<br>
-                    &nbsp;&nbsp;• 그 수산물 메뉴 선택<br>
-                    3️⃣ 완료
-                </p>
-                <p><strong>현재 진행 카테고리:</strong><br>
-                    {current_cat_num} / {TOTAL_CATEGORY_COUNT if TOTAL_CATEGORY_COUNT else '-'}
-                </p>
-                <p><strong>🔒 개인정보 보호</strong><br>
-                    수집된 정보는 연구 목적으로만 사용되며,<br>
-                    개인정보는 안전하게 보호됩니다.
-                </p>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+        render_html(templates.sidebar_guide(current_cat_num, TOTAL_CATEGORY_COUNT))
 
         st.markdown("### 📊 진행 상황")
         if st.session_state.step == 'info':
@@ -1263,5 +2270,9 @@ def main():
     elif st.session_state.step == 'complete':
         show_completion()
 
+    track('render', value=round((time.perf_counter() - started) * 1000, 1))
+    warmup.mark_first_render()
+
 if __name__ == "__main__":
-    main()
+    get_rerun_profiler().run(main, st.session_state.get('step'), st.session_state.get('category_index'),
+                             now=format_korean_time)
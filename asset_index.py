@@ -0,0 +1,178 @@
+"""카탈로그(MENU_DATA) ↔ 이미지 파일 정합성 인덱스
+
+시작할 때 한 번 images/ 를 훑어 수산물/메뉴 이름 → 경로, 크기(가로×세로), 내용 해시를
+만들고 JSON으로 저장합니다. 다음 시작 때는 폴더 수정시각과 카탈로그 해시가 같으면
+디렉터리를 다시 훑지 않고 JSON만 읽습니다. 조회는 dict 한 번(O(1))입니다.
+"""
+import hashlib
+import json
+import os
+import unicodedata
+
+ASSET_DIRS = {
+    'ingredient': os.path.join('images', 'ingredients'),
+    'menu': os.path.join('images', 'menus'),
+}
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+IGNORED_FILES = {'.DS_Store', 'Thumbs.db', 'desktop.ini'}
+INDEX_FORMAT = 1
+
+
+def _nfc(text):
+    return unicodedata.normalize('NFC', text)
+
+
+def catalog_names(menu_data, ingredient_categories):
+    ingredients = [ing for _, ings in ingredient_categories for ing in ings]
+    ingredients += [ing for ing in menu_data if ing not in ingredients]
+    menus = []
+    seen = set()
+    for methods in menu_data.values():
+        for menu_list in methods.values():
+            for m in menu_list:
+                if m not in seen:
+                    seen.add(m)
+                    menus.append(m)
+    return {'ingredient': ingredients, 'menu': menus}
+
+
+def catalog_hash(menu_data, ingredient_categories):
+    payload = json.dumps([menu_data, ingredient_categories], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _dir_signature(base_dir):
+    sig = {}
+    for kind, rel in ASSET_DIRS.items():
+        try:
+            sig[kind] = os.stat(os.path.join(base_dir, rel)).st_mtime_ns
+        except OSError:
+            sig[kind] = None
+    return sig
+
+
+def _image_size(path):
+    try:
+        from PIL import Image
+        with Image.open(path) as im:  # 헤더만 읽음
+            return im.size
+    except Exception:
+        return None, None
+
+
+def _file_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class AssetIndex:
+    def __init__(self, data):
+        self.data = data
+        self._entries = {kind: data['entries'].get(kind, {}) for kind in ASSET_DIRS}
+
+    def lookup(self, kind, name):
+        """{'path', 'width', 'height', 'hash', 'size', 'mtime_ns'} 또는 None"""
+        return self._entries[kind].get(name)
+
+    def path(self, kind, name):
+        entry = self._entries[kind].get(name)
+        return entry['path'] if entry else None
+
+    @property
+    def missing(self):
+        return self.data['missing']
+
+    @property
+    def orphans(self):
+        return self.data['orphans']
+
+    @property
+    def ignored(self):
+        return self.data['ignored']
+
+    def report(self):
+        return {
+            'entries': {kind: len(v) for kind, v in self._entries.items()},
+            'missing': self.missing,
+            'orphans': self.orphans,
+            'ignored': self.ignored,
+        }
+
+
+def build_asset_index(base_dir, menu_data, ingredient_categories, previous=None):
+    """이미지 폴더를 훑어 인덱스 생성 (previous가 있으면 크기/수정시각이 같은 파일은 해시 재사용)"""
+    prev_files = {}
+    if previous:
+        for kind_entries in previous.get('entries', {}).values():
+            for entry in kind_entries.values():
+                prev_files[entry['path']] = entry
+
+    names = catalog_names(menu_data, ingredient_categories)
+    entries, missing, orphans, ignored = {}, {}, [], []
+    for kind, rel in ASSET_DIRS.items():
+        wanted = set(names[kind])
+        found = {}
+        try:
+            listing = sorted(os.scandir(os.path.join(base_dir, rel)), key=lambda e: e.name)
+        except OSError:
+            listing = []
+        for de in listing:
+            rel_path = os.path.join(rel, de.name)
+            if de.name in IGNORED_FILES or de.name.startswith('.'):
+                ignored.append(rel_path)
+                continue
+            stem, ext = os.path.splitext(de.name)
+            stem = _nfc(stem)
+            if not de.is_file() or ext.lower() not in IMAGE_EXTENSIONS or stem not in wanted or stem in found:
+                orphans.append(rel_path)
+                continue
+            st_ = de.stat()
+            prev = prev_files.get(rel_path)
+            if prev and prev['size'] == st_.st_size and prev['mtime_ns'] == st_.st_mtime_ns:
+                found[stem] = prev
+                continue
+            width, height = _image_size(de.path)
+            found[stem] = {
+                'path': rel_path, 'width': width, 'height': height,
+                'hash': _file_hash(de.path), 'size': st_.st_size, 'mtime_ns': st_.st_mtime_ns,
+            }
+        entries[kind] = found
+        missing[kind] = [n for n in names[kind] if n not in found]
+
+    return {
+        'format': INDEX_FORMAT,
+        'catalog_hash': catalog_hash(menu_data, ingredient_categories),
+        'dir_signature': _dir_signature(base_dir),
+        'entries': entries,
+        'missing': missing,
+        'orphans': orphans,
+        'ignored': ignored,
+    }
+
+
+def load_or_build_asset_index(base_dir, menu_data, ingredient_categories, cache_path):
+    """저장된 인덱스가 현재 폴더/카탈로그와 맞으면 그대로, 아니면 다시 만들어 저장"""
+    previous = None
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    if (previous and previous.get('format') == INDEX_FORMAT
+            and previous.get('catalog_hash') == catalog_hash(menu_data, ingredient_categories)
+            and previous.get('dir_signature') == _dir_signature(base_dir)):
+        return AssetIndex(previous)
+
+    data = build_asset_index(base_dir, menu_data, ingredient_categories, previous=previous)
+    try:
+        tmp = cache_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        print(f"⚠️ 이미지 인덱스 저장 실패: {e}")
+    return AssetIndex(data)
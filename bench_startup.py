@@ -0,0 +1,72 @@
+"""콜드 스타트 벤치마크
+
+새 프로세스에서 app.py 첫 실행(첫 화면 렌더링)까지 걸린 시간, 백그라운드 예열 작업별
+시간, 예열 이후 두 번째 실행 시간을 잽니다. Streamlit의 AppTest로 실행합니다.
+
+    python bench_startup.py --runs 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def child():
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import warmup
+
+    at = AppTest.from_file(os.path.join(APP_DIR, "app.py"), default_timeout=120)
+    t1 = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - t1
+
+    w = warmup.LAST_STARTED
+    if w is not None:
+        w.join(timeout=120)
+    t2 = time.perf_counter()
+    at.run()
+    warm_run = time.perf_counter() - t2
+
+    print(json.dumps({
+        'import_apptest_s': t1 - t0,
+        'first_request_s': first_run,
+        'warm_request_s': warm_run,
+        'first_render_ms': w.first_render_ms if w else None,
+        'warmup_total_s': (w.finished_at - w.started_at) if w and w.finished_at else None,
+        'warmup_tasks_s': {k: v['seconds'] for k, v in w.status().items()} if w else {},
+        'exceptions': [str(e.value) for e in at.exception],
+    }, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    results = []
+    for i in range(args.runs):
+        out = subprocess.run([sys.executable, __file__, "--child"], capture_output=True, text=True, cwd=os.getcwd())
+        line = [l for l in out.stdout.splitlines() if l.startswith("{")]
+        if not line:
+            print(out.stderr[-2000:], file=sys.stderr)
+            sys.exit(1)
+        r = json.loads(line[-1])
+        results.append(r)
+        print(f"[{i + 1}] 첫 요청 {r['first_request_s'] * 1000:.0f}ms · 예열 후 {r['warm_request_s'] * 1000:.0f}ms"
+              f" · 예열 {r['warmup_total_s'] or 0:.2f}s {r['warmup_tasks_s']}")
+
+    firsts = sorted(r['first_request_s'] for r in results)
+    print(f"첫 요청 중앙값: {firsts[len(firsts) // 2] * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""종이 설문 일괄 가져오기 (CSV / XLSX)
+
+코디네이터가 입력한 스프레드시트를 청크 단위로 읽어 카탈로그로 검증하고,
+(이름, 소속) 기준으로 중복을 걸러 청크마다 저장소에 묶음(트랜잭션) 단위로 기록합니다.
+파일이 여러 개면 파일별 파싱/검증을 프로세스 풀에서 동시에 돌리고, 워커는 검증한 청크를
+크기가 정해진 큐로 바로 넘기므로 메모리에는 CHUNK_ROWS × (워커 수 × 3) 행 정도만 머뭅니다.
+
+필요한 열: 이름, 소속, 선택한_메뉴 (선택: 선택한_수산물, 설문일시, 응답ID)
+- 선택한_수산물: JSON 목록 또는 "김, 굴" (비어 있으면 메뉴의 수산물로 채움)
+- 선택한_메뉴:  JSON 객체 또는 "김: 김밥, 김무침; 굴: 굴전" (';' '/' 줄바꿈으로 수산물 구분)
+
+    python bulk_import.py paper_a.xlsx paper_b.csv [--store-url URL] [--report rejected.csv]
+"""
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from catalog import load_catalog, record_catalog_version
+from storage import default_store_url, make_response_row, open_store
+
+CHUNK_ROWS = 5000
+COMMIT_BATCH = 2000
+REQUIRED_COLUMNS = ('이름', '소속', '선택한_메뉴')
+KST = timezone(timedelta(hours=9))
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+_ITEM_SPLIT = re.compile(r'\s*[,，、]\s*')
+_GROUP_SPLIT = re.compile(r'\s*(?:;|/|\n)\s*')
+
+
+def person_key(name, affiliation):
+    return f"{str(name).strip()}\x1f{str(affiliation).strip()}"
+
+
+def paper_response_id(name, affiliation):
+    """(이름, 소속)이 같으면 같은 ID → 같은 파일을 다시 가져와도 저장소에서 한 번 더 걸러짐"""
+    return 'paper-' + hashlib.sha1(person_key(name, affiliation).encode('utf-8')).hexdigest()[:20]
+
+
+# ---- 셀 파싱 ----
+
+def parse_ingredients(cell):
+    text = '' if cell is None else str(cell).strip()
+    if not text:
+        return []
+    if text.startswith('['):
+        value = json.loads(text)
+        if not isinstance(value, list):
+            raise ValueError("선택한_수산물 JSON이 목록이 아닙니다")
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v for v in _ITEM_SPLIT.split(text) if v]
+
+
+def parse_menus(cell):
+    text = '' if cell is None else str(cell).strip()
+    if not text:
+        return {}
+    if text.startswith('{'):
+        value = json.loads(text)
+        if not isinstance(value, dict):
+            raise ValueError("선택한_메뉴 JSON이 객체가 아닙니다")
+        return {str(k).strip(): [str(m).strip() for m in (v if isinstance(v, list) else [v]) if str(m).strip()]
+                for k, v in value.items()}
+    menus = {}
+    for group in _GROUP_SPLIT.split(text):
+        if not group:
+            continue
+        if ':' not in group:
+            raise ValueError(f"'수산물: 메뉴, 메뉴' 형식이 아닙니다: {group}")
+        ing, items = group.split(':', 1)
+        menus.setdefault(ing.strip(), []).extend(v for v in _ITEM_SPLIT.split(items.strip()) if v)
+    return menus
+
+
+def _clean_time(value):
+    if value is None or str(value).strip() == '':
+        return datetime.now(KST).strftime(TIME_FORMAT)
+    if isinstance(value, datetime):
+        return value.strftime(TIME_FORMAT)
+    text = str(value).strip()
+    for fmt in (TIME_FORMAT, '%Y-%m-%d %H:%M', '%Y-%m-%d', '%Y.%m.%d'):
+        try:
+            return datetime.strptime(text, fmt).strftime(TIME_FORMAT)
+        except ValueError:
+            pass
+    raise ValueError(f"설문일시 형식 오류: {text}")
+
+
+def convert_record(record, catalog):
+    """시트 1행(dict) → (저장할 행, None) 또는 (None, 거부 사유). 현재 카탈로그로 검증하고 그 버전을 기록"""
+    name = str(record.get('이름') or '').strip()
+    affiliation = str(record.get('소속') or '').strip()
+    if not name or not affiliation:
+        return None, "이름/소속 누락"
+    try:
+        menus = parse_menus(record.get('선택한_메뉴'))
+        ingredients = parse_ingredients(record.get('선택한_수산물')) or list(menus)
+        submitted_at = _clean_time(record.get('설문일시'))
+    except ValueError as e:
+        return None, str(e)
+    if not ingredients:
+        return None, "선택한 수산물이 없습니다"
+    problems = catalog.validate_selection(ingredients, menus)
+    if problems:
+        return None, "; ".join(problems)
+    rid = str(record.get('응답ID') or '').strip() or paper_response_id(name, affiliation)
+    return make_response_row(rid, name, affiliation, submitted_at, ingredients, menus, catalog.version), None
+
+
+# ---- 파일 읽기 (청크) ----
+
+def _detect_encoding(path):
+    with open(path, 'rb') as f:
+        head = f.read(1 << 16)
+    for enc in ('utf-8-sig', 'cp949'):
+        try:
+            head.decode(enc)
+            return enc
+        except UnicodeDecodeError as e:
+            if enc == 'utf-8-sig' and e.start >= len(head) - 3:
+                return enc  # 청크 경계에서 잘린 멀티바이트 문자
+    return 'utf-8-sig'
+
+
+def _iter_csv_chunks(path, chunk_rows):
+    with open(path, encoding=_detect_encoding(path), newline='') as f:
+        reader = csv.DictReader(f)
+        yield list(reader.fieldnames or [])
+        chunk = []
+        for record in reader:
+            chunk.append(record)
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _iter_xlsx_chunks(path, chunk_rows):
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else '' for h in next(rows, [])]
+        yield header
+        chunk = []
+        for values in rows:
+            if values is None or all(v is None for v in values):
+                continue
+            chunk.append(dict(zip(header, values)))
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        wb.close()
+
+
+def iter_chunks(path, chunk_rows=CHUNK_ROWS):
+    """첫 값은 헤더, 이후 행 dict 목록"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.xlsx', '.xlsm'):
+        return _iter_xlsx_chunks(path, chunk_rows)
+    if ext in ('.csv', '.txt'):
+        return _iter_csv_chunks(path, chunk_rows)
+    raise ValueError(f"지원하지 않는 파일 형식: {path}")
+
+
+def parse_file(path, chunk_rows=CHUNK_ROWS):
+    """파일 하나를 청크마다 파싱/검증 → (파일 이름, 행 목록, 거부 목록, 읽은 행 수) 반복자"""
+    name = os.path.basename(path)
+    try:
+        catalog = load_catalog()
+        chunks = iter_chunks(path, chunk_rows)
+        header = next(chunks)
+        missing = [c for c in REQUIRED_COLUMNS if c not in header]
+        if missing:
+            yield name, [], [{'file': name, 'row': 1, 'reason': f"필수 열 없음: {', '.join(missing)}"}], 0
+            return
+        line = 1
+        for chunk in chunks:
+            rows, rejected = [], []
+            for record in chunk:
+                line += 1
+                row, reason = convert_record(record, catalog)
+                if row is None:
+                    rejected.append({'file': name, 'row': line, 'reason': reason})
+                else:
+                    row['_line'] = line
+                    rows.append(row)
+            yield name, rows, rejected, len(chunk)
+    except Exception as e:
+        yield name, [], [{'file': name, 'row': None, 'reason': f"파일을 읽을 수 없습니다: {e}"}], 0
+
+
+# ---- 워커 프로세스 (검증한 청크를 큐로 넘김) ----
+
+_chunk_queue = None
+_chunk_rows = CHUNK_ROWS
+
+
+def _init_worker(chunk_queue, chunk_rows):
+    global _chunk_queue, _chunk_rows
+    _chunk_queue, _chunk_rows = chunk_queue, chunk_rows
+
+
+def _parse_into_queue(path):
+    try:
+        for chunk in parse_file(path, _chunk_rows):
+            _chunk_queue.put(chunk)
+    finally:
+        _chunk_queue.put(None)  # 파일 끝
+
+
+def _parsed_chunks(paths, workers, chunk_rows):
+    """모든 파일의 검증된 청크 (여러 파일이면 워커에서 끝나는 대로)"""
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield from parse_file(path, chunk_rows)
+        return
+    workers = min(workers, len(paths))
+    methods = multiprocessing.get_all_start_methods()
+    # HTTP 수집 서버(스레드 사용)에서도 부르므로 fork 대신 새 인터프리터
+    ctx = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    chunk_queue = ctx.Queue(maxsize=2 * workers)  # 저장이 밀리면 워커가 기다림
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(chunk_queue, chunk_rows)) as pool:
+        futures = [pool.submit(_parse_into_queue, path) for path in paths]
+        remaining = len(paths)
+        try:
+            while remaining:
+                try:
+                    chunk = chunk_queue.get(timeout=1)
+                except queue.Empty:
+                    for future in futures:
+                        if future.done() and future.exception() is not None:
+                            raise future.exception()  # 워커 프로세스가 죽음
+                    continue
+                if chunk is None:
+                    remaining -= 1
+                else:
+                    yield chunk
+        finally:
+            if remaining:
+                # 저장 중 오류로 멈춘 경우: 남은 파일은 취소하고, 큐에 막힌 워커가 끝나도록 비워 줌
+                for future in futures:
+                    future.cancel()
+                while not all(future.done() for future in futures):
+                    try:
+                        chunk_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+
+
+# ---- 저장 ----
+
+def import_files(store, paths, queue_upload=True, workers=None, batch_size=COMMIT_BATCH,
+                 chunk_rows=CHUNK_ROWS):
+    """여러 파일 가져오기. 결과 요약 dict"""
+    t0 = time.perf_counter()
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+
+    frame = store.read_frame()
+    seen = {person_key(n, a) for n, a in zip(frame['이름'], frame['소속'])}
+    del frame
+    rejected, duplicates = [], []
+    total = imported = 0
+    for name, rows, chunk_rejected, n in _parsed_chunks(paths, workers, chunk_rows):
+        total += n
+        rejected.extend(chunk_rejected)
+        fresh = []
+        for row in rows:
+            key = person_key(row['이름'], row['소속'])
+            line = row.pop('_line')
+            if key in seen:
+                duplicates.append({'file': name, 'row': line, 'reason': "이미 있는 (이름, 소속)"})
+                continue
+            seen.add(key)
+            fresh.append(row)
+        for start in range(0, len(fresh), batch_size):
+            imported += len(store.append_rows(fresh[start:start + batch_size], queue_upload=queue_upload))
+    if imported:
+        record_catalog_version(store, load_catalog())
+
+    return {
+        'files': len(paths),
+        'rows': total,
+        'imported': imported,
+        'duplicates': duplicates,
+        'rejected': rejected,
+        'seconds': round(time.perf_counter() - t0, 2),
+    }
+
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['file', 'row', 'reason'])
+        writer.writeheader()
+        writer.writerows(report['rejected'] + report['duplicates'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="종이 설문 CSV/XLSX 일괄 가져오기")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--store-url', default=None, help="기본값: BLUEFOOD_STORE_URL 또는 BLUEFOOD_DATA_DIR의 SQLite")
+    parser.add_argument('--report', default=None, help="거부/중복 행을 기록할 CSV 경로")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--no-sheets', action='store_true', help="Google Sheets 업로드 대기열에 올리지 않음")
+    args = parser.parse_args()
+
+    store = open_store(args.store_url or default_store_url())
+    report = import_files(store, args.files, queue_upload=not args.no_sheets, workers=args.workers)
+    print(f"📥 {report['files']}개 파일 {report['rows']}행 → 저장 {report['imported']}건, "
+          f"중복 {len(report['duplicates'])}건, 거부 {len(report['rejected'])}건 ({report['seconds']}s)")
+    if args.report:
+        write_report(report, args.report)
+        print(f"📝 {args.report}")
+
+
+if __name__ == "__main__":
+    main()
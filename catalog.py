@@ -0,0 +1,208 @@
+"""설문 카탈로그 (수산물 카테고리, 수산물별 조리법/메뉴)
+
+카탈로그 내용은 menu_catalog.json에 있고, 이 모듈이 읽어서 조회용 인덱스를 만든 Catalog로
+컴파일합니다. 파일 수정시각이 바뀌면 다음 load_catalog() 호출 때 다시 읽으므로
+메뉴를 고쳐도 서버를 다시 시작할 필요가 없습니다 (고친 파일이 잘못됐으면 이전 카탈로그 유지).
+
+Catalog.version은 내용 해시라 같은 내용이면 어느 서버에서나 같고, 응답마다
+'카탈로그버전'으로 저장되어 카탈로그가 바뀐 뒤에도 응답자가 실제로 본 메뉴 기준으로 집계합니다.
+
+Streamlit 앱, 오프라인 설문 클라이언트(offline_client.py), 수집 서버(ingest_server.py),
+일괄 가져오기(bulk_import.py)가 모두 이 모듈 하나를 기준으로 합니다.
+
+    python catalog.py          # menu_catalog.json 검사 + 이미지 누락 보고
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_FORMAT = 1
+
+
+def catalog_path():
+    return os.environ.get("BLUEFOOD_CATALOG_FILE") or os.path.join(APP_DIR, "menu_catalog.json")
+
+
+class Catalog:
+    """menu_data: {수산물: {조리법: [메뉴]}}, categories: [(카테고리, [수산물])]"""
+
+    def __init__(self, menu_data, categories, version):
+        self.menu_data = menu_data
+        self.categories = categories
+        self.version = version
+        self.ingredients = [ing for _, ings in categories for ing in ings]
+        self.menus_by_ingredient = {ing: [m for menus in methods.values() for m in menus]
+                                    for ing, methods in menu_data.items()}
+        self.method_of = {(ing, m): method for ing, methods in menu_data.items()
+                          for method, menus in methods.items() for m in menus}
+        self._ingredient_set = set(menu_data)
+        self._menu_sets = {ing: set(menus) for ing, menus in self.menus_by_ingredient.items()}
+
+    @classmethod
+    def from_history(cls, version, menus_by_ingredient):
+        """저장소에 기록된 예전 버전(수산물 → 메뉴 목록)으로 만든 검증용 카탈로그 (조리법/카테고리 없음)"""
+        menu_data = {ing: {'': list(menus)} for ing, menus in menus_by_ingredient.items()}
+        return cls(menu_data, [('', list(menu_data))], version)
+
+    def menus_for(self, ingredient):
+        return self.menus_by_ingredient.get(ingredient, [])
+
+    def validate_selection(self, selected_ingredients, selected_menus):
+        """카탈로그에 없는 수산물/메뉴, 선택하지 않은 수산물의 메뉴를 찾아 문제 목록으로 돌려준다"""
+        problems = []
+        if not isinstance(selected_ingredients, list) or not isinstance(selected_menus, dict):
+            return ["선택한_수산물은 목록, 선택한_메뉴는 {수산물: [메뉴]} 형식이어야 합니다"]
+        for ing in selected_ingredients:
+            if ing not in self._ingredient_set:
+                problems.append(f"알 수 없는 수산물: {ing}")
+        for ing, menus in selected_menus.items():
+            if ing not in selected_ingredients:
+                problems.append(f"선택하지 않은 수산물의 메뉴: {ing}")
+                continue
+            if not isinstance(menus, list):
+                problems.append(f"{ing} 메뉴가 목록이 아닙니다")
+                continue
+            for m in menus:
+                if m not in self._menu_sets.get(ing, ()):
+                    problems.append(f"{ing}에 없는 메뉴: {m}")
+        return problems
+
+
+# ---- 컴파일 ----
+
+def compile_catalog(raw):
+    """menu_catalog.json 내용(dict) → Catalog. 구조가 잘못됐으면 ValueError (문제를 모두 모아서)"""
+    if not isinstance(raw, dict) or raw.get('format') != CATALOG_FORMAT:
+        raise ValueError(f"format {CATALOG_FORMAT}인 카탈로그 객체가 아닙니다")
+    problems = []
+    categories = []
+    for entry in raw.get('categories') or []:
+        label, ings = entry.get('label'), entry.get('ingredients')
+        if not label or not isinstance(ings, list) or not ings:
+            problems.append(f"카테고리 형식 오류: {entry}")
+            continue
+        categories.append((label, list(ings)))
+    menu_data = raw.get('menus')
+    if not isinstance(menu_data, dict) or not menu_data:
+        raise ValueError("menus가 비어 있거나 객체가 아닙니다")
+
+    seen_ing = Counter(ing for _, ings in categories for ing in ings)
+    problems += [f"여러 카테고리에 있는 수산물: {ing}" for ing, n in seen_ing.items() if n > 1]
+    problems += [f"메뉴가 없는 수산물: {ing}" for ing in seen_ing if ing not in menu_data]
+    problems += [f"카테고리에 없는 수산물(설문에 안 보임): {ing}" for ing in menu_data if ing not in seen_ing]
+    for ing, methods in menu_data.items():
+        if not isinstance(methods, dict) or not methods:
+            problems.append(f"{ing}: 조리법 객체가 비어 있습니다")
+            continue
+        names = []
+        for method, menus in methods.items():
+            if not isinstance(menus, list) or not menus or not all(isinstance(m, str) and m.strip() for m in menus):
+                problems.append(f"{ing}/{method}: 메뉴 목록 형식 오류")
+                continue
+            names += menus
+        problems += [f"{ing}: 중복 메뉴 {m}" for m, n in Counter(names).items() if n > 1]
+    if problems:
+        raise ValueError("; ".join(problems))
+
+    payload = json.dumps([menu_data, categories], ensure_ascii=False, sort_keys=True)
+    version = hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+    return Catalog(menu_data, categories, version)
+
+
+# ---- 불러오기 (수정시각 기준 핫 리로드) ----
+
+_lock = threading.Lock()
+_loaded = {}  # 경로 → (파일 서명, Catalog 또는 None, 오류)
+
+
+def load_catalog(path=None):
+    """현재 카탈로그. 파일이 바뀌었을 때만 다시 컴파일 (호출 비용은 평소 stat 한 번)"""
+    path = path or catalog_path()
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _loaded.get(path)
+    if cached and cached[0] == signature:
+        if cached[1] is None:
+            raise ValueError(cached[2])
+        return cached[1]
+    with _lock:
+        cached = _loaded.get(path)
+        if cached and cached[0] == signature and cached[1] is not None:
+            return cached[1]
+        previous = cached[1] if cached else None
+        try:
+            with open(path, encoding='utf-8') as f:
+                catalog = compile_catalog(json.load(f))
+        except ValueError as e:
+            if previous is None:
+                _loaded[path] = (signature, None, f"카탈로그 오류 ({path}): {e}")
+                raise ValueError(_loaded[path][2]) from e
+            # 고치는 도중 저장된 파일 등: 이전 카탈로그로 계속 (같은 서명이면 다시 읽지 않음)
+            print(f"⚠️ 카탈로그를 다시 읽지 못해 이전 버전({previous.version}) 유지: {e}")
+            _loaded[path] = (signature, previous, None)
+            return previous
+        if previous is not None and previous.version != catalog.version:
+            print(f"🔄 카탈로그 다시 읽음: {previous.version} → {catalog.version}")
+        _loaded[path] = (signature, catalog, None)
+        return catalog
+
+
+# ---- 카탈로그 변경에 따른 노출 수 ----
+
+CATALOG_HISTORY_KEY = 'catalog_versions'
+_recorded = set()
+
+
+def record_catalog_version(store, catalog):
+    """응답에 찍는 카탈로그 버전의 수산물 → 메뉴 목록을 저장소 메타에 한 번 남김"""
+    key = (id(store), catalog.version)
+    if key in _recorded:
+        return
+    if catalog.version not in (store.get_meta(CATALOG_HISTORY_KEY, {}) or {}):
+        with store.lock('catalog-history', timeout=10, lease=30):
+            history = store.get_meta(CATALOG_HISTORY_KEY, {}) or {}
+            if catalog.version not in history:
+                history[catalog.version] = catalog.menus_by_ingredient
+                store.set_meta(CATALOG_HISTORY_KEY, history)
+    _recorded.add(key)
+
+
+def exposure_counts(version_counts, history):
+    """응답자가 실제로 본 카탈로그 기준 항목별 노출 응답자 수
+
+    version_counts: {카탈로그버전: 응답 수} ('' 또는 기록에 없는 버전은 모든 항목에 노출로 봄)
+    history: {카탈로그버전: {수산물: [메뉴]}}
+    → (수산물 Counter, 메뉴 Counter, 모든 항목 공통 노출 수)
+    """
+    ingredients, menus = Counter(), Counter()
+    everywhere = 0
+    for version, n in version_counts.items():
+        shown = history.get(version)
+        if shown is None:
+            everywhere += n
+            continue
+        for ing in shown:
+            ingredients[ing] += n
+        for m in {m for ing_menus in shown.values() for m in ing_menus}:
+            menus[m] += n
+    return ingredients, menus, everywhere
+
+
+def asset_coverage(catalog, base_dir=APP_DIR):
+    """이미지 누락 {'ingredient': [...], 'menu': [...]} (이미지 인덱스 기준)"""
+    from asset_index import load_or_build_asset_index
+    index = load_or_build_asset_index(base_dir, catalog.menu_data, catalog.categories,
+                                      os.path.join(base_dir, ".asset_index.json"))
+    return index.missing
+
+
+if __name__ == "__main__":
+    current = load_catalog()
+    print(f"✅ {catalog_path()} · 버전 {current.version} · 수산물 {len(current.ingredients)}개 · "
+          f"메뉴 {len(current.method_of)}개")
+    for kind, names in asset_coverage(current).items():
+        if names:
+            print(f"⚠️ 이미지 없음 ({kind}): {', '.join(names)}")
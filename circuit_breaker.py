@@ -0,0 +1,143 @@
+"""Google 백엔드 호출용 서킷 브레이커
+
+최근 호출(window개)의 실패율이 failure_rate 이상이면 회로를 열어(open) 한동안 Google을
+부르지 않고 바로 CircuitOpen을 냅니다. 그동안 앱은 로컬 저장소와 마지막 명단으로만 동작하고
+(degraded), open_seconds가 지나면 호출 하나만 시험(half-open)으로 통과시켜 성공하면 다시
+닫고, 실패하면 대기 시간을 두 배로 늘려(최대 max_open_seconds) 다시 엽니다.
+
+- 예외뿐 아니라 slow_call_sec보다 오래 걸린 호출도 실패로 셉니다 (응답은 돌려줌)
+- clock을 주입할 수 있어 가짜 시계로 결정적으로 시험할 수 있습니다 (admission.py와 같은 방식)
+"""
+import threading
+import time
+from collections import deque
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpen(Exception):
+    """회로가 열려 있어 호출하지 않음"""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_rate=0.5, window=10, min_calls=3, open_seconds=30.0, max_open_seconds=300.0,
+                 slow_call_sec=None, clock=time.monotonic, on_state_change=None):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.slow_call_sec = slow_call_sec
+        self.clock = clock
+        self.on_state_change = on_state_change  # (이전 상태, 새 상태) — 잠금 밖에서 호출
+        self._lock = threading.Lock()
+        self._results = deque(maxlen=window)  # True = 실패
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._open_for = open_seconds
+        self._probing = False
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.last_error = None
+
+    @property
+    def state(self):
+        return self._state
+
+    def available(self):
+        """지금 호출하면 통과할지 (상태를 바꾸지 않음)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                return self.clock() >= self._opened_at + self._open_for
+            return not self._probing
+
+    def retry_in(self):
+        """열려 있을 때 다음 시험 호출까지 남은 초"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._open_for - self.clock())
+
+    def _acquire(self):
+        """호출 허가. (허가 여부, 상태 변화)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True, None
+            if self._state == OPEN and self.clock() >= self._opened_at + self._open_for:
+                self._state = HALF_OPEN
+                self._probing = True
+                return True, (OPEN, HALF_OPEN)
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True, None
+            self.rejected += 1
+            return False, None
+
+    def _record(self, failed, error=None):
+        with self._lock:
+            before = self._state
+            self.calls += 1
+            if failed:
+                self.failures += 1
+                self.last_error = error
+            if self._state == HALF_OPEN:
+                self._probing = False
+                if failed:
+                    self._open(backoff=True)
+                else:
+                    self._state = CLOSED
+                    self._open_for = self.open_seconds
+                    self._results.clear()
+            else:
+                self._results.append(failed)
+                if (self._state == CLOSED and len(self._results) >= self.min_calls
+                        and sum(self._results) / len(self._results) >= self.failure_rate):
+                    self._open(backoff=False)
+            after = self._state
+        return (before, after) if before != after else None
+
+    def _open(self, backoff):
+        if backoff:
+            self._open_for = min(self.max_open_seconds, self._open_for * 2)
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self._results.clear()
+
+    def _notify(self, change):
+        if change and self.on_state_change is not None:
+            try:
+                self.on_state_change(*change)
+            except Exception as e:
+                print(f"⚠️ 서킷 브레이커 상태 알림 실패: {e}")
+
+    def call(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs). 회로가 열려 있으면 부르지 않고 CircuitOpen"""
+        allowed, change = self._acquire()
+        self._notify(change)
+        if not allowed:
+            raise CircuitOpen(f"Google 연결 차단 중 ({self.retry_in():.0f}초 뒤 재시도)")
+        t0 = self.clock()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._notify(self._record(True, f"{type(e).__name__}: {e}"))
+            raise
+        seconds = self.clock() - t0
+        slow = self.slow_call_sec is not None and seconds > self.slow_call_sec
+        self._notify(self._record(slow, f"느린 응답 {seconds:.1f}s" if slow else None))
+        return result
+
+    def metrics(self):
+        with self._lock:
+            recent = list(self._results)
+        return {
+            'state': self._state,
+            'failure_rate': sum(recent) / len(recent) if recent else 0.0,
+            'calls': self.calls,
+            'failures': self.failures,
+            'rejected': self.rejected,
+            'retry_in': self.retry_in(),
+            'last_error': self.last_error,
+        }
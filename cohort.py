@@ -0,0 +1,111 @@
+"""두 응답자 집단의 항목별 선택률 비교 (카이제곱 / Fisher 정확 검정 + FDR)
+
+집단은 응답자×항목 행렬(incidence.py)의 행 마스크입니다. 집단별 선택 수는 마스크 벡터와
+행렬의 곱 한 번이고, 항목마다 2×2 표 [[A 선택, A 미선택], [B 선택, B 미선택]]의 검정을
+배열 연산으로 한꺼번에 계산합니다.
+
+- 기대도수가 모두 MIN_EXPECTED 이상이면 Yates 보정 카이제곱(자유도 1),
+  아니면 Fisher 정확 검정(양측). Fisher는 해당 항목에만 돌립니다.
+- 항목 수만큼 검정하므로 Benjamini–Hochberg로 q값(FDR)을 함께 냅니다.
+"""
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+MIN_EXPECTED = 5
+DEFAULT_ALPHA = 0.05
+
+
+# ---- 집단 마스크 ----
+
+def affiliation_mask(incidence, affiliations):
+    return np.isin(incidence.affiliations.astype(str), list(affiliations))
+
+
+def time_mask(incidence, start=None, end=None):
+    """설문일시 문자열 start 이상 end 미만 (예: '2025-03-01', '2025-03-08'). 일시가 없는 응답은 제외"""
+    times = pd.Series(incidence.submitted_at, dtype=object).fillna('').astype(str).to_numpy()
+    mask = times != ''
+    if start:
+        mask &= times >= start
+    if end:
+        mask &= times < end
+    return mask
+
+
+def ingredient_mask(incidence, ingredients):
+    """주어진 수산물 중 하나라도 고른 응답자"""
+    labels = incidence.ingredient_labels
+    cols = [labels.index(ing) for ing in ingredients if ing in labels]
+    if not cols:
+        return np.zeros(incidence.n_respondents, dtype=bool)
+    return np.asarray(incidence.ingredients[:, cols].sum(axis=1)).ravel() > 0
+
+
+# ---- 검정 ----
+
+def bh_qvalues(pvalues):
+    """Benjamini–Hochberg 보정 q값 (입력 순서 그대로)"""
+    p = np.asarray(pvalues, dtype=np.float64)
+    m = len(p)
+    if m == 0:
+        return p
+    order = np.argsort(p)
+    ranked = p[order] * m / np.arange(1, m + 1)
+    q = np.minimum.accumulate(ranked[::-1])[::-1]
+    out = np.empty(m)
+    out[order] = np.minimum(q, 1.0)
+    return out
+
+
+def two_by_two_tests(a, n_a, b, n_b, min_expected=MIN_EXPECTED):
+    """항목별 (p값, Fisher 사용 여부). a, b: 집단별 선택 수 배열"""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    n = n_a + n_b
+    chosen = a + b
+    table = np.stack([a, n_a - a, b, n_b - b], axis=1)
+    expected = np.stack([chosen * n_a, (n - chosen) * n_a, chosen * n_b, (n - chosen) * n_b], axis=1) / max(n, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        diff = np.maximum(np.abs(table - expected) - 0.5, 0)  # Yates 보정
+        chi2 = np.where(expected > 0, diff ** 2 / expected, 0.0).sum(axis=1)
+    pvalues = stats.chi2.sf(chi2, 1)
+    small = expected.min(axis=1) < min_expected
+    for i in np.flatnonzero(small):
+        pvalues[i] = stats.fisher_exact([[a[i], n_a - a[i]], [b[i], n_b - b[i]]])[1]
+    return pvalues, small
+
+
+def compare_cohorts(incidence, mask_a, mask_b, kind='menu', alpha=DEFAULT_ALPHA, exclude=()):
+    """항목별 비교표 (p값 오름차순). 두 집단 모두 아무도 고르지 않은 항목과 exclude는 뺌"""
+    matrix = incidence.matrix(kind)
+    labels = incidence.labels(kind)
+    mask_a = np.asarray(mask_a, dtype=bool)
+    mask_b = np.asarray(mask_b, dtype=bool)
+    n_a, n_b = int(mask_a.sum()), int(mask_b.sum())
+    a = np.asarray(mask_a.astype(np.float64) @ matrix).ravel()
+    b = np.asarray(mask_b.astype(np.float64) @ matrix).ravel()
+
+    keep = (a + b > 0) & ~np.isin(np.asarray(labels, dtype=object), list(exclude))
+    a, b = a[keep], b[keep]
+    names = [label for label, k in zip(labels, keep) if k]
+    if n_a == 0 or n_b == 0 or len(names) == 0:
+        return pd.DataFrame(columns=['항목', 'A 선택', 'A 선택률(%)', 'B 선택', 'B 선택률(%)', '차이(%p)',
+                                     '검정', 'p', 'q (FDR)', '유의']), n_a, n_b
+
+    pvalues, small = two_by_two_tests(a, n_a, b, n_b)
+    qvalues = bh_qvalues(pvalues)
+    rate_a, rate_b = a / n_a * 100, b / n_b * 100
+    table = pd.DataFrame({
+        '항목': names,
+        'A 선택': a.astype(int),
+        'A 선택률(%)': rate_a.round(1),
+        'B 선택': b.astype(int),
+        'B 선택률(%)': rate_b.round(1),
+        '차이(%p)': (rate_a - rate_b).round(1),
+        '검정': np.where(small, 'Fisher', 'χ²'),
+        'p': pvalues,
+        'q (FDR)': qvalues,
+        '유의': qvalues < alpha,
+    })
+    return table.sort_values(['p', '항목'], kind='stable').reset_index(drop=True), n_a, n_b
@@ -0,0 +1,298 @@
+"""소속(기관)별 결과 묶음 생성 작업 큐
+
+데이터 버전마다 한 번: 집계 큐브(AggregateCube) 스냅샷과 개인별 선택 표를 받아
+소속마다 다중 시트 XLSX + PNG 차트를 만들어 소속별 ZIP으로 묶습니다.
+
+- 작업은 백그라운드 스레드 하나가 순서대로 처리하고, 소속별 생성은 프로세스 풀에서 동시에
+  (큐브는 initializer로 워커마다 한 번만 전달, 개인별 표는 해당 소속 몫만 작업 인자로)
+- 결과는 reports/<데이터 버전>/ 에 저장되어 같은 버전이면 다시 만들지 않음 (최근 KEEP_VERSIONS개 유지)
+- 화면은 job.progress()만 읽고 기다리지 않음
+"""
+import io
+import json
+import multiprocessing
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+CHART_TOP_N = 15
+KEEP_VERSIONS = 2
+MANIFEST_FILE = "manifest.json"
+BUNDLE_FILE = "전체_소속별_결과.zip"
+
+_WORKER = {}  # 워커 프로세스: {'cube', 'version', 'font_path'} (initializer로 한 번만 전달)
+
+
+def safe_filename(name):
+    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]', '_', str(name)).strip(' .')
+    return name or '_'
+
+
+def _version_dirname(version):
+    return safe_filename(str(version).replace('@', '_'))
+
+
+# ---- 소속 1곳 결과 (워커 프로세스) ----
+
+def facility_frames(cube, affiliation, people):
+    """시트 이름 → DataFrame"""
+    n = cube.respondents.get(affiliation, 0)
+    total = cube.total_respondents
+
+    def with_rates(frame, keys, overall):
+        frame['선택률(%)'] = (frame['선택 수'] / max(n, 1) * 100).round(1)
+        frame['전체 선택률(%)'] = [round(overall.get(tuple(k), 0) / max(total, 1) * 100, 1)
+                                for k in frame[list(keys)].itertuples(index=False)]
+        return frame
+
+    ing_keys = ('카테고리', '수산물')
+    menu_keys = ('수산물', '조리법', '메뉴')
+    ingredients = with_rates(cube.to_frame(ing_keys, {'소속': affiliation}), ing_keys, cube.rollup(ing_keys))
+    menus = with_rates(cube.to_frame(menu_keys, {'소속': affiliation}), menu_keys, cube.rollup(menu_keys))
+    methods = cube.to_frame(('조리법',), {'소속': affiliation})
+    summary = pd.DataFrame([
+        ('소속', affiliation),
+        ('응답자 수', n),
+        ('전체 응답자 수', total),
+        ('선택된 수산물 종류', len(ingredients)),
+        ('선택된 메뉴 종류', len(menus)),
+        ('데이터 버전', _WORKER.get('version', '')),
+    ], columns=['항목', '값'])
+    return {
+        '요약': summary,
+        '식재료 순위': ingredients,
+        '메뉴 순위': menus,
+        '조리법별': methods,
+        '개인별 선택': people,
+    }
+
+
+def _chart_png(frame, label_col, title):
+    # pyplot 전역 상태를 쓰지 않는 Figure (단일 프로세스 모드에서 앱 스레드와 함께 돌아도 안전)
+    from matplotlib.figure import Figure
+
+    head = frame.head(CHART_TOP_N).iloc[::-1]
+    fig = Figure(figsize=(7, max(3, 0.35 * len(head) + 1)))
+    ax = fig.subplots()
+    ax.barh(head[label_col], head['선택 수'])
+    ax.set_title(title)
+    ax.set_xlabel("선택 수")
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=120)
+    return buf.getvalue()
+
+
+def build_facility_pack(affiliation, people, out_dir, name):
+    """소속 1곳 ZIP 생성 (XLSX + PNG). 만든 파일 경로"""
+    cube = _WORKER['cube']
+    frames = facility_frames(cube, affiliation, people)
+
+    xlsx = io.BytesIO()
+    with pd.ExcelWriter(xlsx, engine='openpyxl') as writer:
+        for sheet, frame in frames.items():
+            frame.to_excel(writer, sheet_name=sheet, index=False)
+
+    path = os.path.join(out_dir, f"{name}.zip")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{name}_결과.xlsx", xlsx.getvalue())
+        if len(frames['식재료 순위']):
+            zf.writestr("식재료_순위.png", _chart_png(frames['식재료 순위'], '수산물', f"{affiliation} 식재료 Top"))
+        if len(frames['메뉴 순위']):
+            zf.writestr("메뉴_순위.png", _chart_png(frames['메뉴 순위'], '메뉴', f"{affiliation} 메뉴 Top"))
+    os.replace(tmp, path)
+    return path
+
+
+def _init_worker(cube, version, font_path):
+    _WORKER.update(cube=cube, version=version, font_path=font_path)
+    if font_path and os.path.exists(font_path):
+        import matplotlib
+        import matplotlib.font_manager as fm
+        fm.fontManager.addfont(font_path)
+        matplotlib.rcParams['font.family'] = fm.FontProperties(fname=font_path).get_name()
+        matplotlib.rcParams['axes.unicode_minus'] = False
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    # 스트림릿 서버는 스레드가 많아 fork가 안전하지 않으므로 새 인터프리터에서 시작
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+# ---- 작업 / 큐 ----
+
+class ReportJob:
+    def __init__(self, version, affiliations, out_dir):
+        self.version = version
+        self.affiliations = affiliations
+        self.out_dir = out_dir
+        self.state = 'queued'  # queued → running → done / failed
+        self.done = 0
+        self.error = None
+        self.paths = {}
+        self.bundle = None
+        self.started_at = None
+        self.seconds = None
+
+    @property
+    def total(self):
+        return len(self.affiliations)
+
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+
+class ReportJobQueue:
+    """프로세스 공용 (st.cache_resource). 같은 데이터 버전 작업은 한 번만"""
+
+    def __init__(self, root, workers=None, font_path=None):
+        self.root = root
+        self.workers = workers or os.cpu_count() or 1
+        self.font_path = font_path
+        self._jobs = {}
+        self._latest = None
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="bluefood-reports", daemon=True)
+        self._thread.start()
+
+    def latest(self):
+        return self._latest
+
+    def submit(self, version, cube, per_person_df):
+        """cube: 이 작업 전용 스냅샷 (다른 스레드가 고치지 않는 객체)"""
+        with self._lock:
+            job = self._jobs.get(version)
+            if job is not None and job.state != 'failed':
+                self._latest = job
+                return job
+            out_dir = os.path.join(self.root, _version_dirname(version))
+            job = ReportJob(version, cube.affiliations(), out_dir)
+            if self._load_cached(job):
+                job.state = 'done'
+            else:
+                self._queue.put((job, cube, per_person_df))
+            self._jobs[version] = job
+            self._latest = job
+            return job
+
+    def _load_cached(self, job):
+        try:
+            with open(os.path.join(job.out_dir, MANIFEST_FILE), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        paths = {aff: os.path.join(job.out_dir, name) for aff, name in manifest.get('files', {}).items()}
+        if manifest.get('version') != job.version or not all(os.path.exists(p) for p in paths.values()):
+            return False
+        job.paths = paths
+        job.bundle = os.path.join(job.out_dir, BUNDLE_FILE)
+        job.done = job.total
+        job.seconds = manifest.get('seconds')
+        return True
+
+    def _run(self):
+        while True:
+            job, cube, per_person_df = self._queue.get()
+            job.state = 'running'
+            job.started_at = time.time()
+            t0 = time.perf_counter()
+            try:
+                self._generate(job, cube, per_person_df)
+                job.seconds = round(time.perf_counter() - t0, 1)
+                self._write_manifest(job)
+                self._prune()
+                job.state = 'done'
+            except Exception as e:
+                job.error = str(e)
+                job.state = 'failed'
+                print(f"⚠️ 소속별 결과 생성 실패 ({job.version}): {e}")
+
+    def _generate(self, job, cube, per_person_df):
+        os.makedirs(job.out_dir, exist_ok=True)
+        people = _split_people(per_person_df)
+        tasks = [(aff, people.get(aff, _EMPTY_PEOPLE), job.out_dir, name)
+                 for aff, name in _unique_names(job.affiliations).items()]
+        initargs = (cube, job.version, self.font_path)
+        pending = tasks
+        if self.workers > 1 and len(tasks) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks)), mp_context=_pool_context(),
+                                         initializer=_init_worker, initargs=initargs) as pool:
+                    futures = {pool.submit(build_facility_pack, *t): t[0] for t in tasks}
+                    for future in as_completed(futures):
+                        job.paths[futures[future]] = future.result()
+                        job.done += 1
+                pending = []
+            except Exception as e:
+                print(f"⚠️ 소속별 결과 병렬 생성 실패, 단일 프로세스로 계속: {e}")
+                pending = [t for t in tasks if t[0] not in job.paths]
+        if pending:
+            _init_worker(*initargs)
+            for t in pending:
+                job.paths[t[0]] = build_facility_pack(*t)
+                job.done += 1
+
+        bundle = os.path.join(job.out_dir, BUNDLE_FILE)
+        with zipfile.ZipFile(bundle + ".tmp", 'w', zipfile.ZIP_STORED) as zf:  # 안의 ZIP은 이미 압축됨
+            for aff in job.affiliations:
+                zf.write(job.paths[aff], os.path.basename(job.paths[aff]))
+        os.replace(bundle + ".tmp", bundle)
+        job.bundle = bundle
+
+    def _write_manifest(self, job):
+        manifest = {
+            'version': job.version,
+            'files': {aff: os.path.basename(p) for aff, p in job.paths.items()},
+            'seconds': job.seconds,
+            'created_at': job.started_at,
+        }
+        with open(os.path.join(job.out_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+    def _prune(self):
+        """최근 KEEP_VERSIONS개 버전의 결과만 남김"""
+        try:
+            dirs = [e for e in os.scandir(self.root) if e.is_dir()]
+        except OSError:
+            return
+        dirs.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for old in dirs[KEEP_VERSIONS:]:
+            shutil.rmtree(old.path, ignore_errors=True)
+
+
+_EMPTY_PEOPLE = pd.DataFrame(columns=['이름', '수산물', '메뉴'])
+
+
+def _unique_names(affiliations):
+    """소속 → 파일 이름 (특수문자를 바꾼 뒤 겹치면 -2, -3 …)"""
+    names, used = {}, set()
+    for aff in affiliations:
+        base = name = safe_filename(aff)
+        i = 1
+        while name.lower() in used:
+            i += 1
+            name = f"{base}-{i}"
+        used.add(name.lower())
+        names[aff] = name
+    return names
+
+
+def _split_people(per_person_df):
+    """개인별 선택 표 → 소속(큐브와 같은 정규화) → 해당 소속 표"""
+    if per_person_df is None or len(per_person_df) == 0:
+        return {}
+    from aggregate_cube import UNKNOWN_LABEL
+    keys = per_person_df['소속'].map(lambda a: (str(a).strip() if a is not None and not pd.isna(a) else '')
+                                     or UNKNOWN_LABEL)
+    columns = [c for c in ('이름', '수산물', '메뉴') if c in per_person_df.columns]
+    return {aff: group[columns].reset_index(drop=True) for aff, group in per_person_df.groupby(keys, sort=False)}
@@ -0,0 +1,90 @@
+"""응답자 × 항목(수산물/메뉴) 0/1 희소 행렬
+
+랭킹 불확실성, 메뉴 구성 최적화, 유사도, 영양 프로파일, 집단 비교가 모두 같은 행렬을
+쓰므로 데이터 버전당 한 번만 만듭니다.
+"""
+import numpy as np
+import scipy.sparse as sp
+
+from asset_index import catalog_names
+
+
+def catalog_orders(menu_data, ingredient_categories):
+    """카탈로그 순서의 (수산물 목록, 메뉴 목록), 메뉴 → 수산물들, 메뉴 → 조리법"""
+    names = catalog_names(menu_data, ingredient_categories)
+    menu_ingredients, menu_methods = {}, {}
+    for ing, methods in menu_data.items():
+        for method, menu_list in methods.items():
+            for m in menu_list:
+                menu_ingredients.setdefault(m, []).append(ing)
+                menu_methods.setdefault(m, method)
+    return names['ingredient'], names['menu'], menu_ingredients, menu_methods
+
+
+def _binary_csr(rows, n_rows, labels):
+    """rows: 행마다 항목 이름 집합 → (csr, 최종 라벨 목록). 카탈로그에 없는 항목은 뒤에 붙인다"""
+    pos = {label: i for i, label in enumerate(labels)}
+    labels = list(labels)
+    indptr, indices = [0], []
+    for items in rows:
+        cols = set()
+        for it in items:
+            j = pos.get(it)
+            if j is None:
+                j = pos[it] = len(labels)
+                labels.append(it)
+            cols.add(j)
+        indices.extend(sorted(cols))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.uint8)
+    mat = sp.csr_matrix((data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+                        shape=(n_rows, len(labels)))
+    return mat, labels
+
+
+class Incidence:
+    """ingredients: n×I, menus: n×M (uint8 CSR). affiliations: 행별 소속 배열"""
+
+    def __init__(self, affiliations, ingredient_matrix, ingredient_labels, menu_matrix, menu_labels,
+                 response_ids=None, submitted_at=None):
+        self.affiliations = np.asarray(affiliations, dtype=object)
+        self.ingredients = ingredient_matrix
+        self.ingredient_labels = ingredient_labels
+        self.menus = menu_matrix
+        self.menu_labels = menu_labels
+        self.response_ids = np.asarray(response_ids if response_ids is not None else [], dtype=object)
+        self.submitted_at = np.asarray(submitted_at if submitted_at is not None else [], dtype=object)
+
+    @property
+    def n_respondents(self):
+        return self.ingredients.shape[0]
+
+    def matrix(self, kind):
+        return self.ingredients if kind == 'ingredient' else self.menus
+
+    def labels(self, kind):
+        return self.ingredient_labels if kind == 'ingredient' else self.menu_labels
+
+    def rows_for_affiliation(self, affiliation):
+        return np.flatnonzero(self.affiliations == affiliation)
+
+
+def build_incidence(records, menu_data, ingredient_categories):
+    """records: (소속, 선택한_수산물 list, 선택한_메뉴 dict[, 응답ID, 설문일시]) 반복자"""
+    ingredient_order, menu_order, _, _ = catalog_orders(menu_data, ingredient_categories)
+    affs, ing_rows, menu_rows, ids, times = [], [], [], [], []
+    for rec in records:
+        aff, ings, menus_map = rec[0], rec[1], rec[2]
+        affs.append(aff)
+        ids.append(rec[3] if len(rec) > 3 else None)
+        times.append(rec[4] if len(rec) > 4 else None)
+        ing_rows.append([i for i in ings if i])
+        chosen = []
+        for menus in menus_map.values():
+            if isinstance(menus, list):
+                chosen.extend(m for m in menus if m)
+        menu_rows.append(chosen)
+    n = len(affs)
+    ing_mat, ing_labels = _binary_csr(ing_rows, n, ingredient_order)
+    menu_mat, menu_labels = _binary_csr(menu_rows, n, menu_order)
+    return Incidence(affs, ing_mat, ing_labels, menu_mat, menu_labels, ids, times)
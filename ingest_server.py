@@ -0,0 +1,284 @@
+"""오프라인 설문 클라이언트용 수집 서버 (표준 라이브러리 http.server)
+
+- GET  /                  → bluefood_survey.html (시작할 때 catalog.py로 다시 생성)
+- GET  /sw.js, /images/…  → 서비스 워커, 이미지 (그 외 파일은 내보내지 않음)
+- POST /api/responses     → {"responses": [응답, ...]} 를 Streamlit 앱과 같은 저장소에 기록
+- POST /api/import?filename=종이설문.xlsx → CSV/XLSX 본문 일괄 가져오기 (bulk_import.py)
+  BLUEFOOD_IMPORT_TOKEN 환경변수를 설정했을 때만 열리며 "Authorization: Bearer <토큰>" 필요
+- GET  /api/health        → 저장소 상태
+
+응답은 응답ID로 중복 제거되므로 클라이언트가 같은 묶음을 다시 보내도 안전합니다.
+선택 항목은 응답자가 본 카탈로그 버전(저장소 메타의 카탈로그 기록)으로 검증하고, 거부한 응답도
+저장소 kv('quarantine')에 원본 그대로 격리해 두므로 클라이언트는 대기열에서 지워도 됩니다.
+저장된 응답은 Google Sheets 업로드 대기열에 올라가 Streamlit 앱의 동기화 작업이 올립니다.
+참여자 명단(이름+소속)과 소속별 모집 마감은 Streamlit 앱이 저장소에 올려 둔 명단으로 앱과 똑같이
+확인합니다(roster.py). 앱이 아직 명단을 올리지 않았으면 503으로 답해 클라이언트가 대기열에 남겨 둡니다.
+
+    python ingest_server.py --port 8502 [--store-url sqlite:///data/bluefood_survey.db]
+"""
+import argparse
+import hmac
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, timedelta, timezone
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from bulk_import import import_files
+from catalog import CATALOG_HISTORY_KEY, Catalog, load_catalog, record_catalog_version
+from migrate_schema import quarantine
+from offline_client import APP_DIR, CLIENT_FILE, SERVICE_WORKER_FILE, build_offline_client
+from roster import load_roster
+from storage import default_store_url, ensure_affiliation_counts, make_response_row, new_response_id, open_store
+
+KST = timezone(timedelta(hours=9))
+MAX_BODY_BYTES = 2 * 1024 * 1024
+MAX_BATCH = 500
+RESPONSE_ID_RE = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+CATALOG_VERSION_RE = re.compile(r'^[0-9a-f]{12}$')
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+STATIC_PREFIXES = ('/images/',)
+MAX_IMPORT_BYTES = 200 * 1024 * 1024
+IMPORT_EXTENSIONS = ('.csv', '.txt', '.xlsx', '.xlsm')
+REPORT_LIMIT = 1000
+
+
+class RosterUnavailable(RuntimeError):
+    pass
+
+
+def _clean_time(value):
+    """클라이언트가 기록한 설문일시 (형식이 맞지 않으면 서버 시각)"""
+    try:
+        return datetime.strptime(str(value), TIME_FORMAT).strftime(TIME_FORMAT)
+    except (TypeError, ValueError):
+        return datetime.now(KST).strftime(TIME_FORMAT)
+
+
+def parse_submission(item, catalog, history=None):
+    """클라이언트 응답 1건 → (저장할 행, None) 또는 (None, 거부 사유)
+
+    클라이언트가 받아 간 카탈로그버전이 history({버전: {수산물: [메뉴]}})에 있으면 그 버전으로,
+    없으면 현재 카탈로그로 검증. 카탈로그버전은 클라이언트 값을 그대로 기록
+    """
+    if not isinstance(item, dict):
+        return None, "객체 형식이 아닙니다"
+    rid = str(item.get('응답ID', '')).strip()
+    if not RESPONSE_ID_RE.match(rid):
+        return None, "응답ID 형식 오류"
+    name = str(item.get('이름', '')).strip()
+    affiliation = str(item.get('소속', '')).strip()
+    if not name or not affiliation:
+        return None, "이름/소속 누락"
+    ingredients = item.get('선택한_수산물')
+    menus = item.get('선택한_메뉴')
+    version = str(item.get('카탈로그버전') or '')
+    version = version if CATALOG_VERSION_RE.match(version) else catalog.version
+    if version != catalog.version and version in (history or {}):
+        catalog = Catalog.from_history(version, history[version])
+    problems = catalog.validate_selection(ingredients, menus)
+    if problems:
+        return None, "; ".join(problems)
+    return make_response_row(rid, name, affiliation, _clean_time(item.get('설문일시')), ingredients, menus,
+                             version), None
+
+
+def ingest(store, items):
+    """{'accepted': [...], 'duplicate': [...], 'rejected': [{'응답ID', 'reason'}]}
+
+    명단에 없는 이름/소속과 목표 인원이 찬 소속은 저장하기 전에 거부. 명단이 없으면 RosterUnavailable
+    """
+    roster = load_roster(store)
+    if roster is None:
+        raise RosterUnavailable("Streamlit 앱이 아직 참여자 명단을 저장소에 올리지 않았습니다")
+    catalog = load_catalog()
+    history = store.get_meta(CATALOG_HISTORY_KEY, {}) or {}
+    quota_full = roster.quota_checker(store)
+    rows, rejected, bad = [], [], []
+    for item in items:
+        row, reason = parse_submission(item, catalog, history)
+        if row is not None and not roster.allows(row['이름'], row['소속']):
+            row, reason = None, "등록되지 않은 성함/소속"
+        elif row is not None and quota_full(row['소속'], row['응답ID']):
+            row, reason = None, "목표 인원이 찬 소속 (모집 마감)"
+        if row is None:
+            rid = item.get('응답ID') if isinstance(item, dict) else None
+            rejected.append({'응답ID': rid, 'reason': reason})
+            original = item if isinstance(item, dict) else {'원본': item}
+            key = str(rid) if RESPONSE_ID_RE.match(str(rid)) else f"ingest-{new_response_id()}"
+            bad.append(({**original, '응답ID': key}, f"수집 서버 거부: {reason}"))
+        else:
+            rows.append(row)
+    quarantine(store, bad)  # 클라이언트는 거부된 응답을 지우므로 원본은 서버에 남김
+    added = set(store.append_rows(rows, queue_upload=True)) if rows else set()
+    if added:
+        record_catalog_version(store, catalog)
+    accepted, duplicate = [], []
+    for r in rows:
+        rid = r['응답ID']
+        (accepted if rid in added else duplicate).append(rid)
+        added.discard(rid)  # 묶음 안에서 두 번 보낸 응답은 두 번째부터 중복
+    return {'accepted': accepted, 'duplicate': duplicate, 'rejected': rejected}
+
+
+class IngestHandler(SimpleHTTPRequestHandler):
+    store = None
+    root = APP_DIR
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=self.root, **kwargs)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def end_headers(self):
+        path = urlparse(self.path).path
+        if path in ('/', f'/{CLIENT_FILE}', f'/{SERVICE_WORKER_FILE}'):
+            self.send_header('Cache-Control', 'no-cache')  # 새 버전은 서비스 워커가 판단
+        super().end_headers()
+
+    def _route_static(self):
+        """내보내도 되는 파일만 통과 (저장소 파일 등 앱 폴더의 나머지는 404)"""
+        path = unquote(urlparse(self.path).path)
+        if path == '/':
+            self.path = f'/{CLIENT_FILE}'
+            return True
+        if '..' in path.split('/'):
+            return False
+        return path in (f'/{CLIENT_FILE}', f'/{SERVICE_WORKER_FILE}') or path.startswith(STATIC_PREFIXES)
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/api/health':
+            self._send_json(200, {'ok': True, 'store': self.store.label, 'version': self.store.version()})
+            return
+        if not self._route_static():
+            self.send_error(404)
+            return
+        super().do_GET()
+
+    def do_HEAD(self):
+        if not self._route_static():
+            self.send_error(404)
+            return
+        super().do_HEAD()
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path == '/api/import':
+            self._handle_import()
+            return
+        if path != '/api/responses':
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._send_json(413 if length > 0 else 400, {'error': '본문 크기 오류'})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length).decode('utf-8'))
+        except (UnicodeDecodeError, ValueError):
+            self._send_json(400, {'error': 'JSON 형식 오류'})
+            return
+        items = payload.get('responses') if isinstance(payload, dict) else payload
+        if not isinstance(items, list) or len(items) > MAX_BATCH:
+            self._send_json(400, {'error': f'responses는 최대 {MAX_BATCH}건의 목록이어야 합니다'})
+            return
+        try:
+            result = ingest(self.store, items)
+        except RosterUnavailable as e:
+            self._send_json(503, {'error': f'{e}, 잠시 후 다시 보내주세요'})
+            return
+        except Exception as e:
+            print(f"❌ 응답 저장 오류: {e}")
+            self._send_json(503, {'error': '저장소 오류, 잠시 후 다시 보내주세요'})
+            return
+        if result['accepted']:
+            print(f"📥 {len(result['accepted'])}건 저장 (중복 {len(result['duplicate'])}, 거부 {len(result['rejected'])})")
+        self._send_json(200, result)
+
+    def _handle_import(self):
+        token = os.environ.get('BLUEFOOD_IMPORT_TOKEN')
+        given = self.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not token or not hmac.compare_digest(given, token):
+            self._send_json(403, {'error': '가져오기 권한이 없습니다'})
+            return
+        filename = parse_qs(urlparse(self.path).query).get('filename', [''])[-1]
+        ext = os.path.splitext(filename)[1].lower()
+        length = int(self.headers.get('Content-Length') or 0)
+        if ext not in IMPORT_EXTENSIONS:
+            self._send_json(400, {'error': f"filename 확장자는 {', '.join(IMPORT_EXTENSIONS)} 중 하나여야 합니다"})
+            return
+        if length <= 0 or length > MAX_IMPORT_BYTES:
+            self._send_json(413 if length > 0 else 400, {'error': '본문 크기 오류'})
+            return
+
+        # 본문을 임시 파일로 흘려 받은 뒤 CLI와 같은 경로로 가져오기
+        fd, tmp = tempfile.mkstemp(suffix=ext)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                remaining = length
+                while remaining > 0:
+                    block = self.rfile.read(min(remaining, 1 << 20))
+                    if not block:
+                        break
+                    f.write(block)
+                    remaining -= len(block)
+            report = import_files(self.store, [tmp], workers=1)
+        except Exception as e:
+            print(f"❌ 일괄 가져오기 오류: {e}")
+            self._send_json(503, {'error': '가져오기 실패, 잠시 후 다시 시도해주세요'})
+            return
+        finally:
+            os.unlink(tmp)
+
+        for entry in report['rejected'] + report['duplicates']:
+            entry['file'] = filename
+        print(f"📥 일괄 가져오기 {filename}: {report['imported']}건 저장 / {report['rows']}행")
+        self._send_json(200, {
+            'rows': report['rows'],
+            'imported': report['imported'],
+            'duplicates': len(report['duplicates']),
+            'rejected': len(report['rejected']),
+            'details': (report['rejected'] + report['duplicates'])[:REPORT_LIMIT],
+            'seconds': report['seconds'],
+        })
+
+
+def make_server(host, port, store, root=APP_DIR):
+    handler = type('BoundIngestHandler', (IngestHandler,), {'store': store, 'root': root})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 설문 클라이언트 + 응답 수집 서버")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--store-url', default=None, help="기본값: BLUEFOOD_STORE_URL 또는 BLUEFOOD_DATA_DIR의 SQLite")
+    parser.add_argument('--no-build', action='store_true', help="bluefood_survey.html/sw.js 다시 생성하지 않음")
+    args = parser.parse_args()
+
+    if not args.no_build:
+        build_offline_client(APP_DIR)
+    store = open_store(args.store_url or default_store_url())
+    ensure_affiliation_counts(store)
+    record_catalog_version(store, load_catalog())  # 내려보낸 페이지의 카탈로그로 나중에 온 응답을 검증
+    server = make_server(args.host, args.port, store)
+    print(f"🌊 수집 서버: http://{args.host}:{args.port}/ (저장소: {store.label})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""관리자 실시간 모드용 증분 집계
+
+저장소의 변경 피드(read_since: 마지막으로 본 seq 이후 행)만 읽어 카운터에 더하므로
+갱신 비용은 새 응답 수에 비례합니다. 저장소 version()이 지난번과 같으면 아무것도 읽지 않습니다
+(엑셀: 파일 수정시각/크기, SQLite/Redis: revision 값 하나). 다른 서버 프로세스, 수집 서버,
+일괄 가져오기로 들어온 응답도 같은 저장소를 거치므로 모두 반영됩니다.
+
+행이 지워진 경우(마이그레이션 격리 등)는 저장소 행 수가 카운터와 어긋나는 것으로
+알아채고 처음부터 다시 셉니다.
+"""
+import threading
+from collections import Counter, deque
+from datetime import timedelta
+
+RECENT_ROWS = 20
+RECENT_TIMES = 5000
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class LiveCounters:
+    """프로세스 공용 (st.cache_resource). load_list / load_dict: 선택 항목 셀 파서"""
+
+    def __init__(self, load_list, load_dict):
+        self.load_list = load_list
+        self.load_dict = load_dict
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.seq = 0
+        self.version = None
+        self.total = 0
+        self.ingredients = Counter()
+        self.menus = Counter()
+        self.affiliations = Counter()
+        self.recent = deque(maxlen=RECENT_ROWS)
+        self._times = deque(maxlen=RECENT_TIMES)  # 설문일시 문자열 (같은 형식이라 문자열 비교로 시간 비교)
+
+    def _apply(self, rows):
+        for row in rows:
+            ings = self.load_list(row.get('선택한_수산물'))
+            menus = self.load_dict(row.get('선택한_메뉴'))
+            self.ingredients.update(ing for ing in ings if ing)
+            self.menus.update(m for items in menus.values() if isinstance(items, list) for m in items if m)
+            self.affiliations[str(row.get('소속', '')).strip()] += 1
+            self.recent.append({'설문일시': row.get('설문일시', ''), '소속': row.get('소속', ''),
+                                '수산물': len(ings)})
+            self._times.append(str(row.get('설문일시', '')))
+        self.total += len(rows)
+
+    def poll(self, store):
+        """새 행만 반영. 반영한 행 수 (처음부터 다시 센 경우 전체 행 수)"""
+        with self._lock:
+            version = store.version()
+            if version is not None and version == self.version:
+                return 0
+            rows, last = store.read_since(self.seq)
+            self._apply(rows)
+            self.seq = last
+            if store.count() != self.total:
+                self._reset()
+                rows, self.seq = store.read_since(0)
+                self._apply(rows)
+            self.version = version  # 읽기 전에 받은 버전: 그사이 들어온 행은 다음 poll에서
+            return len(rows)
+
+    def snapshot(self, top_n, now, window_minutes=10):
+        """화면용 복사본 (now: 설문일시와 같은 시간대의 datetime)"""
+        cutoff = (now - timedelta(minutes=window_minutes)).strftime(TIME_FORMAT)
+        with self._lock:
+            return {
+                'total': self.total,
+                'recent_window': sum(t >= cutoff for t in self._times),
+                'ingredients': self.ingredients.most_common(top_n),
+                'menus': self.menus.most_common(top_n),
+                'affiliations': self.affiliations.most_common(),
+                'recent': list(reversed(self.recent)),
+            }
+
@@ -0,0 +1,296 @@
+"""메뉴 구성 최적화 (응답자 커버리지 최대화)
+
+k개 메뉴를 골랐을 때 "선택한 메뉴가 하나 이상 들어 있는" 응답자 수를 최대화합니다.
+
+- 탐욕(기본): 메뉴마다 응답자 비트셋(파이썬 int)을 만들어 두고, 추가 커버리지는
+  (bits & ~covered).bit_count() 한 번으로 계산합니다. 커버리지는 부분모듈(submodular)이라
+  이전 이득이 상한이 되므로 힙에서 지연 평가(CELF)해 대부분의 메뉴를 다시 세지 않습니다.
+- 정확(선택): 같은 메뉴 조합을 고른 응답자를 패턴 하나로 묶어 정수계획(scipy milp)으로 풉니다.
+  패턴 수가 EXACT_MAX_PATTERNS를 넘으면 시간 제한 안에 최적성을 증명하지 못하므로 제공하지 않습니다
+  (무작위 패턴 200개에서 약 5초).
+
+제약: 수산물당 최대 메뉴 수, 조리법당 최대 수/최소 조리법 종류 수,
+카테고리별 최대/최소 메뉴 수, 반드시 포함할 메뉴.
+"""
+import heapq
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from incidence import catalog_orders
+
+EXACT_MAX_PATTERNS = 200
+
+
+class PlanConstraints:
+    def __init__(self, max_per_ingredient=None, max_per_method=None, min_methods=0,
+                 max_per_category=None, min_per_category=None, fixed=()):
+        self.max_per_ingredient = max_per_ingredient
+        self.max_per_method = max_per_method
+        self.min_methods = min_methods or 0
+        self.max_per_category = max_per_category
+        self.min_per_category = dict(min_per_category or {})
+        self.fixed = tuple(fixed)
+
+
+class MenuPlan:
+    def __init__(self, menus, gains, covered, n_respondents, mode, optimal, unmet, seconds):
+        self.menus = menus
+        self.gains = gains            # 메뉴를 순서대로 더할 때의 추가 커버리지
+        self.covered = covered
+        self.n_respondents = n_respondents
+        self.mode = mode
+        self.optimal = optimal        # 정확 모드에서 최적성이 증명되었는지
+        self.unmet = unmet            # 만족하지 못한 제약 설명 목록
+        self.seconds = seconds
+
+    @property
+    def coverage(self):
+        return self.covered / self.n_respondents if self.n_respondents else 0.0
+
+
+def _column_bitsets(matrix):
+    """응답자×메뉴 행렬의 열마다 응답자 비트셋(int, 리틀엔디언)"""
+    csc = sp.csc_matrix(matrix)
+    n = csc.shape[0]
+    bitsets = []
+    for j in range(csc.shape[1]):
+        rows = csc.indices[csc.indptr[j]:csc.indptr[j + 1]]
+        col = np.zeros(n, dtype=bool)
+        col[rows] = True
+        bitsets.append(int.from_bytes(np.packbits(col, bitorder='little').tobytes(), 'little'))
+    return bitsets
+
+
+class MenuOptimizer:
+    """incidence(응답자×메뉴)와 카탈로그로 메뉴 속성(수산물/조리법/카테고리)을 준비"""
+
+    def __init__(self, incidence, menu_data, ingredient_categories, rows=None):
+        matrix = incidence.menus if rows is None else incidence.menus[rows]
+        self.matrix = sp.csr_matrix(matrix)
+        self.n_respondents = self.matrix.shape[0]
+        self.menus = list(incidence.menu_labels)
+        self._index = {m: j for j, m in enumerate(self.menus)}
+
+        _, _, menu_ingredients, menu_methods = catalog_orders(menu_data, ingredient_categories)
+        ing_to_category = {ing: label for label, ings in ingredient_categories for ing in ings}
+        self.ingredients = [tuple(menu_ingredients.get(m, ())) for m in self.menus]
+        self.methods = [menu_methods.get(m) for m in self.menus]
+        self.categories = [tuple(sorted({ing_to_category[i] for i in ings if i in ing_to_category}))
+                           for ings in self.ingredients]
+        self.bitsets = _column_bitsets(self.matrix)
+        self.singleton = [b.bit_count() for b in self.bitsets]
+        self._patterns = None
+
+    def patterns(self):
+        """{고른 메뉴 번호 튜플: 응답자 수} (메뉴를 하나도 고르지 않은 응답자 제외)"""
+        if self._patterns is None:
+            rows = self.matrix[np.diff(self.matrix.indptr) > 0]
+            patterns = {}
+            for r in range(rows.shape[0]):
+                key = tuple(rows.indices[rows.indptr[r]:rows.indptr[r + 1]])
+                patterns[key] = patterns.get(key, 0) + 1
+            self._patterns = patterns
+        return self._patterns
+
+    def exact_available(self):
+        return len(self.patterns()) <= EXACT_MAX_PATTERNS
+
+    def menu_info(self, menu):
+        """(수산물 튜플, 조리법)"""
+        j = self._index[menu]
+        return self.ingredients[j], self.methods[j]
+
+    # ---- 제약 ----
+
+    def _feasible(self, j, state, c):
+        if c.max_per_ingredient is not None:
+            if any(state['ing'].get(i, 0) >= c.max_per_ingredient for i in self.ingredients[j]):
+                return False
+        if c.max_per_method is not None and self.methods[j] is not None:
+            if state['method'].get(self.methods[j], 0) >= c.max_per_method:
+                return False
+        if c.max_per_category is not None:
+            if any(state['cat'].get(cat, 0) >= c.max_per_category for cat in self.categories[j]):
+                return False
+        return True
+
+    def _deficits(self, state, c):
+        method_gap = max(0, c.min_methods - len([m for m, v in state['method'].items() if v > 0]))
+        cat_gap = {cat: need - state['cat'].get(cat, 0)
+                   for cat, need in c.min_per_category.items() if need > state['cat'].get(cat, 0)}
+        return method_gap, cat_gap
+
+    def _helps(self, j, state, method_gap, cat_gap):
+        if method_gap and self.methods[j] is not None and not state['method'].get(self.methods[j]):
+            return True
+        return any(cat in cat_gap for cat in self.categories[j])
+
+    def _take(self, j, state):
+        for i in self.ingredients[j]:
+            state['ing'][i] = state['ing'].get(i, 0) + 1
+        if self.methods[j] is not None:
+            state['method'][self.methods[j]] = state['method'].get(self.methods[j], 0) + 1
+        for cat in self.categories[j]:
+            state['cat'][cat] = state['cat'].get(cat, 0) + 1
+
+    def _unmet(self, picks, c):
+        state = {'ing': {}, 'method': {}, 'cat': {}}
+        for j in picks:
+            self._take(j, state)
+        method_gap, cat_gap = self._deficits(state, c)
+        unmet = []
+        if method_gap:
+            unmet.append(f"조리법 종류 {c.min_methods}개 이상 (현재 {c.min_methods - method_gap}개)")
+        for cat, gap in cat_gap.items():
+            unmet.append(f"{cat} {c.min_per_category[cat]}개 이상 (현재 {c.min_per_category[cat] - gap}개)")
+        return unmet
+
+    def _fixed_indices(self, c):
+        missing = [m for m in c.fixed if m not in self._index]
+        if missing:
+            raise ValueError(f"카탈로그/응답에 없는 메뉴: {', '.join(missing)}")
+        return [self._index[m] for m in dict.fromkeys(c.fixed)]
+
+    # ---- 탐욕 (지연 평가) ----
+
+    def greedy(self, k, constraints=None):
+        t0 = time.perf_counter()
+        c = constraints or PlanConstraints()
+        state = {'ing': {}, 'method': {}, 'cat': {}}
+        picks, gains, covered = [], [], 0
+        for j in self._fixed_indices(c):
+            picks.append(j)
+            gains.append((self.bitsets[j] & ~covered).bit_count())
+            covered |= self.bitsets[j]
+            self._take(j, state)
+
+        chosen = set(picks)
+        heap = [(-self.singleton[j], j, -1) for j in range(len(self.menus)) if j not in chosen]
+        heapq.heapify(heap)
+        while len(picks) < k and heap:
+            method_gap, cat_gap = self._deficits(state, c)
+            # 남은 자리가 부족한 최소 조건 수만큼이면 조건을 채우는 메뉴만 고른다
+            restricted = (k - len(picks)) <= max(method_gap, sum(cat_gap.values()))
+            deferred, picked = [], None
+            while heap:
+                neg_gain, j, stamp = heapq.heappop(heap)
+                if not self._feasible(j, state, c):
+                    continue  # 상한 제약은 단조이므로 다시 가능해지지 않음
+                if restricted and not self._helps(j, state, method_gap, cat_gap):
+                    deferred.append((neg_gain, j, stamp))
+                    continue
+                if stamp == len(picks):
+                    picked = (j, -neg_gain)
+                    break
+                gain = (self.bitsets[j] & ~covered).bit_count()
+                heapq.heappush(heap, (-gain, j, len(picks)))
+            for item in deferred:
+                heapq.heappush(heap, item)
+            if picked is None:
+                break
+            j, gain = picked
+            picks.append(j)
+            gains.append(gain)
+            covered |= self.bitsets[j]
+            self._take(j, state)
+
+        return MenuPlan([self.menus[j] for j in picks], gains, covered.bit_count(), self.n_respondents,
+                        'greedy', False, self._unmet(picks, c), time.perf_counter() - t0)
+
+    # ---- 정확 (정수계획) ----
+
+    def exact(self, k, constraints=None, time_limit=10.0):
+        """시간 제한 안에 최적성이 증명되지 않으면 탐욕 해와 비교해 더 나은 쪽을 돌려준다"""
+        from scipy.optimize import Bounds, LinearConstraint, milp
+
+        t0 = time.perf_counter()
+        c = constraints or PlanConstraints()
+        fixed = self._fixed_indices(c)
+        m = len(self.menus)
+
+        # 같은 메뉴 조합을 고른 응답자는 하나의 패턴(가중치=인원)으로
+        patterns = self.patterns()
+        keys = list(patterns)
+        p = len(keys)
+        weights = np.array([patterns[key] for key in keys], dtype=float)
+
+        methods = sorted({x for x in self.methods if x is not None})
+        cats = sorted({x for cs in self.categories for x in cs})
+        q = len(methods) if c.min_methods else 0
+        n_vars = m + p + q
+
+        # 변수: x (메뉴 m개), y (패턴 p개, 커버 여부), z (조리법 q개, 최소 종류 조건일 때만)
+        objective = np.zeros(n_vars)
+        objective[m:m + p] = -weights
+
+        # y_p - Σ_{j∈p} x_j ≤ 0
+        r_idx = np.repeat(np.arange(p), [len(key) for key in keys])
+        c_idx = np.fromiter((j for key in keys for j in key), dtype=np.int64, count=len(r_idx))
+        cover = sp.hstack([
+            sp.csr_matrix((-np.ones(len(r_idx)), (r_idx, c_idx)), shape=(p, m)),
+            sp.identity(p, format='csr'),
+            sp.csr_matrix((p, q)),
+        ])
+        blocks = [LinearConstraint(cover, -np.inf, 0)]
+
+        def add_row(cols, lo, hi):
+            row = np.zeros(n_vars)
+            row[list(cols)] = 1
+            blocks.append(LinearConstraint(row, lo, hi))
+
+        add_row(range(m), 0, k)
+        if c.max_per_ingredient is not None:
+            for ing in sorted({i for ings in self.ingredients for i in ings}):
+                add_row([j for j in range(m) if ing in self.ingredients[j]], 0, c.max_per_ingredient)
+        if c.max_per_method is not None:
+            for meth in methods:
+                add_row([j for j in range(m) if self.methods[j] == meth], 0, c.max_per_method)
+        for cat in cats:
+            lo = c.min_per_category.get(cat, 0)
+            hi = c.max_per_category if c.max_per_category is not None else np.inf
+            if lo or hi != np.inf:
+                add_row([j for j in range(m) if cat in self.categories[j]], lo, hi)
+        if q:
+            # z_t ≤ Σ_{j∈조리법 t} x_j,  Σ z ≥ min_methods
+            for t, meth in enumerate(methods):
+                row = np.zeros(n_vars)
+                row[[j for j in range(m) if self.methods[j] == meth]] = -1
+                row[m + p + t] = 1
+                blocks.append(LinearConstraint(row, -np.inf, 0))
+            add_row(range(m + p, n_vars), c.min_methods, np.inf)
+
+        integrality = np.ones(n_vars)
+        integrality[m:m + p] = 0  # x가 정수면 y는 최적해에서 저절로 0/1
+        lower = np.zeros(n_vars)
+        lower[fixed] = 1
+        upper = np.ones(n_vars)
+
+        res = milp(objective, constraints=blocks, integrality=integrality, bounds=Bounds(lower, upper),
+                   options={'time_limit': time_limit})
+        if res.x is None:
+            plan = self.greedy(k, c)
+            plan.unmet = plan.unmet + [f"정확 모드 해를 찾지 못함: {res.message}"]
+            return plan
+
+        # 보여줄 때는 추가 커버리지가 큰 순서로
+        remaining = [int(j) for j in np.flatnonzero(res.x[:m] > 0.5)]
+        picks, gains, covered = [], [], 0
+        while remaining:
+            j = max(remaining, key=lambda j: (self.bitsets[j] & ~covered).bit_count())
+            remaining.remove(j)
+            picks.append(j)
+            gains.append((self.bitsets[j] & ~covered).bit_count())
+            covered |= self.bitsets[j]
+        plan = MenuPlan([self.menus[j] for j in picks], gains, covered.bit_count(),
+                        self.n_respondents, 'exact', res.status == 0, self._unmet(picks, c),
+                        time.perf_counter() - t0)
+        if not plan.optimal:
+            greedy = self.greedy(k, c)
+            if (len(greedy.unmet), -greedy.covered) < (len(plan.unmet), -plan.covered):
+                greedy.mode = 'exact'
+                greedy.seconds = time.perf_counter() - t0
+                greedy.unmet = greedy.unmet + ["시간 제한 안에 정확해를 찾지 못해 탐욕 해를 표시"]
+                return greedy
+        return plan
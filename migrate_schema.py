@@ -0,0 +1,246 @@
+"""저장된 선택 항목(선택한_수산물 / 선택한_메뉴) 스키마 마이그레이션
+
+- 스키마 1: JSON과 예전 Python repr("['김', '굴']") 문자열이 섞여 있어
+  읽을 때마다 json → ast.literal_eval 순서로 두 번 시도
+- 스키마 2: 모든 행이 make_response_row와 같은 정규 JSON
+  (문자열 항목, 앞뒤 공백/빈 값/중복 제거) → 빠른 파서(orjson) 하나로 읽음
+
+마이그레이션은 모든 행을 정규 JSON으로 다시 쓰고, 어느 형식으로도 읽을 수 없는 행은
+저장소에서 빼서 격리(quarantine) 보고서와 저장소 kv('quarantine')에 남긴 뒤
+메타데이터 schema_version을 올립니다. 여러 번 실행해도 결과는 같습니다.
+
+--sheets를 주면 Google Sheet의 두 열도 정규 JSON으로 고칩니다. Sheet 행은 지우지 않습니다
+(동기화 워터마크가 행 번호 기준). 격리 대상 행은 가져오기(pull) 때 다시 걸러집니다.
+
+    python migrate_schema.py [--store-url URL] [--report quarantine.csv] [--sheets] [--dry-run]
+"""
+import argparse
+import ast
+import csv
+import json
+import os
+import time
+
+import pandas as pd
+
+from storage import RESPONSE_COLUMNS, default_store_url, normalize_row, open_store
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+SCHEMA_VERSION = 2
+SCHEMA_META_KEY = 'schema_version'
+SELECTION_COLUMNS = ('선택한_수산물', '선택한_메뉴')
+
+
+def store_schema_version(store):
+    """기록이 없는 저장소는 스키마 1"""
+    try:
+        return int(store.get_meta(SCHEMA_META_KEY, 1) or 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+# ---- 빠른 파서 (스키마 2 전용, 대체 파서 없음) ----
+
+def load_ingredients(cell):
+    if not isinstance(cell, (str, bytes)) or not cell:
+        return cell if isinstance(cell, list) else []
+    try:
+        value = _loads(cell)
+    except ValueError:
+        return []
+    return value if isinstance(value, list) else []
+
+
+def load_menus(cell):
+    if not isinstance(cell, (str, bytes)) or not cell:
+        return cell if isinstance(cell, dict) else {}
+    try:
+        value = _loads(cell)
+    except ValueError:
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+# ---- 정규화 ----
+
+def _legacy_load(cell, kind):
+    """JSON, 없으면 Python repr. 빈 칸은 빈 값. 읽을 수 없으면 ValueError"""
+    if cell is None or (isinstance(cell, float) and pd.isna(cell)):
+        return kind()
+    if isinstance(cell, kind):
+        return cell
+    text = str(cell).strip()
+    if not text:
+        return kind()
+    try:
+        value = json.loads(text)
+    except ValueError:
+        try:
+            value = ast.literal_eval(text)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            raise ValueError(f"JSON/Python 형식이 아닙니다: {text[:40]}") from None
+    if not isinstance(value, kind):
+        raise ValueError(f"{'목록' if kind is list else '객체'}이 아닙니다: {text[:40]}")
+    return value
+
+
+def _clean_items(values):
+    return list(dict.fromkeys(s for s in (str(v).strip() for v in values if v is not None) if s))
+
+
+def canonical_selection(ingredients_cell, menus_cell):
+    """두 셀 → 정규 JSON 문자열 (수산물, 메뉴). 읽을 수 없으면 ValueError"""
+    ingredients = _clean_items(_legacy_load(ingredients_cell, list))
+    menus = {}
+    for ing, items in _legacy_load(menus_cell, dict).items():
+        ing = str(ing).strip()
+        items = _clean_items(items if isinstance(items, (list, tuple)) else [items])
+        if ing and items:
+            menus[ing] = _clean_items(menus.get(ing, []) + items)
+    return json.dumps(ingredients, ensure_ascii=False), json.dumps(menus, ensure_ascii=False)
+
+
+def canonicalize_rows(rows):
+    """([정규화된 행], [(원래 행, 사유)])"""
+    good, bad = [], []
+    for row in rows:
+        row = normalize_row(row)
+        try:
+            ings, menus = canonical_selection(row['선택한_수산물'], row['선택한_메뉴'])
+        except ValueError as e:
+            bad.append((row, str(e)))
+            continue
+        good.append({**row, '선택한_수산물': ings, '선택한_메뉴': menus})
+    return good, bad
+
+
+def quarantine(store, bad):
+    """격리 행 원본을 저장소 kv에 보관 (응답ID 기준, 보고서를 잃어도 복구 가능)"""
+    for row, reason in bad:
+        store.kv_set('quarantine', str(row['응답ID']), {'row': dict(row), 'reason': reason})
+
+
+# ---- 저장소 / Sheet 마이그레이션 ----
+
+def migrate_store(store, dry_run=False):
+    """저장소 전체를 스키마 2로. 결과 요약 dict"""
+    t0 = time.perf_counter()
+    with store.lock('schema-migration', timeout=60, lease=600):
+        rows = [normalize_row(r) for r in store.read_frame().to_dict('records')]
+        good, bad = canonicalize_rows(rows)
+        originals = {str(r['응답ID']): r for r in rows}
+        changed = [r for r in good
+                   if any(str(originals[str(r['응답ID'])][c]) != r[c] for c in SELECTION_COLUMNS)]
+        if not dry_run:
+            quarantine(store, bad)
+            if changed or bad:
+                store.replace_rows(changed, remove_ids=[r['응답ID'] for r, _ in bad])
+            store.set_meta(SCHEMA_META_KEY, SCHEMA_VERSION)
+    return {
+        'rows': len(rows),
+        'rewritten': len(changed),
+        'quarantined': [{**row, 'reason': reason} for row, reason in bad],
+        'seconds': round(time.perf_counter() - t0, 2),
+    }
+
+
+def migrate_worksheet(worksheet, dry_run=False):
+    """Sheet의 두 선택 열을 정규 JSON으로 (비어 있는 응답ID도 채움). 결과 요약 dict"""
+    from sheets_sync import column_letter
+
+    values = worksheet.get_all_values()
+    if not values:
+        return {'rows': 0, 'rewritten': 0, 'quarantined': []}
+    header = values[0]
+    columns = {c: header.index(c) + 1 for c in (*SELECTION_COLUMNS, '응답ID') if c in header}
+    if len(columns) < 3:
+        raise ValueError("Sheet 헤더에 선택한_수산물/선택한_메뉴/응답ID 열이 없습니다")
+
+    updates, quarantined, rewritten = [], [], set()
+    for line, cells in enumerate(values[1:], start=2):
+        if not any(str(c).strip() for c in cells):
+            continue
+        row = normalize_row(dict(zip(header, cells)))  # 응답ID가 없으면 원래 내용으로 legacy ID
+        good, bad = canonicalize_rows([row])
+        if bad:
+            quarantined.extend({**r, 'reason': reason, 'sheet_row': line} for r, reason in bad)
+            continue
+        target = good[0]
+        for col, index in columns.items():
+            current = cells[index - 1] if index <= len(cells) else ''
+            if str(current) != str(target[col]):
+                updates.append({'range': f"{column_letter(index)}{line}", 'values': [[str(target[col])]]})
+                rewritten.add(line)
+    if updates and not dry_run:
+        worksheet.batch_update(updates)
+    return {
+        'rows': len(values) - 1,
+        'rewritten': len(rewritten),
+        'quarantined': quarantined,
+    }
+
+
+def write_report(quarantined, path):
+    fieldnames = RESPONSE_COLUMNS + ['reason', 'source', 'sheet_row']
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(quarantined)
+
+
+def _open_worksheet(secrets_path):
+    """Streamlit secrets.toml의 서비스 계정으로 설문 Sheet 열기 (앱과 같은 설정)"""
+    import tomllib
+
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    with open(secrets_path, 'rb') as f:
+        secrets = tomllib.load(f)
+    creds_dict = dict(secrets['gcp_service_account'])
+    creds_dict['private_key'] = creds_dict.get('private_key', '').replace('\\n', '\n')
+    cfg = secrets['google_sheets']
+    client = gspread.authorize(Credentials.from_service_account_info(
+        creds_dict, scopes=["https://www.googleapis.com/auth/spreadsheets",
+                            "https://www.googleapis.com/auth/drive"]))
+    if cfg.get('google_sheet_id'):
+        return client.open_by_key(cfg['google_sheet_id']).sheet1
+    return client.open(cfg['google_sheet_name']).sheet1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="선택 항목을 정규 JSON(스키마 2)으로 마이그레이션")
+    parser.add_argument('--store-url', default=None, help="기본값: BLUEFOOD_STORE_URL 또는 BLUEFOOD_DATA_DIR의 SQLite")
+    parser.add_argument('--report', default='quarantine.csv', help="격리 행 보고서 CSV 경로")
+    parser.add_argument('--sheets', action='store_true', help="Google Sheet도 마이그레이션")
+    parser.add_argument('--secrets', default=os.path.join('.streamlit', 'secrets.toml'))
+    parser.add_argument('--dry-run', action='store_true', help="바꾸지 않고 결과만 출력")
+    args = parser.parse_args()
+
+    store = open_store(args.store_url or default_store_url())
+    before = store_schema_version(store)
+    result = migrate_store(store, dry_run=args.dry_run)
+    quarantined = [{**r, 'source': store.label} for r in result['quarantined']]
+    print(f"🗄️ {store.label} 스키마 {before} → {SCHEMA_VERSION}: {result['rows']}행, "
+          f"다시 씀 {result['rewritten']}, 격리 {len(result['quarantined'])} ({result['seconds']}s)")
+
+    if args.sheets:
+        sheet_result = migrate_worksheet(_open_worksheet(args.secrets), dry_run=args.dry_run)
+        quarantined += [{**r, 'source': 'sheets'} for r in sheet_result['quarantined']]
+        print(f"📄 Google Sheet: {sheet_result['rows']}행, 다시 씀 {sheet_result['rewritten']}, "
+              f"격리 {len(sheet_result['quarantined'])}")
+
+    if quarantined:
+        write_report(quarantined, args.report)
+        print(f"📝 격리 보고서: {args.report}")
+    if args.dry_run:
+        print("(dry-run: 아무것도 바꾸지 않았습니다)")
+
+
+if __name__ == "__main__":
+    main()
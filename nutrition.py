@@ -0,0 +1,199 @@
+"""메뉴 선택 → 영양 프로파일 (선호 가중 평균)
+
+menu_nutrients.csv(메뉴별 1인분 영양 성분, 직접 채우는 표)를 카탈로그 메뉴 이름으로 붙여
+응답자 × 메뉴 0/1 행렬(incidence.py)과 한 번의 희소 행렬 곱으로 계산합니다.
+
+- 응답자 프로파일: 고른 메뉴들의 성분 평균 (값이 비어 있는 메뉴는 그 성분에서만 뺌)
+- 소속 프로파일: 소속 응답자들이 고른 메뉴 전체의 성분 평균 (많이 고른 메뉴일수록 크게 반영)
+
+표에 값을 지어 넣지 않습니다. 빈 칸은 "모름"이고, 화면에 성분별 반영 비율을 함께 보여 줍니다.
+
+    python nutrition.py template [--out menu_nutrients.csv]   # 카탈로그 메뉴로 빈 표 만들기/새 메뉴 추가
+    python nutrition.py check [--file menu_nutrients.csv]     # 채운 비율 확인
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MENU_COLUMN = '메뉴'
+INFO_COLUMNS = ('수산물', '조리법', '출처')  # 작성 참고용 (계산에 쓰지 않음)
+DEFAULT_NUTRIENTS = ['에너지(kcal)', '단백질(g)', '지방(g)', '오메가3(g)', '나트륨(mg)', '칼슘(mg)', '철(mg)',
+                     '비타민D(μg)']
+
+
+def nutrient_path():
+    return os.environ.get("BLUEFOOD_NUTRIENT_FILE") or os.path.join(APP_DIR, "menu_nutrients.csv")
+
+
+class NutrientTable:
+    """values: 메뉴 × 성분 float 배열 (빈 칸은 NaN)"""
+
+    def __init__(self, menus, nutrients, values, signature=None):
+        self.menus = list(menus)
+        self.nutrients = list(nutrients)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.signature = signature
+        self._pos = {m: i for i, m in enumerate(self.menus)}
+
+    def aligned(self, menu_labels):
+        """incidence 메뉴 순서로 맞춘 (값 L×K, 값 있음 L×K)"""
+        out = np.full((len(menu_labels), len(self.nutrients)), np.nan)
+        for i, menu in enumerate(menu_labels):
+            j = self._pos.get(menu)
+            if j is not None:
+                out[i] = self.values[j]
+        known = ~np.isnan(out)
+        return np.where(known, out, 0.0), known.astype(np.float64)
+
+    def coverage(self, catalog_menus):
+        """성분별 값이 있는 카탈로그 메뉴 비율(%), 카탈로그에 없는 표의 메뉴"""
+        _, known = self.aligned(catalog_menus)
+        share = known.mean(axis=0) * 100 if len(catalog_menus) else np.zeros(len(self.nutrients))
+        unknown = sorted(set(self.menus) - set(catalog_menus))
+        return pd.Series(share.round(1), index=self.nutrients), unknown
+
+
+def load_nutrient_table(path=None):
+    """표가 없으면 None. 숫자가 아닌 값은 오류 (어느 메뉴/성분인지 알려 줌)"""
+    path = path or nutrient_path()
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    frame = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    if MENU_COLUMN not in frame.columns:
+        raise ValueError(f"{path}: '{MENU_COLUMN}' 열이 없습니다")
+    frame[MENU_COLUMN] = frame[MENU_COLUMN].str.strip()
+    frame = frame[frame[MENU_COLUMN] != '']
+    duplicated = frame[MENU_COLUMN][frame[MENU_COLUMN].duplicated()].tolist()
+    if duplicated:
+        raise ValueError(f"{path}: 중복 메뉴 {', '.join(duplicated)}")
+    nutrients = [c for c in frame.columns if c != MENU_COLUMN and c not in INFO_COLUMNS]
+    values = np.full((len(frame), len(nutrients)), np.nan)
+    for k, col in enumerate(nutrients):
+        cells = frame[col].str.strip().str.replace(',', '', regex=False)
+        numbers = pd.to_numeric(cells.where(cells != ''), errors='coerce')
+        bad = cells[(cells != '') & numbers.isna()]
+        if len(bad):
+            menu = frame[MENU_COLUMN].iloc[frame.index.get_loc(bad.index[0])]
+            raise ValueError(f"{path}: {menu} / {col} 값이 숫자가 아닙니다: {bad.iloc[0]!r}")
+        values[:, k] = numbers.to_numpy(dtype=np.float64)
+    return NutrientTable(frame[MENU_COLUMN], nutrients, values, signature=(stat.st_mtime_ns, stat.st_size))
+
+
+# ---- 프로파일 ----
+
+class NutrientProfiles:
+    """respondents: 응답자별 표, facilities: 소속별 표 (성분 열은 1인분 평균)"""
+
+    def __init__(self, respondents, facilities, nutrients):
+        self.respondents = respondents
+        self.facilities = facilities
+        self.nutrients = nutrients
+
+
+def _safe_mean(sums, counts):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def compute_profiles(incidence, table):
+    """응답자 × 메뉴 행렬 X와 [값 | 값 있음 | 하나라도 있음 | 1] 을 한 번 곱해 합계/개수를 같이 구함"""
+    values, known = table.aligned(incidence.menu_labels)
+    k = len(table.nutrients)
+    stacked = np.hstack([values, known, known.any(axis=1, keepdims=True), np.ones((len(values), 1))])
+    x = sp.csr_matrix(incidence.menus, dtype=np.float64)
+    per_row = np.asarray(x @ stacked)  # n × (2K + 2)
+
+    affs = incidence.affiliations
+    names, group = np.unique(affs.astype(str), return_inverse=True)
+    g = sp.csr_matrix((np.ones(len(group)), (group, np.arange(len(group)))), shape=(len(names), len(group)))
+    per_aff = np.asarray(g @ per_row)
+
+    def frame(sums, lead):
+        out = pd.DataFrame(lead)
+        out['선택 메뉴'] = sums[:, 2 * k + 1].astype(int)
+        out['영양 정보 있는 선택'] = sums[:, 2 * k].astype(int)
+        means = _safe_mean(sums[:, :k], sums[:, k:2 * k])
+        for j, nutrient in enumerate(table.nutrients):
+            out[nutrient] = means[:, j].round(2)
+        return out
+
+    def given(column):
+        return len(column) == len(affs) and any(v is not None for v in column)
+
+    lead = {'소속': affs}
+    if given(incidence.response_ids):
+        lead = {'응답ID': incidence.response_ids, **lead}
+    if given(incidence.submitted_at):
+        lead['설문일시'] = incidence.submitted_at
+    respondents = frame(per_row, lead)
+    facilities = frame(per_aff, {'소속': names, '응답자': np.bincount(group, minlength=len(names))})
+    return NutrientProfiles(respondents, facilities, table.nutrients)
+
+
+# ---- CLI ----
+
+def _catalog_rows():
+    from catalog import load_catalog
+    catalog = load_catalog()
+    rows = []
+    for ing, methods in catalog.menu_data.items():
+        for method, menus in methods.items():
+            rows.extend((ing, method, m) for m in menus)
+    return catalog, rows
+
+
+def write_template(path):
+    """카탈로그 메뉴마다 한 줄. 이미 있는 표면 채운 값은 두고 새 메뉴만 뒤에 추가"""
+    _, rows = _catalog_rows()
+    if os.path.exists(path):
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    else:
+        frame = pd.DataFrame(columns=[*INFO_COLUMNS[:2], MENU_COLUMN, *DEFAULT_NUTRIENTS, INFO_COLUMNS[2]])
+    have = set(frame[MENU_COLUMN].str.strip()) if len(frame) else set()
+    seen = set()
+    new = []
+    for ing, method, menu in rows:
+        if menu in have or menu in seen:
+            continue
+        seen.add(menu)
+        new.append({'수산물': ing, '조리법': method, MENU_COLUMN: menu})
+    if new:
+        frame = pd.concat([frame, pd.DataFrame(new)], ignore_index=True).fillna('')
+    frame.to_csv(path, index=False, encoding='utf-8-sig')
+    return len(new), len(frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메뉴 영양 성분표")
+    sub = parser.add_subparsers(dest='command', required=True)
+    tp = sub.add_parser('template', help="카탈로그 메뉴로 빈 표 만들기 (기존 표에는 새 메뉴만 추가)")
+    tp.add_argument('--out', default=None)
+    ck = sub.add_parser('check', help="성분별 채운 비율")
+    ck.add_argument('--file', default=None)
+    args = parser.parse_args()
+
+    if args.command == 'template':
+        path = args.out or nutrient_path()
+        added, total = write_template(path)
+        print(f"📝 {path}: 메뉴 {added}개 추가 (전체 {total}개). 값은 1인분 기준으로 채워 주세요.")
+        return
+    path = args.file or nutrient_path()
+    table = load_nutrient_table(path)
+    if table is None:
+        raise SystemExit(f"❌ {path} 없음 — 먼저 `python nutrition.py template`")
+    catalog, rows = _catalog_rows()
+    share, unknown = table.coverage(list(dict.fromkeys(m for _, _, m in rows)))
+    print(f"✅ {path} · 메뉴 {len(table.menus)}개 · 카탈로그 {catalog.version}")
+    for nutrient, pct in share.items():
+        print(f"  {nutrient:<12} {pct:5.1f}%")
+    if unknown:
+        print(f"⚠️ 카탈로그에 없는 메뉴: {', '.join(unknown)}")
+
+
+if __name__ == "__main__":
+    main()
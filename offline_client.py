@@ -0,0 +1,174 @@
+"""오프라인 설문 클라이언트 생성기
+
+현재 카탈로그(catalog.py, menu_catalog.json)와 이미지 인덱스로 bluefood_survey.html과
+서비스 워커 sw.js를 만듭니다.
+
+- 첫 방문 때 페이지와 이미지를 서비스 워커가 캐시 → 이후에는 연결 없이 열림
+- 완료된 응답은 IndexedDB 대기열에 쌓이고, 연결되면 ingest_server.py의
+  POST /api/responses 로 모아서 한 번에 전송 (응답ID로 중복 제거)
+
+    python offline_client.py          # 앱 폴더에 bluefood_survey.html, sw.js 생성
+"""
+import hashlib
+import json
+import os
+from urllib.parse import quote
+
+from asset_index import catalog_names, load_or_build_asset_index
+from catalog import load_catalog
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_FILE = os.path.join(APP_DIR, "offline_template.html")
+CLIENT_FILE = "bluefood_survey.html"
+SERVICE_WORKER_FILE = "sw.js"
+
+SERVICE_WORKER_TEMPLATE = """// offline_client.py가 생성 (직접 수정하지 마세요)
+const CACHE = 'bluefood-__VERSION__';
+const PRECACHE = __PRECACHE__;
+// 메뉴 이미지는 양이 많아 설치를 막지 않고, 페이지가 열린 뒤 요청(warm-cache)을 받아 채운다
+const LAZY = __LAZY__;
+const DB_NAME = 'bluefood-offline';
+const OUTBOX = 'outbox';
+
+self.addEventListener('install', event => {
+    event.waitUntil(caches.open(CACHE).then(cache => cache.addAll(PRECACHE)).then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(caches.keys()
+        .then(keys => Promise.all(keys.filter(k => k.startsWith('bluefood-') && k !== CACHE).map(k => caches.delete(k))))
+        .then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+    const url = new URL(event.request.url);
+    if (event.request.method !== 'GET' || url.pathname.includes('/api/')) {
+        return;
+    }
+    event.respondWith(caches.match(event.request, { ignoreSearch: true }).then(hit => hit || fetch(event.request).then(res => {
+        if (res.ok && url.origin === self.location.origin) {
+            const copy = res.clone();
+            caches.open(CACHE).then(cache => cache.put(event.request, copy));
+        }
+        return res;
+    })));
+});
+
+async function warmCache() {
+    const cache = await caches.open(CACHE);
+    for (const url of LAZY) {
+        if (!(await cache.match(url))) {
+            try {
+                await cache.add(url);
+            } catch (e) {
+                return;  // 연결이 끊기면 다음 방문 때 이어서
+            }
+        }
+    }
+}
+
+self.addEventListener('message', event => {
+    if (event.data === 'warm-cache') {
+        event.waitUntil(warmCache());
+    }
+});
+
+function openDb() {
+    return new Promise((resolve, reject) => {
+        const req = indexedDB.open(DB_NAME, 1);
+        req.onupgradeneeded = () => req.result.createObjectStore(OUTBOX, { keyPath: '응답ID' });
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+}
+
+async function flushOutbox() {
+    const db = await openDb();
+    const queued = await new Promise((resolve, reject) => {
+        const req = db.transaction(OUTBOX).objectStore(OUTBOX).getAll();
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+    if (!queued.length) {
+        return;
+    }
+    const res = await fetch('./api/responses', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ responses: queued }),
+    });
+    if (!res.ok) {
+        throw new Error(`HTTP ${res.status}`);
+    }
+    const body = await res.json();
+    const tx = db.transaction(OUTBOX, 'readwrite');
+    // 거부된 응답은 서버가 원본을 격리 보관하므로 기기 대기열에서는 지운다
+    [...body.accepted, ...body.duplicate, ...body.rejected.map(r => r['응답ID'])]
+        .forEach(id => tx.objectStore(OUTBOX).delete(id));
+    await new Promise(resolve => { tx.oncomplete = resolve; });
+    const clients = await self.clients.matchAll();
+    clients.forEach(c => c.postMessage('outbox-flushed'));
+}
+
+self.addEventListener('sync', event => {
+    if (event.tag === 'bluefood-flush') {
+        event.waitUntil(flushOutbox());
+    }
+});
+"""
+
+
+def _image_map(base_dir, catalog):
+    index = load_or_build_asset_index(base_dir, catalog.menu_data, catalog.categories,
+                                      os.path.join(base_dir, ".asset_index.json"))
+    images = {}
+    for kind, names in catalog_names(catalog.menu_data, catalog.categories).items():
+        images[kind] = {}
+        for name in names:
+            entry = index.lookup(kind, name)
+            if entry:
+                images[kind][name] = (entry['path'].replace(os.sep, '/'), entry['hash'])
+    return images
+
+
+def build_offline_client(base_dir=APP_DIR, out_dir=None):
+    """bluefood_survey.html, sw.js 생성. 생성한 파일 경로 목록을 돌려준다"""
+    out_dir = out_dir or base_dir
+    current = load_catalog()
+    images = _image_map(base_dir, current)
+    catalog = {
+        'catalogVersion': current.version,
+        'categories': current.categories,
+        'menuData': current.menu_data,
+        'images': {kind: {name: path for name, (path, _) in entries.items()} for kind, entries in images.items()},
+    }
+    # 카탈로그나 이미지 내용이 바뀌면 서비스 워커 캐시 이름도 바뀌어 새로 받는다
+    digest = hashlib.sha1(json.dumps([catalog, images], ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    with open(TEMPLATE_FILE, encoding='utf-8') as f:
+        template = f.read()
+    digest.update(template.encode('utf-8'))
+    version = digest.hexdigest()[:12]
+    catalog['version'] = version
+
+    html = template.replace('__CATALOG_JSON__', json.dumps(catalog, ensure_ascii=False))
+    urls = {kind: sorted('./' + quote(path) for path, _ in entries.values()) for kind, entries in images.items()}
+    precache = ['./', f'./{CLIENT_FILE}'] + urls['ingredient']
+    sw = (SERVICE_WORKER_TEMPLATE
+          .replace('__VERSION__', version)
+          .replace('__PRECACHE__', json.dumps(precache, indent=4))
+          .replace('__LAZY__', json.dumps(urls['menu'], indent=4)))
+
+    written = []
+    for name, content in ((CLIENT_FILE, html), (SERVICE_WORKER_FILE, sw)):
+        path = os.path.join(out_dir, name)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp, path)
+        written.append(path)
+    return written
+
+
+if __name__ == "__main__":
+    for path in build_offline_client():
+        print(f"✅ {path}")
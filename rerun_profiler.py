@@ -0,0 +1,124 @@
+"""느린 rerun 프로파일링 (관리자가 켤 때만)
+
+켜져 있으면 스크립트 rerun마다 표본 추출 스레드가 그 스레드의 호출 스택을 interval마다 읽어
+(sys._current_frames) 접힌 스택(folded stacks: "a;b;c 횟수")으로 모읍니다.
+threshold_ms보다 오래 걸린 rerun만 최근 keep개 보관하고, 나머지는 버립니다.
+꺼져 있으면 run()은 fn()을 그대로 부르기만 합니다.
+
+보관한 파일은 flamegraph.pl, speedscope, inferno에 그대로 넣을 수 있고, 맨 아래 프레임에
+설문 단계(step)와 category_index가 들어 있습니다.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+DEFAULT_INTERVAL = 0.005
+DEFAULT_THRESHOLD_MS = 500
+DEFAULT_KEEP = 20
+
+
+class Capture:
+    __slots__ = ('at', 'duration_ms', 'step', 'category_index', 'samples', 'stacks')
+
+    def __init__(self, at, duration_ms, step, category_index, samples, stacks):
+        self.at = at
+        self.duration_ms = duration_ms
+        self.step = step
+        self.category_index = category_index
+        self.samples = samples
+        self.stacks = stacks  # Counter: 접힌 스택 → 표본 수
+
+    def folded(self):
+        root = f"rerun[step={self.step},category_index={self.category_index}]"
+        return "".join(f"{root};{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def filename(self):
+        stamp = self.at.replace('-', '').replace(':', '').replace(' ', '_')
+        return f"rerun_{stamp}_{self.step}_{self.category_index}_{self.duration_ms:.0f}ms.folded"
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RerunProfiler:
+    """프로세스 공용 (st.cache_resource). 동시에 도는 여러 세션의 rerun을 표본 스레드 하나가 함께 추출"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL, threshold_ms=DEFAULT_THRESHOLD_MS, keep=DEFAULT_KEEP,
+                 clock=time.perf_counter):
+        self.enabled = False
+        self.interval = interval
+        self.threshold_ms = threshold_ms
+        self.clock = clock
+        self.captures = deque(maxlen=keep)
+        self.profiled = 0
+        self._lock = threading.Lock()
+        self._targets = {}  # 스레드 id → Counter
+        self._wake = threading.Event()
+        self._thread = None
+
+    def run(self, fn, step=None, category_index=None, now=None):
+        """fn() 실행. 켜져 있으면 표본 추출 후 느린 경우만 보관 (예외도 그대로 전달)"""
+        if not self.enabled:
+            return fn()
+        tid = threading.get_ident()
+        stacks = Counter()
+        with self._lock:
+            self._targets[tid] = stacks
+            self._ensure_thread()
+        self._wake.set()
+        t0 = self.clock()
+        try:
+            return fn()
+        finally:
+            duration_ms = (self.clock() - t0) * 1000
+            with self._lock:
+                self._targets.pop(tid, None)
+                self.profiled += 1
+                if duration_ms >= self.threshold_ms:
+                    self.captures.append(Capture(now() if now else time.strftime('%Y-%m-%d %H:%M:%S'),
+                                                 duration_ms, step, category_index,
+                                                 sum(stacks.values()), stacks))
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._sample_loop, name="bluefood-profiler", daemon=True)
+            self._thread.start()
+
+    def _sample_loop(self):
+        stop_code = RerunProfiler.run.__code__
+        while True:
+            self._wake.wait()
+            with self._lock:
+                targets = list(self._targets)
+                if not targets:
+                    self._wake.clear()
+                    continue
+            frames = sys._current_frames()
+            samples = []
+            for tid in targets:
+                frame = frames.get(tid)
+                labels = []
+                while frame is not None and frame.f_code is not stop_code:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                if labels:
+                    samples.append((tid, ";".join(reversed(labels))))
+            del frames
+            with self._lock:  # 그사이 끝난 rerun에는 더하지 않음
+                for tid, stack in samples:
+                    if tid in self._targets:
+                        self._targets[tid][stack] += 1
+            time.sleep(self.interval)
+
+    def recent(self):
+        """보관된 느린 rerun (최근 것부터)"""
+        with self._lock:
+            return list(reversed(self.captures))
+
+    def metrics(self):
+        with self._lock:
+            return {'enabled': self.enabled, 'profiled': self.profiled, 'captured': len(self.captures),
+                    'keep': self.captures.maxlen, 'active': len(self._targets)}
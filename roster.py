@@ -0,0 +1,61 @@
+"""참여자 명단/모집 목표를 저장소로 공유 (Streamlit 앱 → 수집 서버)
+
+명단(secrets allowed_pairs + Google Sheets '참여자_명단')과 소속별 목표 인원은 Streamlit 앱만 읽을 수
+있으므로, 앱이 읽을 때마다 저장소 kv에 올려 두고 수집 서버(ingest_server.py)가 같은 기준으로 확인합니다.
+엑셀 저장소의 kv는 프로세스 안에만 있으므로 수집 서버와 함께 쓰려면 SQLite/Redis 저장소가 필요합니다.
+"""
+from storage import affiliation_key
+
+NAMESPACE = 'roster'
+
+
+def publish_pairs(store, pairs):
+    store.kv_set(NAMESPACE, 'pairs', sorted([name, aff] for name, aff in pairs))
+
+
+def publish_quotas(store, quotas):
+    store.kv_set(NAMESPACE, 'quotas', {aff: int(target) for aff, target in quotas.items()})
+
+
+class Roster:
+    """pairs: {(이름, 소속)} (비어 있으면 누구나 참여), quotas: {소속: 목표 인원}"""
+
+    def __init__(self, pairs, quotas):
+        self.pairs = pairs
+        self.quotas = quotas
+
+    def allows(self, name, affiliation):
+        return not self.pairs or (name.strip(), affiliation.strip()) in self.pairs
+
+    def quota_checker(self, store):
+        """응답 1건마다 부르는 마감 확인 함수 full(소속, 응답ID). 받아들인 응답은 같은 묶음 안에서 바로 셈에 더함
+
+        이미 저장됐거나 묶음 앞쪽에서 받은 응답ID(오프라인 클라이언트가 다시 보낸 응답)는 저장할 때
+        중복으로 걸러지므로 세지도 막지도 않음
+        """
+        counts = store.affiliation_counts(list(self.quotas)) if self.quotas else {}
+        known = store.known_ids() if self.quotas else set()
+
+        def full(affiliation, response_id=None):
+            if response_id is not None and str(response_id) in known:
+                return False
+            aff = affiliation_key(affiliation)
+            target = self.quotas.get(aff)
+            if not target:
+                return False
+            if counts.get(aff, 0) >= target:
+                return True
+            counts[aff] = counts.get(aff, 0) + 1
+            if response_id is not None:
+                known.add(str(response_id))
+            return False
+        return full
+
+
+def load_roster(store):
+    """앱이 올린 명단과 목표. 아직 한 번도 올라오지 않았으면 None"""
+    pairs = store.kv_get(NAMESPACE, 'pairs')
+    if pairs is None:
+        return None
+    quotas = store.kv_get(NAMESPACE, 'quotas', {}) or {}
+    return Roster({(name, aff) for name, aff in pairs}, quotas)
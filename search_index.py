@@ -0,0 +1,133 @@
+"""개인별 선택 탭용 응답자 검색 인덱스 (n-gram + 한글 초성)
+
+데이터 버전당 한 번만 만들고, 검색은 후보 값만 확인한 뒤 행 번호 배열을 돌려줍니다.
+"""
+import numpy as np
+
+CHOSUNG = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+           'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+_CHOSUNG_SET = set(CHOSUNG)
+_HANGUL_BASE, _HANGUL_LAST = 0xAC00, 0xD7A3
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def to_chosung(text):
+    """'홍길동' → 'ㅎㄱㄷ' (한글 음절이 아닌 글자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            out.append(CHOSUNG[(code - _HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return ''.join(out)
+
+
+def is_chosung_query(q):
+    """초성이 하나 이상 있고 완성형 한글이 없으면 초성 검색 ('ㅎㄱㄷ', 'ㅅㄹ1')"""
+    has_chosung = False
+    for ch in q:
+        if ch in _CHOSUNG_SET:
+            has_chosung = True
+        elif _HANGUL_BASE <= ord(ch) <= _HANGUL_LAST:
+            return False
+    return has_chosung
+
+
+def _grams(text):
+    """1-gram + 2-gram 집합"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class NgramIndex:
+    """문자열 컬럼 하나에 대한 부분일치 인덱스 (고유값 단위)"""
+
+    def __init__(self, values):
+        value_rows = {}
+        for row_id, v in enumerate(values):
+            key = '' if v is None or (isinstance(v, float) and v != v) else str(v)
+            value_rows.setdefault(key, []).append(row_id)
+
+        self.values = list(value_rows)
+        self._rows = [np.asarray(value_rows[v], dtype=np.int64) for v in self.values]
+        self._exact = {v: i for i, v in enumerate(self.values)}
+        self._folded = [v.casefold() for v in self.values]
+        self._chosung = [to_chosung(v) for v in self.values]
+        self._plain_postings = self._build_postings(self._folded)
+        self._chosung_postings = self._build_postings(self._chosung)
+
+    @staticmethod
+    def _build_postings(strings):
+        postings = {}
+        for vid, s in enumerate(strings):
+            for g in _grams(s):
+                postings.setdefault(g, set()).add(vid)
+        return postings
+
+    def _match_value_ids(self, q):
+        if is_chosung_query(q):
+            postings, strings = self._chosung_postings, self._chosung
+        else:
+            q = q.casefold()
+            postings, strings = self._plain_postings, self._folded
+
+        grams = [q[i:i + 2] for i in range(len(q) - 1)] or [q]
+        candidates = None
+        for g in sorted(grams, key=lambda g: len(postings.get(g, ()))):
+            found = postings.get(g)
+            if not found:
+                return []
+            candidates = set(found) if candidates is None else candidates & found
+            if not candidates:
+                return []
+        return [vid for vid in candidates if q in strings[vid]]
+
+    def _rows_for(self, value_ids):
+        if not value_ids:
+            return _EMPTY
+        if len(value_ids) == 1:
+            return self._rows[value_ids[0]]
+        return np.sort(np.concatenate([self._rows[vid] for vid in value_ids]))
+
+    def search(self, q):
+        """부분일치(대소문자 무시) 또는 초성 검색 → 정렬된 행 번호"""
+        return self._rows_for(self._match_value_ids(q.strip()))
+
+    def exact(self, value):
+        vid = self._exact.get(value)
+        return _EMPTY if vid is None else self._rows[vid]
+
+    def sorted_values(self):
+        return sorted(v for v in self.values if v)
+
+
+class RespondentSearchIndex:
+    """개인별 선택 표(per_person_df)의 이름/소속 검색 + 드롭다운 목록"""
+
+    def __init__(self, per_person_df, no_menu_label):
+        self.frame = per_person_df
+        self.n_rows = len(per_person_df)
+        self.name_index = NgramIndex(per_person_df['이름'].tolist())
+        self.aff_index = NgramIndex(per_person_df['소속'].tolist())
+        self.menu_rows = np.flatnonzero(per_person_df['메뉴'].to_numpy() != no_menu_label)
+        self.name_options = self.name_index.sorted_values()
+
+    def filter(self, name_q="", aff_q="", only_menu_selected=False, exact_name=None):
+        """조건을 모두 만족하는 행 번호 (None이면 전체)"""
+        ids = None
+        if name_q.strip():
+            ids = self.name_index.search(name_q)
+        if aff_q.strip():
+            found = self.aff_index.search(aff_q)
+            ids = found if ids is None else np.intersect1d(ids, found, assume_unique=True)
+        if exact_name is not None:
+            found = self.name_index.exact(exact_name)
+            ids = found if ids is None else np.intersect1d(ids, found, assume_unique=True)
+        if only_menu_selected:
+            ids = self.menu_rows if ids is None else np.intersect1d(ids, self.menu_rows, assume_unique=True)
+        return ids
+
+    def select(self, row_ids):
+        return self.frame if row_ids is None else self.frame.iloc[row_ids]
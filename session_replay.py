@@ -0,0 +1,262 @@
+"""실제 참여자 클릭 기록 재생 (성능 회귀 시험)
+
+telemetry.py가 저장소 이벤트 로그에 남긴 카테고리 화면 조작(수산물/메뉴 켜기·끄기,
+← 이전, 초기화, 다음/제출)을 세션별 트레이스로 뽑고, streamlit AppTest로 같은 순서대로
+다시 눌러 조작마다 rerun 시간을 잽니다. 이름/소속/세션 ID는 트레이스에 들어가지 않습니다.
+
+재생할 때 저장소는 memory://(프로세스 안 임시 SQLite), Google Sheets는 secrets 없이
+연결하지 않으므로 운영 데이터에 아무것도 쓰지 않습니다. 생각하는 시간은 건너뛰고 바로 다음 조작.
+
+    python session_replay.py export --out traces.jsonl [--store-url URL] [--limit 200]
+    python session_replay.py replay traces.jsonl [--report report.json]
+                                    [--baseline perf_baseline.json [--tolerance 1.25]] [--write-baseline PATH]
+
+--baseline을 주면 조작 종류별 p50/p95가 기준보다 tolerance배(+ 여유 SLACK_MS) 넘게 느려졌을 때
+종료 코드 1로 끝나므로 CI에서 그대로 쓸 수 있습니다.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+TRACE_FORMAT = 1
+MIN_SAMPLES = 5
+SLACK_MS = 5.0
+NAV_LABELS = {'prev': "← 이전", 'reset': "초기화"}
+
+
+# ---- 이벤트 로그 → 트레이스 ----
+
+def _parse_action(event):
+    """telemetry 이벤트 → 재생 조작 dict (재생 대상이 아니면 None)"""
+    kind, detail = event.get('kind'), event.get('detail') or ''
+    if event.get('step') != 'category_loop' or kind not in ('toggle', 'nav'):
+        return None
+    action = {'category': int(event['category'])}
+    if kind == 'nav':
+        action['action'] = detail
+    elif detail.startswith('ing:'):
+        action.update(action='ingredient', ingredient=detail[5:])
+    elif detail.startswith('menu:') and '|' in detail:
+        ingredient, menu = detail[6:].split('|', 1)
+        action.update(action='menu', ingredient=ingredient, menu=menu)
+    else:
+        return None
+    return action
+
+
+def extract_traces(events, min_actions=2, limit=None):
+    """세션별 조작 순서 [{'id', 'actions': [...]}] (세션 ID는 순번으로 바꿈)"""
+    by_session = defaultdict(list)
+    for event in events:
+        action = _parse_action(event)
+        if action is not None:
+            by_session[event['session']].append((float(event.get('at') or 0), action))
+    traces = []
+    for actions in by_session.values():
+        if len(actions) < min_actions:
+            continue
+        actions.sort(key=lambda item: item[0])
+        t0 = actions[0][0]
+        traces.append({'id': f"trace-{len(traces) + 1:04d}",
+                       'actions': [{**a, 't': round(at - t0, 2)} for at, a in actions]})
+        if limit and len(traces) >= limit:
+            break
+    return traces
+
+
+def write_traces(traces, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'format': TRACE_FORMAT, 'traces': len(traces)}) + "\n")
+        for trace in traces:
+            f.write(json.dumps(trace, ensure_ascii=False) + "\n")
+
+
+def read_traces(path):
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('format') != TRACE_FORMAT:
+            raise ValueError(f"트레이스 형식 {TRACE_FORMAT} 파일이 아닙니다: {path}")
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ---- 재생 ----
+
+def _find_button(at, action, catalog):
+    """조작에 해당하는 버튼 (없으면 None)"""
+    idx = action['category']
+    name = action['action']
+    if name == 'ingredient':
+        key = f"ing_{idx}_{action['ingredient']}"
+        return next((b for b in at.button if b.key == key), None)
+    if name == 'menu':
+        _, ing_list = catalog.categories[idx]
+        chosen = [ing for ing in ing_list if ing in at.session_state['selected_ingredients']]
+        if action['ingredient'] not in chosen:
+            return None
+        prefix = f"menu_{idx}_{chosen.index(action['ingredient'])}_"
+        suffix = f"_{action['menu']}"
+        return next((b for b in at.button if b.key and b.key.startswith(prefix) and b.key.endswith(suffix)), None)
+    if name in NAV_LABELS:
+        label = NAV_LABELS[name]
+    elif name in ('next', 'submit'):
+        label = "제출 →" if name == 'submit' else "다음 →"
+    else:
+        return None
+    return next((b for b in at.button if b.label == label), None)
+
+
+def replay_trace(trace, app_path, catalog, timeout=60):
+    """트레이스 1개 재생. ([(조작, ms)], 건너뛴 조작 수)"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app_path, default_timeout=timeout)
+    first = trace['actions'][0]['category']
+    at.session_state['step'] = 'category_loop'
+    at.session_state['category_index'] = first
+    at.session_state['name'] = "재생"
+    at.session_state['affiliation'] = "재생"
+    at.session_state['selected_ingredients'] = []
+    at.session_state['selected_menus'] = {}
+    at.run()
+
+    timings, skipped = [], 0
+    for action in trace['actions']:
+        if at.session_state['step'] != 'category_loop' or at.session_state['category_index'] != action['category']:
+            skipped += 1  # 이 빌드에서 화면 흐름이 달라짐 (카탈로그 변경 등)
+            continue
+        button = _find_button(at, action, catalog)
+        if button is None or button.disabled:
+            skipped += 1
+            continue
+        t0 = time.perf_counter()
+        button.click().run()
+        timings.append((action['action'], (time.perf_counter() - t0) * 1000))
+        if at.exception:
+            raise RuntimeError(f"{trace['id']} {action}: {at.exception[0].value}")
+    return timings, skipped
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def summarize(samples):
+    """{조작: [ms]} → {조작: {'n', 'p50', 'p95', 'max'}} ('all' 포함)"""
+    samples = dict(samples)
+    samples['all'] = [ms for values in samples.values() for ms in values]
+    return {name: {'n': len(values), 'p50': round(_percentile(values, 0.5), 1),
+                   'p95': round(_percentile(values, 0.95), 1), 'max': round(max(values), 1)}
+            for name, values in samples.items() if values}
+
+
+def replay(traces, app_path=os.path.join(APP_DIR, 'app.py'), warmup=1):
+    """모든 트레이스 재생 (앞 warmup개는 캐시 예열용으로 재고 버림). 보고서 dict"""
+    app_path = os.path.abspath(app_path)
+    os.environ['BLUEFOOD_STORE_URL'] = 'memory://'
+    os.environ.setdefault('BLUEFOOD_DATA_DIR', tempfile.mkdtemp(prefix='bluefood-replay-'))
+    os.chdir(os.environ['BLUEFOOD_DATA_DIR'])  # 작업 폴더의 예전 엑셀 백업 등을 읽지 않도록
+    sys.path.insert(0, os.path.dirname(app_path))
+    from catalog import load_catalog
+    catalog = load_catalog()
+
+    samples, skipped = defaultdict(list), 0
+    t0 = time.perf_counter()
+    for i, trace in enumerate(traces):
+        timings, n_skipped = replay_trace(trace, app_path, catalog)
+        if i < warmup:
+            continue
+        skipped += n_skipped
+        for name, ms in timings:
+            samples[name].append(ms)
+    return {
+        'traces': max(0, len(traces) - warmup),
+        'skipped_actions': skipped,
+        'seconds': round(time.perf_counter() - t0, 1),
+        'actions': summarize(samples),
+    }
+
+
+def compare(report, baseline, tolerance=1.25):
+    """기준보다 느려진 항목 목록 [(조작, 지표, 기준 ms, 현재 ms)]"""
+    regressions = []
+    for name, base in baseline.get('actions', {}).items():
+        now = report['actions'].get(name)
+        if now is None or now['n'] < MIN_SAMPLES or base['n'] < MIN_SAMPLES:
+            continue
+        for metric in ('p50', 'p95'):
+            if now[metric] > base[metric] * tolerance + SLACK_MS:
+                regressions.append((name, metric, base[metric], now[metric]))
+    return regressions
+
+
+# ---- CLI ----
+
+def _export(args):
+    sys.path.insert(0, APP_DIR)
+    from storage import default_store_url, open_store
+    store = open_store(args.store_url or default_store_url())
+    events, _ = store.read_events()
+    traces = extract_traces(events, min_actions=args.min_actions, limit=args.limit)
+    write_traces(traces, args.out)
+    print(f"🎞️ {store.label} 이벤트 {len(events)}건 → 트레이스 {len(traces)}개: {args.out}")
+
+
+def _replay(args):
+    for name in ('report', 'baseline', 'write_baseline'):  # replay()가 작업 폴더를 옮기므로
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    traces = read_traces(args.traces)
+    report = replay(traces, app_path=args.app, warmup=args.warmup)
+    print(f"▶️ 트레이스 {report['traces']}개 재생 ({report['seconds']}s, 건너뛴 조작 {report['skipped_actions']}건)")
+    for name, s in report['actions'].items():
+        print(f"  {name:<11} n={s['n']:<5} p50 {s['p50']:>7.1f}ms  p95 {s['p95']:>7.1f}ms  max {s['max']:>7.1f}ms")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.write_baseline:
+        with open(args.write_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📌 기준 저장: {args.write_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for name, metric, before, after in regressions:
+            print(f"❌ {name} {metric}: {before:.1f}ms → {after:.1f}ms")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ 기준 대비 회귀 없음 (허용 {args.tolerance}배 + {SLACK_MS:.0f}ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="참여자 조작 트레이스 추출 / 재생")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ex = sub.add_parser('export', help="저장소 이벤트 로그 → 트레이스 JSONL")
+    ex.add_argument('--out', default='traces.jsonl')
+    ex.add_argument('--store-url', default=None, help="기본값: BLUEFOOD_STORE_URL 또는 BLUEFOOD_DATA_DIR의 SQLite")
+    ex.add_argument('--min-actions', type=int, default=2)
+    ex.add_argument('--limit', type=int, default=None)
+    ex.set_defaults(func=_export)
+
+    rp = sub.add_parser('replay', help="트레이스 재생 + 조작별 rerun 시간")
+    rp.add_argument('traces')
+    rp.add_argument('--app', default=os.path.join(APP_DIR, 'app.py'))
+    rp.add_argument('--warmup', type=int, default=1, help="결과에서 뺄 앞쪽 트레이스 수 (캐시 예열)")
+    rp.add_argument('--report', default=None)
+    rp.add_argument('--baseline', default=None)
+    rp.add_argument('--tolerance', type=float, default=1.25)
+    rp.add_argument('--write-baseline', default=None)
+    rp.set_defaults(func=_replay)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
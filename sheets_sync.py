@@ -0,0 +1,122 @@
+"""Google Sheets ↔ 로컬 백업 양방향 증분 동기화
+
+- pull: 저장된 워터마크 이후에 Sheet에 추가된 행만 범위 조회(get_values)로 가져와
+  응답ID 기준으로 중복을 제거한 뒤 로컬 저장소에 추가
+  (저장소가 스키마 2면 선택 열을 정규 JSON으로 바꾸고, 읽을 수 없는 행은 격리)
+- push: 로컬에서 업로드 대기 중인 행을 append_rows 한 번으로 올림
+"""
+from migrate_schema import SCHEMA_VERSION, canonicalize_rows, quarantine, store_schema_version
+from storage import RESPONSE_COLUMNS, normalize_row
+
+WATERMARK_KEY = 'sheet_watermark'
+
+
+def column_letter(n):
+    """1 → A, 27 → AA"""
+    letters = ''
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+class SheetsSync:
+    """worksheet: gspread Worksheet 또는 같은 메서드를 가진 가짜 객체
+    (row_values, get_values, append_rows, update_cell)"""
+
+    def __init__(self, worksheet, store):
+        self.worksheet = worksheet
+        self.store = store
+
+    def ensure_header(self):
+        header = self.worksheet.row_values(1)
+        if not header or all(cell == '' for cell in header):
+            self.worksheet.append_rows([RESPONSE_COLUMNS])
+            return list(RESPONSE_COLUMNS)
+        # 나중에 생긴 열(응답ID, 카탈로그버전)이 없는 예전 Sheet는 오른쪽 끝에 열 추가
+        for col in RESPONSE_COLUMNS[RESPONSE_COLUMNS.index('응답ID'):]:
+            if col not in header:
+                self.worksheet.update_cell(1, len(header) + 1, col)
+                header = header + [col]
+        return header
+
+    def pull(self):
+        """워터마크 이후 행만 읽어 로컬에 반영. (읽은 행 수, 새로 추가된 행 수)"""
+        header = self.ensure_header()
+        watermark = int(self.store.get_meta(WATERMARK_KEY, 0) or 0)
+        first_row = watermark + 2  # 1행은 헤더
+        raw = self.worksheet.get_values(f"A{first_row}:{column_letter(len(header))}")
+        values = [r for r in raw if any(str(c).strip() for c in r)]
+        if not values:
+            if raw:
+                self.store.set_meta(WATERMARK_KEY, watermark + len(raw))
+            return 0, 0
+
+        rows = [normalize_row(dict(zip(header, r))) for r in values]
+        if store_schema_version(self.store) >= SCHEMA_VERSION:
+            rows, bad = canonicalize_rows(rows)
+            quarantine(self.store, bad)
+        known = self.store.known_ids()
+        fresh = [r for r in rows if str(r['응답ID']) not in known]
+        added = self.store.append_rows(fresh) if fresh else []
+        self.store.set_meta(WATERMARK_KEY, watermark + len(raw))  # 빈 행도 Sheet의 한 줄
+        return len(values), len(added)
+
+    def push(self):
+        """업로드 대기열을 Sheet로 올림. 올린 행 수"""
+        rows = self.store.pending_upload_rows()
+        if not rows:
+            return 0
+        header = self.ensure_header()
+        values = [[str(r.get(col, '')) for col in header] for r in rows]
+        self.worksheet.append_rows(values)
+        self.store.mark_uploaded([r['응답ID'] for r in rows])
+        return len(rows)
+
+    def sync(self):
+        pushed = self.push()
+        read, pulled = self.pull()
+        return {'pushed': pushed, 'read': read, 'pulled': pulled}
+
+
+class InMemoryWorksheet:
+    """테스트/로컬 개발용 가짜 워크시트 (SheetsSync가 쓰는 메서드만 구현)"""
+
+    def __init__(self, rows=None):
+        self.rows = [list(r) for r in (rows or [])]
+        self.read_calls = []
+
+    def row_values(self, row):
+        return list(self.rows[row - 1]) if len(self.rows) >= row else []
+
+    def get_values(self, range_name):
+        start = range_name.split(':')[0]
+        first_row = int(''.join(ch for ch in start if ch.isdigit()))
+        self.read_calls.append(range_name)
+        return [list(r) for r in self.rows[first_row - 1:]]
+
+    def get_all_values(self):
+        return [list(r) for r in self.rows]
+
+    def append_row(self, values):
+        self.rows.append(list(values))
+
+    def append_rows(self, values):
+        self.rows.extend(list(r) for r in values)
+
+    def batch_update(self, data):
+        for item in data:
+            cell = item['range']
+            letters = ''.join(ch for ch in cell if ch.isalpha())
+            col = 0
+            for ch in letters:
+                col = col * 26 + ord(ch) - 64
+            self.update_cell(int(cell[len(letters):]), col, item['values'][0][0])
+
+    def update_cell(self, row, col, value):
+        while len(self.rows) < row:
+            self.rows.append([])
+        r = self.rows[row - 1]
+        while len(r) < col:
+            r.append('')
+        r[col - 1] = value
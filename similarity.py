@@ -0,0 +1,64 @@
+"""항목 간 유사도 인덱스 ("X를 고른 응답자는 Y도 골랐다")
+
+동시 선택 수 C = Xᵀ X (X: 응답자×항목 0/1 희소 행렬)에서
+- cosine  = C_ij / √(c_i · c_j)
+- jaccard = C_ij / (c_i + c_j − C_ij)
+를 계산하고 항목마다 상위 k개 이웃만 남깁니다. C는 만드는 동안만 쓰고 버리므로 인덱스 크기는
+항목 수 × k이고, 조회는 저장된 목록을 그대로 돌려주므로 O(k).
+
+응답이 들어올 때마다 고치지는 않습니다(증분 갱신). 응답 1건을 더하려면 C 전체가 있어야 하는데,
+C를 들고 있으면 인덱스 크기가 항목 수²가 되기 때문입니다. 대신 호출하는 쪽이 응답자×항목 행렬로
+주기적으로 다시 만듭니다(app.py: 데이터 버전이 바뀌었고 마지막 재구성 후 SIMILARITY_REBUILD_SEC이
+지났을 때). 10만 명 × 400항목에서 0.2초 남짓 걸립니다.
+"""
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+
+METRICS = ('cosine', 'jaccard')
+
+
+class SimilarityIndex:
+    """counts: 항목 → 선택 수, neighbours: 지표 → 항목 → [(이웃, 점수, 동시 선택 수)] (상위 k개)"""
+
+    def __init__(self, k=10, min_support=1):
+        self.k = k
+        self.min_support = min_support
+        self.counts = Counter()
+        self.neighbours = {metric: {} for metric in METRICS}
+
+    @classmethod
+    def from_matrix(cls, matrix, labels, k=10, min_support=1):
+        index = cls(k=k, min_support=min_support)
+        x = sp.csr_matrix(matrix, dtype=np.int32)
+        cooc = (x.T @ x).tocsr()
+        diag = cooc.diagonal().astype(np.float64)
+        rank = np.argsort(np.argsort(np.asarray(labels, dtype=object)))  # 같은 점수면 이름 순
+        for i, label in enumerate(labels):
+            if not diag[i]:
+                continue
+            index.counts[label] = int(diag[i])
+            start, end = cooc.indptr[i], cooc.indptr[i + 1]
+            others, co = cooc.indices[start:end], cooc.data[start:end].astype(np.float64)
+            keep = (others != i) & (co >= max(min_support, 1))
+            others, co = others[keep], co[keep]
+            if not len(others):
+                continue
+            scores = {
+                'cosine': co / np.sqrt(diag[i] * diag[others]),
+                'jaccard': co / (diag[i] + diag[others] - co),
+            }
+            for metric in METRICS:
+                top = np.lexsort((rank[others], -co, -scores[metric]))[:k]
+                index.neighbours[metric][label] = [(labels[others[j]], round(float(scores[metric][j]), 4),
+                                                    int(co[j])) for j in top]
+        return index
+
+    def query(self, item, metric='cosine', limit=None):
+        """[(이웃, 점수, 동시 선택 수), ...] 점수 내림차순"""
+        found = self.neighbours[metric].get(item, [])
+        return found if limit is None else found[:limit]
+
+    def items(self):
+        return sorted(self.counts, key=lambda i: (-self.counts[i], i))
@@ -0,0 +1,168 @@
+"""관리자 SQL 콘솔용 분석 DB (데이터 버전마다 한 번 만드는 메모리 SQLite)
+
+응답 저장소 형식(엑셀/SQLite/Redis)과 관계없이 아래 정규화된 표를 만들어 둡니다.
+
+- respondents(response_id, name, affiliation, submitted_at, catalog_version, n_ingredients, n_menus)
+- selections_long(response_id, affiliation, submitted_at, kind, ingredient, menu)
+  kind = 'ingredient'(menu는 NULL) / 'menu'
+- catalog(category, ingredient, cooking_method, menu)
+- nutrients(menu, <성분 열>...)  ← 영양 성분표(nutrition.py)가 있을 때만
+
+질의는 각자 읽기 전용 연결에서 돌고, 권한 검사기(authorizer)가 SELECT 외의 동작(쓰기, ATTACH,
+PRAGMA 등)을 막습니다. progress handler가 timeout_sec을 넘긴 질의를 중단하고, 결과는
+max_rows행까지만 가져옵니다. SQLite는 질의 실행 중 GIL을 놓으므로 설문 화면을 막지 않습니다.
+"""
+import itertools
+import sqlite3
+import time
+
+import pandas as pd
+
+DEFAULT_TIMEOUT_SEC = 5
+DEFAULT_MAX_ROWS = 10000
+PROGRESS_STEPS = 10000  # 이 VM 명령 수마다 시간 확인
+
+SCHEMA = """
+CREATE TABLE respondents (
+    response_id TEXT, name TEXT, affiliation TEXT, submitted_at TEXT, catalog_version TEXT,
+    n_ingredients INTEGER, n_menus INTEGER
+);
+CREATE TABLE selections_long (
+    response_id TEXT, affiliation TEXT, submitted_at TEXT, kind TEXT, ingredient TEXT, menu TEXT
+);
+CREATE TABLE catalog (category TEXT, ingredient TEXT, cooking_method TEXT, menu TEXT);
+"""
+
+EXAMPLES = {
+    "소속별 응답 수": "SELECT affiliation, COUNT(*) AS n\nFROM respondents\nGROUP BY affiliation\nORDER BY n DESC",
+    "조리법별 메뉴 선택 수": (
+        "SELECT c.cooking_method, COUNT(*) AS n\nFROM selections_long s\n"
+        "JOIN catalog c ON c.menu = s.menu AND c.ingredient = s.ingredient\n"
+        "WHERE s.kind = 'menu'\nGROUP BY c.cooking_method\nORDER BY n DESC"),
+    "카테고리별 선택 응답자 비율(%)": (
+        "SELECT c.category,\n"
+        "       ROUND(100.0 * COUNT(DISTINCT s.response_id) / (SELECT COUNT(*) FROM respondents), 1) AS pct\n"
+        "FROM selections_long s\nJOIN (SELECT DISTINCT category, ingredient FROM catalog) c ON c.ingredient = s.ingredient\n"
+        "WHERE s.kind = 'ingredient'\nGROUP BY c.category\nORDER BY pct DESC"),
+    "날짜별 응답 수": (
+        "SELECT substr(submitted_at, 1, 10) AS day, COUNT(*) AS n\nFROM respondents\nGROUP BY day\nORDER BY day"),
+}
+
+_ALLOWED_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION,
+                    getattr(sqlite3, 'SQLITE_RECURSIVE', 33)}
+_counter = itertools.count()
+
+
+class QueryTimeout(Exception):
+    pass
+
+
+class QueryResult:
+    def __init__(self, frame, truncated, elapsed_ms):
+        self.frame = frame
+        self.truncated = truncated
+        self.elapsed_ms = elapsed_ms
+
+
+def _authorize(action, arg1, arg2, db_name, trigger):
+    return sqlite3.SQLITE_OK if action in _ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+
+class AnalyticsDB:
+    """version: 데이터 버전, tables: 표 이름 → 열 목록"""
+
+    def __init__(self, version=None):
+        self.version = version
+        self._uri = f"file:bluefood-sql-{next(_counter)}?mode=memory&cache=shared"
+        self._keeper = sqlite3.connect(self._uri, uri=True, check_same_thread=False)  # 닫히면 DB도 사라짐
+        self._keeper.executescript(SCHEMA)
+        self.tables = {}
+        self.build_seconds = 0.0
+
+    @classmethod
+    def from_frame(cls, df, load_list, load_dict, menu_data, ingredient_categories, nutrient_table=None,
+                   version=None):
+        t0 = time.perf_counter()
+        db = cls(version)
+        db._load_catalog(menu_data, ingredient_categories)
+        db._load_responses(df, load_list, load_dict)
+        if nutrient_table is not None:
+            db._load_nutrients(nutrient_table)
+        db._keeper.execute("ANALYZE")  # 인덱스는 만들지 않음 (메모리 전체 스캔이 빠르고, 조인은 SQLite가 임시 인덱스를 씀)
+        db._keeper.commit()
+        db.tables = {name: [row[1] for row in db._keeper.execute(f"PRAGMA table_info({name})")]
+                     for (name,) in db._keeper.execute("SELECT name FROM sqlite_master WHERE type = 'table' "
+                                                       "AND name NOT LIKE 'sqlite_%' ORDER BY rowid")}
+        db.build_seconds = time.perf_counter() - t0
+        return db
+
+    def _load_catalog(self, menu_data, ingredient_categories):
+        category_of = {ing: label for label, ings in ingredient_categories for ing in ings}
+        rows = [(category_of.get(ing), ing, method, menu)
+                for ing, methods in menu_data.items() for method, menus in methods.items() for menu in menus]
+        self._keeper.executemany("INSERT INTO catalog VALUES (?, ?, ?, ?)", rows)
+
+    def _load_responses(self, df, load_list, load_dict):
+        def column(name):
+            if name not in df.columns:
+                return [None] * len(df)
+            values = df[name].astype('string').str.strip()
+            return values.astype(object).where(values.notna() & (values != ''), None).tolist()
+
+        def raw(name):
+            return df[name].tolist() if name in df.columns else [None] * len(df)
+
+        respondents, selections = [], []
+        for i, (rid, name, aff, at, version, ings, menus) in enumerate(zip(
+                column('응답ID'), column('이름'), column('소속'), column('설문일시'), column('카탈로그버전'),
+                raw('선택한_수산물'), raw('선택한_메뉴'))):
+            rid = rid or f"row-{i + 1}"
+            ings = [ing for ing in load_list(ings) if ing]
+            menus = load_dict(menus)
+            n_menus = 0
+            for ing in ings:
+                selections.append((rid, aff, at, 'ingredient', ing, None))
+            for ing, items in menus.items():
+                if not isinstance(items, list):
+                    continue
+                for menu in items:
+                    if menu:
+                        selections.append((rid, aff, at, 'menu', ing, menu))
+                        n_menus += 1
+            respondents.append((rid, name, aff, at, version, len(ings), n_menus))
+        self._keeper.executemany("INSERT INTO respondents VALUES (?, ?, ?, ?, ?, ?, ?)", respondents)
+        self._keeper.executemany("INSERT INTO selections_long VALUES (?, ?, ?, ?, ?, ?)", selections)
+
+    def _load_nutrients(self, table):
+        columns = ", ".join(f'"{n}" REAL' for n in table.nutrients)
+        self._keeper.execute(f"CREATE TABLE nutrients (menu TEXT PRIMARY KEY, {columns})")
+        marks = ", ".join("?" * (len(table.nutrients) + 1))
+        rows = [(menu, *[None if pd.isna(v) else float(v) for v in values])
+                for menu, values in zip(table.menus, table.values)]
+        self._keeper.executemany(f"INSERT INTO nutrients VALUES ({marks})", rows)
+
+    def query(self, sql, timeout_sec=DEFAULT_TIMEOUT_SEC, max_rows=DEFAULT_MAX_ROWS):
+        """SELECT 한 문장 실행 → QueryResult. 시간 초과는 QueryTimeout, 문법/권한 오류는 sqlite3.Error"""
+        conn = sqlite3.connect(self._uri, uri=True)
+        try:
+            conn.execute("PRAGMA query_only = ON")
+            conn.set_authorizer(_authorize)
+            deadline = time.monotonic() + timeout_sec
+            conn.set_progress_handler(lambda: time.monotonic() > deadline, PROGRESS_STEPS)
+            t0 = time.perf_counter()
+            try:
+                cursor = conn.execute(sql)
+                rows = cursor.fetchmany(max_rows + 1) if cursor.description else []
+            except sqlite3.OperationalError as e:
+                if time.monotonic() > deadline:
+                    raise QueryTimeout(f"{timeout_sec}초 안에 끝나지 않아 중단했습니다") from e
+                raise
+            columns = [d[0] for d in cursor.description or ()]
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+        finally:
+            conn.close()
+        truncated = len(rows) > max_rows
+        return QueryResult(pd.DataFrame(rows[:max_rows], columns=columns), truncated, elapsed_ms)
+
+    def close(self):
+        self._keeper.close()
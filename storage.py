@@ -0,0 +1,857 @@
+"""설문 응답 저장소
+
+- ExcelResponseStore: 단일 프로세스용 bluefood_survey.xlsx (기존 방식)
+- SQLiteResponseStore: 공유 볼륨의 SQLite 파일 (여러 Streamlit 프로세스 공용, 기본값)
+- RedisResponseStore: Redis 프로토콜 서버 (redis-py 호환 클라이언트면 무엇이든)
+
+모든 저장소는 응답 외에 동기화 메타데이터, 업로드 대기열, 임시저장(draft)/캐시용
+키-값 공간(kv_get/kv_set, 값은 JSON으로 저장), 설문 진행 이벤트 로그(append_events/read_events),
+소속별 응답 수 카운터(affiliation_counts, 응답을 넣을 때 함께 증가)와
+프로세스 간 잠금(lock)을 같은 방식으로 제공합니다.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+RESPONSE_COLUMNS = ['이름', '소속', '설문일시', '선택한_수산물', '선택한_메뉴', '응답ID', '카탈로그버전']
+# 설문 진행 이벤트 (telemetry.py). 응답 데이터가 아니라 version()은 바뀌지 않음
+EVENT_FIELDS = ['session', 'at', 'kind', 'step', 'category', 'value', 'detail']
+# 소속별 응답 수 카운터를 응답 전체로 한 번 센 적이 있는지 (카운터가 생기기 전 저장소)
+AFFILIATION_COUNTS_READY = 'affiliation_counts_ready'
+
+
+def new_response_id():
+    return uuid.uuid4().hex
+
+
+def legacy_response_id(row):
+    """응답ID가 없는 예전 행: 내용 해시로 결정적인 ID를 만든다 (양쪽 저장소에서 동일)"""
+    parts = [str(row.get(col, '') if row.get(col) is not None else '') for col in RESPONSE_COLUMNS[:5]]
+    return 'legacy-' + hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def _blank(v):
+    return v is None or (isinstance(v, float) and pd.isna(v)) or str(v).strip() == ''
+
+
+def normalize_row(row):
+    """dict → RESPONSE_COLUMNS 순서의 dict (응답ID 보정)"""
+    out = {col: ('' if _blank(row.get(col)) else row.get(col)) for col in RESPONSE_COLUMNS}
+    if _blank(out['응답ID']):
+        out['응답ID'] = legacy_response_id(out)
+    return out
+
+
+def make_response_row(response_id, name, affiliation, submitted_at, selected_ingredients, selected_menus,
+                      catalog_version=''):
+    return {
+        '이름': name,
+        '소속': affiliation,
+        '설문일시': submitted_at,
+        '선택한_수산물': json.dumps(selected_ingredients, ensure_ascii=False),
+        '선택한_메뉴': json.dumps(selected_menus, ensure_ascii=False),
+        '응답ID': response_id,
+        '카탈로그버전': catalog_version or '',
+    }
+
+
+def affiliation_key(value):
+    return '' if _blank(value) else str(value).strip()
+
+
+def count_affiliations(values):
+    counts = {}
+    for value in values:
+        key = affiliation_key(value)
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def ensure_affiliation_counts(store):
+    """카운터가 생기기 전에 쌓인 응답이 있으면 한 번 전부 세어 둠"""
+    if not store.get_meta(AFFILIATION_COUNTS_READY):
+        store.rebuild_affiliation_counts()
+
+
+def _json_default(value):
+    if hasattr(value, 'item'):  # numpy 스칼라
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return str(value)
+    raise TypeError(f"kv 값은 JSON으로 저장합니다 ({type(value).__name__}는 목록/사전으로 바꿔 주세요)")
+
+
+def kv_dumps(value):
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+def kv_loads(raw, default=None):
+    """JSON이 아닌 값(예전 형식 등)은 없는 것으로 봄 (공유 데이터를 코드로 실행하지 않음)"""
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return default
+
+
+def rows_to_frame(rows):
+    return pd.DataFrame(rows, columns=RESPONSE_COLUMNS)
+
+
+class LockTimeout(RuntimeError):
+    pass
+
+
+class ExcelResponseStore:
+    """bluefood_survey.xlsx + 사이드카 JSON(동기화 워터마크, 업로드 대기열)
+
+    한 프로세스 안에서만 안전합니다. 여러 프로세스는 SQLite/Redis 저장소를 쓰세요.
+    """
+
+    label = "excel"
+
+    def __init__(self, filename="bluefood_survey.xlsx"):
+        self.filename = filename
+        self.meta_filename = os.path.splitext(filename)[0] + ".sync.json"
+        self.events_filename = os.path.splitext(filename)[0] + ".events.jsonl"
+        self._lock = threading.RLock()
+        self._ids_cache = (None, set())
+        self._frame_cache = (None, None)
+        self._kv = {}
+
+    # ---- 버전 / 읽기 ----
+
+    def version(self):
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def read_frame(self):
+        """파일 버전(수정시각, 크기)이 같으면 마지막으로 읽은 표를 재사용 (실시간 모드가 자주 부름)"""
+        with self._lock:
+            version = self.version()
+            if version is None:
+                return pd.DataFrame(columns=RESPONSE_COLUMNS)
+            if self._frame_cache[0] != version:
+                self._frame_cache = (version, self._parse())
+            return self._frame_cache[1].copy()
+
+    def _parse(self):
+        df = pd.read_excel(self.filename)
+        for col in RESPONSE_COLUMNS:
+            if col not in df.columns:
+                df[col] = ''
+        missing = df['응답ID'].isna() | (df['응답ID'].astype(str).str.strip() == '')
+        if missing.any():
+            df['응답ID'] = df['응답ID'].astype(object)
+            df.loc[missing, '응답ID'] = [legacy_response_id(r) for r in df.loc[missing].to_dict('records')]
+        return df
+
+    def read_since(self, seq):
+        """seq(행 번호) 이후 응답. ([행 dict], 마지막 seq)"""
+        df = self.read_frame()
+        return [normalize_row(r) for r in df.iloc[seq:].to_dict('records')], len(df)
+
+    def count(self):
+        return len(self.read_frame())
+
+    def known_ids(self):
+        version = self.version()
+        cached_version, ids = self._ids_cache
+        if version is not None and version == cached_version:
+            return ids
+        ids = set(self.read_frame()['응답ID'].astype(str))
+        self._ids_cache = (version, ids)
+        return ids
+
+    # ---- 쓰기 ----
+
+    def append_rows(self, rows, queue_upload=False):
+        """새 행 추가 (이미 있는 응답ID는 건너뜀). 추가된 응답ID 목록을 돌려준다"""
+        rows = [normalize_row(r) for r in rows]
+        with self._lock:
+            df = self.read_frame()
+            known = set(df['응답ID'].astype(str))
+            fresh = []
+            for r in rows:
+                if str(r['응답ID']) not in known:
+                    known.add(str(r['응답ID']))
+                    fresh.append(r)
+            if not fresh:
+                return []
+            df = pd.concat([df, pd.DataFrame(fresh, columns=RESPONSE_COLUMNS)], ignore_index=True)
+            df.to_excel(self.filename, index=False)
+            self._ids_cache = (self.version(), known)
+            added = [r['응답ID'] for r in fresh]
+            counts = self.get_meta('affiliation_counts', {}) or {}
+            for key, n in count_affiliations(r['소속'] for r in fresh).items():
+                counts[key] = counts.get(key, 0) + n
+            self.set_meta('affiliation_counts', counts)
+            if queue_upload:
+                self.enqueue_upload(added)
+            return added
+
+    def replace_rows(self, rows, remove_ids=()):
+        """응답ID가 같은 행을 제자리에서 바꾸고 remove_ids 행은 지움 (스키마 마이그레이션용). 바뀐 행 수"""
+        replacements = {str(r['응답ID']): r for r in (normalize_row(r) for r in rows)}
+        remove = {str(rid) for rid in remove_ids}
+        with self._lock:
+            out, changed = [], 0
+            for rec in self.read_frame().to_dict('records'):
+                rid = str(rec['응답ID'])
+                if rid in remove:
+                    changed += 1
+                    continue
+                if rid in replacements:
+                    rec = replacements[rid]
+                    changed += 1
+                out.append(rec)
+            if not changed:
+                return 0
+            pd.DataFrame(out, columns=RESPONSE_COLUMNS).to_excel(self.filename, index=False)
+            self._ids_cache = (None, set())
+            if remove:
+                self.mark_uploaded(remove)
+            self.rebuild_affiliation_counts()
+            return changed
+
+    # ---- 메타데이터 (워터마크, 업로드 대기열) ----
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_filename, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, meta):
+        tmp = self.meta_filename + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp, self.meta_filename)
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            return self._read_meta().get(key, default)
+
+    def set_meta(self, key, value):
+        with self._lock:
+            meta = self._read_meta()
+            meta[key] = value
+            self._write_meta(meta)
+
+    def enqueue_upload(self, response_ids):
+        with self._lock:
+            pending = self.get_meta('pending_upload', [])
+            pending.extend(rid for rid in response_ids if rid not in pending)
+            self.set_meta('pending_upload', pending)
+
+    def pending_upload_rows(self):
+        with self._lock:
+            pending = self.get_meta('pending_upload', [])
+            if not pending:
+                return []
+            df = self.read_frame()
+        wanted = set(pending)
+        rows = [normalize_row(r) for r in df.to_dict('records') if str(r['응답ID']) in wanted]
+        order = {rid: i for i, rid in enumerate(pending)}
+        return sorted(rows, key=lambda r: order[str(r['응답ID'])])
+
+    def mark_uploaded(self, response_ids):
+        done = set(response_ids)
+        with self._lock:
+            pending = self.get_meta('pending_upload', [])
+            self.set_meta('pending_upload', [rid for rid in pending if rid not in done])
+
+    # ---- 소속별 응답 수 ----
+
+    def affiliation_counts(self, affiliations=None):
+        """{소속: 응답 수} (affiliations를 주면 그 소속만, 없는 소속은 0)"""
+        counts = self.get_meta('affiliation_counts', {}) or {}
+        return counts if affiliations is None else {a: counts.get(a, 0) for a in affiliations}
+
+    def rebuild_affiliation_counts(self):
+        """저장된 응답 전체로 다시 셈"""
+        with self._lock:
+            counts = count_affiliations(self.read_frame()['소속'])
+            self.set_meta('affiliation_counts', counts)
+            self.set_meta(AFFILIATION_COUNTS_READY, True)
+        return counts
+
+    # ---- 이벤트 로그 (사이드카 JSONL, 줄 번호가 seq) ----
+
+    def append_events(self, events):
+        if not events:
+            return
+        with self._lock, open(self.events_filename, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps([e.get(k) for k in EVENT_FIELDS], ensure_ascii=False) + "\n" for e in events)
+
+    def read_events(self, since=0):
+        """since(seq) 이후 이벤트. ([이벤트 dict], 마지막 seq)"""
+        events, seq = [], 0
+        try:
+            with self._lock, open(self.events_filename, encoding='utf-8') as f:
+                for seq, line in enumerate(f, start=1):
+                    if seq > since:
+                        events.append(dict(zip(EVENT_FIELDS, json.loads(line))))
+        except OSError:
+            return [], since
+        return events, max(seq, since)
+
+    # ---- 키-값 / 잠금 (프로세스 메모리) ----
+
+    def kv_get(self, namespace, key, default=None):
+        entry = self._kv.get((namespace, key))
+        if entry is None:
+            return default
+        if entry[1] is not None and entry[1] < time.time():
+            self._kv.pop((namespace, key), None)
+            return default
+        return kv_loads(entry[0], default)
+
+    def kv_set(self, namespace, key, value, ttl=None):
+        # 다른 저장소와 같이 JSON으로 (값이 호출한 쪽 객체와 공유되지 않음)
+        self._kv[(namespace, key)] = (kv_dumps(value), time.time() + ttl if ttl else None)
+
+    def kv_delete(self, namespace, key):
+        self._kv.pop((namespace, key), None)
+
+    @contextlib.contextmanager
+    def lock(self, name, timeout=30, lease=60):
+        with self._lock:
+            yield
+
+
+_SQL_COLUMNS = ['name', 'affiliation', 'submitted_at', 'ingredients', 'menus', 'response_id', 'catalog_version']
+_SQL_UPDATE_COLUMNS = [c for c in _SQL_COLUMNS if c != 'response_id']
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    response_id TEXT NOT NULL UNIQUE,
+    name TEXT, affiliation TEXT, submitted_at TEXT, ingredients TEXT, menus TEXT,
+    catalog_version TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS pending_upload (response_id TEXT PRIMARY KEY, queued_at REAL);
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT, key TEXT, value BLOB, expires_at REAL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS locks (name TEXT PRIMARY KEY, owner TEXT, expires_at REAL);
+CREATE TABLE IF NOT EXISTS affiliation_counts (affiliation TEXT PRIMARY KEY, n INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT, at REAL, kind TEXT, step TEXT, category INTEGER, value REAL, detail TEXT
+);
+"""
+
+
+class SQLiteResponseStore:
+    """SQLite 파일 하나를 여러 프로세스가 공유 (쓰기는 BEGIN IMMEDIATE 트랜잭션)
+
+    version()은 쓰기마다 같은 트랜잭션에서 올라가는 revision 값이라,
+    어느 프로세스든 데이터가 바뀌었는지 한 번의 조회로 알 수 있습니다.
+    """
+
+    label = "sqlite"
+
+    def __init__(self, path, journal_mode="WAL", busy_timeout=30.0):
+        self.filename = path
+        self._uri = path.startswith("file:")
+        self._journal_mode = journal_mode
+        self._busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._keepalive = self._conn() if self._uri else None  # 메모리 DB 유지용
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.filename, timeout=self._busy_timeout,
+                                   isolation_level=None, uri=self._uri)
+            if self._journal_mode and not self._uri:
+                conn.execute(f"PRAGMA journal_mode={self._journal_mode}")
+            conn.executescript(_SQLITE_SCHEMA)
+            columns = {r[1] for r in conn.execute("PRAGMA table_info(responses)")}
+            if 'catalog_version' not in columns:  # 카탈로그버전 열이 생기기 전 파일
+                with contextlib.suppress(sqlite3.OperationalError):  # 다른 프로세스가 먼저 추가
+                    conn.execute("ALTER TABLE responses ADD COLUMN catalog_version TEXT NOT NULL DEFAULT ''")
+            self._local.conn = conn
+        return conn
+
+    @contextlib.contextmanager
+    def _write(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _bump_revision(conn):
+        conn.execute("INSERT INTO meta(key, value) VALUES('revision', '1') "
+                     "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+
+    # ---- 버전 / 읽기 ----
+
+    def version(self):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return None if row is None else f"r{row[0]}"
+
+    def read_frame(self):
+        cur = self._conn().execute(f"SELECT {', '.join(_SQL_COLUMNS)} FROM responses ORDER BY seq")
+        return rows_to_frame([dict(zip(RESPONSE_COLUMNS, r)) for r in cur])
+
+    def read_since(self, seq):
+        """seq 이후 응답 (변경 피드용). ([행 dict], 마지막 seq)"""
+        cur = self._conn().execute(
+            f"SELECT seq, {', '.join(_SQL_COLUMNS)} FROM responses WHERE seq > ? ORDER BY seq", (seq,))
+        rows, last = [], seq
+        for r in cur:
+            last = r[0]
+            rows.append(dict(zip(RESPONSE_COLUMNS, r[1:])))
+        return rows, last
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def known_ids(self):
+        return {r[0] for r in self._conn().execute("SELECT response_id FROM responses")}
+
+    # ---- 쓰기 ----
+
+    def append_rows(self, rows, queue_upload=False):
+        rows = [normalize_row(r) for r in rows]
+        added = []
+        with self._write() as conn:
+            for r in rows:
+                cur = conn.execute(
+                    f"INSERT OR IGNORE INTO responses({', '.join(_SQL_COLUMNS)}) VALUES ({', '.join('?' * len(_SQL_COLUMNS))})",
+                    [str(r[col]) for col in RESPONSE_COLUMNS])
+                if cur.rowcount:
+                    added.append(r['응답ID'])
+                    conn.execute("INSERT INTO affiliation_counts VALUES (?, 1) "
+                                 "ON CONFLICT(affiliation) DO UPDATE SET n = n + 1", (affiliation_key(r['소속']),))
+            if added:
+                self._bump_revision(conn)
+                if queue_upload:
+                    now = time.time()
+                    conn.executemany("INSERT OR IGNORE INTO pending_upload VALUES (?, ?)",
+                                     [(rid, now) for rid in added])
+        return added
+
+    def replace_rows(self, rows, remove_ids=()):
+        """응답ID가 같은 행을 제자리에서(seq 유지) 바꾸고 remove_ids 행은 지움. 바뀐 행 수"""
+        rows = [normalize_row(r) for r in rows]
+        changed = 0
+        with self._write() as conn:
+            for r in rows:
+                changed += conn.execute(
+                    f"UPDATE responses SET {', '.join(f'{c} = ?' for c in _SQL_UPDATE_COLUMNS)} WHERE response_id = ?",
+                    [str(r[col]) for col in RESPONSE_COLUMNS if col != '응답ID'] + [str(r['응답ID'])]).rowcount
+            for rid in remove_ids:
+                changed += conn.execute("DELETE FROM responses WHERE response_id = ?", (str(rid),)).rowcount
+                conn.execute("DELETE FROM pending_upload WHERE response_id = ?", (str(rid),))
+            if changed:
+                self._bump_revision(conn)
+                self._recount_affiliations(conn)
+        return changed
+
+    # ---- 소속별 응답 수 ----
+
+    def affiliation_counts(self, affiliations=None):
+        """{소속: 응답 수} (affiliations를 주면 그 소속만, 없는 소속은 0)"""
+        if affiliations is None:
+            return dict(self._conn().execute("SELECT affiliation, n FROM affiliation_counts"))
+        conn = self._conn()
+        out = {}
+        for a in affiliations:
+            row = conn.execute("SELECT n FROM affiliation_counts WHERE affiliation = ?", (a,)).fetchone()
+            out[a] = row[0] if row else 0
+        return out
+
+    @staticmethod
+    def _recount_affiliations(conn):
+        counts = count_affiliations(r[0] for r in conn.execute("SELECT affiliation FROM responses"))
+        conn.execute("DELETE FROM affiliation_counts")
+        conn.executemany("INSERT INTO affiliation_counts VALUES (?, ?)", counts.items())
+        conn.execute("INSERT INTO meta(key, value) VALUES(?, 'true') ON CONFLICT(key) DO UPDATE SET value = 'true'",
+                     (AFFILIATION_COUNTS_READY,))
+        return counts
+
+    def rebuild_affiliation_counts(self):
+        """저장된 응답 전체로 다시 셈 (같은 트랜잭션이라 동시에 들어오는 응답과 어긋나지 않음)"""
+        with self._write() as conn:
+            return self._recount_affiliations(conn)
+
+    # ---- 메타데이터 / 업로드 대기열 ----
+
+    def get_meta(self, key, default=None):
+        if key == 'pending_upload':
+            return [r[0] for r in self._conn().execute(
+                "SELECT response_id FROM pending_upload ORDER BY queued_at")]
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def set_meta(self, key, value):
+        with self._write() as conn:
+            conn.execute("INSERT INTO meta(key, value) VALUES(?, ?) "
+                         "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                         (key, json.dumps(value, ensure_ascii=False)))
+
+    def enqueue_upload(self, response_ids):
+        now = time.time()
+        with self._write() as conn:
+            conn.executemany("INSERT OR IGNORE INTO pending_upload VALUES (?, ?)",
+                             [(rid, now) for rid in response_ids])
+
+    def pending_upload_rows(self):
+        cur = self._conn().execute(
+            f"SELECT {', '.join('r.' + c for c in _SQL_COLUMNS)} FROM pending_upload p "
+            "JOIN responses r ON r.response_id = p.response_id ORDER BY p.queued_at, r.seq")
+        return [dict(zip(RESPONSE_COLUMNS, r)) for r in cur]
+
+    def mark_uploaded(self, response_ids):
+        with self._write() as conn:
+            conn.executemany("DELETE FROM pending_upload WHERE response_id = ?",
+                             [(rid,) for rid in response_ids])
+
+    # ---- 이벤트 로그 ----
+
+    def append_events(self, events):
+        if not events:
+            return
+        with self._write() as conn:
+            conn.executemany(f"INSERT INTO events({', '.join(EVENT_FIELDS)}) VALUES ({', '.join('?' * len(EVENT_FIELDS))})",
+                             [[e.get(k) for k in EVENT_FIELDS] for e in events])
+
+    def read_events(self, since=0):
+        """since(seq) 이후 이벤트. ([이벤트 dict], 마지막 seq)"""
+        cur = self._conn().execute(f"SELECT seq, {', '.join(EVENT_FIELDS)} FROM events WHERE seq > ? ORDER BY seq",
+                                   (since,))
+        events, last = [], since
+        for r in cur:
+            last = r[0]
+            events.append(dict(zip(EVENT_FIELDS, r[1:])))
+        return events, last
+
+    # ---- 키-값 / 잠금 ----
+
+    def kv_get(self, namespace, key, default=None):
+        row = self._conn().execute("SELECT value, expires_at FROM kv WHERE namespace = ? AND key = ?",
+                                   (namespace, key)).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return default
+        return kv_loads(row[0], default)
+
+    def kv_set(self, namespace, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._write() as conn:
+            conn.execute("INSERT OR REPLACE INTO kv VALUES (?, ?, ?, ?)",
+                         (namespace, key, kv_dumps(value), expires_at))
+
+    def kv_delete(self, namespace, key):
+        with self._write() as conn:
+            conn.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    @contextlib.contextmanager
+    def lock(self, name, timeout=30, lease=60):
+        """프로세스 간 잠금 (만료 시각이 있는 임대 행)"""
+        token = f"{self._owner}-{threading.get_ident()}"
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._write() as conn:
+                now = time.time()
+                conn.execute("DELETE FROM locks WHERE name = ? AND expires_at < ?", (name, now))
+                cur = conn.execute("INSERT OR IGNORE INTO locks VALUES (?, ?, ?)", (name, token, now + lease))
+                if cur.rowcount:
+                    break
+            if time.monotonic() > deadline:
+                raise LockTimeout(f"잠금 획득 실패: {name}")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            with self._write() as conn:
+                conn.execute("DELETE FROM locks WHERE name = ? AND owner = ?", (name, token))
+
+
+class RedisResponseStore:
+    """Redis 프로토콜 저장소. client는 redis.Redis 호환 객체 (fakeredis 등 로컬 대체 가능)
+
+    응답 묶음 쓰기: WATCH seq → 없는 응답ID 확인 → MULTI(HSET 응답, ZADD by_seq, seq/revision 갱신) → EXEC
+    seq를 바꾸는 쓰기끼리는 트랜잭션이 겹치면 다시 시도하므로, seq 순서가 곧 커밋 순서이고
+    중복/유실이 없습니다. read_since는 by_seq 정렬 집합에서 새 응답ID만 골라 읽습니다.
+    """
+
+    label = "redis"
+
+    def __init__(self, client, prefix="bluefood"):
+        self.client = client
+        self.prefix = prefix
+        self.filename = f"redis:{prefix}"
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._indexed = False
+
+    def _k(self, *parts):
+        return ":".join((self.prefix,) + parts)
+
+    def version(self):
+        v = self.client.get(self._k('revision'))
+        return None if v is None else f"r{int(v)}"
+
+    def _records(self):
+        raw = self.client.hvals(self._k('responses'))
+        return sorted((json.loads(v) for v in raw), key=lambda rec: rec['seq'])
+
+    def read_frame(self):
+        return rows_to_frame([rec['row'] for rec in self._records()])
+
+    def _ensure_seq_index(self):
+        """by_seq 정렬 집합이 생기기 전에 쌓인 응답을 한 번 색인"""
+        if self._indexed or self.get_meta('seq_index'):
+            self._indexed = True
+            return
+        with self.lock('seq-index', timeout=30, lease=120):
+            if not self.get_meta('seq_index'):
+                mapping = {rec['row']['응답ID']: rec['seq'] for rec in self._records()}
+                if mapping:
+                    self.client.zadd(self._k('by_seq'), mapping)
+                self.set_meta('seq_index', True)
+        self._indexed = True
+
+    def read_since(self, seq):
+        self._ensure_seq_index()
+        entries = self.client.zrangebyscore(self._k('by_seq'), f"({int(seq)}", '+inf', withscores=True)
+        if not entries:
+            return [], seq
+        raw = self.client.hmget(self._k('responses'), [rid for rid, _ in entries])
+        rows = [json.loads(v)['row'] for v in raw if v is not None]
+        return rows, int(entries[-1][1])
+
+    def count(self):
+        return self.client.hlen(self._k('responses'))
+
+    def known_ids(self):
+        return {k.decode() if isinstance(k, bytes) else k for k in self.client.hkeys(self._k('responses'))}
+
+    def append_rows(self, rows, queue_upload=False):
+        from redis.exceptions import WatchError
+        rows = [normalize_row(r) for r in rows]
+        ids = [str(r['응답ID']) for r in rows]
+        if not rows:
+            return []
+        key, seq_key = self._k('responses'), self._k('seq')
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(seq_key)
+                    seq = int(pipe.get(seq_key) or 0)
+                    exists = pipe.hmget(key, ids)
+                    pipe.multi()
+                    added, seen = [], set()
+                    for r, rid, current in zip(rows, ids, exists):
+                        if current is not None or rid in seen:
+                            continue
+                        seq += 1
+                        seen.add(rid)
+                        added.append(rid)
+                        pipe.hset(key, rid, json.dumps({'seq': seq, 'row': {c: str(r[c]) for c in RESPONSE_COLUMNS}},
+                                                       ensure_ascii=False))
+                        pipe.zadd(self._k('by_seq'), {rid: seq})
+                        pipe.hincrby(self._k('affiliation_counts'), affiliation_key(r['소속']), 1)
+                        if queue_upload:
+                            pipe.zadd(self._k('pending_upload'), {rid: seq})
+                    if not added:
+                        pipe.reset()
+                        return []
+                    pipe.set(seq_key, seq)
+                    pipe.incr(self._k('revision'))
+                    pipe.execute()
+                    return added
+                except WatchError:
+                    continue  # 다른 프로세스가 먼저 썼음: 새 seq와 중복 여부로 다시
+
+    def replace_rows(self, rows, remove_ids=()):
+        """응답ID가 같은 행을 제자리에서(seq 유지) 바꾸고 remove_ids 행은 지움. 바뀐 행 수"""
+        key = self._k('responses')
+        changed = 0
+        for r in (normalize_row(r) for r in rows):
+            raw = self.client.hget(key, str(r['응답ID']))
+            if raw is None:
+                continue
+            rec = json.loads(raw)
+            rec['row'] = {c: str(r[c]) for c in RESPONSE_COLUMNS}
+            self.client.hset(key, str(r['응답ID']), json.dumps(rec, ensure_ascii=False))
+            changed += 1
+        remove_ids = [str(rid) for rid in remove_ids]
+        if remove_ids:
+            changed += self.client.hdel(key, *remove_ids)
+            self.client.zrem(self._k('by_seq'), *remove_ids)
+            self.client.zrem(self._k('pending_upload'), *remove_ids)
+        if changed:
+            self.client.incr(self._k('revision'))
+            self.rebuild_affiliation_counts()
+        return changed
+
+    def affiliation_counts(self, affiliations=None):
+        """{소속: 응답 수} (affiliations를 주면 그 소속만, 없는 소속은 0)"""
+        key = self._k('affiliation_counts')
+        if affiliations is None:
+            return {(k.decode() if isinstance(k, bytes) else k): int(v) for k, v in self.client.hgetall(key).items()}
+        affiliations = list(affiliations)
+        values = self.client.hmget(key, affiliations) if affiliations else []
+        return {a: int(v) if v is not None else 0 for a, v in zip(affiliations, values)}
+
+    def rebuild_affiliation_counts(self):
+        """저장된 응답 전체로 다시 셈 (세는 동안 들어온 응답은 빠질 수 있어 한가할 때 실행)"""
+        counts = count_affiliations(rec['row'].get('소속') for rec in self._records())
+        pipe = self.client.pipeline()
+        pipe.delete(self._k('affiliation_counts'))
+        if counts:
+            pipe.hset(self._k('affiliation_counts'), mapping=counts)
+        pipe.execute()
+        self.set_meta(AFFILIATION_COUNTS_READY, True)
+        return counts
+
+    def get_meta(self, key, default=None):
+        if key == 'pending_upload':
+            return [k.decode() if isinstance(k, bytes) else k
+                    for k in self.client.zrange(self._k('pending_upload'), 0, -1)]
+        v = self.client.hget(self._k('meta'), key)
+        return default if v is None else json.loads(v)
+
+    def set_meta(self, key, value):
+        self.client.hset(self._k('meta'), key, json.dumps(value, ensure_ascii=False))
+
+    def enqueue_upload(self, response_ids):
+        """append_rows와 같이 seq를 점수로 → 다시 올리는 응답도 저장 순서대로 업로드"""
+        response_ids = [str(rid) for rid in response_ids]
+        if not response_ids:
+            return
+        self._ensure_seq_index()
+        pipe = self.client.pipeline(transaction=False)
+        for rid in response_ids:
+            pipe.zscore(self._k('by_seq'), rid)
+        scores = pipe.execute()
+        last = int(self.client.get(self._k('seq')) or 0)  # 아직 저장되지 않은 응답은 맨 뒤
+        mapping = {rid: int(score) if score is not None else last for rid, score in zip(response_ids, scores)}
+        self.client.zadd(self._k('pending_upload'), mapping, nx=True)
+
+    def pending_upload_rows(self):
+        ids = self.get_meta('pending_upload', [])
+        if not ids:
+            return []
+        raw = self.client.hmget(self._k('responses'), ids)
+        return [json.loads(v)['row'] for v in raw if v is not None]
+
+    def mark_uploaded(self, response_ids):
+        if response_ids:
+            self.client.zrem(self._k('pending_upload'), *response_ids)
+
+    def append_events(self, events):
+        if events:
+            self.client.rpush(self._k('events'),
+                              *(json.dumps([e.get(k) for k in EVENT_FIELDS], ensure_ascii=False) for e in events))
+
+    def read_events(self, since=0):
+        """since(seq) 이후 이벤트. seq는 목록 위치(1부터)"""
+        raw = self.client.lrange(self._k('events'), since, -1)
+        return [dict(zip(EVENT_FIELDS, json.loads(v))) for v in raw], since + len(raw)
+
+    def kv_get(self, namespace, key, default=None):
+        v = self.client.get(self._k('kv', namespace, key))
+        return default if v is None else kv_loads(v, default)
+
+    def kv_set(self, namespace, key, value, ttl=None):
+        self.client.set(self._k('kv', namespace, key), kv_dumps(value), ex=int(ttl) if ttl else None)
+
+    def kv_delete(self, namespace, key):
+        self.client.delete(self._k('kv', namespace, key))
+
+    @contextlib.contextmanager
+    def lock(self, name, timeout=30, lease=60):
+        key = self._k('lock', name)
+        token = f"{self._owner}-{threading.get_ident()}"
+        deadline = time.monotonic() + timeout
+        while not self.client.set(key, token, nx=True, px=int(lease * 1000)):
+            if time.monotonic() > deadline:
+                raise LockTimeout(f"잠금 획득 실패: {name}")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            current = self.client.get(key)
+            if current is not None and (current.decode() if isinstance(current, bytes) else current) == token:
+                self.client.delete(key)
+
+
+def default_store_url():
+    """BLUEFOOD_STORE_URL 환경변수, 없으면 공유 볼륨(BLUEFOOD_DATA_DIR)의 SQLite"""
+    url = os.environ.get("BLUEFOOD_STORE_URL")
+    if url:
+        return url
+    data_dir = os.environ.get("BLUEFOOD_DATA_DIR", ".")
+    return f"sqlite:///{os.path.join(data_dir, 'bluefood_survey.db')}"
+
+
+def open_store(url):
+    """저장소 URL → 저장소 객체
+
+    - sqlite:///data/bluefood_survey.db (?journal_mode=delete: NFS 등 WAL 미지원 볼륨)
+    - redis://host:6379/0
+    - excel:///bluefood_survey.xlsx
+    - memory:// (프로세스 내 임시 SQLite, 테스트/리플레이용)
+    """
+    parsed = urlparse(url)
+    params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+    # sqlite:///상대경로, sqlite:////절대경로
+    path = parsed.netloc + (parsed.path[1:] if parsed.path.startswith('/') else parsed.path)
+    if parsed.scheme == 'sqlite':
+        return SQLiteResponseStore(path or "bluefood_survey.db", journal_mode=params.get('journal_mode', 'WAL'))
+    if parsed.scheme == 'memory':
+        return SQLiteResponseStore(f"file:bluefood-{uuid.uuid4().hex}?mode=memory&cache=shared", journal_mode=None)
+    if parsed.scheme in ('redis', 'rediss', 'unix'):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("Redis 저장소를 쓰려면 redis 패키지가 필요합니다 (pip install redis)") from e
+        return RedisResponseStore(redis.Redis.from_url(url), prefix=params.get('prefix', 'bluefood'))
+    if parsed.scheme == 'excel':
+        return ExcelResponseStore(path or "bluefood_survey.xlsx")
+    raise ValueError(f"지원하지 않는 저장소 URL: {url}")
+
+
+def import_excel_once(store, filename):
+    """기존 엑셀 백업을 새 저장소로 한 번만 옮김 (이미 옮겼으면 건너뜀)
+
+    스키마 2로 표시된 저장소에는 SheetsSync.pull과 같이 정규 JSON으로 바꿔 넣고, 읽을 수 없는 행은 격리
+    """
+    from migrate_schema import SCHEMA_VERSION, canonicalize_rows, quarantine, store_schema_version
+    if isinstance(store, ExcelResponseStore) or not os.path.exists(filename):
+        return 0
+    with store.lock('import-excel'):
+        if store.get_meta('imported_excel'):
+            return 0
+        legacy = ExcelResponseStore(filename)
+        rows = [normalize_row(r) for r in legacy.read_frame().to_dict('records')]
+        if store_schema_version(store) >= SCHEMA_VERSION:
+            rows, bad = canonicalize_rows(rows)
+            quarantine(store, bad)
+        added = store.append_rows(rows)
+        store.enqueue_upload(legacy.get_meta('pending_upload', []))
+        store.set_meta('imported_excel', filename)
+        return len(added)
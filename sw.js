@@ -0,0 +1,400 @@
+// offline_client.py가 생성 (직접 수정하지 마세요)
+const CACHE = 'bluefood-d43fdfae5479';
+const PRECACHE = [
+    "./",
+    "./bluefood_survey.html",
+    "./images/ingredients/%EA%B0%80%EB%A6%AC%EB%B9%84.jpg",
+    "./images/ingredients/%EA%B0%80%EC%9E%90%EB%AF%B8.jpg",
+    "./images/ingredients/%EA%B0%80%EC%9E%AC.jpg",
+    "./images/ingredients/%EA%B0%88%EC%B9%98.jpg",
+    "./images/ingredients/%EA%B2%8C.jpg",
+    "./images/ingredients/%EA%B3%A0%EB%93%B1%EC%96%B4.jpg",
+    "./images/ingredients/%EA%B3%A8%EB%B1%85%EC%9D%B4.jpg",
+    "./images/ingredients/%EA%B5%B4.jpg",
+    "./images/ingredients/%EA%B9%80.jpg",
+    "./images/ingredients/%EA%BC%AC%EB%A7%89.jpg",
+    "./images/ingredients/%EA%BC%B4%EB%9A%9C%EA%B8%B0.jpg",
+    "./images/ingredients/%EA%BD%81%EC%B9%98.jpg",
+    "./images/ingredients/%EB%82%99%EC%A7%80.jpg",
+    "./images/ingredients/%EB%8B%A4%EB%9E%91%EC%96%B4.jpg",
+    "./images/ingredients/%EB%8B%A4%EC%8A%AC%EA%B8%B0.jpg",
+    "./images/ingredients/%EB%8B%A4%EC%8B%9C%EB%A7%88.jpg",
+    "./images/ingredients/%EB%8C%80%EA%B5%AC.jpg",
+    "./images/ingredients/%EB%A7%9B%EC%82%B4.jpg",
+    "./images/ingredients/%EB%A7%A4%EC%83%9D%EC%9D%B4.jpg",
+    "./images/ingredients/%EB%A9%B8%EC%B9%98.jpg",
+    "./images/ingredients/%EB%AA%85%ED%83%9C.jpg",
+    "./images/ingredients/%EB%AC%B8%EC%96%B4.jpg",
+    "./images/ingredients/%EB%AF%B8%EB%8D%94%EB%8D%95.jpg",
+    "./images/ingredients/%EB%AF%B8%EC%97%AD.jpg",
+    "./images/ingredients/%EB%B0%94%EC%A7%80%EB%9D%BD.jpg",
+    "./images/ingredients/%EB%B0%95%EB%8C%80.jpg",
+    "./images/ingredients/%EB%B0%B1%ED%95%A9.jpg",
+    "./images/ingredients/%EB%B1%85%EC%96%B4.jpg",
+    "./images/ingredients/%EB%B3%91%EC%96%B4.jpg",
+    "./images/ingredients/%EC%82%BC%EC%B9%98.jpg",
+    "./images/ingredients/%EC%83%88%EC%9A%B0.jpg",
+    "./images/ingredients/%EC%86%8C%EB%9D%BC.jpg",
+    "./images/ingredients/%EC%95%84%EA%B7%80.jpg",
+    "./images/ingredients/%EC%96%B4%EB%9E%80.jpg",
+    "./images/ingredients/%EC%96%B4%EB%AC%B5.jpg",
+    "./images/ingredients/%EC%97%B0%EC%96%B4.jpg",
+    "./images/ingredients/%EC%98%A4%EC%A7%95%EC%96%B4.jpg",
+    "./images/ingredients/%EC%9E%84%EC%97%B0%EC%88%98.jpg",
+    "./images/ingredients/%EC%9E%A5%EC%96%B4.jpg",
+    "./images/ingredients/%EC%9E%AC%EC%B2%A9.jpg",
+    "./images/ingredients/%EC%A0%84%EB%B3%B5.jpg",
+    "./images/ingredients/%EC%A1%B0%EA%B8%B0.jpg",
+    "./images/ingredients/%EC%A3%BC%EA%BE%B8%EB%AF%B8.jpg",
+    "./images/ingredients/%EC%A5%90%ED%8F%AC.jpg",
+    "./images/ingredients/%ED%86%B3.jpg",
+    "./images/ingredients/%ED%8C%8C%EB%9E%98.jpg",
+    "./images/ingredients/%ED%99%8D%ED%95%A9.jpg"
+];
+// 메뉴 이미지는 양이 많아 설치를 막지 않고, 페이지가 열린 뒤 요청(warm-cache)을 받아 채운다
+const LAZY = [
+    "./images/menus/%EA%B0%80%EB%A6%AC%EB%B9%84%EB%B2%84%ED%84%B0%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EA%B0%80%EB%A6%AC%EB%B9%84%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EA%B0%80%EB%A6%AC%EB%B9%84%EC%B0%9C.png",
+    "./images/menus/%EA%B0%80%EB%A6%AC%EB%B9%84%EC%B4%88%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EA%B0%80%EB%A6%AC%EB%B9%84%EC%B4%88%EB%B0%A5.png",
+    "./images/menus/%EA%B0%80%EB%A6%AC%EB%B9%84%EC%B9%BC%EA%B5%AD%EC%88%98.png",
+    "./images/menus/%EA%B0%80%EB%A6%AC%EB%B9%84%ED%83%95.png",
+    "./images/menus/%EA%B0%80%EC%9E%90%EB%AF%B8%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EA%B0%80%EC%9E%90%EB%AF%B8%EB%AF%B8%EC%97%AD%EA%B5%AD.png",
+    "./images/menus/%EA%B0%80%EC%9E%90%EB%AF%B8%EC%A0%84.png",
+    "./images/menus/%EA%B0%80%EC%9E%90%EB%AF%B8%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EA%B0%80%EC%9E%90%EB%AF%B8%EC%B0%9C.png",
+    "./images/menus/%EA%B0%80%EC%9E%90%EB%AF%B8%ED%8A%80%EA%B9%80.png",
+    "./images/menus/%EA%B0%80%EC%9E%AC%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EA%B0%80%EC%9E%AC%EC%B0%9C.png",
+    "./images/menus/%EA%B0%84%EC%9E%A5%EA%B2%8C%EC%9E%A5.png",
+    "./images/menus/%EA%B0%84%EC%9E%A5%EC%83%88%EC%9A%B0%EC%9E%A5.png",
+    "./images/menus/%EA%B0%84%EC%9E%A5%EC%96%B4%EB%AC%B5%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EA%B0%88%EC%B9%98%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EA%B0%88%EC%B9%98%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EA%B1%B4%EC%83%88%EC%9A%B0%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EA%B2%8C%EB%A7%9B%EC%82%B4%EB%B3%B6%EC%9D%8C%EB%B0%A5.png",
+    "./images/menus/%EA%B2%8C%EB%A7%9B%EC%82%B4%EC%BD%A9%EB%82%98%EB%AC%BC%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EA%B2%8C%EC%82%B4%EB%B3%B6%EC%9D%8C%EB%B0%A5.png",
+    "./images/menus/%EA%B2%8C%EC%82%B4%ED%8C%8C%EC%8A%A4%ED%83%80.png",
+    "./images/menus/%EA%B3%A0%EB%93%B1%EC%96%B4%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EA%B3%A0%EB%93%B1%EC%96%B4%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EA%B3%A8%EB%B1%85%EC%9D%B4%EA%BC%AC%EC%B9%98%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EA%B3%A8%EB%B1%85%EC%9D%B4%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EA%B3%A8%EB%B1%85%EC%9D%B4%EB%AC%BC%ED%9A%8C.png",
+    "./images/menus/%EA%B3%A8%EB%B1%85%EC%9D%B4%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EA%B3%A8%EB%B1%85%EC%9D%B4%EB%B9%84%EB%B9%94%EB%A9%B4.png",
+    "./images/menus/%EA%B3%A8%EB%B1%85%EC%9D%B4%EC%A3%BD.png",
+    "./images/menus/%EA%B3%A8%EB%B1%85%EC%9D%B4%ED%83%95.png",
+    "./images/menus/%EA%B3%A8%EB%B1%85%EC%9D%B4%ED%8A%80%EA%B9%80.png",
+    "./images/menus/%EA%B5%B4%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EA%B5%B4%EA%B5%AD%EB%B0%A5.png",
+    "./images/menus/%EA%B5%B4%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EA%B5%B4%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EA%B5%B4%EC%88%9C%EB%91%90%EB%B6%80%EC%B0%8C%EA%B0%9C.png",
+    "./images/menus/%EA%B5%B4%EC%A0%84.png",
+    "./images/menus/%EA%B5%B4%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EA%B5%B4%EC%A7%AC%EB%BD%95.png",
+    "./images/menus/%EA%B5%B4%EC%B0%9C.png",
+    "./images/menus/%EA%B5%B4%EC%B9%BC%EA%B5%AD%EC%88%98.png",
+    "./images/menus/%EA%B5%B4%ED%8A%80%EA%B9%80.png",
+    "./images/menus/%EA%B9%80%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EA%B9%80%EB%B0%A5.png",
+    "./images/menus/%EA%B9%80%EB%B6%80%EA%B0%81.png",
+    "./images/menus/%EA%B9%80%EC%9E%90%EB%B0%98.png",
+    "./images/menus/%EA%BC%AC%EB%A7%89%EB%90%9C%EC%9E%A5%EC%B0%8C%EA%B0%9C.png",
+    "./images/menus/%EA%BC%AC%EB%A7%89%EB%96%A1%EA%BC%AC%EC%B9%98%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EA%BC%AC%EB%A7%89%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EA%BC%AC%EB%A7%89%EB%B9%84%EB%B9%94%EB%B0%A5.png",
+    "./images/menus/%EA%BC%AC%EB%A7%89%EC%A0%84.png",
+    "./images/menus/%EA%BC%AC%EB%A7%89%EC%B0%9C.png",
+    "./images/menus/%EA%BC%AC%EB%A7%89%EC%B9%BC%EA%B5%AD%EC%88%98.png",
+    "./images/menus/%EA%BC%B4%EB%9A%9C%EA%B8%B0%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EA%BC%B4%EB%9A%9C%EA%B8%B0%EC%A0%93%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EA%BC%B4%EB%9A%9C%EA%B8%B0%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EA%BC%B4%EB%9A%9C%EA%B8%B0%EC%B0%9C.png",
+    "./images/menus/%EA%BD%81%EC%B9%98%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EA%BD%81%EC%B9%98%EA%B9%80%EC%B9%98%EC%B0%8C%EA%B0%9C.png",
+    "./images/menus/%EA%BD%81%EC%B9%98%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EA%BD%83%EA%B2%8C%EA%B0%95%EC%A0%95.png",
+    "./images/menus/%EA%BD%83%EA%B2%8C%EB%9D%BC%EB%A9%B4.png",
+    "./images/menus/%EA%BD%83%EA%B2%8C%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EA%BD%83%EA%B2%8C%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EA%BD%83%EA%B2%8C%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EA%BD%83%EA%B2%8C%EC%B0%9C.png",
+    "./images/menus/%EA%BD%83%EA%B2%8C%ED%83%95.png",
+    "./images/menus/%EB%82%99%EC%A7%80%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EB%82%99%EC%A7%80%EB%B9%84%EB%B9%94%EB%B0%A5.png",
+    "./images/menus/%EB%82%99%EC%A7%80%EC%88%98%EC%A0%9C%EB%B9%84.png",
+    "./images/menus/%EB%82%99%EC%A7%80%EC%97%B0%ED%8F%AC%ED%83%95.png",
+    "./images/menus/%EB%82%99%EC%A7%80%EC%B0%9C.png",
+    "./images/menus/%EB%82%99%EC%A7%80%EC%B4%88%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EB%82%99%EC%A7%80%ED%83%95%ED%83%95%EC%9D%B4.png",
+    "./images/menus/%EB%82%99%EC%A7%80%ED%98%B8%EB%A1%B1%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EB%82%A0%EC%B9%98%EC%95%8C%EA%B3%84%EB%9E%80%EB%A7%90%EC%9D%B4.png",
+    "./images/menus/%EB%82%A0%EC%B9%98%EC%95%8C%EB%8B%AC%EA%B1%80%EC%B0%9C.png",
+    "./images/menus/%EB%82%A0%EC%B9%98%EC%95%8C%EB%B0%A5.png",
+    "./images/menus/%EB%82%A0%EC%B9%98%EC%95%8C%EC%8A%A4%ED%81%AC%EB%9E%A8%EB%B8%94%EC%97%90%EA%B7%B8.png",
+    "./images/menus/%EB%8B%A4%EC%8A%AC%EA%B8%B0%EB%90%9C%EC%9E%A5%EA%B5%AD.png",
+    "./images/menus/%EB%8B%A4%EC%8A%AC%EA%B8%B0%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EB%8B%A4%EC%8A%AC%EA%B8%B0%EC%88%98%EC%A0%9C%EB%B9%84.png",
+    "./images/menus/%EB%8B%A4%EC%8A%AC%EA%B8%B0%ED%8C%8C%EC%A0%84.png",
+    "./images/menus/%EB%8B%A4%EC%8B%9C%EB%A7%88%EC%B1%84%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EB%8B%A4%EC%8B%9C%EB%A7%88%EC%B1%84%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EB%8B%A4%EC%8B%9C%EB%A7%88%ED%8A%80%EA%B0%81.png",
+    "./images/menus/%EB%8C%80%EA%B5%AC%EB%A7%A4%EC%9A%B4%ED%83%95.png",
+    "./images/menus/%EB%8C%80%EA%B5%AC%EC%A0%84.png",
+    "./images/menus/%EB%8C%80%EA%B5%AC%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EB%A7%91%EC%9D%80%EB%8C%80%EA%B5%AC%ED%83%95.png",
+    "./images/menus/%EB%A7%9B%EC%82%B4%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EB%A7%9B%EC%82%B4%EC%A0%84.png",
+    "./images/menus/%EB%A7%A4%EC%83%9D%EC%9D%B4%EA%B5%B4%EA%B5%AD.png",
+    "./images/menus/%EB%A7%A4%EC%83%9D%EC%9D%B4%EC%A0%84.png",
+    "./images/menus/%EB%A7%A4%EC%83%9D%EC%9D%B4%EC%B9%BC%EA%B5%AD%EC%88%98.png",
+    "./images/menus/%EB%A7%A4%EC%BD%A4%EB%B0%94%EC%A7%80%EB%9D%BD%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EB%A7%A4%EC%BD%A4%EC%96%B4%EB%AC%B5%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EB%A9%B8%EC%B9%98%EA%B9%80%EB%B0%A5.png",
+    "./images/menus/%EB%A9%B8%EC%B9%98%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EB%AA%85%EB%9E%80%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EB%AA%85%EB%9E%80%EC%A0%93%EA%B0%88.png",
+    "./images/menus/%EB%AA%85%EB%9E%80%ED%8C%8C%EC%8A%A4%ED%83%80.png",
+    "./images/menus/%EB%AA%85%ED%83%9C%EC%B0%9C.png",
+    "./images/menus/%EB%AC%B8%EC%96%B4%EB%9D%BC%EB%A9%B4.png",
+    "./images/menus/%EB%AC%B8%EC%96%B4%EB%B3%B6%EC%9D%8C%EB%B0%A5.png",
+    "./images/menus/%EB%AC%B8%EC%96%B4%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EB%AC%B8%EC%96%B4%EC%A0%84.png",
+    "./images/menus/%EB%AC%B8%EC%96%B4%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EB%AC%B8%EC%96%B4%EC%B4%88%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EB%AC%B8%EC%96%B4%EC%BD%A9%EB%82%98%EB%AC%BC%EC%B0%9C.png",
+    "./images/menus/%EB%AC%B8%EC%96%B4%ED%83%95.png",
+    "./images/menus/%EB%AC%B8%EC%96%B4%ED%8A%80%EA%B9%80.png",
+    "./images/menus/%EB%AC%B8%EC%96%B4%ED%9A%8C.png",
+    "./images/menus/%EB%AC%BC%ED%8C%8C%EB%9E%98%EC%A0%84.png",
+    "./images/menus/%EB%AF%B8%EB%8D%94%EB%8D%95%EB%90%9C%EC%9E%A5%EC%B0%8C%EA%B0%9C.png",
+    "./images/menus/%EB%AF%B8%EB%8D%94%EB%8D%95%EB%B0%A5.png",
+    "./images/menus/%EB%AF%B8%EB%8D%94%EB%8D%95%EC%88%9C%EB%91%90%EB%B6%80%EC%B0%8C%EA%B0%9C.png",
+    "./images/menus/%EB%AF%B8%EB%8D%94%EB%8D%95%EC%BD%A9%EB%82%98%EB%AC%BC%EC%B0%9C.png",
+    "./images/menus/%EB%AF%B8%EC%97%AD%EA%B5%AD%EB%B0%A5.png",
+    "./images/menus/%EB%AF%B8%EC%97%AD%EA%B5%AD.png",
+    "./images/menus/%EB%AF%B8%EC%97%AD%EC%A4%84%EA%B8%B0%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EB%AF%B8%EC%97%AD%EC%B4%88%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EB%B0%94%EC%A7%80%EB%9D%BD%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EB%B0%94%EC%A7%80%EB%9D%BD%EB%AF%B8%EC%97%AD%EA%B5%AD.png",
+    "./images/menus/%EB%B0%94%EC%A7%80%EB%9D%BD%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EB%B0%94%EC%A7%80%EB%9D%BD%EB%B6%80%EC%B6%94%EC%A0%84.png",
+    "./images/menus/%EB%B0%94%EC%A7%80%EB%9D%BD%EB%B9%84%EB%B9%94%EB%B0%A5.png",
+    "./images/menus/%EB%B0%94%EC%A7%80%EB%9D%BD%EC%88%9C%EB%91%90%EB%B6%80%EC%B0%8C%EA%B0%9C.png",
+    "./images/menus/%EB%B0%94%EC%A7%80%EB%9D%BD%EC%B0%9C.png",
+    "./images/menus/%EB%B0%94%EC%A7%80%EB%9D%BD%EC%B9%BC%EA%B5%AD%EC%88%98.png",
+    "./images/menus/%EB%B0%95%EB%8C%80%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EB%B0%95%EB%8C%80%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EB%B0%B1%ED%95%A9%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EB%B0%B1%ED%95%A9%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EB%B0%B1%ED%95%A9%EB%B3%B6%EC%9D%8C%EB%B0%A5.png",
+    "./images/menus/%EB%B0%B1%ED%95%A9%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EB%B0%B1%ED%95%A9%EC%B0%9C.png",
+    "./images/menus/%EB%B0%B1%ED%95%A9%EC%B9%BC%EA%B5%AD%EC%88%98.png",
+    "./images/menus/%EB%B0%B1%ED%95%A9%ED%83%95.png",
+    "./images/menus/%EB%B1%85%EC%96%B4%ED%8F%AC%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EB%B1%85%EC%96%B4%ED%8F%AC%ED%8A%80%EA%B9%80.png",
+    "./images/menus/%EB%B3%91%EC%96%B4%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EB%B3%91%EC%96%B4%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EB%B6%81%EC%96%B4%EC%B1%84%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EC%82%BC%EC%B9%98%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EC%83%88%EC%9A%B0%EB%8B%AC%EA%B1%80%EA%B5%AD.png",
+    "./images/menus/%EC%83%88%EC%9A%B0%EB%8B%AC%EA%B1%80%EC%B0%9C.png",
+    "./images/menus/%EC%83%88%EC%9A%B0%EB%B2%84%ED%84%B0%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EC%83%88%EC%9A%B0%EB%B3%B6%EC%9D%8C%EB%B0%A5.png",
+    "./images/menus/%EC%83%88%EC%9A%B0%EC%A0%84.png",
+    "./images/menus/%EC%83%88%EC%9A%B0%EC%A0%93.png",
+    "./images/menus/%EC%83%88%EC%9A%B0%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EC%83%88%EC%9A%B0%ED%81%AC%EB%A6%BC%ED%8C%8C%EC%8A%A4%ED%83%80.png",
+    "./images/menus/%EC%83%88%EC%9A%B0%ED%8A%80%EA%B9%80.png",
+    "./images/menus/%EC%83%9D%EA%B5%B4.png",
+    "./images/menus/%EC%86%8C%EB%9D%BC%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EC%86%8C%EB%9D%BC%EB%90%9C%EC%9E%A5%EC%B0%8C%EA%B0%9C.png",
+    "./images/menus/%EC%86%8C%EB%9D%BC%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EC%86%8C%EB%9D%BC%EB%B2%84%ED%84%B0%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EC%86%8C%EB%9D%BC%EB%B9%84%EB%B9%94%EB%A9%B4.png",
+    "./images/menus/%EC%86%8C%EB%9D%BC%EC%88%99%ED%9A%8C.png",
+    "./images/menus/%EC%86%8C%EB%9D%BC%ED%8A%80%EA%B9%80.png",
+    "./images/menus/%EC%86%8C%EB%9D%BC%ED%9A%8C.png",
+    "./images/menus/%EC%95%84%EA%B7%80%EC%B0%9C.png",
+    "./images/menus/%EC%95%84%EA%B7%80%ED%83%95.png",
+    "./images/menus/%EC%95%8C%ED%83%95.png",
+    "./images/menus/%EC%96%91%EB%85%90%EA%B2%8C%EC%9E%A5.png",
+    "./images/menus/%EC%96%91%EB%85%90%EC%83%88%EC%9A%B0%EC%9E%A5.png",
+    "./images/menus/%EC%96%B4%EB%AC%B5%EA%B3%A0%EB%A1%9C%EC%BC%80.png",
+    "./images/menus/%EC%96%B4%EB%AC%B5%EB%B3%B6%EC%9D%8C%EB%B0%A5.png",
+    "./images/menus/%EC%96%B4%EB%AC%B5%EC%9A%B0%EB%8F%99.png",
+    "./images/menus/%EC%96%B4%EB%AC%B5%EC%A0%84.png",
+    "./images/menus/%EC%96%B4%EB%AC%B5%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EC%96%B4%EB%AC%B5%EC%B0%9C.png",
+    "./images/menus/%EC%96%B4%EB%AC%B5%ED%83%95.png",
+    "./images/menus/%EC%96%BC%ED%81%B0%EC%83%88%EC%9A%B0%EB%A7%A4%EC%9A%B4%ED%83%95.png",
+    "./images/menus/%EC%97%B0%EC%96%B4%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EC%97%B0%EC%96%B4%EB%8D%AE%EB%B0%A5.png",
+    "./images/menus/%EC%97%B0%EC%96%B4%ED%9A%8C.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%EB%8D%AE%EB%B0%A5.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%EB%AC%B4%EA%B5%AD.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%EB%B2%84%ED%84%B0%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%EC%88%99%ED%9A%8C.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%EC%B4%88%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%EC%BD%A9%EB%82%98%EB%AC%BC%EC%B0%9C.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%ED%8A%80%EA%B9%80.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%ED%95%B4%EB%AC%BC%EC%A0%84.png",
+    "./images/menus/%EC%98%A4%EC%A7%95%EC%96%B4%ED%9A%8C.png",
+    "./images/menus/%EC%9E%84%EC%97%B0%EC%88%98%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EC%9E%84%EC%97%B0%EC%88%98%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EC%9E%A5%EC%96%B4%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EC%9E%A5%EC%96%B4%EB%8D%AE%EB%B0%A5.png",
+    "./images/menus/%EC%9E%A5%EC%96%B4%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EC%9E%A5%EC%96%B4%EC%B0%9C.png",
+    "./images/menus/%EC%9E%A5%EC%96%B4%ED%8A%80%EA%B9%80.png",
+    "./images/menus/%EC%9E%AC%EC%B2%A9%EA%B5%AD.png",
+    "./images/menus/%EC%9E%AC%EC%B2%A9%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EC%9E%AC%EC%B2%A9%EB%B6%80%EC%B6%94%EC%A0%84.png",
+    "./images/menus/%EC%A0%84%EB%B3%B5%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EC%A0%84%EB%B3%B5%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EC%A0%84%EB%B3%B5%EB%AF%B8%EC%97%AD%EA%B5%AD.png",
+    "./images/menus/%EC%A0%84%EB%B3%B5%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EC%A0%84%EB%B3%B5%EC%9E%A5%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EC%A0%84%EB%B3%B5%EC%A3%BD.png",
+    "./images/menus/%EC%A0%84%EB%B3%B5%EC%B0%9C.png",
+    "./images/menus/%EC%A0%84%EB%B3%B5%ED%8C%8C%EC%8A%A4%ED%83%80.png",
+    "./images/menus/%EC%A0%84%EB%B3%B5%ED%9A%8C.png",
+    "./images/menus/%EC%A1%B0%EA%B8%B0%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EC%A1%B0%EA%B8%B0%EC%B0%9C.png",
+    "./images/menus/%EC%A3%BC%EA%BE%B8%EB%AF%B8%EA%B0%90%EC%9E%90%EC%88%98%EC%A0%9C%EB%B9%84.png",
+    "./images/menus/%EC%A3%BC%EA%BE%B8%EB%AF%B8%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EC%A3%BC%EA%BE%B8%EB%AF%B8%EB%B3%B6%EC%9D%8C%EB%8D%AE%EB%B0%A5.png",
+    "./images/menus/%EC%A3%BC%EA%BE%B8%EB%AF%B8%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EC%A3%BC%EA%BE%B8%EB%AF%B8%EC%88%99%ED%9A%8C.png",
+    "./images/menus/%EC%A3%BC%EA%BE%B8%EB%AF%B8%EC%97%B0%ED%8F%AC%ED%83%95.png",
+    "./images/menus/%EC%A3%BC%EA%BE%B8%EB%AF%B8%EC%A7%AC%EB%BD%95.png",
+    "./images/menus/%EC%A3%BC%EA%BE%B8%EB%AF%B8%EC%B0%9C.png",
+    "./images/menus/%EC%A5%90%ED%8F%AC%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EC%A5%90%ED%8F%AC%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%EC%A5%90%ED%8F%AC%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EC%A5%90%ED%8F%AC%EC%A0%84.png",
+    "./images/menus/%EC%A5%90%ED%8F%AC%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EC%A5%90%ED%8F%AC%ED%8A%80%EA%B9%80.png",
+    "./images/menus/%EC%B0%B8%EC%86%8C%EB%9D%BC%EC%95%BC%EC%B1%84%EC%A3%BD.png",
+    "./images/menus/%EC%B0%B8%EC%86%8C%EB%9D%BC%EC%9E%A5%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EC%B0%B8%EC%B9%98%EA%B9%80%EB%B0%A5.png",
+    "./images/menus/%EC%B0%B8%EC%B9%98%EA%B9%80%EC%B9%98%EC%B0%8C%EA%B0%9C.png",
+    "./images/menus/%EC%B0%B8%EC%B9%98%EB%8B%AC%EA%B1%80%EB%A7%90%EC%9D%B4.png",
+    "./images/menus/%EC%B0%B8%EC%B9%98%EC%8A%A4%ED%85%8C%EC%9D%B4%ED%81%AC.png",
+    "./images/menus/%EC%B0%B8%EC%B9%98%EC%96%91%EB%B0%B0%EC%B6%94%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%EC%B0%B8%EC%B9%98%ED%9A%8C.png",
+    "./images/menus/%EC%BD%94%EB%8B%A4%EB%A6%AC%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%EC%BD%94%EB%8B%A4%EB%A6%AC%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%EC%BD%A9%EB%82%98%EB%AC%BC%EC%96%B4%EB%AC%B5%EC%B0%9C.png",
+    "./images/menus/%ED%86%B3%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%ED%86%B3%EB%B0%A5.png",
+    "./images/menus/%ED%8C%8C%EB%9E%98%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%ED%8C%8C%EB%9E%98%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%EA%B5%AC%EC%9D%B4.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%EB%90%9C%EC%9E%A5%EC%B0%8C%EA%B0%9C.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%EB%AC%B4%EC%B9%A8.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%EB%B3%B6%EC%9D%8C.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%EC%A0%84.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%EC%A1%B0%EB%A6%BC.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%EC%A3%BD.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%EC%A7%AC%EB%BD%95.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%EC%B0%9C.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%EC%B9%BC%EA%B5%AD%EC%88%98.png",
+    "./images/menus/%ED%99%8D%ED%95%A9%ED%83%95.png",
+    "./images/menus/%ED%99%A9%ED%83%9C%EB%AF%B8%EC%97%AD%EA%B5%AD.png"
+];
+const DB_NAME = 'bluefood-offline';
+const OUTBOX = 'outbox';
+
+self.addEventListener('install', event => {
+    event.waitUntil(caches.open(CACHE).then(cache => cache.addAll(PRECACHE)).then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(caches.keys()
+        .then(keys => Promise.all(keys.filter(k => k.startsWith('bluefood-') && k !== CACHE).map(k => caches.delete(k))))
+        .then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+    const url = new URL(event.request.url);
+    if (event.request.method !== 'GET' || url.pathname.includes('/api/')) {
+        return;
+    }
+    event.respondWith(caches.match(event.request, { ignoreSearch: true }).then(hit => hit || fetch(event.request).then(res => {
+        if (res.ok && url.origin === self.location.origin) {
+            const copy = res.clone();
+            caches.open(CACHE).then(cache => cache.put(event.request, copy));
+        }
+        return res;
+    })));
+});
+
+async function warmCache() {
+    const cache = await caches.open(CACHE);
+    for (const url of LAZY) {
+        if (!(await cache.match(url))) {
+            try {
+                await cache.add(url);
+            } catch (e) {
+                return;  // 연결이 끊기면 다음 방문 때 이어서
+            }
+        }
+    }
+}
+
+self.addEventListener('message', event => {
+    if (event.data === 'warm-cache') {
+        event.waitUntil(warmCache());
+    }
+});
+
+function openDb() {
+    return new Promise((resolve, reject) => {
+        const req = indexedDB.open(DB_NAME, 1);
+        req.onupgradeneeded = () => req.result.createObjectStore(OUTBOX, { keyPath: '응답ID' });
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+}
+
+async function flushOutbox() {
+    const db = await openDb();
+    const queued = await new Promise((resolve, reject) => {
+        const req = db.transaction(OUTBOX).objectStore(OUTBOX).getAll();
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+    if (!queued.length) {
+        return;
+    }
+    const res = await fetch('./api/responses', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ responses: queued }),
+    });
+    if (!res.ok) {
+        throw new Error(`HTTP ${res.status}`);
+    }
+    const body = await res.json();
+    const tx = db.transaction(OUTBOX, 'readwrite');
+    // 거부된 응답은 서버가 원본을 격리 보관하므로 기기 대기열에서는 지운다
+    [...body.accepted, ...body.duplicate, ...body.rejected.map(r => r['응답ID'])]
+        .forEach(id => tx.objectStore(OUTBOX).delete(id));
+    await new Promise(resolve => { tx.oncomplete = resolve; });
+    const clients = await self.clients.matchAll();
+    clients.forEach(c => c.postMessage('outbox-flushed'));
+}
+
+self.addEventListener('sync', event => {
+    if (event.tag === 'bluefood-flush') {
+        event.waitUntil(flushOutbox());
+    }
+});
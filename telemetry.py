@@ -0,0 +1,177 @@
+"""설문 진행 이벤트 기록 (퍼널 / 화면별 체류 시간 / 서버 렌더링 시간)
+
+record()는 세션별 메모리 버퍼에 dict 하나를 붙이기만 하고, 백그라운드 스레드가
+flush_sec마다(버퍼가 flush_events개를 넘으면 바로) 모든 세션 버퍼를 한 번의 쓰기로
+저장소 이벤트 로그(append_events)에 넣습니다. 버퍼가 세션이 아니라 프로세스 쪽에 있어
+중간에 떠난 참여자의 마지막 이벤트도 남습니다.
+
+이벤트 종류 (step: info / guide / category_loop / complete, category: category_index)
+- enter, exit: 화면 진입/이탈 (exit의 value = 머문 초)
+- toggle: 수산물/메뉴 선택 켜기/끄기 (detail 예: 'ing:+김', 'menu:-김|김밥')
+- nav: 카테고리 화면 버튼 (detail: prev / reset / next / submit) — session_replay.py 재생용
+- render: 서버 렌더링 시간 (value = ms)
+"""
+import threading
+import time
+
+import pandas as pd
+
+from storage import EVENT_FIELDS
+
+FLUSH_SEC = 10
+FLUSH_EVENTS = 500
+MAX_PENDING = 50000
+
+
+class TelemetryRecorder:
+    """프로세스 공용 (st.cache_resource)"""
+
+    def __init__(self, store, flush_sec=FLUSH_SEC, flush_events=FLUSH_EVENTS, clock=time.time):
+        self.store = store
+        self.flush_sec = flush_sec
+        self.flush_events = flush_events
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._buffers = {}  # 세션 → [이벤트]
+        self._pending = 0
+        self._wake = threading.Event()
+        self.flushed = 0
+        self.dropped = 0
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name="bluefood-telemetry", daemon=True)
+        self._thread.start()
+
+    def record(self, session, kind, step, category=None, value=None, detail=None):
+        event = {'session': session, 'at': self.clock(), 'kind': kind, 'step': step,
+                 'category': category, 'value': value, 'detail': detail}
+        with self._lock:
+            self._buffers.setdefault(session, []).append(event)
+            self._pending += 1
+            full = self._pending >= self.flush_events
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        """버퍼 전체를 한 번에 저장. 저장한 이벤트 수 (실패하면 버퍼로 되돌리고 0)"""
+        with self._flush_lock:
+            with self._lock:
+                buffers, self._buffers = self._buffers, {}
+                self._pending = 0
+            events = [e for buf in buffers.values() for e in buf]
+            if not events:
+                return 0
+            try:
+                self.store.append_events(events)
+            except Exception as e:
+                self.last_error = str(e)
+                self._requeue(buffers)
+                return 0
+            self.flushed += len(events)
+            self.last_error = None
+            return len(events)
+
+    def _requeue(self, buffers):
+        with self._lock:
+            for session, buf in self._buffers.items():
+                buffers.setdefault(session, []).extend(buf)
+            self._buffers = buffers
+            self._pending = sum(len(buf) for buf in buffers.values())
+            # 저장소가 오래 안 되면 가장 오래된 세션부터 버림 (메모리 상한)
+            for session in list(self._buffers):
+                if self._pending <= MAX_PENDING:
+                    break
+                dropped = self._buffers.pop(session)
+                self._pending -= len(dropped)
+                self.dropped += len(dropped)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_sec)
+            self._wake.clear()
+            self.flush()
+
+    def metrics(self):
+        with self._lock:
+            return {'pending': self._pending, 'sessions': len(self._buffers), 'flushed': self.flushed,
+                    'dropped': self.dropped, 'last_error': self.last_error}
+
+
+# ---- 분석 (관리자 탭) ----
+
+def page_order(category_labels):
+    """[(step, category, 화면 이름)] 설문 진행 순서"""
+    return ([('info', None, '정보 입력'), ('guide', None, '안내')]
+            + [('category_loop', i, f"{i + 1}. {label}") for i, label in enumerate(category_labels)]
+            + [('complete', None, '완료')])
+
+
+def _page_index(frame, pages):
+    index = {(step, cat): i for i, (step, cat, _) in enumerate(pages)}
+    cats = frame['category'].where(frame['step'] == 'category_loop')
+    return [index.get((s, None if pd.isna(c) else int(c))) for s, c in zip(frame['step'], cats)]
+
+
+def events_frame(events):
+    frame = pd.DataFrame(events, columns=EVENT_FIELDS)
+    frame['value'] = pd.to_numeric(frame['value'], errors='coerce')
+    return frame
+
+
+def funnel_table(frame, category_labels):
+    """화면별 도달 세션 수 / 처음 대비 전환율 / 직전 화면 대비 전환율 / 이탈 수 (뒤로 가기는 가장 멀리 간 화면 기준)"""
+    pages = page_order(category_labels)
+    enters = frame[frame['kind'] == 'enter'].copy()
+    enters['page'] = _page_index(enters, pages)
+    furthest = enters.dropna(subset=['page']).groupby('session')['page'].max()
+    reached = [int((furthest >= i).sum()) for i in range(len(pages))]
+    rows = []
+    for i, (_, _, name) in enumerate(pages):
+        prev = reached[i - 1] if i else reached[0]
+        rows.append({
+            '화면': name,
+            '도달 세션': reached[i],
+            '전체 대비(%)': round(reached[i] / reached[0] * 100, 1) if reached[0] else 0.0,
+            '직전 대비(%)': round(reached[i] / prev * 100, 1) if prev else 0.0,
+            '이탈': prev - reached[i] if i else 0,
+        })
+    return pd.DataFrame(rows)
+
+
+def _by_page(frame, kind, category_labels):
+    pages = page_order(category_labels)
+    part = frame[(frame['kind'] == kind) & frame['value'].notna()].copy()
+    part['page'] = _page_index(part, pages)
+    part = part.dropna(subset=['page'])
+    part['화면'] = [pages[int(i)][2] for i in part['page']]
+    return part.sort_values('page', kind='stable'), [name for _, _, name in pages]
+
+
+def dwell_table(frame, category_labels):
+    """화면별 머문 시간(초) 분포"""
+    part, names = _by_page(frame, 'exit', category_labels)
+    stats = part.groupby('화면', sort=False)['value'].describe(percentiles=[0.25, 0.5, 0.75, 0.9])
+    stats = stats.reindex([n for n in names if n in stats.index])
+    return stats[['count', '25%', '50%', '75%', '90%', 'max']].round(1).rename(columns={'count': '표본'}), part
+
+
+def render_table(frame, category_labels):
+    """화면별 서버 렌더링 시간(ms)"""
+    part, names = _by_page(frame, 'render', category_labels)
+    grouped = part.groupby('화면', sort=False)['value']
+    stats = pd.DataFrame({'rerun 수': grouped.size(), 'p50': grouped.quantile(0.5), 'p95': grouped.quantile(0.95),
+                          'max': grouped.max()})
+    return stats.reindex([n for n in names if n in stats.index]).round(1)
+
+
+def toggle_table(frame, category_labels):
+    """카테고리 화면별 세션당 선택 켜기/끄기 횟수"""
+    part = frame[(frame['kind'] == 'toggle') & (frame['step'] == 'category_loop')]
+    if len(part) == 0:
+        return pd.DataFrame(columns=['카테고리', '세션', '세션당 조작'])
+    grouped = part.groupby('category')
+    out = pd.DataFrame({'세션': grouped['session'].nunique(), '조작': grouped.size()})
+    out['세션당 조작'] = (out['조작'] / out['세션']).round(1)
+    out.index = [f"{int(i) + 1}. {category_labels[int(i)]}" if int(i) < len(category_labels) else str(i)
+                 for i in out.index]
+    return out.rename_axis('카테고리').reset_index()[['카테고리', '세션', '세션당 조작']]
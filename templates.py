@@ -0,0 +1,131 @@
+"""화면용 HTML 조각
+
+정적인 블록은 import 때 한 번 만들어 두고, 값이 들어가는 조각은 입력값별로 lru_cache에
+담아 재실행마다 f-string을 다시 만들지 않습니다. 스타일은 static/bluefood.css 클래스로
+옮겨서 매 재실행 전송량을 줄였습니다 (CSS 파일 자체는 브라우저가 한 번 받아 캐시).
+"""
+import os
+from functools import lru_cache
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+GLOBAL_CSS_FILE = "bluefood.css"
+GLOBAL_CSS_TAG = f'<link rel="stylesheet" href="./app/static/{GLOBAL_CSS_FILE}">'
+
+
+@lru_cache(maxsize=1)
+def inline_global_css():
+    """정적 파일 서빙이 꺼져 있을 때만 쓰는 인라인 <style>"""
+    with open(os.path.join(STATIC_DIR, GLOBAL_CSS_FILE), encoding="utf-8") as f:
+        return "<style>" + f.read() + "</style>"
+
+
+# ---- 정적 블록 ----
+
+TITLE = "<h1>블루푸드<br>선호도 조사</h1>"
+
+INFO_LEAD = '<p class="bf-lead">설문 참여를 위해 성함과 소속을 입력해주세요.</p>'
+
+GUIDE_BANNER = '<div class="bf-banner"><span class="bf-icon">📋</span><span>설문 안내</span></div>'
+
+GUIDE_HEADING = '<h3 class="bf-h3"><span class="bf-icon">🍯</span>&nbsp;2단계 진행 방법</h3>'
+
+GUIDE_STEP_1 = (
+    '<div class="bf-step-card"><div class="bf-badge">1단계</div>'
+    '<div>아래 수산물(원재료) 중에서 <strong>좋아하시는 것</strong>을 <strong>모두 선택</strong>해주세요.<br>'
+    '<span class="bf-sub">↘ 각 카테고리는 아무 것도 선택하지 않으셔도 됩니다.</span></div></div>'
+)
+
+GUIDE_STEP_2 = (
+    '<div class="bf-step-card bf-last"><div class="bf-badge bf-badge-2">2단계</div>'
+    '<div>선택하신 재료가 있다면, <strong>각각에 대해 선호하시는 메뉴</strong>를 골라주세요.</div></div>'
+)
+
+GUIDE_NOTE = '<div class="bf-note">⚠ 전체 설문 기준으로는 <strong>최소 3개 이상</strong> 수산물을 선택해주세요.</div>'
+
+# 안내 화면에서만 버튼을 크게 (전역 CSS에 넣으면 다른 화면 버튼까지 바뀜)
+GUIDE_BUTTON_STYLE = (
+    "<style>div.stButton > button{width:100%!important;font-size:20px!important;padding:18px 0!important;"
+    "border-radius:12px!important;font-weight:700!important;background-color:#0078FF!important;color:#fff!important;"
+    "border:none!important}@media (max-width:768px){div.stButton{width:100%!important;display:flex!important;"
+    "justify-content:center!important}}</style>"
+)
+
+CATEGORY_LEAD = (
+    '<p>아래 수산물(원재료) 중에서 <strong>좋아하는 수산물</strong>을 모두 선택해주세요. '
+    '좋아하는 재료가 없으시면 선택하지 않으셔도 됩니다.<br>'
+    '<strong>※ 단, 전체 설문 기준으로는 최소 3개 이상 수산물을 선택 부탁드립니다.</strong></p>'
+)
+
+MENU_LEAD = (
+    '<p class="bf-menu-lead">이 카테고리에서 선택하신 수산물이 있다면,<br>'
+    '각 수산물마다 좋아하시는 조리 메뉴를 골라주세요.<br>'
+    '<strong>각 수산물당 최소 1개 이상</strong> 선택 부탁드립니다.</p>'
+)
+
+SIDEBAR_RESEARCH = (
+    '<div class="bf-research"><div class="bf-card-title">📌 연구 정보</div>'
+    '<div class="bf-item"><strong>🔹 연구명</strong><br>요양원 거주 고령자 대상 건강 상태 및<br>블루푸드 식이 데이터베이스 구축</div>'
+    '<div class="bf-item"><strong>🔹 정부과제명</strong><br>글로벌 블루푸드 미래리더 양성 프로젝트</div>'
+    '<div class="bf-item"><strong>🔹 연구 담당자</strong><br>류혜리, 유정연<br>(서울대학교 농생명공학부 박사과정)</div>'
+    '</div>'
+)
+
+
+# ---- 값이 들어가는 조각 (입력값별 캐시) ----
+
+@lru_cache(maxsize=64)
+def sidebar_guide(current_cat_num, total_categories):
+    return (
+        '<div class="bf-guide"><div class="bf-card-title">📋 설문 안내</div>'
+        '<p><strong>🎯 목적</strong><br>블루푸드 선호도 조사</p>'
+        '<p><strong>⏱️ 소요</strong><br>약 3-5분</p>'
+        '<p><strong>📝 설문 방식</strong><br>1️⃣ 참여자 정보 입력(성함/소속)<br>2️⃣ 카테고리별로<br>'
+        '&nbsp;&nbsp;• 선호 수산물 선택 →<br>&nbsp;&nbsp;• 그 수산물 메뉴 선택<br>3️⃣ 완료</p>'
+        f'<p><strong>현재 진행 카테고리:</strong><br>{current_cat_num} / {total_categories if total_categories else "-"}</p>'
+        '<p><strong>🔒 개인정보 보호</strong><br>수집된 정보는 연구 목적으로만 사용되며,<br>'
+        '개인정보는 안전하게 보호됩니다.</p></div>'
+    )
+
+
+@lru_cache(maxsize=64)
+def total_selected_box(total_selected_count):
+    if total_selected_count < 3:
+        msg = f"현재까지 전체 선택 수산물: {total_selected_count}개 · 최소 3개 이상 선택 부탁드립니다."
+        cls = "bf-warn"
+    else:
+        msg = f"현재까지 전체 선택 수산물: {total_selected_count}개"
+        cls = "bf-ok"
+    return f'<div class="bf-status {cls}">{msg}</div>'
+
+
+@lru_cache(maxsize=512)
+def menu_title(ing_name):
+    return f'<h4 class="bf-menu-title">🍽️ {ing_name} 메뉴</h4>'
+
+
+@lru_cache(maxsize=1024)
+def menu_status_box(ing_name, chosen_cnt):
+    if chosen_cnt == 0:
+        return (f'<div class="bf-menu-status bf-warn">⚠️ <strong>{ing_name}</strong>: '
+                f'최소 1개 이상의 메뉴를 선택해주세요.</div>')
+    return f'<div class="bf-menu-status bf-ok">✅ <strong>{ing_name}</strong>: {chosen_cnt}개 메뉴 선택됨</div>'
+
+
+@lru_cache(maxsize=1024)
+def selected_ingredients_summary(ingredients):
+    """ingredients: 수산물 이름 튜플"""
+    return (f'<div class="bf-summary"><div class="bf-summary-title">🐟 선택한 수산물:</div>'
+            f'<div>{", ".join(ingredients)}</div></div>')
+
+
+@lru_cache(maxsize=1024)
+def selected_menus_summary(items):
+    """items: ((수산물, (메뉴, ...)), ...) 튜플"""
+    parts = []
+    for ing_name, menus in items:
+        if menus:
+            parts.append(f"<li><b>{ing_name}</b>: {', '.join(menus)}</li>")
+        else:
+            parts.append(f"<li><b>{ing_name}</b>: (메뉴 선택 없음)</li>")
+    return (f'<div class="bf-summary bf-last"><div class="bf-summary-title">🍽️ 선택한 메뉴:</div>'
+            f'<ul>{"".join(parts)}</ul></div>')
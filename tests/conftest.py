@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import open_store  # noqa: E402
+
+
+@pytest.fixture
+def store():
+    return open_store('memory://')
+
+
+@pytest.fixture
+def app_module(monkeypatch):
+    """bare 모드로 import한 app (공유 저장소는 memory://, 프로세스 공용 자원은 테스트마다 새로)"""
+    pytest.importorskip('streamlit')
+    monkeypatch.setenv('BLUEFOOD_STORE_URL', 'memory://')
+    import app
+    for holder in (app.get_response_store, app.get_google_breaker, app._aggregate_cube_holder):
+        holder.clear()
+    yield app
+    for holder in (app.get_response_store, app.get_google_breaker, app._aggregate_cube_holder):
+        holder.clear()
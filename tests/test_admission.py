@@ -0,0 +1,67 @@
+import pytest
+
+from admission import AdmissionController, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class StubUploads:
+    """가짜 Sheets 업로드: 올린 시각만 기록"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.times = []
+
+    def upload(self, row):
+        self.times.append((row, self.clock()))
+
+
+def controller(clock, rate_per_sec=1.0, burst=3, max_wait=2.0, max_queue=10):
+    return AdmissionController(TokenBucket(rate_per_sec, burst, clock=clock), max_queue=max_queue,
+                               max_wait=max_wait, clock=clock, sleep=clock.sleep)
+
+
+def test_burst_is_admitted_up_to_max_wait_and_rest_shed():
+    clock = FakeClock()
+    adm = controller(clock)
+    backend = StubUploads(clock)
+
+    tickets = [adm.admit() for _ in range(8)]
+    assert [t.admitted for t in tickets] == [True] * 5 + [False] * 3
+    assert [t.delay for t in tickets[:5]] == pytest.approx([0, 0, 0, 1, 2])
+    assert {t.reason for t in tickets[5:]} == {'timeout'}
+    assert adm.queue_depth == 2 and adm.max_queue_depth == 2
+
+    # 순서대로 기다렸다가 올림 (1개 토큰 = 업로드 1회)
+    for row, ticket in enumerate(tickets[:5]):
+        clock.now = ticket.issued_at
+        adm.wait(ticket)
+        backend.upload(row)
+    assert [t for _, t in backend.times] == pytest.approx([0, 0, 0, 1, 2])
+
+    m = adm.metrics()
+    assert (m['admitted'], m['shed_timeout'], m['shed_queue_full'], m['queue_depth']) == (5, 3, 0, 0)
+    assert m['wait_max'] == pytest.approx(2) and m['wait_p50'] == pytest.approx(0)
+
+
+def test_queue_limit_sheds_before_reserving_tokens():
+    clock = FakeClock()
+    adm = controller(clock, burst=1, max_wait=10.0, max_queue=2)
+    tickets = [adm.admit() for _ in range(5)]
+    assert [t.reason for t in tickets] == ['admitted', 'admitted', 'admitted', 'queue_full', 'queue_full']
+    assert adm.metrics()['shed_queue_full'] == 2
+
+    clock.now = 5.0  # 토큰이 다시 찼지만 대기 중인 두 건이 예약해 둔 만큼만 남음
+    for t in tickets[1:3]:
+        adm.wait(t)
+    assert adm.queue_depth == 0
+    assert adm.bucket.available() == pytest.approx(1)  # 5초 동안 찬 토큰 - 예약 2 (최대 1)
@@ -0,0 +1,58 @@
+import json
+
+from aggregate_cube import AggregateCube
+
+MENU_DATA = {'김': {'구이': ['김구이'], '밥': ['김주먹밥']}, '굴': {'전': ['굴전']}}
+CATEGORIES = [('해조류', ['김']), ('조개류', ['굴'])]
+
+
+def test_state_round_trips_through_json():
+    cube = AggregateCube.from_records([
+        ('초이스엔', ['김', '굴'], {'김': ['김구이', '김주먹밥'], '굴': ['굴전']}),
+        ('부산요양원', ['김'], {'김': ['김구이']}),
+        (None, ['굴'], {}),
+    ], MENU_DATA, CATEGORIES)
+    restored = AggregateCube.from_state(json.loads(json.dumps(cube.to_state(), ensure_ascii=False)),
+                                        MENU_DATA, CATEGORIES)
+    assert restored.ingredient_cells == cube.ingredient_cells
+    assert restored.menu_cells == cube.menu_cells
+    assert restored.respondents == cube.respondents
+    restored.add_response('초이스엔', ['김'], {'김': ['김주먹밥']})
+    assert restored.rollup(('소속', '메뉴'))[('초이스엔', '김주먹밥')] == 2
+
+
+# ---- 앱의 제출 시 증분 반영 ----
+
+def _row(app, rid, affiliation='초이스엔'):
+    ing = app.CATALOG.ingredients[0]
+    menus = {ing: app.CATALOG.menus_for(ing)[:1]}
+    row = app.make_response_row(rid, '홍길동', affiliation, '2025-03-01 10:00:00', [ing], menus, app.CATALOG.version)
+    return row, [ing], menus
+
+
+def test_submit_updates_cube_only_for_its_own_revision(app_module, monkeypatch):
+    app = app_module
+    store = app.get_response_store()
+    store.append_rows([_row(app, 'rid-00000001')[0]])
+    version = app.dataset_key(store.version())
+    app.load_aggregate_cube(store.read_frame(), version)
+    assert store.kv_get('cache', 'aggregate_cube')['version'] == version
+
+    assert app.save_to_local_store(*_row(app, 'rid-00000002'))
+    holder = app._aggregate_cube_holder()
+    assert holder['cube'].total_respondents == 2
+    assert holder['version'] == app.dataset_key(store.version())
+    assert store.kv_get('cache', 'aggregate_cube')['version'] == version  # 제출마다 공유 kv에 쓰지 않음
+
+    append_rows = store.append_rows
+
+    def with_other_replica(rows, queue_upload=False):
+        append_rows([_row(app, 'rid-other001', '부산요양원')[0]])  # 다른 서버 프로세스가 사이에 저장
+        return append_rows(rows, queue_upload=queue_upload)
+    monkeypatch.setattr(store, 'append_rows', with_other_replica)
+    assert app.save_to_local_store(*_row(app, 'rid-00000003'))
+    assert holder['cube'] is None
+
+    monkeypatch.setattr(store, 'append_rows', append_rows)
+    cube = app.load_aggregate_cube(store.read_frame(), app.dataset_key(store.version()))
+    assert cube.total_respondents == 4
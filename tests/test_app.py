@@ -0,0 +1,24 @@
+import time
+
+import pytest
+
+
+def test_whitelist_cold_start_does_not_wait_for_refresh_lock(app_module, monkeypatch):
+    app = app_module
+    app.load_allowed_name_affil_pairs.clear()
+    monkeypatch.setattr(app, '_fetch_sheet_whitelist_pairs', lambda: ({('홍길동', '초이스엔')}, {}))
+    store = app.get_response_store()
+
+    with store.lock('whitelist-refresh', timeout=1):  # 예열 스레드가 명단을 읽는 중
+        t0 = time.perf_counter()
+        with pytest.raises(app.WhitelistLoading):
+            app.load_sheet_whitelist_pairs()
+        with pytest.raises(app.WhitelistLoading):
+            app.load_allowed_name_affil_pairs()  # 명단 없이 캐시하지 않음
+        assert time.perf_counter() - t0 < 1
+
+    assert app.is_valid_name_affil('홍길동', '초이스엔')
+    assert not app.is_valid_name_affil('김철수', '초이스엔')
+    store.kv_delete('cache', 'whitelist')  # 만료
+    with store.lock('whitelist-refresh', timeout=1):
+        assert app.load_sheet_whitelist_pairs() == {('홍길동', '초이스엔')}  # 마지막 명단
@@ -0,0 +1,62 @@
+import csv
+
+import pytest
+
+from bulk_import import import_files
+from catalog import load_catalog
+
+
+def write_csv(path, names, affiliation='초이스엔', bad=()):
+    catalog = load_catalog()
+    ing = catalog.ingredients[0]
+    menu = f"{ing}: {catalog.menus_for(ing)[0]}"
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['이름', '소속', '선택한_메뉴'])
+        for name in names:
+            writer.writerow([name, affiliation, '없는수산물: 없는메뉴' if name in bad else menu])
+    return str(path)
+
+
+@pytest.fixture
+def append_calls(store, monkeypatch):
+    calls = []
+    append_rows = store.append_rows
+
+    def counting(rows, queue_upload=True):
+        calls.append(len(rows))
+        return append_rows(rows, queue_upload=queue_upload)
+    monkeypatch.setattr(store, 'append_rows', counting)
+    return calls
+
+
+def test_import_commits_per_chunk(store, tmp_path, append_calls):
+    path = write_csv(tmp_path / 'a.csv', [f'참여자{i}' for i in range(25)], bad={'참여자3'})
+    report = import_files(store, [path], queue_upload=False, workers=1, chunk_rows=10, batch_size=4)
+    assert report['rows'] == 25 and report['imported'] == 24
+    assert [r['row'] for r in report['rejected']] == [5]
+    assert max(append_calls) <= 4 and sum(append_calls) == 24
+    assert store.count() == 24
+
+
+def test_import_streams_from_workers(store, tmp_path, append_calls):
+    a = write_csv(tmp_path / 'a.csv', [f'참여자{i}' for i in range(30)])
+    b = write_csv(tmp_path / 'b.csv', [f'참여자{i}' for i in range(20, 50)])  # 10명 겹침
+    missing = tmp_path / 'c.csv'
+    missing.write_text('이름,소속\n홍길동,초이스엔\n', encoding='utf-8')
+    report = import_files(store, [a, b, str(missing)], queue_upload=False, workers=2, chunk_rows=7)
+    assert report['files'] == 3 and report['rows'] == 60
+    assert report['imported'] == 50 and len(report['duplicates']) == 10
+    assert report['rejected'][0]['reason'].startswith('필수 열 없음')
+    assert len(append_calls) >= 8  # 청크마다 저장
+    assert store.count() == 50
+
+
+def test_worker_queue_drained_when_store_fails(store, tmp_path, monkeypatch):
+    paths = [write_csv(tmp_path / f'{i}.csv', [f'참여자{i}-{j}' for j in range(40)]) for i in range(3)]
+
+    def broken(rows, queue_upload=True):
+        raise RuntimeError('store down')
+    monkeypatch.setattr(store, 'append_rows', broken)
+    with pytest.raises(RuntimeError):
+        import_files(store, paths, workers=2, chunk_rows=2)  # 큐에 막힌 워커 때문에 멈추지 않아야 함
@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+from catalog import CATALOG_FORMAT, compile_catalog, exposure_counts, load_catalog, record_catalog_version
+
+
+def raw_catalog(menus=None):
+    return {
+        'format': CATALOG_FORMAT,
+        'categories': [{'label': '해조류', 'ingredients': ['김']}, {'label': '조개류', 'ingredients': ['굴']}],
+        'menus': menus or {'김': {'구이': ['김구이'], '밥': ['김밥']}, '굴': {'전': ['굴전']}},
+    }
+
+
+def write(path, raw, mtime_ns):
+    path.write_text(json.dumps(raw, ensure_ascii=False), encoding='utf-8')
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_compile_collects_all_problems():
+    raw = raw_catalog({'김': {'구이': ['김구이', '김구이']}, '전복': {'죽': ['전복죽']}})
+    with pytest.raises(ValueError) as e:
+        compile_catalog(raw)
+    message = str(e.value)
+    for problem in ("메뉴가 없는 수산물: 굴", "카테고리에 없는 수산물(설문에 안 보임): 전복", "김: 중복 메뉴 김구이"):
+        assert problem in message
+
+
+def test_reload_picks_up_edited_file_by_mtime(tmp_path):
+    path = tmp_path / 'menu_catalog.json'
+    write(path, raw_catalog(), 1_000_000_000)
+    first = load_catalog(str(path))
+    assert load_catalog(str(path)) is first  # 파일이 그대로면 다시 컴파일하지 않음
+    assert first.menus_for('굴') == ['굴전']
+
+    edited = raw_catalog()
+    edited['menus']['굴']['국'] = ['굴국']
+    write(path, edited, 2_000_000_000)
+    second = load_catalog(str(path))
+    assert second.menus_for('굴') == ['굴전', '굴국']
+    assert second.method_of[('굴', '굴국')] == '국'
+    assert second.version != first.version
+    assert compile_catalog(edited).version == second.version  # 같은 내용이면 같은 버전
+
+    path.write_text('{"format": 1, "menus": ', encoding='utf-8')  # 저장 도중의 깨진 파일
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert load_catalog(str(path)) is second
+
+
+def test_validate_selection():
+    catalog = compile_catalog(raw_catalog())
+    assert catalog.validate_selection(['김'], {'김': ['김밥']}) == []
+    assert catalog.validate_selection(['김', '전복'], {'김': ['굴전'], '굴': ['굴전']}) == [
+        "알 수 없는 수산물: 전복", "김에 없는 메뉴: 굴전", "선택하지 않은 수산물의 메뉴: 굴"]
+
+
+def test_exposure_counts_follow_recorded_versions(store):
+    old = compile_catalog(raw_catalog())
+    new = compile_catalog(raw_catalog({'김': {'구이': ['김구이']}, '굴': {'전': ['굴전'], '국': ['굴국']}}))
+    record_catalog_version(store, old)
+    record_catalog_version(store, new)
+    history = store.get_meta('catalog_versions')
+    ingredients, menus, everywhere = exposure_counts({old.version: 3, new.version: 2, '': 1}, history)
+    assert ingredients == {'김': 5, '굴': 5}
+    assert menus == {'김구이': 5, '김밥': 3, '굴전': 5, '굴국': 2}
+    assert everywhere == 1  # 버전이 없는 예전 응답은 모든 항목에 노출로 봄
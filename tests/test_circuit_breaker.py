@@ -0,0 +1,115 @@
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class Backend:
+    """가짜 Google 호출: fail이면 예외, sleep만큼 가짜 시계를 진행"""
+
+    def __init__(self, clock, fail=True, sleep=0.0):
+        self.clock = clock
+        self.fail = fail
+        self.sleep = sleep
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        self.clock.advance(self.sleep)
+        if self.fail:
+            raise ConnectionError("연결 끊김")
+        return 'ok'
+
+
+def open_breaker(clock, **kwargs):
+    breaker = CircuitBreaker(failure_rate=0.5, window=4, min_calls=3, open_seconds=30, clock=clock, **kwargs)
+    backend = Backend(clock)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            breaker.call(backend)
+    return breaker, backend
+
+
+def test_fails_fast_while_open():
+    clock = FakeClock()
+    breaker, backend = open_breaker(clock)
+    assert breaker.state == OPEN
+    for _ in range(5):
+        with pytest.raises(CircuitOpen):
+            breaker.call(backend)
+    assert backend.calls == 3  # 열린 동안은 백엔드를 부르지 않음
+    assert breaker.rejected == 5
+    clock.advance(29)
+    assert not breaker.available() and breaker.retry_in() == pytest.approx(1)
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success():
+    clock = FakeClock()
+    breaker, backend = open_breaker(clock)
+    clock.advance(30)
+    backend.fail = False
+    concurrent = []
+
+    def probe():
+        # 시험 호출이 끝나기 전의 다른 호출은 통과하지 못함
+        with pytest.raises(CircuitOpen):
+            breaker.call(backend)
+        concurrent.append(breaker.state)
+        return backend()
+
+    assert breaker.call(probe) == 'ok'
+    assert concurrent == [HALF_OPEN]
+    assert breaker.state == CLOSED
+    assert breaker.call(backend) == 'ok'
+
+
+def test_failed_probe_reopens_with_doubled_wait():
+    clock = FakeClock()
+    breaker, backend = open_breaker(clock)
+    clock.advance(30)
+    with pytest.raises(ConnectionError):
+        breaker.call(backend)
+    assert breaker.state == OPEN
+    assert breaker.retry_in() == pytest.approx(60)
+
+
+def test_slow_calls_count_as_failures():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, window=4, min_calls=3, open_seconds=30, slow_call_sec=8, clock=clock)
+    slow = Backend(clock, fail=False, sleep=9)
+    assert [breaker.call(slow) for _ in range(3)] == ['ok'] * 3  # 느려도 응답은 돌려줌
+    assert breaker.state == OPEN
+    assert breaker.last_error.startswith('느린 응답')
+
+
+def test_google_call_fails_fast_and_recovers(app_module, monkeypatch):
+    clock = FakeClock()
+    breaker = app_module.get_google_breaker()
+    breaker.clock = clock
+    drained = []
+    monkeypatch.setattr(app_module, 'schedule_pending_upload', lambda: drained.append(True))
+    backend = Backend(clock)
+
+    for _ in range(breaker.min_calls):
+        with pytest.raises(ConnectionError):
+            app_module.google_call(backend)
+    assert not app_module.google_available()
+    with pytest.raises(CircuitOpen):
+        app_module.google_call(backend)
+    assert backend.calls == breaker.min_calls
+
+    clock.advance(breaker.open_seconds)
+    backend.fail = False
+    assert app_module.google_call(backend) == 'ok'
+    assert breaker.state == CLOSED
+    assert drained == [True]  # 복구되면 로컬 대기열 업로드 시작
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from cohort import bh_qvalues, compare_cohorts, two_by_two_tests
+from incidence import build_incidence
+
+# (A 선택, B 선택): 큰 표는 카이제곱, 작은 기대도수는 Fisher
+COUNTS = [(40, 20), (35, 33), (3, 0), (1, 6), (60, 59), (0, 2)]
+N_A, N_B = 80, 70
+
+
+def test_pvalues_match_scipy():
+    a, b = np.array(COUNTS).T
+    pvalues, small = two_by_two_tests(a, N_A, b, N_B)
+    for (x, y), p, use_fisher in zip(COUNTS, pvalues, small):
+        table = [[x, N_A - x], [y, N_B - y]]
+        expected = stats.contingency.expected_freq(table)
+        assert use_fisher == (expected.min() < 5)
+        if use_fisher:
+            assert p == pytest.approx(stats.fisher_exact(table)[1], rel=1e-9)
+        else:
+            assert p == pytest.approx(stats.chi2_contingency(table, correction=True)[1], rel=1e-9)
+    assert small.tolist() == [False, False, True, True, False, True]
+
+
+def test_bh_qvalues_are_monotone_and_match_scipy():
+    p = np.random.default_rng(4).random(50) ** 3
+    q = bh_qvalues(p)
+    assert np.all(q >= p) and np.all(q <= 1)
+    assert np.all(np.diff(q[np.argsort(p)]) >= 0)  # p가 크면 q도 작아지지 않음
+    if hasattr(stats, 'false_discovery_control'):
+        assert q == pytest.approx(stats.false_discovery_control(p, method='bh'))
+    assert bh_qvalues([]).tolist() == []
+
+
+def test_compare_cohorts_table():
+    menu_data = {'김': {'구이': ['김구이'], '밥': ['김밥']}, '굴': {'전': ['굴전']}}
+    categories = [('해조류', ['김']), ('조개류', ['굴'])]
+    records = ([('A', ['김'], {'김': ['김구이']})] * 30 + [('A', ['굴'], {'굴': ['굴전']})] * 10
+               + [('B', ['김'], {'김': ['김밥']})] * 30 + [('B', ['굴'], {'굴': ['굴전']})] * 10)
+    incidence = build_incidence(records, menu_data, categories)
+    table, n_a, n_b = compare_cohorts(incidence, incidence.affiliations == 'A', incidence.affiliations == 'B')
+    assert (n_a, n_b) == (40, 40)
+    assert table['항목'].tolist()[-1] == '굴전' and not table['유의'].iloc[-1]
+    assert set(table.loc[table['유의'], '항목']) == {'김구이', '김밥'}
+    assert table.loc[table['항목'] == '김구이', '차이(%p)'].item() == 75.0
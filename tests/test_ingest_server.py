@@ -0,0 +1,99 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from catalog import CATALOG_HISTORY_KEY, load_catalog
+from ingest_server import RosterUnavailable, ingest, make_server
+from roster import publish_pairs, publish_quotas
+
+
+def submission(rid, name='홍길동', affiliation='초이스엔'):
+    catalog = load_catalog()
+    ing = catalog.ingredients[0]
+    return {'응답ID': rid, '이름': name, '소속': affiliation, '설문일시': '2025-03-01 10:00:00',
+            '선택한_수산물': [ing], '선택한_메뉴': {ing: catalog.menus_for(ing)[:1]},
+            '카탈로그버전': catalog.version}
+
+
+def test_ingest_waits_for_roster(store):
+    with pytest.raises(RosterUnavailable):
+        ingest(store, [submission('rid-00000001')])
+    assert store.count() == 0
+
+
+def test_ingest_checks_roster_before_storing(store):
+    publish_pairs(store, {('홍길동', '초이스엔')})
+    result = ingest(store, [submission('rid-00000001'), submission('rid-00000002', name='김철수')])
+    assert result['accepted'] == ['rid-00000001']
+    assert [r['응답ID'] for r in result['rejected']] == ['rid-00000002']
+    assert store.known_ids() == {'rid-00000001'}
+
+
+def test_ingest_applies_quota_within_batch(store):
+    publish_pairs(store, set())  # 빈 명단 = 누구나
+    publish_quotas(store, {'초이스엔': 2})
+    result = ingest(store, [submission(f'rid-0000000{i}') for i in range(3)])
+    assert len(result['accepted']) == 2
+    assert result['rejected'][0]['reason'].startswith('목표 인원')
+    assert store.affiliation_counts(['초이스엔'])['초이스엔'] == 2
+    assert ingest(store, [submission('rid-00000009', affiliation='부산요양원')])['accepted'] == ['rid-00000009']
+
+
+def test_resent_batch_does_not_use_up_quota(store):
+    publish_pairs(store, set())
+    publish_quotas(store, {'초이스엔': 4})
+    first = [submission(f'rid-0000000{i}') for i in range(3)]  # 목표 - 1
+    assert len(ingest(store, first)['accepted']) == 3
+    # 응답을 받기 전에 연결이 끊겨 같은 묶음을 다시 보내면서 새 응답 하나, 묶음 안 중복 하나를 함께 보냄
+    result = ingest(store, first + [submission('rid-00000003'), submission('rid-00000003')])
+    assert result['accepted'] == ['rid-00000003']
+    assert sorted(result['duplicate']) == ['rid-00000000', 'rid-00000001', 'rid-00000002', 'rid-00000003']
+    assert result['rejected'] == []
+    assert store.affiliation_counts(['초이스엔'])['초이스엔'] == 4
+
+
+def test_post_returns_503_until_roster_published(store, tmp_path):
+    server = make_server('127.0.0.1', 0, store, root=str(tmp_path))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/api/responses'
+
+    def post():
+        body = json.dumps({'responses': [submission('rid-00000001')]}).encode('utf-8')
+        req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req) as res:
+            return json.loads(res.read())
+
+    try:
+        with pytest.raises(urllib.error.HTTPError) as e:
+            post()
+        assert e.value.code == 503
+        publish_pairs(store, {('홍길동', '초이스엔')})
+        assert post()['accepted'] == ['rid-00000001']
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_ingest_validates_against_client_catalog_version(store):
+    publish_pairs(store, set())
+    catalog = load_catalog()
+    ing = catalog.ingredients[0]
+    old_version = 'a' * 12
+    store.set_meta(CATALOG_HISTORY_KEY, {old_version: {ing: ['예전 메뉴']}})
+    item = {**submission('rid-00000001'), '선택한_메뉴': {ing: ['예전 메뉴']}, '카탈로그버전': old_version}
+    assert ingest(store, [item])['accepted'] == ['rid-00000001']
+    # 같은 메뉴라도 현재 카탈로그 버전으로 받아 간 응답은 거부
+    stale = {**item, '응답ID': 'rid-00000002', '카탈로그버전': catalog.version}
+    assert [r['응답ID'] for r in ingest(store, [stale])['rejected']] == ['rid-00000002']
+
+
+def test_rejected_items_are_quarantined(store):
+    publish_pairs(store, {('홍길동', '초이스엔')})
+    item = submission('rid-00000001', name='김철수')
+    result = ingest(store, [item, 'not-a-dict'])
+    assert len(result['rejected']) == 2
+    kept = store.kv_get('quarantine', 'rid-00000001')
+    assert kept['row']['이름'] == '김철수' and '등록되지 않은' in kept['reason']
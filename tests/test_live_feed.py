@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from live_feed import LiveCounters
+from storage import make_response_row, open_store
+
+
+def response(i, affiliation='초이스엔'):
+    return make_response_row(f'rid-{i:08d}', f'참여자{i}', affiliation, '2025-03-01 10:00:00', ['김'],
+                             {'김': ['김주먹밥']})
+
+
+class CountingStore:
+    """저장소 호출 횟수를 세는 감싸개"""
+
+    def __init__(self, store):
+        self.store = store
+        self.calls = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self.store, name)
+        if not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+@pytest.fixture(params=['memory', 'excel', 'redis'])
+def live_store(request, tmp_path):
+    if request.param == 'memory':
+        return open_store('memory://')
+    if request.param == 'excel':
+        return open_store(f"excel:///{tmp_path / 'live.xlsx'}")
+    fakeredis = pytest.importorskip('fakeredis')
+    from storage import RedisResponseStore
+    return RedisResponseStore(fakeredis.FakeRedis())
+
+
+def test_poll_reads_only_when_store_changed(live_store):
+    live = LiveCounters(json.loads, json.loads)
+    live_store.append_rows([response(i) for i in range(3)])
+    store = CountingStore(live_store)
+    assert live.poll(store) == 3
+    reads = store.calls.get('read_since', 0)
+
+    for _ in range(5):
+        assert live.poll(store) == 0
+    assert store.calls.get('read_since', 0) == reads
+    assert store.calls.get('count', 0) == 1
+
+    live_store.append_rows([response(3, affiliation='부산요양원')])
+    assert live.poll(store) == 1
+    assert live.total == 4 and live.affiliations['부산요양원'] == 1
+
+
+def test_excel_read_frame_parses_once_per_file_version(tmp_path, monkeypatch):
+    store = open_store(f"excel:///{tmp_path / 'live.xlsx'}")
+    store.append_rows([response(i) for i in range(2)])
+    parsed = []
+    original = store._parse
+    monkeypatch.setattr(store, '_parse', lambda: parsed.append(1) or original())
+    for _ in range(3):
+        store.read_since(0)
+        store.count()
+    assert len(parsed) == 1
+    store.append_rows([response(2)])
+    assert store.count() == 3 and len(parsed) == 2
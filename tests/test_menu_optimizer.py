@@ -0,0 +1,68 @@
+import itertools
+import math
+import random
+
+import pytest
+
+import menu_optimizer
+from incidence import build_incidence
+from menu_optimizer import MenuOptimizer, PlanConstraints
+
+MENU_DATA = {
+    '김': {'구이': ['김구이'], '밥': ['김밥', '김주먹밥']},
+    '굴': {'전': ['굴전'], '국': ['굴국']},
+    '고등어': {'구이': ['고등어구이'], '조림': ['고등어조림']},
+    '미역': {'국': ['미역국'], '무침': ['미역무침']},
+    '오징어': {'볶음': ['오징어볶음'], '튀김': ['오징어튀김']},
+}
+CATEGORIES = [('해조류', ['김', '미역']), ('조개류', ['굴']), ('생선/연체류', ['고등어', '오징어'])]
+
+
+def optimizer(n=40, seed=5):
+    rnd = random.Random(seed)
+    records = []
+    for _ in range(n):
+        ings = rnd.sample(list(MENU_DATA), rnd.randint(1, 2))
+        records.append(('초이스엔', ings, {ing: [rnd.choice([m for ms in MENU_DATA[ing].values() for m in ms])]
+                                          for ing in ings}))
+    return MenuOptimizer(build_incidence(records, MENU_DATA, CATEGORIES), MENU_DATA, CATEGORIES)
+
+
+def brute_force(opt, k):
+    best = 0
+    for combo in itertools.combinations(range(len(opt.menus)), k):
+        covered = 0
+        for j in combo:
+            covered |= opt.bitsets[j]
+        best = max(best, covered.bit_count())
+    return best
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_greedy_within_submodular_bound_of_exact(seed):
+    opt = optimizer(seed=seed)
+    k = 3
+    exact = opt.exact(k)
+    greedy = opt.greedy(k)
+    assert exact.optimal and exact.covered == brute_force(opt, k)
+    assert greedy.covered >= (1 - 1 / math.e) * exact.covered
+    assert greedy.covered <= exact.covered
+    assert sum(greedy.gains) == greedy.covered
+
+
+def test_constraints_are_respected():
+    opt = optimizer()
+    c = PlanConstraints(max_per_ingredient=1, min_methods=4, fixed=('미역무침',))
+    for plan in (opt.greedy(4, c), opt.exact(4, c)):
+        assert '미역무침' in plan.menus
+        ings = [i for m in plan.menus for i in opt.menu_info(m)[0]]
+        assert len(ings) == len(set(ings))
+        assert len({opt.menu_info(m)[1] for m in plan.menus}) >= 4
+        assert plan.unmet == []
+
+
+def test_exact_offered_only_for_small_pattern_counts(monkeypatch):
+    opt = optimizer()
+    assert opt.exact_available()
+    monkeypatch.setattr(menu_optimizer, 'EXACT_MAX_PATTERNS', len(opt.patterns()) - 1)
+    assert not opt.exact_available()
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from search_index import NgramIndex, RespondentSearchIndex, is_chosung_query, to_chosung
+
+NO_MENU = '(메뉴 선택 없음)'
+
+
+def people():
+    return pd.DataFrame({
+        '이름': ['홍길동', '홍길순', '김철수', '홍길동', 'Kim Minji', None],
+        '소속': ['초이스엔', '부산요양원', '초이스엔', '부산요양원', '초이스엔', '초이스엔'],
+        '메뉴': ['김밥', NO_MENU, '굴전', '김구이', NO_MENU, '김밥'],
+    })
+
+
+def test_chosung_conversion():
+    assert to_chosung('홍길동') == 'ㅎㄱㄷ'
+    assert to_chosung('A반 3층') == 'Aㅂ 3ㅊ'  # 한글 음절만 초성으로
+    assert is_chosung_query('ㅎㄱㄷ') and is_chosung_query('ㅅㄹ1')
+    assert not is_chosung_query('홍ㄱ') and not is_chosung_query('kim')
+
+
+def test_chosung_query_finds_full_name():
+    index = NgramIndex(people()['이름'].tolist())
+    assert index.search('ㅎㄱㄷ').tolist() == [0, 3]
+    assert index.search('ㄱㄷ').tolist() == [0, 3]  # 초성 부분일치
+    assert index.search('ㅎㄱ').tolist() == [0, 1, 3]
+    assert index.search('ㅎㅊ').tolist() == []
+
+
+def test_partial_name_query():
+    index = NgramIndex(people()['이름'].tolist())
+    assert index.search('길').tolist() == [0, 1, 3]
+    assert index.search(' 길순 ').tolist() == [1]
+    assert index.search('min').tolist() == [4]  # 대소문자 무시
+    assert index.search('길동이').tolist() == []
+    assert index.exact('홍길동').tolist() == [0, 3]
+
+
+def test_respondent_filter_combines_conditions():
+    index = RespondentSearchIndex(people(), NO_MENU)
+    assert index.name_options == ['Kim Minji', '김철수', '홍길동', '홍길순']
+    assert index.filter() is None  # 조건 없음 = 전체
+    assert index.filter(name_q='ㅎㄱ', aff_q='부산').tolist() == [1, 3]
+    assert index.filter(name_q='ㅎㄱ', aff_q='부산', only_menu_selected=True).tolist() == [3]
+    assert index.filter(aff_q='ㅊㅇ', exact_name='홍길동').tolist() == [0]
+    assert list(index.select(index.filter(name_q='철수'))['이름']) == ['김철수']
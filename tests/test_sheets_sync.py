@@ -0,0 +1,68 @@
+import threading
+
+from sheets_sync import InMemoryWorksheet, SheetsSync
+from storage import make_response_row, open_store
+
+
+def response(i, affiliation='초이스엔'):
+    return make_response_row(f'rid-{i:08d}', f'참여자{i}', affiliation, '2025-03-01 10:00:00', ['김'],
+                             {'김': ['김주먹밥']})
+
+
+def test_concurrent_pushes_under_store_lock_upload_once(tmp_path):
+    store = open_store(f"sqlite:///{tmp_path / 'shared.db'}")  # 공유 캐시 메모리 DB는 잠금 대기를 하지 않음
+    sheet = InMemoryWorksheet()
+    SheetsSync(sheet, None).ensure_header()
+    store.append_rows([response(i) for i in range(20)], queue_upload=True)
+
+    def push():
+        with store.lock('sheets-sync', timeout=5, lease=120):
+            SheetsSync(sheet, store).push()
+
+    errors = []
+
+    def guarded():
+        try:
+            push()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=guarded) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    ids = [r[5] for r in sheet.rows[1:]]
+    assert sorted(ids) == sorted(f'rid-{i:08d}' for i in range(20))
+    assert store.get_meta('pending_upload', []) == []
+
+
+def test_push_pull_round_trip(store):
+    sheet = InMemoryWorksheet()
+    sync = SheetsSync(sheet, store)
+    store.append_rows([response(i) for i in range(3)], queue_upload=True)
+    assert sync.sync() == {'pushed': 3, 'read': 3, 'pulled': 0}
+
+    # 다른 기기에서 Sheet에 직접 추가한 행은 가져오고, 이미 있는 행은 다시 올리지 않음
+    other = response(99, affiliation='부산요양원')
+    sheet.append_rows([[other[c] for c in sheet.rows[0]]])
+    assert sync.sync() == {'pushed': 0, 'read': 1, 'pulled': 1}
+    assert store.known_ids() == {f'rid-{i:08d}' for i in (0, 1, 2, 99)}
+    assert len(sheet.rows) == 5
+    assert sync.sync() == {'pushed': 0, 'read': 0, 'pulled': 0}
+
+
+def test_pull_watermark_counts_blank_rows(store):
+    sheet = InMemoryWorksheet()
+    sync = SheetsSync(sheet, store)
+    header = sync.ensure_header()
+    first, second = response(1), response(2)
+    sheet.append_rows([[first[c] for c in header], [''] * len(header), [second[c] for c in header]])
+    assert sync.pull() == (2, 2)
+    assert store.get_meta('sheet_watermark') == 3
+
+    third = response(3)
+    sheet.append_rows([[third[c] for c in header]])
+    assert sync.pull() == (1, 1)
+    assert sheet.read_calls[-1].startswith('A5:')
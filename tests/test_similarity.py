@@ -0,0 +1,23 @@
+import math
+
+import numpy as np
+import scipy.sparse as sp
+
+from similarity import SimilarityIndex
+
+
+def test_keeps_only_top_k_neighbours_matching_brute_force():
+    rng = np.random.default_rng(0)
+    dense = (rng.random((300, 40)) < 0.2).astype(int)
+    labels = [f'메뉴{i:02d}' for i in range(40)]
+    index = SimilarityIndex.from_matrix(sp.csr_matrix(dense), labels, k=5)
+
+    assert set(vars(index)) == {'k', 'min_support', 'counts', 'neighbours'}  # 동시 선택 행렬은 남기지 않음
+    co = dense.T @ dense
+    for i, label in enumerate(labels):
+        expected = sorted(((co[i, j] / math.sqrt(co[i, i] * co[j, j]), -co[i, j], labels[j])
+                           for j in range(40) if j != i and co[i, j]), key=lambda t: (-t[0], t[1], t[2]))[:5]
+        got = index.query(label, 'cosine')
+        assert [n for n, _, _ in got] == [name for _, _, name in expected]
+        assert [s for _, s, _ in got] == [round(s, 4) for s, _, _ in expected]
+        assert index.counts[label] == co[i, i]
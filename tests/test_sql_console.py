@@ -0,0 +1,57 @@
+import json
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from sql_console import EXAMPLES, AnalyticsDB, QueryTimeout
+
+MENU_DATA = {'김': {'구이': ['김구이'], '밥': ['김밥']}, '굴': {'전': ['굴전']}}
+CATEGORIES = [('해조류', ['김']), ('조개류', ['굴'])]
+
+
+@pytest.fixture
+def db():
+    df = pd.DataFrame({
+        '응답ID': ['rid-1', 'rid-2', ''],
+        '이름': ['홍길동', '김철수', '이영희'],
+        '소속': ['초이스엔', '초이스엔', '부산요양원'],
+        '설문일시': ['2025-03-01 10:00:00', '2025-03-02 11:00:00', '2025-03-02 12:00:00'],
+        '선택한_수산물': [json.dumps(['김', '굴']), json.dumps(['김']), json.dumps([])],
+        '선택한_메뉴': [json.dumps({'김': ['김구이', '김밥'], '굴': ['굴전']}), json.dumps({'김': ['김밥']}), '{}'],
+    })
+    analytics = AnalyticsDB.from_frame(df, json.loads, json.loads, MENU_DATA, CATEGORIES, version='r3')
+    yield analytics
+    analytics.close()
+
+
+def test_normalized_tables(db):
+    assert set(db.tables) == {'respondents', 'selections_long', 'catalog'}
+    result = db.query("SELECT response_id, n_ingredients, n_menus FROM respondents ORDER BY response_id")
+    assert result.frame.values.tolist() == [['rid-1', 2, 3], ['rid-2', 1, 1], ['row-3', 0, 0]]
+    for sql in EXAMPLES.values():
+        assert len(db.query(sql).frame)
+    truncated = db.query("SELECT * FROM selections_long", max_rows=2)
+    assert truncated.truncated and len(truncated.frame) == 2
+
+
+@pytest.mark.parametrize('sql', [
+    "DELETE FROM respondents",
+    "INSERT INTO catalog VALUES ('a', 'b', 'c', 'd')",
+    "CREATE TABLE t (x)",
+    "ATTACH DATABASE ':memory:' AS other",
+    "PRAGMA table_info(respondents)",
+    "PRAGMA query_only = OFF",
+])
+def test_non_select_statements_are_denied(db, sql):
+    with pytest.raises(sqlite3.Error):
+        db.query(sql)
+    assert db.query("SELECT COUNT(*) FROM respondents").frame.iloc[0, 0] == 3
+
+
+def test_runaway_query_hits_timeout(db):
+    runaway = ("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+               "SELECT COUNT(*) FROM n")
+    with pytest.raises(QueryTimeout):
+        db.query(runaway, timeout_sec=0.2)
+    assert db.query("SELECT 1 AS one").frame['one'].tolist() == [1]
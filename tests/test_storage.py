@@ -0,0 +1,167 @@
+import multiprocessing
+import sys
+import threading
+
+import pandas as pd
+import pytest
+
+from migrate_schema import SCHEMA_META_KEY, SCHEMA_VERSION, load_ingredients, load_menus
+from storage import RESPONSE_COLUMNS, import_excel_once, make_response_row, open_store
+
+
+def test_import_excel_once_canonicalizes_legacy_rows(store, tmp_path):
+    legacy = tmp_path / 'legacy.xlsx'
+    pd.DataFrame([
+        ['홍길동', '초이스엔', '2024-01-01 10:00:00', "['김', '굴']", "{'김': ['김주먹밥']}", 'rid-legacy-1', ''],
+        ['김철수', '초이스엔', '2024-01-01 11:00:00', "['김'", "{}", 'rid-legacy-2', ''],
+    ], columns=RESPONSE_COLUMNS).to_excel(legacy, index=False)
+    store.set_meta(SCHEMA_META_KEY, SCHEMA_VERSION)
+
+    assert import_excel_once(store, str(legacy)) == 1
+    row = store.read_frame().iloc[0]
+    assert load_ingredients(row['선택한_수산물']) == ['김', '굴']
+    assert load_menus(row['선택한_메뉴']) == {'김': ['김주먹밥']}
+    assert 'rid-legacy-2' not in store.known_ids()
+    assert store.kv_get('quarantine', 'rid-legacy-2')['row']['이름'] == '김철수'
+    assert import_excel_once(store, str(legacy)) == 0
+
+
+# ---- 여러 프로세스 동시 쓰기 ----
+
+PROCESSES = 4
+ROWS_PER_PROCESS = 50
+
+
+def _append_worker(url, worker):
+    store = open_store(url)
+    for i in range(0, ROWS_PER_PROCESS, 5):
+        store.append_rows([make_response_row(f'w{worker}-{j:04d}', f'참여자{j}', f'소속{worker}',
+                                             '2025-03-01 10:00:00', ['김'], {'김': ['김주먹밥']})
+                           for j in range(i, i + 5)])
+        # 다른 프로세스와 겹치는 응답ID (한 번만 들어가야 함)
+        store.append_rows([make_response_row(f'shared-{i:04d}', '공용', '공용', '2025-03-01 10:00:00', [], {})])
+
+
+def _run_writers(url):
+    ctx = multiprocessing.get_context('fork')
+    procs = [ctx.Process(target=_append_worker, args=(url, w)) for w in range(PROCESSES)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+    expected = {f'w{w}-{j:04d}' for w in range(PROCESSES) for j in range(ROWS_PER_PROCESS)}
+    expected |= {f'shared-{i:04d}' for i in range(0, ROWS_PER_PROCESS, 5)}
+    return expected
+
+
+def _assert_all_stored(store, expected):
+    assert store.count() == len(expected)
+    assert store.known_ids() == expected
+    frame = store.read_frame()
+    assert sorted(frame['응답ID']) == sorted(expected)
+    assert store.affiliation_counts(['소속0', '공용']) == {'소속0': ROWS_PER_PROCESS, '공용': ROWS_PER_PROCESS // 5}
+
+
+def test_sqlite_concurrent_appends_from_processes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    expected = _run_writers(url)
+    _assert_all_stored(open_store(url), expected)
+
+
+@pytest.fixture
+def redis_url():
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.TcpFakeServer(('127.0.0.1', 0), server_type='redis')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_redis_concurrent_appends_from_processes(redis_url):
+    expected = _run_writers(redis_url)
+    _assert_all_stored(open_store(redis_url), expected)
+
+
+def test_redis_read_since_sees_every_commit(redis_url):
+    """쓰는 동안 read_since로 따라가도 빠지는 응답이 없어야 함 (seq 순서 = 커밋 순서)"""
+    reader = open_store(redis_url)
+    seen, last = set(), 0
+    ctx = multiprocessing.get_context('fork')
+    writers = ctx.Process(target=_run_writers, args=(redis_url,))
+    writers.start()
+    while writers.is_alive():
+        rows, last = reader.read_since(last)
+        seen.update(r['응답ID'] for r in rows)
+    writers.join()
+    assert writers.exitcode == 0
+    rows, last = reader.read_since(last)
+    seen.update(r['응답ID'] for r in rows)
+    assert seen == reader.known_ids()
+    assert len(seen) == PROCESSES * ROWS_PER_PROCESS + ROWS_PER_PROCESS // 5
+
+
+def test_redis_seq_index_backfills_existing_records(redis_url):
+    store = open_store(redis_url)
+    store.append_rows([make_response_row(f'rid-{i:08d}', '홍길동', '초이스엔', '2025-03-01 10:00:00', [], {})
+                       for i in range(3)])
+    store.client.delete(store._k('by_seq'))  # 색인이 생기기 전 저장소
+    store.client.hdel(store._k('meta'), 'seq_index')
+    rows, last = open_store(redis_url).read_since(1)
+    assert [r['응답ID'] for r in rows] == ['rid-00000001', 'rid-00000002'] and last == 3
+
+
+# ---- kv (JSON) ----
+
+@pytest.fixture(params=['memory', 'excel', 'redis'])
+def any_store(request, tmp_path):
+    if request.param == 'memory':
+        return open_store('memory://')
+    if request.param == 'excel':
+        return open_store(f"excel:///{tmp_path / 'kv.xlsx'}")
+    fakeredis = pytest.importorskip('fakeredis')
+    from storage import RedisResponseStore
+    return RedisResponseStore(fakeredis.FakeRedis())
+
+
+def test_kv_round_trips_json(any_store):
+    value = {'category_index': 2, 'selected_menus': {'김': ['김주먹밥']}, 'pairs': [['홍길동', '초이스엔']]}
+    any_store.kv_set('draft', 'a', value, ttl=60)
+    assert any_store.kv_get('draft', 'a') == value
+    value['category_index'] = 3  # 저장한 뒤 바꿔도 저장된 값은 그대로
+    assert any_store.kv_get('draft', 'a')['category_index'] == 2
+    with pytest.raises(TypeError):
+        any_store.kv_set('cache', 'bad', {('홍길동', '초이스엔')})
+
+
+def test_kv_ignores_legacy_pickled_values(store):
+    import pickle
+    with store._write() as conn:
+        conn.execute("INSERT INTO kv VALUES (?, ?, ?, ?)", ('cache', 'whitelist', pickle.dumps({('a', 'b')}), None))
+    assert store.kv_get('cache', 'whitelist', 'missing') == 'missing'
+
+
+def test_sqlite_store_works_without_redis(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'redis', None)  # redis 미설치와 같음 (import 시 ImportError)
+    monkeypatch.setitem(sys.modules, 'redis.exceptions', None)
+    store = open_store(f"sqlite:///{tmp_path / 'plain.db'}")
+    row = make_response_row('rid-00000001', '홍길동', '초이스엔', '2025-03-01 10:00:00', [], {})
+    assert store.append_rows([row], queue_upload=True) == ['rid-00000001']
+    assert store.replace_rows([row]) == 1
+    assert [r['응답ID'] for r in store.pending_upload_rows()] == ['rid-00000001']
+
+
+def test_redis_requeued_uploads_keep_append_order():
+    fakeredis = pytest.importorskip('fakeredis')
+    from storage import RedisResponseStore
+    store = RedisResponseStore(fakeredis.FakeRedis())
+    ids = [f'rid-{i:08d}' for i in range(4)]
+    store.append_rows([make_response_row(rid, '홍길동', '초이스엔', '2025-03-01 10:00:00', [], {}) for rid in ids],
+                      queue_upload=True)
+    store.mark_uploaded(ids[:2])
+    store.enqueue_upload([ids[0]])  # 업로드 실패로 다시 올림
+    assert store.get_meta('pending_upload') == [ids[0], ids[2], ids[3]]
+    assert [r['응답ID'] for r in store.pending_upload_rows()] == [ids[0], ids[2], ids[3]]
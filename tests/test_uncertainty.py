@@ -0,0 +1,40 @@
+import numpy as np
+import scipy.sparse as sp
+
+from uncertainty import bootstrap_rankings, competition_ranks
+
+
+def selections(n=300, seed=1):
+    rng = np.random.default_rng(seed)
+    rates = np.array([0.6, 0.45, 0.3, 0.3, 0.05, 0.0])
+    return sp.csr_matrix((rng.random((n, len(rates))) < rates).astype(np.int8))
+
+
+def test_competition_ranks_share_ties():
+    assert competition_ranks(np.array([[5, 9, 5, 1]])).tolist() == [[2, 1, 2, 4]]
+
+
+def test_seeded_ci_contains_point_estimate():
+    matrix = selections()
+    labels = ['김', '굴', '고등어', '갈치', '멍게', '전복']
+    result = bootstrap_rankings(matrix, labels, n_resamples=600, seed=7, workers=1)
+    assert result.labels == labels[:5]  # 한 번도 선택되지 않은 항목은 제외
+    table = result.summary(top_n=2)
+    rate = table['선택률(%)']
+    assert ((table['95% CI 하한(%)'] <= rate) & (rate <= table['95% CI 상한(%)'])).all()
+    assert table['95% CI 하한(%)'].iloc[0] < table['95% CI 상한(%)'].iloc[0]
+    assert table.loc[table['항목'] == '김', 'Top 2 확률'].item() == 1.0
+
+    again = bootstrap_rankings(matrix, labels, n_resamples=600, seed=7, workers=1)
+    assert np.array_equal(again.counts, result.counts)  # 같은 seed → 같은 결과
+
+
+def test_parallel_matches_serial(monkeypatch):
+    import uncertainty
+    monkeypatch.setattr(uncertainty, 'SERIAL_WORK_LIMIT', 0)
+    matrix = selections(n=120)
+    labels = list('abcdef')
+    serial = bootstrap_rankings(matrix, labels, n_resamples=600, seed=3, workers=1)
+    parallel = bootstrap_rankings(matrix, labels, n_resamples=600, seed=3, workers=2)
+    assert np.array_equal(serial.counts, parallel.counts)
+    assert np.array_equal(serial.ranks, parallel.ranks)
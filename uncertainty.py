@@ -0,0 +1,135 @@
+"""랭킹 부트스트랩 (선택 수 신뢰구간 + 순위 안정성)
+
+응답자 단위로 복원추출한 표본의 항목별 선택 수는 (다항분포 가중치 W) @ (응답자×항목 행렬 X)
+이므로, 배치마다 W를 한 번에 뽑아 희소 행렬 곱 한 번으로 계산합니다. 배치는
+ProcessPoolExecutor로 나눠 돌리고, 배치별 난수는 SeedSequence.spawn으로 나눠서
+워커 수와 관계없이 같은 seed면 같은 결과가 나옵니다.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+BATCH_SIZE = 250
+SERIAL_WORK_LIMIT = 2_000_000  # 응답자 수 × 반복 수가 이보다 작으면 프로세스를 띄우지 않음
+
+_WORKER_X = None  # 워커 프로세스: 항목×응답자 행렬 (initializer로 한 번만 전달)
+
+
+def _init_worker(xt):
+    global _WORKER_X
+    _WORKER_X = xt
+
+
+def competition_ranks(counts):
+    """행마다 1 + (나보다 큰 값의 개수). counts: (B, m) 정수 배열"""
+    b, m = counts.shape
+    span = int(counts.max(initial=0)) + 1
+    keyed = (np.arange(b, dtype=np.int64)[:, None] * span - counts.astype(np.int64)).ravel()
+    order = np.sort(keyed)
+    pos = np.searchsorted(order, keyed, side='left').reshape(b, m)
+    return (pos - np.arange(b, dtype=np.int64)[:, None] * m + 1).astype(np.int32)
+
+
+def _resample_batch(xt, seed_seq, size):
+    """size번 복원추출 → (선택 수 (size, m), 순위 (size, m))"""
+    n = xt.shape[1]
+    rng = np.random.default_rng(seed_seq)
+    idx = rng.integers(0, n, size=(size, n))
+    idx += np.arange(size, dtype=idx.dtype)[:, None] * n
+    weights = np.bincount(idx.ravel(), minlength=size * n).reshape(size, n).astype(np.int32)
+    counts = np.asarray(xt @ weights.T).T.astype(np.int32)
+    return counts, competition_ranks(counts)
+
+
+def _worker_batch(seed_seq, size):
+    return _resample_batch(_WORKER_X, seed_seq, size)
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    # 스트림릿 서버는 스레드가 많아 fork가 안전하지 않으므로 새 인터프리터에서 시작
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class BootstrapResult:
+    def __init__(self, labels, observed, n_respondents, counts, ranks, seed):
+        self.labels = list(labels)
+        self.observed = observed
+        self.n_respondents = n_respondents
+        self.counts = counts
+        self.ranks = ranks
+        self.seed = seed
+
+    @property
+    def n_resamples(self):
+        return self.counts.shape[0]
+
+    def observed_ranks(self):
+        return competition_ranks(self.observed[None, :])[0]
+
+    def top_n_probability(self, top_n):
+        return (self.ranks <= top_n).mean(axis=0)
+
+    def summary(self, label='항목', top_n=10, level=0.95):
+        """관측 순위 순서의 표: 선택 수, 선택률과 신뢰구간, 순위 구간, 순위 유지/Top N 확률"""
+        if not self.labels:
+            return pd.DataFrame(columns=['순위', label, '선택 수'])
+        tail = (1 - level) / 2 * 100
+        lo, hi = np.percentile(self.counts, [tail, 100 - tail], axis=0)
+        rank_lo = np.percentile(self.ranks, tail, axis=0, method='lower')
+        rank_hi = np.percentile(self.ranks, 100 - tail, axis=0, method='higher')
+        obs_rank = self.observed_ranks()
+        n = max(self.n_respondents, 1)
+        pct = int(round(level * 100))
+        table = pd.DataFrame({
+            '순위': obs_rank,
+            label: self.labels,
+            '선택 수': self.observed,
+            '선택률(%)': np.round(self.observed / n * 100, 1),
+            f'{pct}% CI 하한(%)': np.round(lo / n * 100, 1),
+            f'{pct}% CI 상한(%)': np.round(hi / n * 100, 1),
+            f'순위 {pct}% 구간': [f"{a}–{b}" if a != b else f"{a}" for a, b in zip(rank_lo, rank_hi)],
+            '같은 순위 확률': np.round((self.ranks == obs_rank).mean(axis=0), 3),
+            f'Top {top_n} 확률': np.round(self.top_n_probability(top_n), 3),
+        })
+        return table.sort_values(['순위', label], kind='stable').reset_index(drop=True)
+
+
+def bootstrap_rankings(matrix, labels, n_resamples=10000, seed=0, workers=None):
+    """matrix: 응답자×항목 0/1 희소 행렬. 선택이 한 번도 없는 항목은 제외하고 계산"""
+    matrix = sp.csr_matrix(matrix)
+    observed = np.asarray(matrix.sum(axis=0)).ravel().astype(np.int32)
+    keep = np.flatnonzero(observed > 0)
+    labels = [labels[j] for j in keep]
+    observed = observed[keep]
+    n = matrix.shape[0]
+    if n == 0 or len(keep) == 0:
+        empty = np.zeros((0, len(keep)), dtype=np.int32)
+        return BootstrapResult(labels, observed, n, empty, empty, seed)
+
+    xt = sp.csr_matrix(matrix[:, keep].T, dtype=np.int32)
+    sizes = [BATCH_SIZE] * (n_resamples // BATCH_SIZE)
+    if n_resamples % BATCH_SIZE:
+        sizes.append(n_resamples % BATCH_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    workers = workers or os.cpu_count() or 1
+    results = None
+    if workers > 1 and len(sizes) > 1 and n * n_resamples >= SERIAL_WORK_LIMIT:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(sizes)), mp_context=_pool_context(),
+                                     initializer=_init_worker, initargs=(xt,)) as pool:
+                results = list(pool.map(_worker_batch, seeds, sizes))
+        except Exception as e:
+            print(f"⚠️ 부트스트랩 병렬 실행 실패, 단일 프로세스로 계산: {e}")
+            results = None
+    if results is None:
+        results = [_resample_batch(xt, s, size) for s, size in zip(seeds, sizes)]
+
+    counts = np.concatenate([c for c, _ in results])
+    ranks = np.concatenate([r for _, r in results])
+    return BootstrapResult(labels, observed, n, counts, ranks, seed)
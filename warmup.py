@@ -0,0 +1,74 @@
+"""프로세스 시작 시 백그라운드 예열 (폰트, Google 인증, 참여자 명단 등)
+
+작업은 등록 순서대로 데몬 스레드 하나에서 실행되고, 화면 쪽은 status()/is_ready()로
+준비 상태만 확인할 뿐 절대 기다리지 않습니다.
+"""
+import threading
+import time
+
+FIRST_IMPORT = time.monotonic()  # 첫 스크립트 실행 시점 (streamlit run 직후 첫 세션)
+LAST_STARTED = None  # 벤치마크에서 상태를 읽기 위한 참조
+
+
+class Warmup:
+    def __init__(self):
+        self._tasks = []
+        self._status = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.started_at = None
+        self.finished_at = None
+        self.first_render_ms = None
+
+    def add(self, name, fn):
+        self._tasks.append((name, fn))
+        self._status[name] = {'state': 'pending', 'seconds': None, 'error': None}
+        return self
+
+    def start(self):
+        global LAST_STARTED
+        LAST_STARTED = self
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self.started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="bluefood-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        for name, fn in self._tasks:
+            self._status[name]['state'] = 'running'
+            t0 = time.perf_counter()
+            try:
+                fn()
+                self._status[name]['state'] = 'done'
+            except Exception as e:
+                self._status[name]['state'] = 'failed'
+                self._status[name]['error'] = str(e)
+                print(f"⚠️ 예열 실패 ({name}): {e}")
+            self._status[name]['seconds'] = time.perf_counter() - t0
+        self.finished_at = time.monotonic()
+        print(f"🔥 예열 완료: {self.finished_at - self.started_at:.2f}s "
+              + ", ".join(f"{n} {s['seconds']:.2f}s" for n, s in self._status.items()))
+
+    def is_ready(self, name=None):
+        if name is None:
+            return self.finished_at is not None
+        return self._status.get(name, {}).get('state') == 'done'
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self, name):
+        return self._status.get(name, {}).get('state') in ('pending', 'running')
+
+    def status(self):
+        return {name: dict(s) for name, s in self._status.items()}
+
+    def mark_first_render(self):
+        """첫 화면 렌더링 완료 시각 기록 (첫 스크립트 실행부터, 한 번만)"""
+        if self.first_render_ms is None:
+            self.first_render_ms = (time.monotonic() - FIRST_IMPORT) * 1000
+            print(f"⏱️ 첫 화면 렌더링: {self.first_render_ms:.0f}ms")